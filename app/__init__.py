@@ -12,6 +12,12 @@ from app.routes.coach import coach_bp
 from app.routes.athlete import athlete_bp
 from . import models  # Import models so they are registered with SQLAlchemy
 from app.real_time.event_handlers import register_all_handlers
+from app.real_time.change_feed import track_model_changes
+from app.utils.competition_config import track_config_changes
+from app.utils.decision_log import track_decision_log_changes
+from app.utils.lifting_order import track_lifting_order_changes
+from app.utils.referee_decisions import track_referee_changes
+from app.utils.schema_upgrades import upgrade_schema
 
 
 class ColoredFormatter(logging.Formatter):
@@ -124,6 +130,16 @@ def create_app(config_name: str | None = None) -> Flask:
                     and "200" in message
                 ):
                     return False
+                # Suppress display fragments endpoint
+                if (
+                    "/display/api/competition/" in message
+                    and "/fragments" in message
+                    and "200" in message
+                ):
+                    return False
+                # Suppress display wall endpoint
+                if "/display/api/wall" in message and "200" in message:
+                    return False
                 # Suppress display timer-state endpoint
                 if "/display/api/timer-state" in message and "200" in message:
                     return False
@@ -166,6 +182,21 @@ def create_app(config_name: str | None = None) -> Flask:
 
         return redirect(url_for("login.login"))
 
+    # Bump per-competition data versions whenever competition data is committed
+    track_model_changes()
+
+    # Keep the decision log filter index current as log rows are committed
+    track_decision_log_changes()
+
+    # Drop cached referee -> assignment mappings when referees are edited
+    track_referee_changes()
+
+    # Recompile competition configs after competitions are saved
+    track_config_changes()
+
+    # Reload cached flight lifting orders when attempts change elsewhere
+    track_lifting_order_changes()
+
     # Register WebSocket event handlers
     register_all_handlers()
     logger.info("Flask app created successfully")
@@ -173,7 +204,7 @@ def create_app(config_name: str | None = None) -> Flask:
 
 
 def _initialize_database(config, instance_path: str) -> None:
-    """Initialize the database if it doesn't exist."""
+    """Initialize the database if it doesn't exist, else upgrade its schema."""
     try:
         if config.is_sqlite():
             db_path = config.get_db_path(instance_path)
@@ -191,6 +222,7 @@ def _initialize_database(config, instance_path: str) -> None:
                 logger.info("Database created successfully!")
             else:
                 logger.info(f"Database already exists at {db_path}")
+                upgrade_schema()
         else:
             # For other databases, check if tables exist
             inspector = db.inspect(db.engine)
@@ -200,6 +232,7 @@ def _initialize_database(config, instance_path: str) -> None:
                 logger.info("Database tables created successfully!")
             else:
                 logger.info("Database tables already exist")
+                upgrade_schema()
     except Exception as e:
         logger.error(f"Error during database initialization: {e}")
         logger.error(f"Database URI: {config.SQLALCHEMY_DATABASE_URI}")
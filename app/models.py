@@ -153,6 +153,34 @@ class Athlete(db.Model):
         return all_attempts
 
 
+class MovementDefinition(db.Model):
+    """
+    One movement of an event as configured in Competition.config, shared by
+    every entry for it. Entries reference it by (event_id, lift_type).
+    """
+
+    __tablename__ = "movement_definition"
+
+    id = db.Column(db.Integer, primary_key=True)
+    competition_id = db.Column(
+        db.Integer, db.ForeignKey("competition.id"), nullable=False
+    )
+    event_id = db.Column(
+        db.Integer, db.ForeignKey("event.id", ondelete="CASCADE"), nullable=False
+    )
+    name = db.Column(db.String(50), nullable=False)  # matches AthleteEntry.lift_type
+    reps = db.Column(db.JSON)
+    attempt_seconds = db.Column(db.Integer)
+    config = db.Column(db.JSON, default=dict)  # the movement block from the config
+    updated_at = db.Column(
+        db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
+    )
+
+    __table_args__ = (
+        db.UniqueConstraint("event_id", "name", name="uq_movement_definition_event"),
+    )
+
+
 class AthleteEntry(db.Model):
     """Athletes entered in specific competition types"""
 
@@ -168,11 +196,15 @@ class AthleteEntry(db.Model):
     is_active = db.Column(db.Boolean, default=True)
     lift_type = db.Column(db.String(50), nullable=False)  # e.g., "snatch", "clean_jerk"
     attempt_time_limit = db.Column(db.Integer, default=60)  # seconds
-    default_reps = db.Column(db.JSON)
-    reps = db.Column(db.JSON)
+    # Athlete's own reps; None follows the movement definition
+    reps_override = db.Column("reps", db.JSON)
 
     opening_weights = db.Column(db.Integer)
-    entry_config = db.Column(db.JSON, default=dict)
+
+    # Copies of the movement taken by entries created before movement
+    # definitions existed; only read when there is no definition
+    stored_default_reps = db.Column("default_reps", db.JSON)
+    stored_entry_config = db.Column("entry_config", db.JSON)
 
     # Relationships
     attempts = db.relationship(
@@ -180,6 +212,13 @@ class AthleteEntry(db.Model):
     )
     event = db.relationship("Event", backref="athlete_entries")
     flight = db.relationship("Flight", backref="athlete_entries")
+    movement = db.relationship(
+        "MovementDefinition",
+        primaryjoin="and_(foreign(AthleteEntry.event_id) == MovementDefinition.event_id, "
+        "foreign(AthleteEntry.lift_type) == MovementDefinition.name)",
+        uselist=False,
+        viewonly=True,
+    )
 
     # Prevent duplicate (athlete, event, lift_type) - Allow athlete in multiple flights of different movements
     __table_args__ = (
@@ -193,6 +232,34 @@ class AthleteEntry(db.Model):
         """Human-readable movement name; we persist this into lift_type, so return it."""
         return self.lift_type or "Unknown"
 
+    @property
+    def default_reps(self):
+        """Reps from the competition config"""
+        if self.movement is not None:
+            return self.movement.reps
+        return self.stored_default_reps
+
+    @property
+    def reps(self):
+        """Reps this athlete will do: their override, else the default"""
+        if self.reps_override is not None:
+            return self.reps_override
+        return self.default_reps
+
+    @property
+    def entry_config(self):
+        """The movement block from the competition config"""
+        if self.movement is not None:
+            return self.movement.config or {}
+        return self.stored_entry_config or {}
+
+    @property
+    def time_limit(self):
+        """Attempt time limit in seconds"""
+        if self.movement is not None and self.movement.attempt_seconds:
+            return self.movement.attempt_seconds
+        return self.attempt_time_limit or 60
+
 
 class AthleteFlight(db.Model):
     """Many-to-many relationship between athletes and flights"""
@@ -272,6 +339,15 @@ class RefereeDecision(db.Model):
     # Relationships
     referee_assignment = db.relationship("RefereeAssignment", backref="decisions")
 
+    # One vote per referee per attempt; later votes replace it (upsert target)
+    __table_args__ = (
+        db.UniqueConstraint(
+            "attempt_id",
+            "referee_assignment_id",
+            name="uq_referee_decision_attempt_assignment",
+        ),
+    )
+
 
 # Timer and Scoring
 class Timer(db.Model):
@@ -310,6 +386,12 @@ class Score(db.Model):
     # Relationships
     athlete_entry = db.relationship("AthleteEntry", backref="scores")
 
+    # Score history is listed newest first, paged by (calculated_at, id)
+    __table_args__ = (
+        db.Index("ix_score_calculated_at_id", "calculated_at", "id"),
+        db.Index("ix_score_athlete_entry_id", "athlete_entry_id"),
+    )
+
 
 # Coach Assignment
 class CoachAssignment(db.Model):
@@ -433,6 +515,18 @@ class RefereeDecisionLog(db.Model):
     # Timestamp
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
 
+    # Results are listed per competition, newest first, and filtered by name
+    __table_args__ = (
+        db.Index(
+            "ix_decision_log_competition_timestamp", "competition_id", "timestamp", "id"
+        ),
+        db.Index("ix_decision_log_competition_event", "competition_id", "event_name"),
+        db.Index("ix_decision_log_competition_flight", "competition_id", "flight_name"),
+        db.Index(
+            "ix_decision_log_competition_athlete", "competition_id", "athlete_name"
+        ),
+    )
+
     def __repr__(self):
         return f"<RefereeDecisionLog {self.referee.name if self.referee else 'Unknown'} - {self.athlete_name} - {self.decision_label}>"
 
@@ -462,6 +556,49 @@ class RefereeDecisionLog(db.Model):
         }
 
 
+class RefereeDecisionAudit(db.Model):
+    """Append-only audit trail of every decision a referee submits"""
+
+    __tablename__ = "referee_decision_audit"
+
+    id = db.Column(db.Integer, primary_key=True)
+    referee_id = db.Column(db.Integer, db.ForeignKey("referee.id"), nullable=False)
+    competition_id = db.Column(
+        db.Integer, db.ForeignKey("competition.id"), nullable=False
+    )
+    attempt_id = db.Column(
+        db.Integer, db.ForeignKey("attempt.id"), nullable=True
+    )  # None when the decision could not be linked to an attempt
+    decision = db.Column(db.String(50), nullable=False)  # e.g. "good_lift"
+    notes = db.Column(db.Text, nullable=True)
+    client_timestamp = db.Column(db.String(50), nullable=True)  # as sent by the tablet
+    # Id generated by the tablet, so retried and replayed decisions apply once
+    client_decision_id = db.Column(db.String(64), nullable=True)
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    # Audit entries are read per attempt or per referee, oldest first
+    __table_args__ = (
+        db.Index("ix_decision_audit_attempt", "attempt_id", "recorded_at"),
+        db.Index("ix_decision_audit_referee", "referee_id", "recorded_at"),
+        db.Index(
+            "uq_decision_audit_client_decision_id", "client_decision_id", unique=True
+        ),
+    )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "referee_id": self.referee_id,
+            "competition_id": self.competition_id,
+            "attempt_id": self.attempt_id,
+            "decision": self.decision,
+            "notes": self.notes,
+            "client_timestamp": self.client_timestamp,
+            "client_decision_id": self.client_decision_id,
+            "recorded_at": self.recorded_at.isoformat() if self.recorded_at else None,
+        }
+
+
 class TechnicalViolation(db.Model):
     """Store configurable technical violation types"""
 
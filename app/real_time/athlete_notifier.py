@@ -0,0 +1,204 @@
+"""
+Per-athlete push notifications: queue position, ETA bucket and "you are up"
+are recomputed when competition data changes and pushed to the athlete's
+Socket.IO room only when they differ from what the athlete last received.
+"""
+
+import queue
+import threading
+import logging
+from typing import Dict, Optional
+
+from app.extensions import db
+from app.utils.queue_projection import get_competition_status
+from .change_feed import change_feed
+from .websocket import competition_realtime
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds (minutes) of the ETA buckets pushed to athletes
+ETA_BUCKET_MINUTES = (1, 3, 5, 10, 15, 30, 60)
+
+
+def eta_bucket(seconds: Optional[int]) -> Optional[str]:
+    """Coarse ETA label, e.g. "3-5m"; pushes only happen when it changes"""
+    if seconds is None:
+        return None
+    if seconds <= 0:
+        return "now"
+    lower = 0
+    for upper in ETA_BUCKET_MINUTES:
+        if seconds < upper * 60:
+            return f"<{upper}m" if lower == 0 else f"{lower}-{upper}m"
+        lower = upper
+    return f"{lower}m+"
+
+
+def athlete_queue_status(status, athlete_id: int) -> dict:
+    """Build the push payload for one athlete from a CompetitionStatus"""
+    prefer_movement = status.preferred_movement(athlete_id)
+    next_attempt, attempt_status = status.next_attempt_for_athlete(
+        athlete_id, None, prefer_movement
+    )
+    if not next_attempt:
+        return {
+            "athlete_id": athlete_id,
+            "no_attempts": True,
+            "attempt_id": None,
+            "status": attempt_status,
+            "you_are_up": False,
+            "position": None,
+            "eta_seconds": None,
+            "eta_bucket": None,
+        }
+
+    you_are_up = attempt_status == "in-progress" or status.is_first_in_queue(
+        next_attempt
+    )
+    position = 0
+    eta_seconds = 0
+    if not you_are_up:
+        projection = status.queue()
+        slot = projection.slots.get(next_attempt.id)
+        position = slot.flight_position if slot else None
+        eta_seconds = projection.estimated_seconds(next_attempt.id)
+
+    event = status.events.get(next_attempt.event_id)
+    return {
+        "athlete_id": athlete_id,
+        "no_attempts": False,
+        "attempt_id": next_attempt.id,
+        "status": attempt_status,
+        "you_are_up": you_are_up,
+        "position": position,
+        "eta_seconds": eta_seconds,
+        "eta_bucket": eta_bucket(eta_seconds),
+        "lift_type": next_attempt.movement_name,
+        "order": next_attempt.attempt_number,
+        "weight": next_attempt.requested_weight,
+        "event": {
+            "id": event.id,
+            "name": event.name,
+            "sport_type": event.sport_type.value if event.sport_type else None,
+        }
+        if event
+        else None,
+    }
+
+
+def _signature(payload: dict) -> tuple:
+    """Fields whose change is worth a push (the exact ETA is not one of them)"""
+    return (
+        payload["attempt_id"],
+        payload["status"],
+        payload["you_are_up"],
+        payload["position"],
+        payload["eta_bucket"],
+        payload.get("weight"),
+    )
+
+
+class AthleteNotifier:
+    """
+    Pushes athlete queue status changes. Change feed bumps are queued and
+    handled on a background thread, so committing requests never wait on
+    the recomputation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_sent: Dict[int, tuple] = {}
+        self._pending: queue.Queue = queue.Queue()
+        self._thread = None
+        self._app = None
+
+    def start(self, app) -> None:
+        """Start the background worker (idempotent)"""
+        with self._lock:
+            self._app = app
+            if self._thread and self._thread.is_alive():
+                return
+            change_feed.add_listener(self._on_change)
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        logger.debug("Athlete notifier started")
+
+    def _on_change(self, competition_id: Optional[int]) -> None:
+        self._pending.put(competition_id)
+
+    def _run(self):
+        while True:
+            changed = {self._pending.get()}
+            # Coalesce bursts of commits into a single recomputation
+            while True:
+                try:
+                    changed.add(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+
+            if None in changed:
+                changed = set(competition_realtime.get_athlete_subscribers())
+
+            try:
+                with self._app.app_context():
+                    try:
+                        for competition_id in changed:
+                            self.refresh(competition_id)
+                    finally:
+                        db.session.remove()
+            except Exception as e:
+                logger.error(f"Athlete notifier refresh failed: {e}")
+
+    def refresh(self, competition_id: int) -> int:
+        """
+        Recompute every subscribed athlete in a competition and push the
+        ones whose status changed. Returns the number of pushes.
+        """
+        athlete_ids = competition_realtime.get_athlete_subscribers(competition_id)
+        if not athlete_ids:
+            return 0
+
+        # Built outside the lock: a socket join must not wait on the queries
+        status = get_competition_status(competition_id)
+        payloads = [
+            athlete_queue_status(status, athlete_id) for athlete_id in athlete_ids
+        ]
+
+        changed = []
+        with self._lock:
+            # Athletes who left meanwhile have been forgotten; keep it that way
+            subscribed = set(
+                competition_realtime.get_athlete_subscribers(competition_id)
+            )
+            for payload in payloads:
+                if payload["athlete_id"] not in subscribed:
+                    continue
+                signature = _signature(payload)
+                if self._last_sent.get(payload["athlete_id"]) == signature:
+                    continue
+                self._last_sent[payload["athlete_id"]] = signature
+                changed.append(payload)
+
+        for payload in changed:
+            competition_realtime.send_to_athlete(
+                payload["athlete_id"], "athlete_status", payload
+            )
+        return len(changed)
+
+    def current(self, competition_id: int, athlete_id: int) -> dict:
+        """Status for a newly joined client; later pushes are relative to it"""
+        payload = athlete_queue_status(
+            get_competition_status(competition_id), athlete_id
+        )
+        with self._lock:
+            self._last_sent[athlete_id] = _signature(payload)
+        return payload
+
+    def forget(self, athlete_id: int) -> None:
+        """Drop what was last sent to an athlete whose last client left"""
+        with self._lock:
+            self._last_sent.pop(athlete_id, None)
+
+
+# Global instance
+athlete_notifier = AthleteNotifier()
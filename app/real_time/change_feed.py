@@ -0,0 +1,218 @@
+"""
+Per-competition change feed: data versions used to key shared display
+projections, plus a fan-out of real-time events to in-process subscribers
+(Server-Sent Events streams) alongside the Socket.IO rooms.
+"""
+
+import queue
+import threading
+import logging
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before the oldest ones are dropped
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# Relationships followed when a changed row has no competition_id of its own
+_PARENT_RELATIONSHIPS = ("athlete", "flight", "event", "athlete_entry")
+
+
+class ChangeFeed:
+    """
+    Tracks a monotonically increasing data version per competition.
+
+    Versions are bumped after every commit that touches competition data, so
+    anything cached against a version is invalidated the moment the
+    underlying rows change. Changes that cannot be attributed to a single
+    competition bump the global version, which invalidates every competition.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._global_version = 0
+        self._versions: Dict[int, int] = {}
+        self._subscribers: Dict[int, List[queue.Queue]] = {}
+        self._listeners: List[Callable[[Optional[int]], None]] = []
+
+    def version(self, competition_id: int) -> Tuple[int, int]:
+        """Return the current (global, competition) version pair"""
+        with self._lock:
+            return self._global_version, self._versions.get(int(competition_id), 0)
+
+    def bump(self, competition_id: Optional[int] = None) -> None:
+        """Mark data for one competition (or every competition) as changed"""
+        with self._lock:
+            if competition_id is None:
+                self._global_version += 1
+            else:
+                competition_id = int(competition_id)
+                self._versions[competition_id] = (
+                    self._versions.get(competition_id, 0) + 1
+                )
+            listeners = list(self._listeners)
+        self.publish(competition_id, "data_changed")
+        for listener in listeners:
+            try:
+                listener(competition_id)
+            except Exception as e:
+                logger.error(f"Change feed listener failed: {e}")
+
+    def add_listener(self, listener: Callable[[Optional[int]], None]) -> None:
+        """
+        Call listener(competition_id) after every bump. Listeners run inside
+        the committing thread and must return quickly.
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def subscribe(self, competition_id: int) -> queue.Queue:
+        """Register a subscriber queue for one competition's events"""
+        subscriber = queue.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        with self._lock:
+            self._subscribers.setdefault(int(competition_id), []).append(subscriber)
+        return subscriber
+
+    def unsubscribe(self, competition_id: int, subscriber: queue.Queue) -> None:
+        """Remove a subscriber queue registered with subscribe()"""
+        with self._lock:
+            subscribers = self._subscribers.get(int(competition_id), [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(int(competition_id), None)
+
+    def subscriber_count(self, competition_id: Optional[int] = None) -> int:
+        """Number of subscribers for one competition, or in total"""
+        with self._lock:
+            if competition_id is not None:
+                return len(self._subscribers.get(int(competition_id), []))
+            return sum(len(subs) for subs in self._subscribers.values())
+
+    def publish(self, competition_id: Optional[int], event: str, data: Any = None):
+        """
+        Deliver an event to subscribers of a competition. Events without a
+        competition go to every subscriber. Slow subscribers lose their
+        oldest buffered events rather than blocking the publisher.
+        """
+        with self._lock:
+            if competition_id is None:
+                targets = [s for subs in self._subscribers.values() for s in subs]
+            else:
+                try:
+                    key = int(competition_id)
+                except (TypeError, ValueError):
+                    return
+                targets = list(self._subscribers.get(key, []))
+
+        for subscriber in targets:
+            while True:
+                try:
+                    subscriber.put_nowait((event, data))
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    def bump_many(self, competition_ids: Iterable[Optional[int]]) -> None:
+        """Bump several competitions at once"""
+        for competition_id in set(competition_ids):
+            self.bump(competition_id)
+
+
+def _competition_ids_for(obj, depth: int = 0) -> Set[int]:
+    """Work out which competition a changed row belongs to without querying"""
+    from app.models import Competition
+
+    if isinstance(obj, Competition):
+        return {obj.id} if obj.id is not None else set()
+
+    loaded = obj.__dict__
+    if loaded.get("competition_id") is not None:
+        return {loaded["competition_id"]}
+
+    if depth < 3:
+        for name in _PARENT_RELATIONSHIPS:
+            related = loaded.get(name)
+            if related is not None:
+                found = _competition_ids_for(related, depth + 1)
+                if found:
+                    return found
+    return set()
+
+
+def _tracked_models():
+    from app.models import (
+        Competition,
+        Event,
+        Flight,
+        Athlete,
+        AthleteEntry,
+        AthleteFlight,
+        Attempt,
+        Score,
+        MovementDefinition,
+    )
+
+    return (
+        Competition,
+        Event,
+        Flight,
+        Athlete,
+        AthleteEntry,
+        AthleteFlight,
+        Attempt,
+        Score,
+        MovementDefinition,
+    )
+
+
+def _after_flush(session, flush_context):
+    tracked = _tracked_models()
+    pending = session.info.setdefault("changed_competitions", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, tracked):
+            continue
+        competition_ids = _competition_ids_for(obj)
+        if competition_ids:
+            pending.update(competition_ids)
+        else:
+            pending.add(None)
+
+
+def mark_changed(session, competition_id: Optional[int]) -> None:
+    """
+    Record a change made with bulk/Core statements, which bypass the flush
+    hooks. The competition's version is bumped when the session commits.
+    """
+    session.info.setdefault("changed_competitions", set()).add(competition_id)
+
+
+def _after_commit(session):
+    pending = session.info.pop("changed_competitions", None)
+    if pending:
+        change_feed.bump_many(pending)
+
+
+def _after_rollback(session):
+    session.info.pop("changed_competitions", None)
+
+
+def track_model_changes() -> None:
+    """Hook the change feed into SQLAlchemy session commits (idempotent)"""
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.debug("Change feed attached to SQLAlchemy sessions")
+
+
+# Global instance
+change_feed = ChangeFeed()
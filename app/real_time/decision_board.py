@@ -0,0 +1,196 @@
+"""
+Live referee decision board: an in-memory vote tally per competition and
+attempt. Every vote is pushed to the competition room as it arrives, and the
+final result is pushed the moment the configured number of referees has
+voted, so displays never poll for decisions.
+"""
+
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Optional
+
+from app.extensions import db
+from app.models import Competition
+from app.utils.competition_config import compiled_config, default_referee_settings
+from app.utils.display_projections import projection_cache
+from .websocket import competition_realtime
+
+logger = logging.getLogger(__name__)
+
+# Attempts kept per competition; older tallies are dropped
+MAX_ATTEMPTS_PER_COMPETITION = 20
+
+
+def load_referee_settings(competition_id: int) -> dict:
+    competition = db.session.get(Competition, competition_id)
+    if not competition:
+        return default_referee_settings()
+    return compiled_config(competition).referee_settings()
+
+
+@dataclass
+class AttemptTally:
+    """Votes cast on one attempt"""
+
+    competition_id: int
+    attempt_id: int
+    required: int
+    votes: Dict[int, dict] = field(default_factory=dict)
+    result: Optional[dict] = None
+
+    def to_dict(self) -> dict:
+        return {
+            "competition_id": self.competition_id,
+            "attempt_id": self.attempt_id,
+            "required": self.required,
+            "votes": {str(k): v for k, v in self.votes.items()},
+            "result": self.result,
+        }
+
+
+def _tally_result(tally: AttemptTally, settings: dict) -> dict:
+    """
+    Majority result. A good lift needs more than half the votes; a tie is
+    no lift, as in ScoringCalculator.determine_attempt_result.
+    """
+    good_votes = sum(1 for vote in tally.votes.values() if vote["decision_value"])
+    no_votes = len(tally.votes) - good_votes
+    good_lift = good_votes > len(tally.votes) / 2
+    option = next(
+        (
+            option
+            for option in settings["decision_options"]
+            if option["value"] is good_lift
+        ),
+        None,
+    )
+    return {
+        "good_lift": good_lift,
+        "label": option["label"]
+        if option
+        else ("Good Lift" if good_lift else "No Lift"),
+        "color": option["color"] if option else None,
+        "good_votes": good_votes,
+        "no_votes": no_votes,
+        "decided_at": datetime.utcnow().isoformat(),
+    }
+
+
+class DecisionBoard:
+    """Per-competition, per-attempt vote tallies with quorum detection"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards: Dict[int, "OrderedDict[int, AttemptTally]"] = {}
+
+    def settings(self, competition_id: int) -> dict:
+        """Referee settings, cached against the competition's data version"""
+        return projection_cache.get(
+            "referee_settings", competition_id, load_referee_settings
+        )
+
+    def record(
+        self,
+        competition_id: int,
+        attempt_id: int,
+        referee_id: int,
+        decision_value: bool,
+        decision_label: Optional[str] = None,
+    ) -> AttemptTally:
+        """
+        Record a vote (a repeat vote replaces the referee's earlier one),
+        push it to the competition room and push the result once quorum is
+        reached or whenever a changed vote flips it.
+        """
+        competition_id = int(competition_id)
+        attempt_id = int(attempt_id)
+        settings = self.settings(competition_id)
+        vote = {
+            "referee_id": referee_id,
+            "decision_value": bool(decision_value),
+            "decision_label": decision_label
+            or ("Good Lift" if decision_value else "No Lift"),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+
+        with self._lock:
+            board = self._boards.setdefault(competition_id, OrderedDict())
+            tally = board.get(attempt_id)
+            if tally is None:
+                tally = AttemptTally(
+                    competition_id=competition_id,
+                    attempt_id=attempt_id,
+                    required=settings["number_of_referees"],
+                )
+                board[attempt_id] = tally
+                while len(board) > MAX_ATTEMPTS_PER_COMPETITION:
+                    board.popitem(last=False)
+            board.move_to_end(attempt_id)
+            tally.votes[int(referee_id)] = vote
+
+            result_changed = False
+            if len(tally.votes) >= tally.required:
+                result = _tally_result(tally, settings)
+                previous = tally.result
+                result_changed = previous is None or (
+                    previous["good_lift"] != result["good_lift"]
+                )
+                if result_changed:
+                    tally.result = result
+            votes_received = len(tally.votes)
+            result = tally.result
+
+        competition_realtime.broadcast_to_competition(
+            competition_id,
+            "referee_vote",
+            {
+                "competition_id": competition_id,
+                "attempt_id": attempt_id,
+                "votes_received": votes_received,
+                "required": tally.required,
+                **vote,
+            },
+        )
+        if result_changed:
+            competition_realtime.broadcast_to_competition(
+                competition_id,
+                "decision_result",
+                {"competition_id": competition_id, "attempt_id": attempt_id, **result},
+            )
+            logger.info(
+                f"Decision for attempt {attempt_id} in competition "
+                f"{competition_id}: {result['label']}"
+            )
+        return tally
+
+    def current(self, competition_id: int) -> Optional[AttemptTally]:
+        """Tally of the attempt most recently voted on"""
+        with self._lock:
+            board = self._boards.get(int(competition_id))
+            if not board:
+                return None
+            return next(reversed(board.values()))
+
+    def get(self, competition_id: int, attempt_id: int) -> Optional[AttemptTally]:
+        with self._lock:
+            return self._boards.get(int(competition_id), {}).get(int(attempt_id))
+
+    def clear(self, competition_id: int, attempt_id: Optional[int] = None) -> None:
+        """Forget one attempt's votes, or every tally for the competition"""
+        with self._lock:
+            if attempt_id is None:
+                self._boards.pop(int(competition_id), None)
+            else:
+                self._boards.get(int(competition_id), {}).pop(int(attempt_id), None)
+
+    def reset(self) -> None:
+        """Forget every tally"""
+        with self._lock:
+            self._boards.clear()
+
+
+# Global instance
+decision_board = DecisionBoard()
@@ -3,8 +3,9 @@ WebSocket event handlers for real-time competition features
 """
 
 from flask_socketio import emit
-from flask import request
-from app.extensions import socketio
+from flask import current_app, request, session
+from app.extensions import db, socketio
+from .athlete_notifier import athlete_notifier
 from .websocket import competition_realtime
 import logging
 
@@ -89,29 +90,35 @@ def register_timer_handlers():
 
 @socketio.on("referee_decision")
 def handle_referee_decision(data):
-    """Handle referee decision submission"""
+    """
+    Persist a referee decision. The result is returned as the Socket.IO ack,
+    so a tablet can vote without a separate HTTP request.
+    """
+    from app.utils.referee_decisions import submit_decision
+
+    if not isinstance(data, dict) or not data:
+        emit("error", {"message": "No data provided"})
+        return {"success": False, "message": "No data provided"}
+
+    result, _ = submit_decision(data)
+    if not result["success"]:
+        emit("error", {"message": result["message"]})
+        return result
+
+    # Existing listeners (dashboards, display stream) get the stored decision
     competition_id = data.get("competition_id")
-    referee_id = data.get("referee_id")
-    decision = data.get("decision")
-    attempt_id = data.get("attempt_id")
-
-    if not all([competition_id, referee_id, decision, attempt_id]):
-        emit("error", {"message": "Missing required decision data"})
-        return
-
-    # Broadcast referee decision
-    decision_data = {
-        "competition_id": competition_id,
-        "referee_id": referee_id,
-        "decision": decision,
-        "attempt_id": attempt_id,
-        "timestamp": data.get("timestamp"),
-    }
-
-    competition_realtime.broadcast_referee_decision(competition_id, decision_data)
-    logger.info(
-        f"Referee {referee_id} decision broadcast for competition {competition_id}"
+    competition_realtime.broadcast_referee_decision(
+        competition_id,
+        {
+            "competition_id": competition_id,
+            "referee_id": result["referee_id"],
+            "decision": result["decision"],
+            "attempt_id": result.get("attempt_id"),
+            "timestamp": data.get("timestamp"),
+        },
     )
+    logger.info(f"Referee {result['referee_id']} decision stored via socket")
+    return result
 
 
 @socketio.on("attempt_result")
@@ -191,6 +198,33 @@ def handle_athlete_queue_update(data):
     logger.info(f"Athlete queue updated for competition {competition_id}")
 
 
+@socketio.on("join_athlete")
+def handle_join_athlete(data=None):
+    """Join the logged-in athlete's room for queue status pushes"""
+    from app.models import Athlete
+
+    athlete_id = session.get("athlete_id")
+    if not athlete_id:
+        emit("error", {"message": "Athlete login required"})
+        return
+
+    athlete = (
+        db.session.query(Athlete.id, Athlete.competition_id)
+        .filter(Athlete.id == athlete_id)
+        .first()
+    )
+    if not athlete or not athlete.competition_id:
+        emit("error", {"message": "Athlete not found"})
+        return
+
+    competition_realtime.join_athlete_room(
+        request.sid, athlete.competition_id, athlete.id
+    )
+    athlete_notifier.start(current_app._get_current_object())
+    emit("athlete_status", athlete_notifier.current(athlete.competition_id, athlete.id))
+    logger.info(f"Athlete {athlete.id} subscribed to queue status pushes")
+
+
 def register_competition_handlers():
     """Register competition-specific event handlers"""
     # Competition handlers are defined above as decorators
@@ -5,6 +5,7 @@ WebSocket server implementation for real-time competition data
 from flask_socketio import emit, join_room, leave_room
 from flask import request
 from app.extensions import socketio
+from .change_feed import change_feed
 import logging
 
 logger = logging.getLogger(__name__)
@@ -18,6 +19,7 @@ class CompetitionRealTime:
     def __init__(self):
         self.connected_clients = {}
         self.competition_rooms = {}
+        self.athlete_rooms = {}  # competition_id -> {athlete_id: {client_id, ...}}
 
     def register_handlers(self):
         """Register WebSocket event handlers"""
@@ -49,6 +51,9 @@ class CompetitionRealTime:
                 if competition_id:
                     self.leave_competition_room(client_id, competition_id)
 
+                if client_data.get("athlete_id"):
+                    self.leave_athlete_room(client_id)
+
                 del self.connected_clients[client_id]
 
         @socketio.on("join_competition")
@@ -118,16 +123,76 @@ class CompetitionRealTime:
 
         logger.info(f"Client {client_id} left competition {competition_id}")
 
+    def join_athlete_room(self, client_id, competition_id, athlete_id):
+        """Add client to an athlete's personal room"""
+        join_room(f"athlete_{athlete_id}")
+
+        if client_id in self.connected_clients:
+            self.connected_clients[client_id]["athlete_id"] = athlete_id
+            self.connected_clients[client_id]["athlete_competition_id"] = competition_id
+
+        athletes = self.athlete_rooms.setdefault(int(competition_id), {})
+        athletes.setdefault(int(athlete_id), set()).add(client_id)
+
+        logger.info(f"Client {client_id} joined athlete room {athlete_id}")
+
+    def leave_athlete_room(self, client_id):
+        """Remove client from the athlete room it joined, if any"""
+        client_data = self.connected_clients.get(client_id, {})
+        athlete_id = client_data.get("athlete_id")
+        competition_id = client_data.get("athlete_competition_id")
+        if not athlete_id:
+            return
+
+        athletes = self.athlete_rooms.get(int(competition_id), {})
+        clients = athletes.get(int(athlete_id), set())
+        clients.discard(client_id)
+        if not clients:
+            from .athlete_notifier import athlete_notifier
+
+            athletes.pop(int(athlete_id), None)
+            athlete_notifier.forget(int(athlete_id))
+        if not athletes:
+            self.athlete_rooms.pop(int(competition_id), None)
+
+        client_data["athlete_id"] = None
+        client_data["athlete_competition_id"] = None
+        logger.info(f"Client {client_id} left athlete room {athlete_id}")
+
+    def get_athlete_subscribers(self, competition_id=None):
+        """
+        Athlete IDs with a connected client, for one competition or as a
+        {competition_id: [athlete_id, ...]} mapping for all of them
+        """
+        if competition_id is not None:
+            return list(self.athlete_rooms.get(int(competition_id), {}))
+        return {cid: list(athletes) for cid, athletes in self.athlete_rooms.items()}
+
+    def send_to_athlete(self, athlete_id, event, data):
+        """Emit an event to every client in an athlete's room"""
+        socketio.emit(event, data, room=f"athlete_{athlete_id}")
+
     def broadcast_to_competition(self, competition_id, event, data):
         """Broadcast data to all clients in a competition room"""
         room_name = f"competition_{competition_id}"
         socketio.emit(event, data, room=room_name)
+        change_feed.publish(competition_id, event, data)
         logger.debug(f"Broadcasted {event} to competition {competition_id}")
 
     def broadcast_timer_update(self, competition_id, timer_data):
         """Broadcast timer update to competition room"""
         self.broadcast_to_competition(competition_id, "timer_update", timer_data)
 
+    def broadcast_timer_state(self, competition_id, timer_state):
+        """
+        Broadcast a timekeeper state transition. When the competition is not
+        known the transition only reaches change feed subscribers.
+        """
+        if competition_id:
+            self.broadcast_to_competition(competition_id, "timer_state", timer_state)
+        else:
+            change_feed.publish(None, "timer_state", timer_state)
+
     def broadcast_referee_decision(self, competition_id, decision_data):
         """Broadcast referee decision to competition room"""
         self.broadcast_to_competition(competition_id, "referee_decision", decision_data)
@@ -1,6 +1,7 @@
 from asyncio.log import logger
 from flask import (
     Blueprint,
+    Response,
     render_template,
     request,
     jsonify,
@@ -8,6 +9,7 @@ from flask import (
     redirect,
     url_for,
     flash,
+    stream_with_context,
 )
 from ..extensions import db
 from ..models import (
@@ -15,9 +17,7 @@ from ..models import (
     Athlete,
     Flight,
     Event,
-    SportType,
     AthleteFlight,
-    ScoringType,
     Referee,
     TimerLog,
     Attempt,
@@ -25,23 +25,50 @@ from ..models import (
     AthleteEntry,
     User,
     UserRole,
-    CoachAssignment,
-    Timer,
-    RefereeDecision,
-    RefereeAssignment,
     Score,
 )
+from ..real_time.change_feed import mark_changed
+from ..real_time.decision_board import decision_board
 from ..utils.referee_generator import (
     generate_sample_referee_data,
     generate_random_username,
     generate_random_password,
 )
+from ..utils.competition_config import compiled_config, default_referee_settings
+from ..utils.athlete_deletion import delete_athletes
+from ..utils.competition_model import apply_competition_model, apply_competition_patch
+from ..utils.lifting_order import (
+    lifting_order_engine,
+    mark_order_stale,
+    write_lifting_orders,
+)
+from ..utils.decision_log import (
+    DECISIONS_PAGE_SIZE,
+    decision_audit_entries,
+    decision_filter_index,
+    decision_page,
+    decision_row_to_dict,
+)
+from ..utils.referee_decisions import (
+    mark_referees_changed,
+    referee_assignment_cache,
+    replay_decisions,
+    submit_decision,
+)
+from ..utils.score_queries import (
+    SCORES_PAGE_SIZE,
+    gzip_chunks,
+    iter_scores_csv,
+    score_filter_options,
+    score_page,
+    score_row_to_dict,
+)
 from ..utils.scoring import (
     ScoringCalculator,
-    calculate_scores_after_referee_decision,
     TimerScoring,
 )
 from datetime import datetime, timezone
+from sqlalchemy import and_, func, insert, or_
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import joinedload
 from werkzeug.security import generate_password_hash
@@ -56,6 +83,7 @@ REFEREE_ALLOWED_ROUTES = [
     "admin.individual_referee_page",
     "admin.referee_login_api",
     "admin.submit_referee_decision",
+    "admin.replay_referee_decisions",
     "admin.get_current_attempt",
     "admin.clear_current_attempt",
     "admin.api_referee_decision",
@@ -236,266 +264,75 @@ def get_competition_model(id):
     )
 
 
+def _save_result_response(result):
+    return jsonify(
+        {
+            "status": "success",
+            "competition_id": result.competition.id,
+            "message": "Competition model saved successfully",
+            "events_created": result.events_created,
+            "events_updated": result.events_updated,
+            "events_deleted": result.events_deleted,
+            "flights_created": result.flights_created,
+            "flights_updated": result.flights_updated,
+            "flights_deleted": result.flights_deleted,
+            "movements_created": result.movements_created,
+            "movements_updated": result.movements_updated,
+            "movements_deleted": result.movements_deleted,
+            "rep_overrides_reset": result.rep_overrides_reset,
+        }
+    )
+
+
 @admin_bp.route("/competition-model/save", methods=["POST"])
 def save_competition_model():
+    """Save the full competition model; only changed rows are written"""
     try:
         data = request.get_json()
-        print("\n=== Competition Save Debug ===")
-        print("Received data:", data)
-
-        # Start a database transaction
-        db.session.begin_nested()
-
-        competition_id = data.get("id")
-        print(f"Processing competition ID: {competition_id}")
-
-        if competition_id:
-            competition = Competition.query.get_or_404(competition_id)
-            print("Existing competition found")
-            print("Current events:", [(e.id, e.name) for e in competition.events])
-            print(
-                "Current flights:",
-                [
-                    (f.id, f.name, f.event_id)
-                    for f in Flight.query.filter_by(competition_id=competition_id).all()
-                ],
-            )
-
-        # Create new competition or update existing one
-        competition_id = data.get("id")
-        if competition_id:
-            competition = Competition.query.get_or_404(competition_id)
-            # Keep track of existing events for cleanup
-            existing_event_ids = {event.id for event in competition.events}
-        else:
-            competition = Competition()
-            existing_event_ids = set()
-            db.session.add(competition)
-
-        # Update basic fields
-        competition.name = data["name"]
-        competition.start_date = datetime.strptime(data["comp_date"], "%Y-%m-%d").date()
-        competition.description = data.get("description", "")
-        competition.breaktime_between_events = data.get("breaktime_between_events", 600)
-        competition.breaktime_between_flights = data.get(
-            "breaktime_between_flights", 180
-        )
 
-        competition.is_active = True
-
-        # Store the complete configuration
-        competition.config = {
-            "name": data["name"],
-            "comp_date": data["comp_date"],
-            "events": data.get("events", []),
-        }
-
-        # Get all existing event and flight IDs for this competition
-        existing_event_ids = {event.id for event in competition.events}
-        existing_flight_ids = {
-            flight.id
-            for flight in Flight.query.filter_by(competition_id=competition.id).all()
-        }
-
-        print("Existing event IDs:", existing_event_ids)
-        print("Existing flight IDs:", existing_flight_ids)
-
-        # Track current IDs to determine what to keep
-        current_event_ids = set()
-        current_flight_ids = set()
-
-        print("Processing events from config:", competition.config.get("events", []))
-
-        def extract_scoring_type_from_event(event_data):
-            """Extract scoring type from event movements data"""
-            movements = event_data.get("movements", [])
-            if movements and len(movements) > 0:
-                first_movement = movements[0]
-                scoring_data = first_movement.get("scoring", {})
-                scoring_type_str = scoring_data.get("type", "max")
-
-                # Map string to enum
-                scoring_type_map = {
-                    "max": ScoringType.MAX,
-                    "sum": ScoringType.SUM,
-                    "min": ScoringType.MIN,
-                }
-                return scoring_type_map.get(scoring_type_str, ScoringType.MAX)
-            return ScoringType.MAX
-
-        for event_data in competition.config["events"]:
-            event_id = event_data.get("id")
-
-            if event_id:
-                # Update existing event
-                event = Event.query.get(event_id)
-                if event and event.competition_id == competition.id:
-                    event.name = event_data["name"]
-                    event.gender = event_data.get("gender")
-                    event.sport_type = (
-                        SportType(event_data["sport_type"])
-                        if event_data.get("sport_type")
-                        else SportType.OLYMPIC_WEIGHTLIFTING
-                    )
-                    # Extract scoring type from movements data
-                    event.scoring_type = extract_scoring_type_from_event(event_data)
-                    event.is_active = True
-                    current_event_ids.add(event.id)
-            else:
-                # Create new event
-                event = Event(
-                    competition=competition,
-                    name=event_data["name"],
-                    gender=event_data.get("gender"),
-                    sport_type=SportType(event_data["sport_type"])
-                    if event_data.get("sport_type")
-                    else SportType.OLYMPIC_WEIGHTLIFTING,
-                    scoring_type=extract_scoring_type_from_event(event_data),
-                    is_active=True,
-                )
-                db.session.add(event)
-                db.session.flush()  # Get the new event ID
-                current_event_ids.add(event.id)
-
-            # Process flights for this event
-            print(f"\nProcessing event {event.id} - {event.name}")
-            if "groups" in event_data:
-                print("Found groups:", event_data["groups"])
-                for flight_data in event_data["groups"]:
-                    flight_id = flight_data.get("id")
-                    print(f"Processing flight data: {flight_data}")
-                    if flight_id:
-                        # Update existing flight
-                        flight = Flight.query.get(flight_id)
-                        print(f"Found existing flight: {flight.id if flight else None}")
-                        if flight and flight.competition_id == competition.id:
-                            flight.name = flight_data["name"]
-                            flight.order = flight_data.get("order", 1)
-                            flight.is_active = flight_data.get("is_active", True)
-                            flight.event_id = event.id  # Update event association
-                            current_flight_ids.add(flight.id)
-                            print(
-                                f"Updated flight {flight.id} - {flight.name} for event {event.id}"
-                            )
-                    else:
-                        # Create new flight
-                        flight = Flight(
-                            event_id=event.id,
-                            competition_id=competition.id,
-                            name=flight_data["name"],
-                            order=flight_data.get("order", 1),
-                            is_active=flight_data.get("is_active", True),
-                        )
-                        db.session.add(flight)
-                        db.session.flush()  # Get the new flight ID
-                        current_flight_ids.add(flight.id)
-
-        # Print final tracking sets
-        print("\nFinal tracking sets:")
-        print("Current event IDs:", current_event_ids)
-        print("Current flight IDs:", current_flight_ids)
-
-        # Remove events and flights that no longer exist in the configuration
-        events_to_delete = existing_event_ids - current_event_ids
-        if events_to_delete:
-            print(f"Deleting events: {events_to_delete}")
-            Event.query.filter(Event.id.in_(events_to_delete)).delete(
-                synchronize_session="fetch"
-            )
+        competition = None
+        if data.get("id"):
+            competition = Competition.query.get_or_404(data["id"])
 
-        # Remove any flights not in current_flight_ids
-        flights_to_delete = existing_flight_ids - current_flight_ids
-        if flights_to_delete:
-            print(f"Deleting flights: {flights_to_delete}")
-            Flight.query.filter(Flight.id.in_(flights_to_delete)).delete(
-                synchronize_session="fetch"
-            )
+        result = apply_competition_model(data, competition)
+        db.session.commit()
 
-        # Print final state
-        print("\nFinal state after save:")
-        print("Events:", [(e.id, e.name) for e in competition.events])
-        print(
-            "Flights:",
-            [
-                (f.id, f.name, f.event_id)
-                for f in Flight.query.filter_by(competition_id=competition.id).all()
-            ],
+        logger.info(
+            "Saved competition: %d (%d events created, %d updated, %d deleted)",
+            result.competition.id,
+            result.events_created,
+            result.events_updated,
+            result.events_deleted,
         )
+        return _save_result_response(result)
 
-        # Remove events that no longer exist in the configuration
-        events_to_delete = existing_event_ids - current_event_ids
-        if events_to_delete:
-            Event.query.filter(Event.id.in_(events_to_delete)).delete(
-                synchronize_session="fetch"
-            )
-
-        # Immediately sync AthleteEntry records with updated competition config
-        if competition.events:
-            from .athlete import extract_movements_for_event
+    except Exception as e:
+        db.session.rollback()
+        logger.error("Error saving competition: %s", str(e))
+        return jsonify({"status": "error", "message": str(e)}), 400
 
-            # Get all athlete entries for this competition
-            athlete_entries = (
-                AthleteEntry.query.join(Event, AthleteEntry.event_id == Event.id)
-                .filter(Event.competition_id == competition.id)
-                .all()
-            )
 
-            updated_count = 0
-            for entry in athlete_entries:
-                movements = extract_movements_for_event(entry.event)
-
-                for mv in movements:
-                    if (mv.get("name") or "").strip() == entry.lift_type:
-                        new_default_reps = mv.get("reps")
-                        if new_default_reps != entry.default_reps:
-                            print(
-                                f"Updating entry {entry.id}: {entry.lift_type} reps from {entry.default_reps} to {new_default_reps}"
-                            )
-                            entry.default_reps = new_default_reps
-
-                            # Reset athlete's reps to match new default_reps when config changes
-                            entry.reps = new_default_reps
-                            print(f"  Reset athlete reps to {new_default_reps}")
-
-                            # Update timer settings
-                            timer = mv.get("timer") or {}
-                            entry.attempt_time_limit = int(
-                                timer.get("attempt_seconds", 60)
-                            )
-                            entry.entry_config = mv
-                            updated_count += 1
-                        break
-
-            if updated_count > 0:
-                print(
-                    f"Updated {updated_count} AthleteEntry records with new competition config"
-                )
+@admin_bp.route("/competition-model/<int:competition_id>", methods=["PATCH"])
+def patch_competition_model(competition_id):
+    """
+    Partial update of the competition model with JSON Patch operations, e.g.
+    [{"op": "replace", "path": "/events/0/movements/1/reps", "value": [3, 3]}]
+    """
+    competition = Competition.query.get_or_404(competition_id)
+    operations = request.get_json(silent=True)
+    if isinstance(operations, dict):
+        operations = operations.get("patch")
 
-        # Commit all changes
+    try:
+        result = apply_competition_patch(competition, operations)
         db.session.commit()
-
-        logger.info(
-            "Saved competition: %d with %d events",
-            competition.id,
-            len(current_event_ids),
-        )
-
-        return jsonify(
-            {
-                "status": "success",
-                "competition_id": competition.id,
-                "message": "Competition model saved successfully",
-                "events_created": len(current_event_ids - existing_event_ids),
-                "events_updated": len(current_event_ids & existing_event_ids),
-                "events_deleted": len(events_to_delete),
-            }
-        )
-
     except Exception as e:
         db.session.rollback()
-        logger.error("Error saving competition: %s", str(e))  # Debug log
+        logger.error("Error patching competition %d: %s", competition_id, str(e))
         return jsonify({"status": "error", "message": str(e)}), 400
 
+    return _save_result_response(result)
+
 
 # ensure /admin/timer gets registered on admin_bp
 from . import timer
@@ -560,230 +397,118 @@ def atheletes_management():
     )
 
 
-@admin_bp.route("/flights-management")
-def flights_management():
-    try:
-        # Get all competitions with their events
-        competitions = Competition.query.options(
-            db.joinedload(Competition.events)
-        ).all()
+def _flight_summaries(flights, competition=None) -> list:
+    """
+    Flight card fields (no rosters), with athlete counts from one grouped
+    query. Flights are expected to have their event loaded.
+    """
+    flight_ids = [flight.id for flight in flights]
+    counts = {}
+    if flight_ids:
+        counts = dict(
+            db.session.query(AthleteFlight.flight_id, func.count(AthleteFlight.id))
+            .filter(AthleteFlight.flight_id.in_(flight_ids))
+            .group_by(AthleteFlight.flight_id)
+        )
 
-        # Get all events with competition information
-        events = Event.query.options(db.joinedload(Event.competition)).all()
+    summaries = []
+    for flight in flights:
+        event = flight.event
+        summaries.append(
+            {
+                "id": flight.id,
+                "name": flight.name,
+                "order": flight.order,
+                "is_active": flight.is_active,
+                "movement_type": flight.movement_type,
+                "event_id": flight.event_id,
+                "event_name": event.name if event else None,
+                "competition_id": event.competition_id
+                if event
+                else flight.competition_id,
+                "competition_name": competition.name if competition else None,
+                "athlete_count": counts.get(flight.id, 0),
+            }
+        )
+    return summaries
 
-        # Get all athletes with competition information
-        athletes = Athlete.query.options(db.joinedload(Athlete.competition)).all()
 
-        # Get all flights with their relationships
-        flights = (
-            Flight.query.options(
-                db.joinedload(Flight.event).joinedload(Event.competition),
-                db.joinedload(Flight.athlete_flights).joinedload(AthleteFlight.athlete),
-                db.joinedload(Flight.competition),  # Direct competition relationship
+def _flights_management_data(competition: Competition) -> dict:
+    """Events and flight summaries of one competition"""
+    events = (
+        Event.query.filter_by(competition_id=competition.id).order_by(Event.id).all()
+    )
+    flights = (
+        Flight.query.options(joinedload(Flight.event))
+        .outerjoin(Event, Flight.event_id == Event.id)
+        .filter(
+            or_(
+                Event.competition_id == competition.id,
+                and_(
+                    Flight.event_id.is_(None),
+                    Flight.competition_id == competition.id,
+                ),
             )
-            .order_by(Flight.order)
-            .all()
         )
+        .order_by(Flight.order, Flight.id)
+        .all()
+    )
 
-        # Build hierarchical competition data structure
-        competitions_data = []
-        for comp in competitions:
-            # Get events for this competition
-            comp_events = []
-            for event in comp.events:
-                # Get flights for this event
-                event_flights = []
-                for flight in event.flights:
-                    if flight.event_id == event.id:
-                        # Get athletes for this flight
-                        flight_athletes = []
-                        if (
-                            hasattr(flight, "athlete_flights")
-                            and flight.athlete_flights
-                        ):
-                            for af in flight.athlete_flights:
-                                if hasattr(af, "athlete") and af.athlete:
-                                    flight_athletes.append(
-                                        {
-                                            "id": af.athlete.id,
-                                            "name": f"{af.athlete.first_name} {af.athlete.last_name}",
-                                            "first_name": af.athlete.first_name,
-                                            "last_name": af.athlete.last_name,
-                                            "order": getattr(af, "order", 0) or 0,
-                                        }
-                                    )
-
-                        event_flights.append(
-                            {
-                                "id": flight.id,
-                                "name": flight.name,
-                                "order": flight.order,
-                                "is_active": flight.is_active,
-                                "event_id": flight.event_id,
-                                "competition_id": event.competition_id,
-                                "athlete_count": len(flight_athletes),
-                                "athletes": flight_athletes,
-                            }
-                        )
-
-                comp_events.append(
-                    {
-                        "id": event.id,
-                        "name": event.name,
-                        "competition_id": comp.id,
-                        "flights": event_flights,
-                    }
-                )
-
-            # Get flights directly associated with this competition (not through events)
-            direct_flights = []
-            for flight in flights:
-                if (
-                    hasattr(flight, "competition_id")
-                    and flight.competition_id == comp.id
-                    and not flight.event_id
-                ):
-                    # Get athletes for this flight
-                    flight_athletes = []
-                    if hasattr(flight, "athlete_flights") and flight.athlete_flights:
-                        for af in flight.athlete_flights:
-                            if hasattr(af, "athlete") and af.athlete:
-                                flight_athletes.append(
-                                    {
-                                        "id": af.athlete.id,
-                                        "name": f"{af.athlete.first_name} {af.athlete.last_name}",
-                                        "first_name": af.athlete.first_name,
-                                        "last_name": af.athlete.last_name,
-                                        "order": getattr(af, "order", 0) or 0,
-                                    }
-                                )
-
-                    direct_flights.append(
-                        {
-                            "id": flight.id,
-                            "name": flight.name,
-                            "order": flight.order,
-                            "is_active": flight.is_active,
-                            "event_id": None,
-                            "competition_id": comp.id,
-                            "athlete_count": len(flight_athletes),
-                            "athletes": flight_athletes,
-                        }
-                    )
+    flight_counts = {}
+    for flight in flights:
+        if flight.event_id:
+            flight_counts[flight.event_id] = flight_counts.get(flight.event_id, 0) + 1
 
-            competitions_data.append(
-                {
-                    "id": comp.id,
-                    "name": comp.name,
-                    "config": comp.config,
-                    "events": comp_events,
-                    "flights": direct_flights,  # Flights directly under competition
-                }
-            )
+    return {
+        "competition": {"id": competition.id, "name": competition.name},
+        "events": [
+            {
+                "id": event.id,
+                "name": event.name,
+                "competition_id": competition.id,
+                "competition_name": competition.name,
+                "flight_count": flight_counts.get(event.id, 0),
+            }
+            for event in events
+        ],
+        "flights": _flight_summaries(flights, competition),
+    }
 
-        # Flat events data for easy access
-        events_data = []
-        for event in events:
-            events_data.append(
-                {
-                    "id": event.id,
-                    "name": event.name,
-                    "competition_id": event.competition_id,
-                    "competition_name": event.competition.name
-                    if event.competition
-                    else None,
-                }
-            )
 
-        # Flat athletes data for easy access
-        athletes_data = []
-        for athlete in athletes:
-            athletes_data.append(
-                {
-                    "id": athlete.id,
-                    "first_name": athlete.first_name,
-                    "last_name": athlete.last_name,
-                    "full_name": f"{athlete.first_name} {athlete.last_name}",
-                    "email": athlete.email,
-                    "phone": athlete.phone,
-                    "team": athlete.team,
-                    "gender": athlete.gender,
-                    "age": athlete.age,
-                    "bodyweight": athlete.bodyweight,
-                    "competition_id": athlete.competition_id,
-                    "competition_name": athlete.competition.name
-                    if athlete.competition
-                    else None,
-                    "is_active": athlete.is_active,
-                }
+@admin_bp.route("/flights-management")
+def flights_management():
+    """
+    Flights of one competition (?competition_id=, else the latest). Only
+    flight summaries are rendered; rosters and attempts load on demand.
+    """
+    try:
+        competitions = [
+            {"id": competition_id, "name": name}
+            for competition_id, name in db.session.query(
+                Competition.id, Competition.name
+            ).order_by(
+                Competition.start_date.desc().nulls_last(), Competition.id.desc()
             )
-        (f"Prepared {len(athletes_data)} athletes data")
-
-        # Flat flights data with proper competition/event relationships
-        flights_data = []
-        for flight in flights:
-            # Get athlete count and athletes list safely
-            athlete_count = 0
-            athletes_list = []
-
-            if hasattr(flight, "athlete_flights") and flight.athlete_flights:
-                athlete_count = len(flight.athlete_flights)
-                for af in flight.athlete_flights:
-                    if hasattr(af, "athlete") and af.athlete:
-                        athletes_list.append(
-                            {
-                                "id": af.athlete.id,
-                                "name": f"{af.athlete.first_name} {af.athlete.last_name}",
-                                "first_name": af.athlete.first_name,
-                                "last_name": af.athlete.last_name,
-                                "order": getattr(af, "order", 0) or 0,
-                            }
-                        )
-
-            # Determine competition info - check both direct competition and event-based competition
-            competition_id = None
-            competition_name = None
-            event_name = None
-
-            # First check if flight has direct competition relationship
-            if hasattr(flight, "competition_id") and flight.competition_id:
-                competition_id = flight.competition_id
-                # Find competition name from our competitions data
-                competition = next(
-                    (c for c in competitions if c.id == competition_id), None
-                )
-                if competition:
-                    competition_name = competition.name
-
-            # Then check if flight has event relationship
-            if flight.event:
-                event_name = flight.event.name
-                if flight.event.competition:
-                    # Event-based competition takes precedence if both exist
-                    competition_id = flight.event.competition_id
-                    competition_name = flight.event.competition.name
+        ]
 
-            flight_data = {
-                "id": flight.id,
-                "name": flight.name,
-                "order": flight.order,
-                "is_active": flight.is_active,
-                "movement_type": flight.movement_type,
-                "event_id": flight.event_id,
-                "event_name": event_name,
-                "competition_id": competition_id,
-                "competition_name": competition_name,
-                "athlete_count": athlete_count,
-                "athletes": athletes_list,
-            }
-            flights_data.append(flight_data)
+        competition_id = request.args.get("competition_id", type=int)
+        if competition_id is None and competitions:
+            competition_id = competitions[0]["id"]
+        competition = (
+            db.session.get(Competition, competition_id) if competition_id else None
+        )
 
+        data = (
+            _flights_management_data(competition)
+            if competition
+            else {"competition": None, "events": [], "flights": []}
+        )
         return render_template(
             "admin/flights_management.html",
-            competitions=competitions_data,
-            events=events_data,
-            athletes=athletes_data,
-            flights=flights_data,
+            competitions=competitions,
+            competition_id=competition.id if competition else None,
+            events=data["events"],
+            flights=data["flights"],
         )
 
     except Exception as e:
@@ -796,12 +521,21 @@ def flights_management():
         return render_template(
             "admin/flights_management.html",
             competitions=[],
+            competition_id=None,
             events=[],
-            athletes=[],
             flights=[],
         )
 
 
+@admin_bp.route("/api/flights-management/<int:competition_id>", methods=["GET"])
+def api_flights_management(competition_id):
+    """Events and flight summaries of a competition, for switching competitions"""
+    competition = db.session.get(Competition, competition_id)
+    if not competition:
+        return jsonify({"status": "error", "message": "Competition not found"}), 404
+    return jsonify({"status": "success", **_flights_management_data(competition)})
+
+
 # Athlete API Routes
 @admin_bp.route("/athletes", methods=["POST"])
 def create_athlete():
@@ -875,6 +609,74 @@ def create_athlete():
         ), 500
 
 
+@admin_bp.route("/athletes/import", methods=["POST"])
+def import_athletes():
+    """
+    Import a CSV roster (multipart field "file"). Optional form fields:
+    competition_id, flight_id and create_accounts ("true" to create athlete
+    user accounts for rows with an email address).
+    """
+    from ..utils.roster_import import import_roster
+
+    try:
+        upload = request.files.get("file")
+        if not upload or not upload.filename:
+            return jsonify({"status": "error", "message": "No file uploaded"}), 400
+
+        # type=int would turn a bad value into None and import without it
+        target_ids = {}
+        for field in ("competition_id", "flight_id"):
+            raw = (request.form.get(field) or "").strip()
+            try:
+                target_ids[field] = int(raw) if raw else None
+            except ValueError:
+                return jsonify(
+                    {"status": "error", "message": "Invalid competition or flight"}
+                ), 400
+        competition_id = target_ids["competition_id"]
+        flight_id = target_ids["flight_id"]
+        if (
+            competition_id is not None
+            and db.session.get(Competition, competition_id) is None
+        ):
+            return jsonify({"status": "error", "message": "Competition not found"}), 404
+        if flight_id is not None and db.session.get(Flight, flight_id) is None:
+            return jsonify({"status": "error", "message": "Flight not found"}), 404
+        create_accounts = request.form.get("create_accounts", "").lower() in (
+            "1",
+            "true",
+            "yes",
+            "on",
+        )
+
+        result = import_roster(
+            upload,
+            competition_id=competition_id,
+            flight_id=flight_id,
+            create_accounts=create_accounts,
+        )
+        db.session.commit()
+
+        return jsonify(
+            {
+                "status": "success",
+                "message": f"Imported {result.created} of {result.rows} athletes",
+                **result.to_dict(),
+            }
+        ), 200
+
+    except (ValueError, UnicodeDecodeError) as e:
+        db.session.rollback()
+        return jsonify(
+            {"status": "error", "message": "Invalid roster file: " + str(e)}
+        ), 400
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(
+            {"status": "error", "message": "Failed to import athletes: " + str(e)}
+        ), 500
+
+
 @admin_bp.route("/athletes/<int:athlete_id>", methods=["GET"])
 def get_athlete(athlete_id):
     """Get athlete details by ID"""
@@ -993,73 +795,58 @@ def update_athlete(athlete_id):
 def delete_athlete(athlete_id):
     """Delete an athlete and all associated records"""
     try:
-        athlete = Athlete.query.get(athlete_id)
-
-        if not athlete:
+        result, found = delete_athletes([athlete_id])
+        if not found:
             return jsonify({"status": "error", "message": "Athlete not found"}), 404
 
-        # Get the associated user record if it exists
-        user_record = None
-        if athlete.user_id:
-            user_record = User.query.get(athlete.user_id)
-
-        # Delete all related records in correct order (deepest dependencies first)
-
-        # 1. Delete Attempts (references athlete_id and athlete_entry_id)
-        attempts = Attempt.query.filter_by(athlete_id=athlete_id).all()
-        for attempt in attempts:
-            db.session.delete(attempt)
-        print(f"Deleted {len(attempts)} attempts for athlete {athlete_id}")
-
-        # 2. Delete Coach Assignments (references athlete_id)
-        coach_assignments = CoachAssignment.query.filter_by(athlete_id=athlete_id).all()
-        for assignment in coach_assignments:
-            db.session.delete(assignment)
-        print(
-            f"Deleted {len(coach_assignments)} coach assignments for athlete {athlete_id}"
-        )
-
-        # 3. Delete Athlete Entries (references athlete_id)
-        athlete_entries = AthleteEntry.query.filter_by(athlete_id=athlete_id).all()
-        for entry in athlete_entries:
-            db.session.delete(entry)
-        print(
-            f"Deleted {len(athlete_entries)} athlete entries for athlete {athlete_id}"
-        )
-
-        # 4. Delete Athlete Flights (references athlete_id)
-        athlete_flights = AthleteFlight.query.filter_by(athlete_id=athlete_id).all()
-        for flight in athlete_flights:
-            db.session.delete(flight)
-        print(
-            f"Deleted {len(athlete_flights)} athlete flights for athlete {athlete_id}"
-        )
-
-        # 5. Update any Timer records that reference this athlete (set to null instead of delete)
-        timers = Timer.query.filter_by(current_athlete_id=athlete_id).all()
-        for timer in timers:
-            timer.current_athlete_id = None
-        print(f"Updated {len(timers)} timer references for athlete {athlete_id}")
+        return jsonify(
+            {
+                "status": "success",
+                "message": "Athlete deleted successfully",
+                "deleted": result.to_dict(),
+            }
+        ), 200
 
-        # 6. Finally delete the athlete record
-        db.session.delete(athlete)
+    except Exception as e:
+        print(f"Error deleting athlete {athlete_id}: {str(e)}")
+        return jsonify(
+            {"status": "error", "message": "Failed to delete athlete: " + str(e)}
+        ), 500
 
-        # 7. Delete the associated user record if it exists
-        if user_record:
-            db.session.delete(user_record)
-            print(f"Deleted user account for athlete: {user_record.email}")
 
-        db.session.commit()
+@admin_bp.route("/athletes:bulk-delete", methods=["POST"])
+def bulk_delete_athletes():
+    """
+    Delete many athletes (a test roster, a withdrawn team) in one
+    transaction.
 
-        message = "Athlete deleted successfully"
+    Body: {"athlete_ids": [1, 2, 3]}. Ids that do not exist are reported
+    back in "missing"; the rest are deleted.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        try:
+            athlete_ids = {int(a) for a in data.get("athlete_ids") or []}
+        except (TypeError, ValueError):
+            return jsonify(
+                {"status": "error", "message": "athlete_ids must be integers"}
+            ), 400
+        if not athlete_ids:
+            return jsonify({"status": "error", "message": "No athletes provided"}), 400
 
-        return jsonify({"status": "success", "message": message}), 200
+        result, found = delete_athletes(athlete_ids)
+        return jsonify(
+            {
+                "status": "success",
+                "message": f"Deleted {result.athletes} athletes",
+                "deleted": result.to_dict(),
+                "missing": sorted(athlete_ids - found),
+            }
+        ), 200
 
     except Exception as e:
-        db.session.rollback()
-        print(f"Error deleting athlete {athlete_id}: {str(e)}")
         return jsonify(
-            {"status": "error", "message": "Failed to delete athlete: " + str(e)}
+            {"status": "error", "message": "Failed to delete athletes: " + str(e)}
         ), 500
 
 
@@ -1227,124 +1014,12 @@ def get_referee_config(competition_id):
     """Get referee configuration for a specific competition"""
     try:
         competition = Competition.query.get_or_404(competition_id)
-
-        referee_config = {
-            "number_of_referees": 3,  # Default
-            "decision_options": [
-                {"label": "Good Lift", "color": "green", "value": True},
-                {"label": "No Lift", "color": "red", "value": False},
-            ],
-        }
-
-        # Extract referee config from competition config if available
-        if competition.config and "events" in competition.config:
-            for event in competition.config["events"]:
-                # Check groups for referee config (new format)
-                if "groups" in event:
-                    for group in event["groups"]:
-                        if "referee" in group:
-                            ref_config = group["referee"]
-
-                            # Parse number of referees
-                            if "n" in ref_config:
-                                referee_config["number_of_referees"] = int(
-                                    ref_config["n"]
-                                )
-
-                            # Parse decision options (new format with objects)
-                            if "options" in ref_config and isinstance(
-                                ref_config["options"], list
-                            ):
-                                decision_options = []
-                                for option in ref_config["options"]:
-                                    if (
-                                        isinstance(option, dict)
-                                        and "label" in option
-                                        and "color" in option
-                                        and "value" in option
-                                    ):
-                                        decision_options.append(
-                                            {
-                                                "label": str(option["label"]),
-                                                "color": str(option["color"]),
-                                                "value": bool(option["value"]),
-                                            }
-                                        )
-
-                                if decision_options:
-                                    referee_config["decision_options"] = (
-                                        decision_options
-                                    )
-
-                            # Use the first group's referee config found
-                            print(f"Found referee config in group: {ref_config}")
-                            break
-                    else:
-                        continue
-                    break
-
-                # Also check movements for legacy format
-                if "movements" in event:
-                    for movement in event["movements"]:
-                        if "referee" in movement:
-                            ref_config = movement["referee"]
-
-                            # Parse number of referees (legacy format)
-                            if "ref_n" in ref_config:
-                                referee_config["number_of_referees"] = int(
-                                    ref_config["ref_n"]
-                                )
-
-                            # Parse decision options from text format (legacy)
-                            if (
-                                "ref_options" in ref_config
-                                and ref_config["ref_options"]
-                            ):
-                                decision_options = []
-                                lines = (
-                                    str(ref_config["ref_options"]).strip().split("\n")
-                                )
-                                for line in lines:
-                                    if line.strip():
-                                        parts = [
-                                            part.strip() for part in line.split(",")
-                                        ]
-                                        if len(parts) >= 3:
-                                            decision_options.append(
-                                                {
-                                                    "label": parts[0],
-                                                    "color": parts[1],
-                                                    "value": parts[2].lower() == "true",
-                                                }
-                                            )
-
-                                if decision_options:
-                                    referee_config["decision_options"] = (
-                                        decision_options
-                                    )
-
-                            print(f"Found referee config in movement: {ref_config}")
-                            break
-                    else:
-                        continue
-                    break
-
-        print(
-            f"Final referee config for competition {competition_id}: {referee_config}"
-        )
-        return jsonify(referee_config)
+        return jsonify(compiled_config(competition).referee_settings())
 
     except Exception as e:
         print("Error fetching referee config:", str(e))
-        return jsonify(
-            {
-                "number_of_referees": 3,
-                "decision_options": [
-                    {"label": "Good Lift", "color": "green", "value": True},
-                    {"label": "No Lift", "color": "red", "value": False},
-                ],
-            }
-        ), 200  # Return 200 with defaults instead of error
+        # Return 200 with defaults instead of error
+        return jsonify(default_referee_settings()), 200
 
 
 # Referee Settings Routes
@@ -1553,6 +1228,8 @@ def referee_login():
         ):
             session["referee_id"] = referee.id
             referee.last_login = datetime.utcnow()
+            # Resolve the decision assignment now rather than on every decision
+            referee_assignment_cache.resolve(referee)
             db.session.commit()
 
             return jsonify(
@@ -1575,259 +1252,61 @@ def referee_login():
 
 
 @admin_bp.route("/api/referee/logout", methods=["POST"])
-def referee_logout():
-    """Handle referee logout"""
-    session.pop("referee_id", None)
-    return jsonify({"success": True, "message": "Logged out successfully"})
-
-
-@admin_bp.route("/referee/logout")
-def referee_logout_page():
-    """Logout page for referees"""
-    session.pop("referee_id", None)
-    return redirect(url_for("admin.referee"))
-
-
-@admin_bp.route("/api/referee-decision", methods=["POST"])
-def submit_referee_decision():
-    """Submit a referee decision and store in database"""
-    """
-    Submit a referee decision for an attempt.
-    This endpoint now properly creates RefereeDecision records and calculates scores.
-    If attempt_id is not provided, it will try to get the current attempt from timer state.
-    """
-    try:
-        from ..models import RefereeDecisionLog
-        import json
-        from pathlib import Path
-
-        data = request.get_json()
-
-        if not data:
-            return jsonify({"success": False, "message": "No data provided"}), 400
-
-        referee_id = data.get("referee_id")
-        competition_id = data.get("competition_id")
-        attempt_id = data.get("attempt_id")
-        decision = data.get(
-            "decision"
-        )  # Should be decision value like 'good_lift', 'no_lift'
-        timestamp = data.get("timestamp")
-        notes = data.get("notes", "")
-
-        # Handle decision being passed as an object (legacy support)
-        if isinstance(decision, dict):
-            decision_label = decision.get("label", "Unknown")
-            decision_value = decision.get("value")
-            # Convert boolean to string format
-            if isinstance(decision_value, bool):
-                decision = "good_lift" if decision_value else "no_lift"
-            elif isinstance(decision_value, str):
-                decision = decision_value
-            else:
-                decision = decision_label.lower().replace(" ", "_")
-            notes = notes or f"Decision: {decision_label}"
-
-        # Validate required fields
-        if not all([referee_id, competition_id, decision]):
-            return jsonify(
-                {"success": False, "message": "Missing required fields"}
-            ), 400
-
-        # If attempt_id is not provided, try to get it from current timer state
-        if not attempt_id:
-            import json
-            from pathlib import Path
-
-            state_file = (
-                Path(__file__).parent.parent.parent / "instance" / "timer_state.json"
-            )
-
-            if state_file.exists():
-                try:
-                    with open(state_file, "r") as f:
-                        timer_state = json.load(f)
-
-                    athlete_id = timer_state.get("athlete_id")
-                    attempt_number = timer_state.get("attempt_number")
-                    flight_id = timer_state.get("flight_id")
-
-                    if athlete_id and attempt_number and flight_id:
-                        # Find the attempt
-                        attempt = Attempt.query.filter_by(
-                            athlete_id=int(athlete_id),
-                            attempt_number=int(attempt_number),
-                            flight_id=int(flight_id),
-                        ).first()
-
-                        if attempt:
-                            attempt_id = attempt.id
-                except Exception as e:
-                    pass  # Timer state not available
-
-        # Verify referee exists and belongs to the competition
-        referee = Referee.query.filter_by(
-            id=referee_id, competition_id=competition_id
-        ).first()
-        if not referee:
-            return jsonify(
-                {"success": False, "message": "Invalid referee or competition"}
-            ), 404
-
-        # Get or create referee assignment
-        # Note: Using a large offset (1000000) to avoid collision with actual User IDs
-        # This maps Referee.id to a virtual user_id for RefereeAssignment
-        virtual_user_id = 1000000 + referee_id
-
-        referee_assignment = RefereeAssignment.query.filter_by(
-            user_id=virtual_user_id, referee_position=referee.position
-        ).first()
-
-        if not referee_assignment:
-            # Create a referee assignment for this referee
-            referee_assignment = RefereeAssignment(
-                user_id=virtual_user_id,
-                referee_position=referee.position or "Referee",
-                is_active=True,
-            )
-            db.session.add(referee_assignment)
-            db.session.flush()
-
-        # If we have an attempt_id (either provided or found from timer state), create proper RefereeDecision
-        if attempt_id:
-            attempt = Attempt.query.get(attempt_id)
-            if not attempt:
-                return jsonify(
-                    {"success": False, "message": f"Invalid attempt ID: {attempt_id}"}
-                ), 404
-
-            # Parse decision value to AttemptResult enum
-            try:
-                decision_enum = AttemptResult[decision.upper().replace(" ", "_")]
-            except (KeyError, AttributeError):
-                # Default mapping for common decision labels
-                decision_map = {
-                    "good_lift": AttemptResult.GOOD_LIFT,
-                    "good": AttemptResult.GOOD_LIFT,
-                    "no_lift": AttemptResult.NO_LIFT,
-                    "no": AttemptResult.NO_LIFT,
-                    "not_to_depth": AttemptResult.NOT_TO_DEPTH,
-                    "missed": AttemptResult.MISSED,
-                    "dnf": AttemptResult.DNF,
-                }
-                decision_enum = decision_map.get(
-                    decision.lower(), AttemptResult.NO_LIFT
-                )
-
-            # Create or update referee decision
-            existing_decision = RefereeDecision.query.filter_by(
-                attempt_id=attempt_id, referee_assignment_id=referee_assignment.id
-            ).first()
-
-            if existing_decision:
-                existing_decision.decision = decision_enum
-                existing_decision.decision_time = datetime.utcnow()
-                existing_decision.notes = notes
-                referee_decision = existing_decision
-                action = "updated"
-            else:
-                referee_decision = RefereeDecision(
-                    attempt_id=attempt_id,
-                    referee_assignment_id=referee_assignment.id,
-                    decision=decision_enum,
-                    decision_time=datetime.utcnow(),
-                    notes=notes,
-                )
-                db.session.add(referee_decision)
-                action = "created"
-
-            # Also log in referee notes for audit trail
-            decision_info = (
-                f"Decision at {timestamp}: {decision} for attempt {attempt_id}"
-            )
-            if referee.notes:
-                referee.notes += f"\n{decision_info}"
-            else:
-                referee.notes = decision_info
-
-            db.session.commit()
-
-            # Calculate scores after decision is submitted
-            try:
-                score_results = calculate_scores_after_referee_decision(attempt_id)
-
-                return jsonify(
-                    {
-                        "success": True,
-                        "message": f"Decision {action} successfully",
-                        "referee_id": referee_id,
-                        "attempt_id": attempt_id,
-                        "decision": decision,
-                        "decision_enum": decision_enum.value,
-                        "attempt_result": score_results["attempt_result"],
-                        "score": score_results["score"],
-                        "rankings_updated": True,
-                    }
-                )
-            except Exception as score_error:
-                # Still return success for decision submission even if score calculation fails
-                return jsonify(
-                    {
-                        "success": True,
-                        "message": f"Decision {action} successfully (score calculation pending)",
-                        "referee_id": referee_id,
-                        "attempt_id": attempt_id,
-                        "decision": decision,
-                        "decision_enum": decision_enum.value,
-                    }
-                )
+def referee_logout():
+    """Handle referee logout"""
+    session.pop("referee_id", None)
+    return jsonify({"success": True, "message": "Logged out successfully"})
 
-        else:
-            # No attempt_id found - store in notes only
-            warning_msg = "Warning: No attempt_id provided or found in timer state. Decision logged in notes only."
 
-            decision_info = f"Decision at {timestamp}: {decision} (NO ATTEMPT LINKED)"
+@admin_bp.route("/referee/logout")
+def referee_logout_page():
+    """Logout page for referees"""
+    session.pop("referee_id", None)
+    return redirect(url_for("admin.referee"))
 
-            if referee.notes:
-                referee.notes += f"\n{decision_info}"
-            else:
-                referee.notes = decision_info
 
-            db.session.commit()
+@admin_bp.route("/api/referee-decision", methods=["POST"])
+def submit_referee_decision():
+    """
+    Submit a referee decision for an attempt. If attempt_id is not provided,
+    the current attempt is taken from the timer state.
+    """
+    data = request.get_json(silent=True)
+    if not data:
+        return jsonify({"success": False, "message": "No data provided"}), 400
 
-            return jsonify(
-                {
-                    "success": True,
-                    "message": warning_msg,
-                    "referee_id": referee_id,
-                    "decision": decision,
-                    "warning": "Decision not linked to attempt - stored in notes only",
-                }
-            )
+    body, status = submit_decision(data)
+    return jsonify(body), status
 
-    except Exception as e:
-        db.session.rollback()
-        print("Error submitting referee decision:", str(e))
-        import traceback
 
-        traceback.print_exc()
-        return jsonify(
-            {"success": False, "message": f"Error submitting decision: {str(e)}"}
-        ), 500
+@admin_bp.route("/api/referee-decisions/replay", methods=["POST"])
+def replay_referee_decisions():
+    """
+    Apply a batch of queued decisions from a reconnecting tablet. Each
+    decision carries a client_decision_id; ones already recorded are skipped.
+    """
+    data = request.get_json(silent=True) or {}
+    body, status = replay_decisions(data.get("decisions"))
+    return jsonify(body), status
 
 
 @admin_bp.route("/api/referee-decisions/<int:competition_id>", methods=["GET"])
 def get_referee_decisions(competition_id):
     """Get all referee decisions for current attempt in a competition"""
     try:
-        # Get decisions from in-memory store
-        if not hasattr(submit_referee_decision, "decisions"):
-            return jsonify({"success": True, "decisions": {}})
-
-        comp_key = f"comp_{competition_id}"
-        decisions = submit_referee_decision.decisions.get(comp_key, {})
+        tally = decision_board.current(competition_id)
+        if not tally:
+            return jsonify({"success": True, "decisions": {}, "result": None})
 
-        return jsonify({"success": True, "decisions": decisions})
+        return jsonify(
+            {
+                "success": True,
+                "attempt_id": tally.attempt_id,
+                "required": tally.required,
+                "decisions": tally.to_dict()["votes"],
+                "result": tally.result,
+            }
+        )
 
     except Exception as e:
         print("Error fetching referee decisions:", str(e))
@@ -1838,10 +1317,8 @@ def get_referee_decisions(competition_id):
 def clear_referee_decisions(competition_id):
     """Clear all referee decisions for a competition (for next attempt)"""
     try:
-        if hasattr(submit_referee_decision, "decisions"):
-            comp_key = f"comp_{competition_id}"
-            if comp_key in submit_referee_decision.decisions:
-                submit_referee_decision.decisions[comp_key] = {}
+        data = request.get_json(silent=True) or {}
+        decision_board.clear(competition_id, data.get("attempt_id"))
 
         return jsonify({"success": True, "message": "Decisions cleared"})
 
@@ -1860,38 +1337,31 @@ def get_current_attempt():
 
 @admin_bp.route("/api/decision-results", methods=["GET"])
 def get_decision_results():
-    """Get referee decisions with filtering"""
+    """
+    Get referee decisions with filtering, newest first. Results are paged;
+    pass back ``next_cursor`` as ``cursor`` for the following page.
+    """
     try:
-        from ..models import RefereeDecisionLog
-
-        competition_id = request.args.get("competition_id", type=int)
-        event = request.args.get("event")
-        flight = request.args.get("flight")
-        athlete = request.args.get("athlete")
-
-        query = RefereeDecisionLog.query.options(
-            db.joinedload(RefereeDecisionLog.referee),
-            db.joinedload(RefereeDecisionLog.competition),
+        rows, next_cursor = decision_page(
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", DECISIONS_PAGE_SIZE, type=int),
+            competition_id=request.args.get("competition_id", type=int),
+            event_name=request.args.get("event"),
+            flight_name=request.args.get("flight"),
+            athlete_name=request.args.get("athlete"),
         )
 
-        if competition_id:
-            query = query.filter_by(competition_id=competition_id)
-
-        if event:
-            query = query.filter_by(event_name=event)
-
-        if flight:
-            query = query.filter_by(flight_name=flight)
-
-        if athlete:
-            query = query.filter_by(athlete_name=athlete)
-
-        decisions = query.order_by(RefereeDecisionLog.timestamp.desc()).all()
-
         return jsonify(
-            {"success": True, "decisions": [d.to_dict() for d in decisions]}
+            {
+                "success": True,
+                "decisions": [decision_row_to_dict(row) for row in rows],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
         ), 200
 
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         print(f"Error fetching decision results: {e}")
         import traceback
@@ -1904,42 +1374,14 @@ def get_decision_results():
 def get_decision_filters(competition_id):
     """Get available filter values for a competition"""
     try:
-        from ..models import RefereeDecisionLog
-
-        # Get unique events
-        events = (
-            db.session.query(RefereeDecisionLog.event_name)
-            .filter_by(competition_id=competition_id)
-            .filter(RefereeDecisionLog.event_name.isnot(None))
-            .distinct()
-            .all()
-        )
-
-        # Get unique flights
-        flights = (
-            db.session.query(RefereeDecisionLog.flight_name)
-            .filter_by(competition_id=competition_id)
-            .filter(RefereeDecisionLog.flight_name.isnot(None))
-            .distinct()
-            .all()
-        )
-
-        # Get unique athlete names
-        athletes = (
-            db.session.query(RefereeDecisionLog.athlete_name)
-            .filter_by(competition_id=competition_id)
-            .filter(RefereeDecisionLog.athlete_name.isnot(None))
-            .distinct()
-            .order_by(RefereeDecisionLog.athlete_name)
-            .all()
-        )
+        values = decision_filter_index.get(competition_id)
 
         return jsonify(
             {
                 "success": True,
-                "events": [e[0] for e in events if e[0]],
-                "flights": [f[0] for f in flights if f[0]],
-                "athletes": [a[0] for a in athletes if a[0]],
+                "events": values["events"],
+                "flights": values["flights"],
+                "athletes": values["athletes"],
             }
         ), 200
 
@@ -1951,6 +1393,24 @@ def get_decision_filters(competition_id):
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@admin_bp.route("/api/decision-audit", methods=["GET"])
+def get_decision_audit():
+    """Decision audit trail for an attempt and/or referee, oldest first"""
+    try:
+        entries = decision_audit_entries(
+            attempt_id=request.args.get("attempt_id", type=int),
+            referee_id=request.args.get("referee_id", type=int),
+        )
+        return jsonify(
+            {"success": True, "entries": [entry.to_dict() for entry in entries]}
+        ), 200
+    except ValueError as e:
+        return jsonify({"success": False, "error": str(e)}), 400
+    except Exception as e:
+        print(f"Error fetching decision audit: {e}")
+        return jsonify({"success": False, "error": str(e)}), 500
+
+
 @admin_bp.route("/api/decision-results/<int:decision_id>", methods=["PUT"])
 def update_decision_result(decision_id):
     """Update a decision result"""
@@ -2099,49 +1559,48 @@ def scoreboard_history():
     return render_template("admin/scoreboard_history.html")
 
 
+def _score_filters():
+    """Score listing filters from the query string"""
+    status = request.args.get("status", "").lower()
+    return {
+        "competition_id": request.args.get("competition_id", type=int),
+        "event_id": request.args.get("event_id", type=int),
+        "flight_id": request.args.get("flight_id", type=int),
+        "is_final": {"final": True, "provisional": False}.get(status),
+    }
+
+
 @admin_bp.route("/api/scores", methods=["GET"])
 def get_all_scores():
-    """Get all scores with athlete and event information"""
+    """
+    Page of scores, newest first. Filters: competition_id, event_id,
+    flight_id, status (final/provisional); pass back ``next_cursor`` as
+    ``cursor`` for the following page.
+    """
     try:
-        scores = Score.query.order_by(Score.calculated_at.desc()).all()
-
-        scores_data = []
-        for score in scores:
-            athlete_entry = score.athlete_entry
-            athlete = athlete_entry.athlete
-            event = athlete_entry.event
-            competition = event.competition if event else None
-            flight = (
-                Flight.query.get(athlete_entry.flight_id)
-                if athlete_entry.flight_id
-                else None
-            )
+        rows, next_cursor = score_page(
+            cursor=request.args.get("cursor"),
+            limit=request.args.get("limit", SCORES_PAGE_SIZE, type=int),
+            **_score_filters(),
+        )
+        return jsonify(
+            {
+                "scores": [score_row_to_dict(row) for row in rows],
+                "next_cursor": next_cursor,
+                "has_more": next_cursor is not None,
+            }
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-            scores_data.append(
-                {
-                    "id": score.id,
-                    "athlete_entry_id": score.athlete_entry_id,
-                    "athlete_name": f"{athlete.first_name} {athlete.last_name}",
-                    "athlete_id": athlete.id,
-                    "event_name": event.name if event else "N/A",
-                    "event_id": event.id if event else None,
-                    "competition_id": competition.id if competition else None,
-                    "competition_name": competition.name if competition else "N/A",
-                    "flight_id": athlete_entry.flight_id,
-                    "flight_name": flight.name if flight else "N/A",
-                    "lift_type": athlete_entry.lift_type or "N/A",
-                    "best_attempt_weight": score.best_attempt_weight,
-                    "total_score": score.total_score,
-                    "rank": score.rank,
-                    "score_type": score.score_type,
-                    "calculated_at": score.calculated_at.isoformat()
-                    if score.calculated_at
-                    else None,
-                    "is_final": score.is_final,
-                }
-            )
 
-        return jsonify(scores_data)
+@admin_bp.route("/api/scores/filters", methods=["GET"])
+def get_score_filters():
+    """Events and flights available to the score history filters"""
+    try:
+        return jsonify(score_filter_options())
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -2189,78 +1648,25 @@ def delete_score(score_id):
 
 @admin_bp.route("/api/scores/export")
 def export_scores():
-    """Export scores to CSV"""
+    """
+    Stream scores as CSV, with the same filters as the listing; ``?gzip=1``
+    compresses the stream on the fly
+    """
     try:
-        import io
-        import csv
-        from flask import make_response
-
-        competition_id = request.args.get("competition_id")
-
-        query = Score.query
-        if competition_id:
-            query = (
-                query.join(AthleteEntry)
-                .join(Event)
-                .filter(Event.competition_id == competition_id)
-            )
-
-        scores = query.order_by(Score.calculated_at.desc()).all()
-
-        # Create CSV
-        output = io.StringIO()
-        writer = csv.writer(output)
-
-        # Headers
-        writer.writerow(
-            [
-                "Rank",
-                "Athlete",
-                "Event",
-                "Flight",
-                "Lift Type",
-                "Best Weight (kg)",
-                "Total Score",
-                "Status",
-                "Calculated At",
-            ]
-        )
-
-        # Data
-        for score in scores:
-            athlete_entry = score.athlete_entry
-            athlete = athlete_entry.athlete
-            event = athlete_entry.event
-            flight = (
-                Flight.query.get(athlete_entry.flight_id)
-                if athlete_entry.flight_id
-                else None
-            )
+        compress = request.args.get("gzip", "").lower() in ("1", "true", "yes")
 
-            writer.writerow(
-                [
-                    score.rank or "-",
-                    f"{athlete.first_name} {athlete.last_name}",
-                    event.name if event else "N/A",
-                    flight.name if flight else "N/A",
-                    athlete_entry.lift_type or "-",
-                    score.best_attempt_weight or "-",
-                    score.total_score or "-",
-                    "FINAL" if score.is_final else "PROVISIONAL",
-                    score.calculated_at.strftime("%Y-%m-%d %H:%M:%S")
-                    if score.calculated_at
-                    else "-",
-                ]
-            )
-
-        # Create response
-        output.seek(0)
-        response = make_response(output.getvalue())
-        response.headers["Content-Disposition"] = (
-            "attachment; filename=scores_export.csv"
-        )
-        response.headers["Content-Type"] = "text/csv"
+        chunks = iter_scores_csv(**_score_filters())
+        if compress:
+            chunks = gzip_chunks(chunks)
+            mimetype = "application/gzip"
+            filename = "scores_export.csv.gz"
+        else:
+            mimetype = "text/csv"
+            filename = "scores_export.csv"
 
+        # The query runs inside the generator, so keep the request context
+        response = Response(stream_with_context(chunks), mimetype=mimetype)
+        response.headers["Content-Disposition"] = f"attachment; filename={filename}"
         return response
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -2273,41 +1679,7 @@ def auto_generate_referees(competition_id):
         competition = Competition.query.get_or_404(competition_id)
 
         # Get referee config for this competition
-        referee_config = {
-            "number_of_referees": 3,  # Default
-            "decision_options": [],
-        }
-
-        # Extract referee config from competition config
-        if competition.config and "events" in competition.config:
-            for event in competition.config["events"]:
-                # Check groups for referee config
-                if "groups" in event:
-                    for group in event["groups"]:
-                        if "referee" in group:
-                            ref_config = group["referee"]
-                            if "n" in ref_config:
-                                referee_config["number_of_referees"] = int(
-                                    ref_config["n"]
-                                )
-                            break
-                    else:
-                        continue
-                    break
-
-                # Check movements for legacy format
-                if "movements" in event:
-                    for movement in event["movements"]:
-                        if "referee" in movement:
-                            ref_config = movement["referee"]
-                            if "ref_n" in ref_config:
-                                referee_config["number_of_referees"] = int(
-                                    ref_config["ref_n"]
-                                )
-                            break
-                    else:
-                        continue
-                    break
+        referee_config = compiled_config(competition).referee_settings()
 
         # Clear existing referees for this competition (optional)
         clear_existing = (
@@ -2317,6 +1689,7 @@ def auto_generate_referees(competition_id):
         )
         if clear_existing:
             Referee.query.filter_by(competition_id=competition_id).delete()
+            mark_referees_changed(db.session, competition_id)
 
         # Check if referees already exist
         existing_count = Referee.query.filter_by(competition_id=competition_id).count()
@@ -2902,21 +2275,14 @@ def get_event_flights(event_id):
         if not event:
             return jsonify({"status": "error", "message": "Event not found"}), 404
 
-        flights = Flight.query.filter_by(event_id=event_id).order_by(Flight.order).all()
+        flights = (
+            Flight.query.options(joinedload(Flight.event))
+            .filter_by(event_id=event_id)
+            .order_by(Flight.order)
+            .all()
+        )
 
-        return jsonify(
-            [
-                {
-                    "id": flight.id,
-                    "event_id": flight.event_id,
-                    "name": flight.name,
-                    "order": flight.order,
-                    "is_active": flight.is_active,
-                    "athlete_count": len(flight.athlete_flights),
-                }
-                for flight in flights
-            ]
-        ), 200
+        return jsonify(_flight_summaries(flights, event.competition)), 200
 
     except Exception as e:
         return jsonify(
@@ -3436,6 +2802,155 @@ def add_athlete_to_flight(flight_id, athlete_id):
         ), 500
 
 
+@admin_bp.route("/flights/<int:flight_id>/athletes:bulk", methods=["POST"])
+def bulk_add_athletes_to_flight(flight_id):
+    """
+    Add many athletes to a flight in one transaction.
+
+    Body: {"athletes": [{"athlete_id": 1, "order": 3, "lot_number": 7}, ...]}
+    or {"athlete_ids": [1, 2, 3]}. Order and lot number are optional; missing
+    orders are allocated after the highest order already used in the flight.
+    Returns one outcome per requested athlete.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        items = data.get("athletes")
+        if items is None:
+            items = [{"athlete_id": a} for a in data.get("athlete_ids") or []]
+
+        requested = []
+        try:
+            for item in items:
+                if not isinstance(item, dict):
+                    item = {"athlete_id": item}
+                requested.append(
+                    {
+                        "athlete_id": int(item["athlete_id"]),
+                        "order": int(item["order"])
+                        if item.get("order") is not None
+                        else None,
+                        "lot_number": int(item["lot_number"])
+                        if item.get("lot_number") is not None
+                        else None,
+                    }
+                )
+        except (KeyError, TypeError, ValueError):
+            return jsonify(
+                {
+                    "status": "error",
+                    "message": "Each athlete needs an integer athlete_id, order and lot_number",
+                }
+            ), 400
+
+        if not requested:
+            return jsonify({"status": "error", "message": "No athletes provided"}), 400
+
+        flight = Flight.query.options(
+            joinedload(Flight.event).joinedload(Event.competition)
+        ).get(flight_id)
+        if not flight:
+            return jsonify({"status": "error", "message": "Flight not found"}), 404
+
+        athlete_ids = {item["athlete_id"] for item in requested}
+        athletes = {
+            athlete.id: athlete
+            for athlete in Athlete.query.filter(Athlete.id.in_(athlete_ids))
+        }
+
+        # Current members and used orders of the flight, in one query
+        members = db.session.query(
+            AthleteFlight.athlete_id, AthleteFlight.order
+        ).filter(AthleteFlight.flight_id == flight_id)
+        in_flight = set()
+        used_orders = set()
+        for athlete_id, order in members:
+            in_flight.add(athlete_id)
+            if order is not None:
+                used_orders.add(order)
+
+        results = []
+        accepted = []
+        for item in requested:
+            athlete_id = item["athlete_id"]
+            if athlete_id not in athletes:
+                outcome = "not_found"
+            elif athlete_id in in_flight:
+                outcome = "already_in_flight"
+            elif item["order"] is not None and item["order"] in used_orders:
+                outcome = "order_taken"
+            else:
+                outcome = "added"
+                in_flight.add(athlete_id)
+                if item["order"] is not None:
+                    used_orders.add(item["order"])
+                accepted.append(item)
+            results.append({"athlete_id": athlete_id, "status": outcome})
+
+        # Allocate the remaining orders after everything already in use
+        next_order = max(used_orders, default=0)
+        for item in accepted:
+            if item["order"] is None:
+                next_order += 1
+                item["order"] = next_order
+        orders = {item["athlete_id"]: item for item in accepted}
+        for result in results:
+            if result["status"] == "added":
+                result["order"] = orders[result["athlete_id"]]["order"]
+                result["lot_number"] = orders[result["athlete_id"]]["lot_number"]
+
+        if accepted:
+            competition_id = flight.event.competition_id if flight.event else None
+            if competition_id:
+                for item in accepted:
+                    athlete = athletes[item["athlete_id"]]
+                    if athlete.competition_id != competition_id:
+                        athlete.competition_id = competition_id
+
+            db.session.execute(
+                insert(AthleteFlight),
+                [
+                    {
+                        "flight_id": flight_id,
+                        "athlete_id": item["athlete_id"],
+                        "order": item["order"],
+                        "lot_number": item["lot_number"],
+                    }
+                    for item in accepted
+                ],
+            )
+            mark_changed(db.session, competition_id)
+
+            # Auto-create AthleteEntry/Attempt records for the event's movements
+            if flight.event:
+                from ..routes.athlete import provision_athlete_entries
+
+                provision_athlete_entries(
+                    flight.event,
+                    flight,
+                    [(item["athlete_id"], item["order"]) for item in accepted],
+                )
+
+            db.session.commit()
+
+        return jsonify(
+            {
+                "status": "success",
+                "message": f"Added {len(accepted)} of {len(requested)} athletes to flight",
+                "added": len(accepted),
+                "results": results,
+            }
+        ), 200
+
+    except Exception as e:
+        db.session.rollback()
+        return jsonify(
+            {
+                "status": "error",
+                "message": "Failed to add athletes to flight: " + str(e),
+            }
+        ), 500
+
+
 @admin_bp.route(
     "/flights/<int:flight_id>/athletes/<int:athlete_id>", methods=["DELETE"]
 )
@@ -3691,53 +3206,6 @@ def list_timer_log():
     return jsonify(rows)
 
 
-def _to_seconds(val):
-    """Accepts int, float, 'MM:SS', 'HH:MM:SS', or numeric strings."""
-    if val is None:
-        return None
-    if isinstance(val, (int, float)):
-        return int(val)
-    s = str(val).strip()
-    if not s:
-        return None
-    if ":" in s:
-        parts = [int(p or 0) for p in s.split(":")]
-        if len(parts) == 3:
-            return parts[0] * 3600 + parts[1] * 60 + parts[2]
-        if len(parts) == 2:
-            return parts[0] * 60 + parts[1]
-    try:
-        return int(float(s))
-    except Exception:
-        return None
-
-
-def _extract_times_from_event_dict(edict):
-    """Search a single event dict for attempt/break time fields (top, movements, groups)."""
-    attempt_sec = None
-    break_sec = None
-
-    def scan_obj(obj):
-        nonlocal attempt_sec, break_sec
-        if not isinstance(obj, dict):
-            return
-        for k, v in obj.items():
-            kl = str(k).lower()
-            if attempt_sec is None and ("attempt" in kl and "time" in kl):
-                attempt_sec = _to_seconds(v)
-            if break_sec is None and ("break" in kl and "time" in kl):
-                break_sec = _to_seconds(v)
-
-    if isinstance(edict, dict):
-        scan_obj(edict)
-        for mv in edict.get("movements") or []:
-            scan_obj(mv)
-        for grp in edict.get("groups") or []:
-            scan_obj(grp)
-
-    return attempt_sec, break_sec
-
-
 # --- TIMER LOG API (already in your file) ---
 # def create_timer_log(): ...
 # def list_timer_log(): ...
@@ -3786,30 +3254,7 @@ def api_timer_defaults():
         event_name = ev.name if ev else None
 
     if comp and comp.config:
-        for ev_cfg in comp.config.get("events") or []:
-            if event_name and ev_cfg.get("name") != event_name:
-                continue
-
-            # Prefer movement-level timers if present
-            for mv in ev_cfg.get("movements") or []:
-                t = mv.get("timer") or {}
-                if attempt is None and t.get("attempt_seconds") is not None:
-                    attempt = int(t["attempt_seconds"])
-                if brk is None and t.get("break_seconds") is not None:
-                    brk = int(t["break_seconds"])
-                if attempt is not None or brk is not None:
-                    break
-
-            # Optional: if you later add group-level overrides
-            for grp in ev_cfg.get("groups") or []:
-                t = grp.get("timer") or {}
-                if attempt is None and t.get("attempt_seconds") is not None:
-                    attempt = int(t["attempt_seconds"])
-                if brk is None and t.get("break_seconds") is not None:
-                    brk = int(t["break_seconds"])
-
-            if event_name:
-                break
+        attempt, brk = compiled_config(comp).timer_defaults(event_name)
 
     return jsonify(
         {
@@ -3840,16 +3285,9 @@ def get_flight_attempts_order(flight_id):
             .all()
         )
 
-        # Initialize lifting_order for attempts that don't have it set
-        order_counter = 1
-        needs_commit = False
-        for attempt in attempts:
-            if attempt.lifting_order is None:
-                attempt.lifting_order = order_counter
-                needs_commit = True
-            order_counter += 1
-
-        if needs_commit:
+        # Attempts without a lifting order get one from the order engine
+        if any(attempt.lifting_order is None for attempt in attempts):
+            lifting_order_engine.sync(flight_id)
             db.session.commit()
             # Re-query to get updated data
             attempts = (
@@ -3898,22 +3336,62 @@ def reorder_flight_attempts(flight_id):
     """Reorder attempts by lifting_order for a flight"""
     try:
         flight = Flight.query.get_or_404(flight_id)
-        data = request.get_json()
+        data = request.get_json() or {}
         updates = data.get("updates", [])
 
+        requested = {}
         for update in updates:
             attempt_id = update.get("id")
-            new_lifting_order = update.get("lifting_order")
+            if not attempt_id:  # Skip rows without an attempt id
+                continue
+            try:
+                requested[int(attempt_id)] = (
+                    int(update["lifting_order"])
+                    if update.get("lifting_order") is not None
+                    else None
+                )
+            except (TypeError, ValueError):
+                return jsonify(
+                    {
+                        "status": "error",
+                        "message": f"Invalid attempt id or lifting order for {attempt_id}",
+                    }
+                ), 400
 
-            if attempt_id:  # Check if attempt_id is not None/empty
-                attempt = Attempt.query.get(attempt_id)
-                if attempt:
-                    attempt.lifting_order = new_lifting_order
+        # One query both checks the ids belong to this flight and gives the
+        # stored positions, so unchanged rows are not written
+        stored = dict(
+            db.session.query(Attempt.id, Attempt.lifting_order).filter(
+                Attempt.flight_id == flight_id, Attempt.id.in_(list(requested))
+            )
+        )
+        unknown = sorted(set(requested) - set(stored))
+        if unknown:
+            return jsonify(
+                {
+                    "status": "error",
+                    "message": "Attempts not in this flight: "
+                    + ", ".join(str(attempt_id) for attempt_id in unknown),
+                }
+            ), 400
 
+        changes = {
+            attempt_id: lifting_order
+            for attempt_id, lifting_order in requested.items()
+            if stored[attempt_id] != lifting_order
+        }
+        if changes:
+            write_lifting_orders(flight_id, changes)
+            mark_changed(db.session, flight.competition_id)
+            mark_order_stale(db.session, flight_id)
         db.session.commit()
 
         return jsonify(
-            {"status": "success", "message": "Attempt order updated successfully"}
+            {
+                "status": "success",
+                "message": "Attempt order updated successfully",
+                "updated": len(changes),
+            }
         ), 200
 
     except Exception as e:
@@ -3929,18 +3407,26 @@ def sort_flight_attempts(flight_id, sort_type):
     try:
         flight = Flight.query.get_or_404(flight_id)
 
-        # Get all attempts for athletes in this flight
+        if sort_type == "weight":
+            # Weight, attempt number, lot number; drops any hand-made order
+            lifting_order_engine.resort(flight_id)
+            db.session.commit()
+            return jsonify(
+                {
+                    "status": "success",
+                    "message": f"Attempts sorted by {sort_type} successfully",
+                }
+            ), 200
+
+        # Only this flight's attempts; an athlete's other flights keep their order
         attempts = (
-            db.session.query(Attempt)
-            .join(AthleteFlight, Attempt.athlete_id == AthleteFlight.athlete_id)
-            .filter(AthleteFlight.flight_id == flight_id)
+            Attempt.query.options(joinedload(Attempt.athlete))
+            .filter(Attempt.flight_id == flight_id)
+            .order_by(Attempt.id)
             .all()
         )
 
-        if sort_type == "weight":
-            # Sort by requested weight (ascending)
-            attempts.sort(key=lambda x: x.requested_weight or 0)
-        elif sort_type == "name":
+        if sort_type == "name":
             # Sort by athlete name
             attempts.sort(key=lambda x: f"{x.athlete.first_name} {x.athlete.last_name}")
         elif sort_type == "random":
@@ -3956,10 +3442,15 @@ def sort_flight_attempts(flight_id, sort_type):
                 }
             ), 400
 
-        # Update lifting_order based on new order
-        for i, attempt in enumerate(attempts):
-            attempt.lifting_order = i + 1
-
+        # Write only the attempts whose position changed
+        changes = {
+            attempt.id: position
+            for position, attempt in enumerate(attempts, start=1)
+            if attempt.lifting_order != position
+        }
+        write_lifting_orders(flight_id, changes)
+        mark_changed(db.session, flight.competition_id)
+        mark_order_stale(db.session, flight_id)
         db.session.commit()
 
         return jsonify(
@@ -4091,8 +3582,9 @@ def update_attempt_weight(attempt_id):
                     }
                 ), 400
 
-        # Update the weight
+        # Update the weight and move the attempt to its new place
         attempt.requested_weight = new_weight
+        lifting_order_engine.attempt_changed(attempt)
 
         # If this is attempt 1 (opening weight), also update the AthleteEntry.opening_weights
         if attempt.attempt_number == 1 and attempt.athlete_entry_id:
@@ -4111,6 +3603,7 @@ def update_attempt_weight(attempt_id):
                 "attempt": {
                     "id": attempt.id,
                     "requested_weight": attempt.requested_weight,
+                    "lifting_order": attempt.lifting_order,
                 },
             }
         ), 200
@@ -4158,6 +3651,7 @@ def update_attempt_status():
 
             attempt.completed_at = datetime.utcnow()
 
+        lifting_order_engine.attempt_changed(attempt)
         db.session.commit()
 
         return jsonify({"message": "Attempt status updated successfully"})
@@ -1,9 +1,16 @@
-from flask import Blueprint, render_template, request, jsonify
+from flask import Blueprint, current_app, render_template, request, jsonify
+from sqlalchemy import insert
 from sqlalchemy.orm import joinedload
 from datetime import datetime, timedelta
 
 from ..extensions import db
+from ..real_time.change_feed import mark_changed
 from ..real_time.timer_manager import timer_manager
+from ..utils.competition_config import compiled_config
+from ..utils.display_projections import load_timer_state
+from ..utils.lifting_order import lifting_order_engine
+from ..utils.movements import ensure_movement_definitions
+from ..utils.queue_projection import get_competition_status, get_queue_projection
 from ..models import (
     Athlete,
     AthleteEntry,
@@ -18,7 +25,6 @@ from ..models import (
 )
 
 from .admin import (
-    get_competitions,
     get_competition_events,
     get_event_flights,
     get_flight_athletes,
@@ -85,23 +91,188 @@ def get_my_flights(athlete_id, competition_id):
     return my_flights
 
 
-def next_pending_attempt(athlete_id):
+def load_dashboard_data(athlete_id):
     """
-    Find the athlete's next pending attempt across all entries.
-    Returns an Attempt row with relationships loaded, or None.
+    Assemble everything the athlete dashboard renders in a fixed number of
+    batched queries: athlete with competition, entries with events,
+    attempts, scores and flights. Returns None if the athlete is unknown.
     """
-    return (
-        Attempt.query.options(
-            joinedload(Attempt.athlete_entry).joinedload(AthleteEntry.event)
-        )
-        .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-        .filter(
-            AthleteEntry.athlete_id == athlete_id,
-            Attempt.status != "finished",  # not completed yet
-        )
-        .order_by(Attempt.started_at.is_(True), Attempt.attempt_number.asc())
+    row = (
+        db.session.query(Athlete, Competition)
+        .outerjoin(Competition, Athlete.competition_id == Competition.id)
+        .filter(Athlete.id == athlete_id)
         .first()
     )
+    if not row:
+        return None
+    athlete_row, competition = row
+
+    if not competition:
+        # Fallback to the most recent competition
+        competition = Competition.query.order_by(Competition.id.desc()).first()
+
+    # All entries (with events and movements) and all attempts, one query each
+    entry_rows = (
+        db.session.query(AthleteEntry, Event)
+        .join(Event, AthleteEntry.event_id == Event.id)
+        .options(joinedload(AthleteEntry.movement))
+        .filter(AthleteEntry.athlete_id == athlete_row.id)
+        .order_by(AthleteEntry.id)
+        .all()
+    )
+    entry_ids = [entry.id for entry, _ in entry_rows]
+
+    attempts_by_entry = {}
+    if entry_ids:
+        attempts = (
+            Attempt.query.filter(Attempt.athlete_entry_id.in_(entry_ids))
+            .order_by(Attempt.attempt_number.asc(), Attempt.id.asc())
+            .all()
+        )
+        for attempt in attempts:
+            attempts_by_entry.setdefault(attempt.athlete_entry_id, []).append(attempt)
+    else:
+        attempts = []
+
+    athlete_config = {
+        "id": athlete_row.id,
+        "profile": {
+            "first_name": athlete_row.first_name,
+            "last_name": athlete_row.last_name,
+            "team": athlete_row.team,
+            "gender": athlete_row.gender,
+            "bodyweight": athlete_row.bodyweight,
+            "age": athlete_row.age,
+            "email": athlete_row.email,
+            "phone": athlete_row.phone,
+        },
+        "competition_state": {"is_active": athlete_row.is_active},
+        "entries": [],
+    }
+
+    active_entries = [(entry, event) for entry, event in entry_rows if entry.is_active]
+    for entry, event in active_entries:
+        entry_config = {
+            "id": entry.id,
+            "event": {
+                "id": event.id,
+                "name": event.name,
+                "weight_category": event.weight_category,
+                "gender": event.gender,
+                "sport_type": event.sport_type,
+            },
+            "lift_type": entry.lift_type,
+            "movement_name": entry.movement_name,
+            "time_limits": {"attempt": entry.time_limit},
+            "opening_weights": entry.opening_weights or 0,
+            # Use default_reps as maximum and reps as current athlete preference
+            "reps": entry.reps or entry.default_reps,  # Current athlete preference
+            "reps_display": str(entry.reps or entry.default_reps).replace(
+                " ", ""
+            ),  # Clean format for display
+            "reps_max": entry.default_reps,  # Maximum from competition config
+            "reps_max_display": str(entry.default_reps).replace(" ", ""),
+            "config": entry.entry_config or {},
+            "attempts": [],
+            "scores": [],
+        }
+
+        for attempt in attempts_by_entry.get(entry.id, []):
+            entry_config["attempts"].append(
+                {
+                    "id": attempt.id,
+                    "attempt_number": attempt.attempt_number,
+                    "requested_weight": attempt.requested_weight,
+                    "actual_weight": attempt.actual_weight,
+                    "status": attempt.status or "waiting",
+                    "final_result": attempt.final_result,
+                    "result": attempt.final_result.value
+                    if attempt.final_result
+                    else None,
+                    "lifting_order": attempt.lifting_order,
+                    "lift_name": entry.movement_name,
+                }
+            )
+
+        athlete_config["entries"].append(entry_config)
+
+    competition_meta = None
+    my_flights = []
+    if competition:
+        competition_meta = {
+            "id": competition.id,
+            "name": competition.name,
+            "description": competition.description,
+            "start_date": competition.start_date.strftime("%Y-%m-%d"),
+            "is_active": competition.is_active,
+            "rankings": [],  # Will populate with per-event ranking and total_score
+        }
+
+        # Populate athlete-specific rankings from one batched score query
+        try:
+            competition_entries = [
+                (entry, event)
+                for entry, event in active_entries
+                if event.competition_id == competition.id
+            ]
+            scores = {}
+            if competition_entries:
+                scores = {
+                    score.athlete_entry_id: score
+                    for score in Score.query.filter(
+                        Score.athlete_entry_id.in_(
+                            [entry.id for entry, _ in competition_entries]
+                        )
+                    )
+                }
+            rankings = []
+            for entry, event in competition_entries:
+                score = scores.get(entry.id)
+                # Prefer movement_name or lift_type for display
+                movement_label = entry.movement_name or entry.lift_type or event.name
+                rankings.append(
+                    {
+                        "movement": movement_label,
+                        "rank": score.rank
+                        if score and score.rank is not None
+                        else None,
+                        "total_score": score.total_score
+                        if score and score.total_score is not None
+                        else 0,
+                    }
+                )
+            competition_meta["rankings"] = rankings
+        except Exception:
+            # Fail gracefully - leave rankings empty
+            competition_meta["rankings"] = competition_meta.get("rankings", [])
+
+        my_flights = get_my_flights(athlete_row.id, competition.id)
+
+    # Next attempt preview, picked from the attempts already loaded
+    events_by_entry = {entry.id: (entry, event) for entry, event in entry_rows}
+    pending = [attempt for attempt in attempts if attempt.status != "finished"]
+    next_attempt_view = None
+    if pending:
+        next_attempt = pending[0]
+        entry, event = events_by_entry[next_attempt.athlete_entry_id]
+        next_attempt_view = {
+            "attempt_id": next_attempt.id,
+            "attempt_number": next_attempt.attempt_number,
+            "requested_weight": next_attempt.requested_weight,
+            "event_name": event.name,
+            "sport_type": event.sport_type.value if event.sport_type else None,
+            "event_category": event.weight_category,
+            "event_gender": event.gender,
+            "lift_type": entry.lift_type,
+            "time": attempt_time_remaining(next_attempt),
+        }
+
+    return {
+        "athlete": athlete_config,
+        "competition": competition_meta,
+        "my_flights": my_flights,
+        "next_attempt": next_attempt_view,
+    }
 
 
 def attempt_time_remaining(attempt: Attempt) -> int:
@@ -127,7 +298,7 @@ def attempt_time_remaining(attempt: Attempt) -> int:
 
     # Fall back to database-based timing
     if attempt.started_at:
-        time_limit = attempt.athlete_entry.attempt_time_limit or 60
+        time_limit = attempt.athlete_entry.time_limit
         elapsed = (datetime.utcnow() - attempt.started_at).total_seconds()
         remaining = max(0, int(time_limit - elapsed))
         return remaining
@@ -172,36 +343,122 @@ def extract_movements_for_event(event):
     if not comp or not isinstance(getattr(comp, "config", None), dict):
         return []
 
-    cfg = comp.config or {}
-    events_cfg = cfg.get("events") or []
-    if not isinstance(events_cfg, list):
-        return []
+    return compiled_config(comp).movements_for_event(event.id, event.name)
+
 
-    # ID match
-    for block in events_cfg:
+def provision_athlete_entries(event, flight, assignments):
+    """
+    Create the missing AthleteEntry and Attempt rows for many athletes in one
+    flight. `assignments` is an iterable of (athlete_id, entry_order).
+
+    Existing entries and attempts are found with one set-based query each and
+    the new rows are written with executemany inserts; nothing is committed
+    here, so callers can provision a whole roster inside their own transaction.
+    Returns {athlete_id: [created AthleteEntry, ...]}.
+    """
+    assignments = list(assignments)
+    created = {athlete_id: [] for athlete_id, _ in assignments}
+    if not assignments:
+        return created
+    athlete_ids = list(created)
+
+    # Only movements that match the flight's movement_type get entries
+    movement_type = flight.movement_type
+    normalized_flight_movement = (
+        normalize_movement_name(movement_type) if movement_type else None
+    )
+    movements = {}
+    for definition in ensure_movement_definitions(event):
         if (
-            isinstance(block, dict)
-            and block.get("id") == event.id
-            and block.get("movements")
+            normalized_flight_movement
+            and normalize_movement_name(definition.name) != normalized_flight_movement
         ):
-            return list(block["movements"])
-
-    # Name match
-    ename = (event.name or "").strip().lower()
-    for block in events_cfg:
-        if not isinstance(block, dict):
             continue
-        if (block.get("name") or "").strip().lower() == ename and block.get(
-            "movements"
-        ):
-            return list(block["movements"])
+        movements[definition.name] = definition
+    if not movements:
+        return created
 
-    # Fallback: first movements block
-    for block in events_cfg:
-        if isinstance(block, dict) and block.get("movements"):
-            return list(block["movements"])
+    existing_entries = set(
+        db.session.query(AthleteEntry.athlete_id, AthleteEntry.lift_type)
+        .filter(
+            AthleteEntry.athlete_id.in_(athlete_ids),
+            AthleteEntry.event_id == event.id,
+            AthleteEntry.flight_id == flight.id,
+        )
+        .all()
+    )
+
+    entry_rows = []
+    for athlete_id, entry_order in assignments:
+        for mv_name in movements:
+            if (athlete_id, mv_name) in existing_entries:
+                continue
+            existing_entries.add((athlete_id, mv_name))
 
-    return []
+            # Reps, timer and config come from the movement definition
+            entry_rows.append(
+                {
+                    "athlete_id": athlete_id,
+                    "event_id": event.id,
+                    "flight_id": flight.id,
+                    "entry_order": entry_order,
+                    "lift_type": mv_name,
+                }
+            )
+    if not entry_rows:
+        return created
+
+    # Bulk inserts bypass the session flush hooks, so record the change here
+    db.session.execute(insert(AthleteEntry), entry_rows)
+    mark_changed(db.session, event.competition_id)
+
+    new_keys = {(row["athlete_id"], row["lift_type"]) for row in entry_rows}
+    new_entries = [
+        entry
+        for entry in AthleteEntry.query.filter(
+            AthleteEntry.athlete_id.in_({row["athlete_id"] for row in entry_rows}),
+            AthleteEntry.event_id == event.id,
+            AthleteEntry.flight_id == flight.id,
+        ).order_by(AthleteEntry.id)
+        if (entry.athlete_id, entry.lift_type) in new_keys
+    ]
+
+    existing_attempts = set(
+        db.session.query(Attempt.athlete_id, Attempt.attempt_number)
+        .filter(
+            Attempt.athlete_id.in_(athlete_ids),
+            Attempt.flight_id == flight.id,
+            Attempt.movement_type == movement_type,
+        )
+        .all()
+    )
+
+    attempt_rows = []
+    for ae in new_entries:
+        created[ae.athlete_id].append(ae)
+
+        # Number of attempts based on reps array length, default 3
+        default_reps = movements[ae.lift_type].reps
+        num_attempts = len(default_reps) if default_reps else 3
+        for attempt_num in range(1, num_attempts + 1):
+            if (ae.athlete_id, attempt_num) in existing_attempts:
+                continue
+            existing_attempts.add((ae.athlete_id, attempt_num))
+            attempt_rows.append(
+                {
+                    "athlete_id": ae.athlete_id,
+                    "athlete_entry_id": ae.id,
+                    "flight_id": flight.id,
+                    "movement_type": movement_type,
+                    "attempt_number": attempt_num,
+                    "requested_weight": 0.0,
+                    "final_result": None,
+                }
+            )
+
+    if attempt_rows:
+        db.session.execute(insert(Attempt), attempt_rows)
+    return created
 
 
 def ensure_athlete_entries_for_event(
@@ -237,100 +494,13 @@ def ensure_athlete_entries_for_event(
         flight_id = athlete_flight.flight_id
         entry_order = athlete_flight.order
 
-    # Get the flight's movement_type to filter which movements to create
     flight = Flight.query.get(flight_id)
-    flight_movement_type = flight.movement_type if flight else None
+    if not flight:
+        raise ValueError(f"Flight {flight_id} not found")
 
-    # Normalize flight movement type for comparison
-    normalized_flight_movement = (
-        normalize_movement_name(flight_movement_type) if flight_movement_type else None
-    )
-
-    movements = extract_movements_for_event(event)
-    created = []
-
-    # Gather existing lift_types for this athlete+event+flight combination
-    existing = {
-        ae.lift_type
-        for ae in AthleteEntry.query.filter_by(
-            athlete_id=athlete_id, event_id=event_id, flight_id=flight_id
-        ).all()
-    }
-
-    for mv in movements or []:
-        mv_name = (mv.get("name") or "").strip()
-
-        # Skip if already exists
-        if not mv_name or mv_name in existing:
-            continue
-
-        # Normalize movement name for comparison
-        normalized_mv_name = normalize_movement_name(mv_name)
-
-        # Only create entry if movement matches flight's movement_type
-        if (
-            normalized_flight_movement
-            and normalized_mv_name != normalized_flight_movement
-        ):
-            continue
-
-        timer = mv.get("timer") or {}
-        attempt_seconds = int(timer.get("attempt_seconds", 60))
-
-        reps_data = mv.get("reps")
-
-        ae = AthleteEntry(
-            athlete_id=athlete_id,
-            event_id=event_id,
-            flight_id=flight_id,
-            entry_order=entry_order,
-            lift_type=mv_name,
-            attempt_time_limit=attempt_seconds,
-            default_reps=reps_data,  # Store default reps directly
-            reps=reps_data,
-            entry_config=mv,
-        )
-        db.session.add(ae)
-        created.append(ae)
-
-    if created:
-        db.session.commit()
-
-        # Create Attempt records for each AthleteEntry
-        for ae in created:
-            # Get the flight's movement_type
-            flight = Flight.query.get(flight_id)
-            movement_type = flight.movement_type if flight else None
-
-            # Determine number of attempts based on reps array length
-            num_attempts = (
-                len(ae.default_reps) if ae.default_reps else 3
-            )  # Default to 3 attempts
-
-            for attempt_num in range(1, num_attempts + 1):
-                # Check if attempt already exists for this athlete+flight+movement+attempt_number
-                existing_attempt = Attempt.query.filter_by(
-                    athlete_id=athlete_id,
-                    flight_id=flight_id,
-                    movement_type=movement_type,
-                    attempt_number=attempt_num,
-                ).first()
-
-                if not existing_attempt:
-                    attempt = Attempt(
-                        athlete_id=athlete_id,
-                        athlete_entry_id=ae.id,
-                        flight_id=flight_id,
-                        movement_type=movement_type,
-                        attempt_number=attempt_num,
-                        requested_weight=0.0,
-                        final_result=None,
-                    )
-                    db.session.add(attempt)
-
-        db.session.commit()
-
-    return created
+    created = provision_athlete_entries(event, flight, [(athlete_id, entry_order)])
+    db.session.commit()
+    return created[athlete_id]
 
 
 # Views / API ---------------------------------------------------------------------------
@@ -345,193 +515,14 @@ def athlete_dashboard():
     if "athlete_id" not in session or "user_id" not in session:
         return redirect(url_for("login.login"))
 
-    athlete_row = resolve_current_athlete()
+    dashboard = load_dashboard_data(session["athlete_id"])
 
     # If athlete not found despite session, clear session and redirect
-    if not athlete_row:
+    if not dashboard:
         session.clear()
         return redirect(url_for("login.login"))
 
-    # Format athlete data with configuration, providing defaults if no athlete found
-    athlete_config = {
-        "id": None,
-        "profile": {
-            "first_name": "Demo",
-            "last_name": "Athlete",
-            "team": "—",
-            "gender": "—",
-            "bodyweight": None,
-            "age": None,
-            "email": None,
-            "phone": None,
-        },
-        "competition_state": {"current_attempt_number": None, "is_active": False},
-        "entries": [],
-    }
-
-    if athlete_row:
-        # Build full athlete configuration
-        athlete_config = {
-            "id": athlete_row.id,
-            "profile": {
-                "first_name": athlete_row.first_name,
-                "last_name": athlete_row.last_name,
-                "team": athlete_row.team,
-                "gender": athlete_row.gender,
-                "bodyweight": athlete_row.bodyweight,
-                "age": athlete_row.age,
-                "email": athlete_row.email,
-                "phone": athlete_row.phone,
-            },
-            "competition_state": {"is_active": athlete_row.is_active},
-            "entries": [],
-        }
-
-        # Load entries with relationships
-        athlete_entries = (
-            AthleteEntry.query.options(
-                joinedload(AthleteEntry.event), joinedload(AthleteEntry.attempts)
-            )
-            .filter(AthleteEntry.athlete_id == athlete_row.id)
-            .filter(AthleteEntry.is_active == True)
-            .all()
-        )
-
-        # Add entry configurations
-        for entry in athlete_entries:
-            entry_config = {
-                "id": entry.id,
-                "event": {
-                    "id": entry.event.id,
-                    "name": entry.event.name,
-                    "weight_category": entry.event.weight_category,
-                    "gender": entry.event.gender,
-                    "sport_type": entry.event.sport_type,
-                },
-                "lift_type": entry.lift_type,
-                "movement_name": entry.movement_name,
-                "time_limits": {"attempt": entry.attempt_time_limit},
-                "opening_weights": entry.opening_weights or 0,
-                # Use default_reps as maximum and reps as current athlete preference
-                "reps": entry.reps or entry.default_reps,  # Current athlete preference
-                "reps_display": str(entry.reps or entry.default_reps).replace(
-                    " ", ""
-                ),  # Clean format for display
-                "reps_max": entry.default_reps,  # Maximum from competition config
-                "reps_max_display": str(entry.default_reps).replace(" ", ""),
-                "config": entry.entry_config or {},
-                "attempts": [],
-                "scores": [],
-            }
-
-            # Add attempts, include lift_name
-            for attempt in sorted(entry.attempts, key=lambda x: x.attempt_number):
-                entry_config["attempts"].append(
-                    {
-                        "id": attempt.id,
-                        "attempt_number": attempt.attempt_number,
-                        "requested_weight": attempt.requested_weight,
-                        "actual_weight": attempt.actual_weight,
-                        "status": attempt.status or "waiting",
-                        "final_result": attempt.final_result,
-                        "result": attempt.final_result.value
-                        if attempt.final_result
-                        else None,
-                        "lifting_order": attempt.lifting_order,
-                        "lift_name": entry.movement_name,
-                    }
-                )
-
-            athlete_config["entries"].append(entry_config)
-
-    # Decide which competition to show
-    competition_id = None
-    competition_meta = None
-
-    if athlete_row and athlete_row.competition_id:
-        competition_id = athlete_row.competition_id
-    else:
-        # Fallback to the most recent competition
-        comps_resp = get_competitions()
-        comps = comps_resp.get_json() if hasattr(comps_resp, "get_json") else []
-        if comps:
-            competition_id = comps[-1]["id"]
-
-    if competition_id:
-        # Load competition directly from database
-        competition = Competition.query.get(competition_id)
-        if competition:
-            competition_meta = {
-                "id": competition.id,
-                "name": competition.name,
-                "description": competition.description,
-                "start_date": competition.start_date.strftime("%Y-%m-%d"),
-                "is_active": competition.is_active,
-                "rankings": [],  # Will populate with per-event ranking and total_score
-            }
-
-            # Populate athlete-specific rankings for the competition
-            try:
-                if athlete_row:
-                    rankings = []
-                    # Use athlete_entries loaded earlier if available
-                    for entry in athlete_entries:
-                        # Only consider entries that belong to this competition
-                        if entry.event and entry.event.competition_id == competition.id:
-                            score = Score.query.filter_by(
-                                athlete_entry_id=entry.id
-                            ).first()
-                            # Prefer movement_name or lift_type for display
-                            movement_label = (
-                                entry.movement_name
-                                or entry.lift_type
-                                or (entry.event.name if entry.event else "Event")
-                            )
-                            rankings.append(
-                                {
-                                    "movement": movement_label,
-                                    "rank": score.rank
-                                    if score and score.rank is not None
-                                    else None,
-                                    "total_score": score.total_score
-                                    if score and score.total_score is not None
-                                    else 0,
-                                }
-                            )
-                    competition_meta["rankings"] = rankings
-            except Exception:
-                # Fail gracefully - leave rankings empty
-                competition_meta["rankings"] = competition_meta.get("rankings", [])
-
-    my_flights = []
-    if competition_id and athlete_row:
-        my_flights = get_my_flights(athlete_row.id, competition_id)
-
-    # Next attempt preview
-    next_attempt = next_pending_attempt(athlete_row.id) if athlete_row else None
-    next_attempt_view = None
-    if next_attempt:
-        entry = next_attempt.athlete_entry
-        event = entry.event
-        next_attempt_view = {
-            "attempt_id": next_attempt.id,
-            "attempt_number": next_attempt.attempt_number,
-            "requested_weight": next_attempt.requested_weight,
-            "event_name": event.name,
-            "sport_type": event.sport_type.value if event.sport_type else None,
-            "event_category": event.weight_category,
-            "event_gender": event.gender,
-            "lift_type": entry.lift_type,
-            "time": attempt_time_remaining(next_attempt),
-        }
-
-    return render_template(
-        "athlete/athlete.html",
-        athlete=athlete_config,
-        competition=competition_meta,
-        my_flights=my_flights,
-        next_attempt=next_attempt_view,
-    )
+    return render_template("athlete/athlete.html", **dashboard)
 
 
 @athlete_bp.route("/update-opening-weight", methods=["POST"])
@@ -626,6 +617,7 @@ def update_opening_weight():
         )
         if first_attempt:
             first_attempt.requested_weight = weight
+            lifting_order_engine.attempt_changed(first_attempt)
 
         db.session.commit()
 
@@ -736,8 +728,9 @@ def update_attempt_weight():
                 }
             ), 403
 
-        # Update weight
+        # Update weight and move the attempt to its new place
         attempt.requested_weight = new_weight
+        lifting_order_engine.attempt_changed(attempt)
         db.session.commit()
 
         # Return updated attempt configuration
@@ -799,281 +792,22 @@ def get_active_event():
     return jsonify({"active_event": None})
 
 
-def check_event_has_in_progress_attempts(event_id: int) -> bool:
-    """Check if any attempt in the event is currently in-progress"""
-    try:
-        return (
-            db.session.query(Attempt)
-            .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-            .filter(AthleteEntry.event_id == event_id, Attempt.status == "in-progress")
-            .first()
-            is not None
-        )
-    except Exception:
-        return False
-
-
-_simple_estimate_cache = {}
-
-
 def calculate_estimated_time(
-    target_attempt: Attempt, competition_id: int, sport_type=None
+    target_attempt, competition_id: int, sport_type=None
 ) -> int:
     """
-    Calculate estimated time until target_attempt is up.
-
-    SIMPLIFIED LOGIC:
-    1. If target attempt is currently in-progress -> return 0 (you're up now)
-    2. If there's another attempt in-progress -> add its remaining time
-    3. Add time for all waiting attempts that come before target in lifting order
-    4. Each attempt = time_limit + 15s buffer
-    5. Add break time when transitioning between flights
-    """
-    # print(f"\n[ESTIMATE] === Starting Calculation ===")
-    # print(f"[ESTIMATE] Target: Athlete {target_attempt.athlete_entry.athlete_id}, Attempt #{target_attempt.attempt_number}, Flight {target_attempt.flight_id}")
-
-    # Quick check: if target attempt is already in-progress, return 0
-    if target_attempt.status == "in-progress":
-        return 0
-
-    if target_attempt.status == "finished":
-        return 0
+    Estimated seconds until target_attempt is up.
 
+    Reads the shared per-competition queue projection, which holds the
+    cumulative time of the waiting attempts ahead of every attempt (time
+    limit + 15s buffer each), and adds the in-progress attempt's remaining
+    time. Attempts that are not waiting return 0.
+    """
     if target_attempt.status != "waiting":
         return 0
 
-    total_seconds = 0
-    competition = Competition.query.get(competition_id)
-    breaktime_between_flights = (
-        competition.breaktime_between_flights if competition else 180
-    )
-    target_flight_id = target_attempt.flight_id
-
-    # 1. CHECK FOR CURRENT IN-PROGRESS ATTEMPT
-    current_attempt = get_current_in_progress_attempt(competition_id, sport_type)
-
-    if current_attempt:
-        # Add remaining time for current attempt
-        remaining = attempt_time_remaining(current_attempt)
-        if remaining and remaining > 0:
-            total_seconds += remaining
-        else:
-            time_limit = current_attempt.athlete_entry.attempt_time_limit or 60
-            total_seconds += time_limit
-
-    # Get all waiting attempts for this competition
-    all_waiting_attempts = get_waiting_attempts_in_order(competition_id, sport_type)
-    # print(f"[ESTIMATE] Total waiting attempts found: {len(all_waiting_attempts)}")
-
-    # Find attempts that come before target in the proper lifting order
-    attempts_ahead = []
-    target_found = False
-
-    for attempt in all_waiting_attempts:
-        if attempt.id == target_attempt.id:
-            target_found = True
-            break
-
-        # Only include attempts from earlier flights OR same flight but before target in lifting order
-        if attempt.flight_id < target_flight_id:
-            # All attempts from earlier flights come first
-            attempts_ahead.append(attempt)
-        elif attempt.flight_id == target_flight_id:
-            # Same flight - only include if it comes before target in lifting order
-            attempts_ahead.append(attempt)
-
-    if not target_found:
-        print(f"[ESTIMATE] ERROR: Target attempt not found in waiting attempts!")
-        print(f"[ESTIMATE] Available attempts:")
-        for attempt in all_waiting_attempts:
-            print(
-                f"[ESTIMATE]   - Athlete {attempt.athlete_entry.athlete_id}, Attempt #{attempt.attempt_number}, Flight {attempt.flight_id}, Status: {attempt.status}"
-            )
-        return 0
-
-    # 2. ADD TIME FOR ALL ATTEMPTS AHEAD
-    for attempt in attempts_ahead:
-        time_limit = attempt.athlete_entry.attempt_time_limit or 60
-        buffer = 15
-        attempt_time = time_limit + buffer
-        total_seconds += attempt_time
-
-    # 3. CACHE AND RETURN RESULT
-    now = datetime.utcnow()
-    cache_key = f"{competition_id}_{target_attempt.id}"
-    result = max(0, int(total_seconds))
-
-    # print(f"[ESTIMATE] Target: Athlete {target_attempt.athlete_entry.athlete_id}, Attempt #{target_attempt.attempt_number}, Flight {target_attempt.flight_id} → {len(attempts_ahead)} ahead, {result}s ({result//60}:{result%60:02d})")
-
-    # Cache result (5 second TTL)
-    _simple_estimate_cache[cache_key] = (result, now)
-
-    # Clean old cache entries
-    for key in list(_simple_estimate_cache.keys()):
-        _, cache_time = _simple_estimate_cache[key]
-        if (now - cache_time).total_seconds() > 10:
-            del _simple_estimate_cache[key]
-
-    return result
-
-
-def get_current_in_progress_attempt(competition_id: int, sport_type=None):
-    """
-    Find the currently in-progress attempt for the competition.
-    Optionally filter by sport_type.
-    """
-    query = (
-        Attempt.query.join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-        .join(Event, AthleteEntry.event_id == Event.id)
-        .filter(Event.competition_id == competition_id, Attempt.status == "in-progress")
-    )
-
-    if sport_type:
-        query = query.filter(Event.sport_type == sport_type)
-
-    return query.first()
-
-
-def get_waiting_attempts_in_order(
-    competition_id: int, sport_type=None, movement_type: str = None
-):
-    """
-    Get all waiting attempts for a competition in lifting order.
-    Optionally filter by sport_type and/or movement_type.
-    """
-    query = (
-        Attempt.query.options(
-            joinedload(Attempt.athlete_entry).joinedload(AthleteEntry.event),
-            joinedload(Attempt.athlete),
-        )
-        .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-        .join(Event, AthleteEntry.event_id == Event.id)
-        .filter(Event.competition_id == competition_id, Attempt.status == "waiting")
-    )
-
-    if sport_type:
-        query = query.filter(Event.sport_type == sport_type)
-
-    if movement_type:
-        query = query.filter(Attempt.movement_type == movement_type)
-
-    # Order by lifting_order (weight-based), then attempt number
-    result = query.order_by(
-        Attempt.lifting_order.asc().nullslast(),
-        Attempt.requested_weight.asc(),
-        Attempt.attempt_number.asc(),
-    ).all()
-
-    return result
-
-
-def is_athlete_first_in_queue(attempt_id: int, athlete_id: int) -> bool:
-    """
-    Return True if the given attempt is currently first in the remaining queue.
-    """
-    try:
-        attempt = Attempt.query.options(joinedload(Attempt.athlete_entry)).get(
-            attempt_id
-        )
-        if not attempt or not attempt.athlete_entry:
-            return False
-
-        event_id = attempt.athlete_entry.event_id
-        flight_id = attempt.athlete_entry.flight_id
-
-        # Get remaining attempts in THIS FLIGHT (waiting or in-progress)
-        remaining = (
-            Attempt.query.join(
-                AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id
-            )
-            .filter(
-                AthleteEntry.event_id == event_id,
-                AthleteEntry.flight_id == flight_id,  # Same flight only
-                Attempt.status.in_(["waiting", "in-progress"]),
-            )
-            .order_by(
-                Attempt.lifting_order.asc().nullslast(),
-                Attempt.requested_weight.asc(),
-                Attempt.attempt_number.asc(),
-            )
-            .all()
-        )
-
-        if not remaining:
-            return False
-
-        # First attempt in the queue
-        first_attempt = remaining[0]
-
-        # If there's an in-progress attempt, target must be it
-        if first_attempt.status == "in-progress":
-            return first_attempt.id == attempt_id
-
-        # Otherwise, target must be the first waiting attempt
-        return first_attempt.id == attempt_id
-
-    except Exception as e:
-        print(f"[ERROR] is_athlete_first_in_queue: {e}")
-        return False
-
-
-def find_next_attempt_for_athlete(
-    athlete_id: int, sport_type=None, prefer_movement: str = None
-):
-    """
-    Find the next pending attempt for this athlete.
-    Priority:
-    1. In-progress attempt (return immediately - "You are up")
-    2. Next waiting attempt in preferred_movement
-    3. Next waiting attempt in any movement (same sport_type)
-    """
-    # Check for in-progress attempt first
-    in_progress = (
-        Attempt.query.options(
-            joinedload(Attempt.athlete_entry).joinedload(AthleteEntry.event)
-        )
-        .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-        .join(Event, AthleteEntry.event_id == Event.id)
-        .filter(AthleteEntry.athlete_id == athlete_id, Attempt.status == "in-progress")
-    )
-
-    if sport_type:
-        in_progress = in_progress.filter(Event.sport_type == sport_type)
-
-    attempt = in_progress.first()
-    if attempt:
-        return attempt, "in-progress"
-
-    # Look for waiting attempts
-    waiting_query = (
-        Attempt.query.options(
-            joinedload(Attempt.athlete_entry).joinedload(AthleteEntry.event)
-        )
-        .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-        .join(Event, AthleteEntry.event_id == Event.id)
-        .filter(AthleteEntry.athlete_id == athlete_id, Attempt.status == "waiting")
-    )
-
-    if sport_type:
-        waiting_query = waiting_query.filter(Event.sport_type == sport_type)
-
-    # Try preferred movement first
-    if prefer_movement:
-        same_movement = (
-            waiting_query.filter(Attempt.movement_type == prefer_movement)
-            .order_by(Attempt.attempt_number.asc())
-            .first()
-        )
-
-        if same_movement:
-            return same_movement, "waiting-same-movement"
-
-    # Fallback to any waiting attempt
-    any_waiting = waiting_query.order_by(Attempt.attempt_number.asc()).first()
-    if any_waiting:
-        return any_waiting, "waiting-other-movement"
-
-    return None, "none"
+    projection = get_queue_projection(competition_id, sport_type)
+    return projection.estimated_seconds(target_attempt.id)
 
 
 @athlete_bp.route("/next-attempt-timer")
@@ -1084,10 +818,22 @@ def get_next_attempt_timer():
     - Shows countdown for first attempt of flight (even if first in queue)
     - After countdown expires, transitions to "YOU ARE UP"
     - For subsequent attempts, shows "YOU ARE UP" immediately when first in queue
+
+    Answered from the shared per-competition status record, so a poll costs
+    one query for the athlete's competition while the data is unchanged.
     """
+    from flask import session
+
     try:
-        athlete = resolve_current_athlete()
-        if not athlete:
+        athlete_row = None
+        athlete_id = session.get("athlete_id")
+        if athlete_id:
+            athlete_row = (
+                db.session.query(Athlete.id, Athlete.competition_id)
+                .filter(Athlete.id == athlete_id)
+                .first()
+            )
+        if not athlete_row:
             return jsonify(
                 {
                     "error": "Athlete not found",
@@ -1099,102 +845,93 @@ def get_next_attempt_timer():
                 }
             ), 404
 
+        if athlete_row.competition_id is None:
+            # Not entered in a competition, so there is no queue to be in
+            return jsonify(
+                {
+                    "no_attempts": True,
+                    "message": "No attempts left",
+                    "time": None,
+                    "timer_active": False,
+                    "timer_type": "inactive",
+                    "sport_type": None,
+                }
+            )
+
+        status = get_competition_status(athlete_row.competition_id)
+
         # Get current context
         current_event_id = request.args.get("event_id", type=int)
         current_sport_type = None
-        competition_id = None
+        competition_id = athlete_row.competition_id
 
         if not current_event_id:
             global _current_active_event_id
             current_event_id = _current_active_event_id
 
         if current_event_id:
-            current_event = Event.query.get(current_event_id)
-            if current_event:
-                current_sport_type = current_event.sport_type
-                competition_id = current_event.competition_id
-
-        if not competition_id and athlete.competition_id:
-            competition_id = athlete.competition_id
-
-        # Determine preferred movement
-        prefer_movement = None
-        most_recent = (
-            Attempt.query.join(
-                AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id
-            )
-            .filter(
-                AthleteEntry.athlete_id == athlete.id,
-                Attempt.status.in_(["in-progress", "finished"]),
-            )
-            .order_by(
-                Attempt.started_at.desc().nullslast(),
-                Attempt.completed_at.desc().nullslast(),
-                Attempt.id.desc(),
-            )
-            .first()
-        )
-
-        if most_recent:
-            prefer_movement = most_recent.movement_type
-
-        # Find athlete's next attempt
-        next_attempt, attempt_status = find_next_attempt_for_athlete(
-            athlete.id, current_sport_type, prefer_movement
+            if current_event_id in status.events:
+                current_sport_type = status.events[current_event_id].sport_type
+            else:
+                current_event = (
+                    db.session.query(Event.sport_type, Event.competition_id)
+                    .filter(Event.id == current_event_id)
+                    .first()
+                )
+                if current_event:
+                    current_sport_type = current_event.sport_type
+                    competition_id = current_event.competition_id or competition_id
+
+        # Find athlete's next attempt, preferring the movement they last lifted
+        prefer_movement = status.preferred_movement(athlete_row.id)
+        next_attempt, attempt_status = status.next_attempt_for_athlete(
+            athlete_row.id, current_sport_type, prefer_movement
         )
 
         # PRIORITY CHECK: Active event break timer (check even if no attempts left)
         # If there's an active event break timer running, show it regardless of other conditions
         try:
-            import json
-            from pathlib import Path
-
-            state_file = (
-                Path(__file__).parent.parent.parent / "instance" / "timer_state.json"
-            )
-            if state_file.exists():
-                with open(state_file, "r") as f:
-                    timer_state = json.load(f)
-
-                # Check if there's an active break timer (both flight and event breaks)
-                break_running = timer_state.get("break_timer_running", False)
-                break_seconds = timer_state.get("break_timer_seconds", 0)
-                break_type = timer_state.get("break_timer_type", "")
-
-                # Show both flight and event break timers explicitly
-                if break_running and break_seconds > 0:
-                    if break_type == "Event Break":
-                        timer_type = "break_between_events"
-                        lift_type_display = "Event Break"
-                    elif break_type == "Flight Break":
-                        timer_type = "break_between_flights"
-                        lift_type_display = "Flight Break"
-                    else:
-                        # Fallback for other break types
-                        timer_type = "break_between_flights"
-                        lift_type_display = "Break"
-
-                    # Create a base response for break timer (no attempt info needed)
-                    base_response = {
-                        "attempt_id": None,
-                        "status": "waiting",
-                        "event": None,
-                        "lift_type": lift_type_display,
-                        "order": None,
-                        "weight": None,
-                        "sport_type": current_sport_type.value
-                        if current_sport_type
-                        else None,
-                        "is_first_in_queue": False,
-                        "is_first_of_flight": False,
-                        "has_completed_attempts": False,
-                        "has_in_progress_attempts": False,
-                        "no_attempts": False,
-                        "time": int(break_seconds),
-                        "timer_active": True,
-                        "timer_type": timer_type,
-                    }
-                    return jsonify(base_response)
+            timer_state = load_timer_state(current_app.instance_path)
+
+            # Check if there's an active break timer (both flight and event breaks)
+            break_running = timer_state.get("break_timer_running", False)
+            break_seconds = timer_state.get("break_timer_seconds", 0)
+            break_type = timer_state.get("break_timer_type", "")
+
+            # Show both flight and event break timers explicitly
+            if break_running and break_seconds > 0:
+                if break_type == "Event Break":
+                    timer_type = "break_between_events"
+                    lift_type_display = "Event Break"
+                elif break_type == "Flight Break":
+                    timer_type = "break_between_flights"
+                    lift_type_display = "Flight Break"
+                else:
+                    # Fallback for other break types
+                    timer_type = "break_between_flights"
+                    lift_type_display = "Break"
+
+                # Create a base response for break timer (no attempt info needed)
+                base_response = {
+                    "attempt_id": None,
+                    "status": "waiting",
+                    "event": None,
+                    "lift_type": lift_type_display,
+                    "order": None,
+                    "weight": None,
+                    "sport_type": current_sport_type.value
+                    if current_sport_type
+                    else None,
+                    "is_first_in_queue": False,
+                    "is_first_of_flight": False,
+                    "has_completed_attempts": False,
+                    "has_in_progress_attempts": False,
+                    "no_attempts": False,
+                    "time": int(break_seconds),
+                    "timer_active": True,
+                    "timer_type": timer_type,
+                }
+                return jsonify(base_response)
         except Exception as e:
             print(f"[DEBUG] Error checking break timer state: {e}")
 
@@ -1216,38 +953,10 @@ def get_next_attempt_timer():
                 }
             )
 
-        # Get event and movement info
-        event = next_attempt.athlete_entry.event
-        movement_name = next_attempt.athlete_entry.movement_name
-
-        # Check if first in FLIGHT queue
-        try:
-            is_first = is_athlete_first_in_queue(next_attempt.id, athlete.id)
-        except Exception:
-            is_first = False
-
-        # Check if this is the first attempt of the flight
-        try:
-            is_first_of_flight = is_first_attempt_of_flight(next_attempt)
-        except Exception:
-            is_first_of_flight = False
-
-        # Check for completed/in-progress attempts
-        try:
-            has_completed = (
-                db.session.query(Attempt)
-                .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
-                .filter(AthleteEntry.event_id == event.id, Attempt.status == "finished")
-                .first()
-                is not None
-            )
-        except Exception:
-            has_completed = False
-
-        try:
-            has_in_progress = check_event_has_in_progress_attempts(event.id)
-        except Exception:
-            has_in_progress = False
+        # Event and flight flags come precomputed from the status record
+        event = status.events[next_attempt.event_id]
+        is_first = status.is_first_in_queue(next_attempt)
+        is_first_of_flight = status.is_first_of_flight(next_attempt)
 
         # Build base response
         base_response = {
@@ -1260,14 +969,14 @@ def get_next_attempt_timer():
                 "category": event.weight_category,
                 "gender": event.gender,
             },
-            "lift_type": movement_name,
+            "lift_type": next_attempt.movement_name,
             "order": next_attempt.attempt_number,
             "weight": next_attempt.requested_weight,
             "sport_type": current_sport_type.value if current_sport_type else None,
             "is_first_in_queue": is_first,
             "is_first_of_flight": is_first_of_flight,
-            "has_completed_attempts": has_completed,
-            "has_in_progress_attempts": has_in_progress,
+            "has_completed_attempts": event.id in status.events_with_completed,
+            "has_in_progress_attempts": event.id in status.events_with_in_progress,
             "no_attempts": False,
         }
 
@@ -1342,32 +1051,6 @@ def is_last_attempt_in_flight(attempt: Attempt, competition_id: int) -> bool:
         return False
 
 
-def is_first_attempt_of_flight(attempt: Attempt) -> bool:
-    """
-    Check if this attempt is the first attempt in its flight.
-    Returns True if:
-    1. No attempts in this flight have been completed yet, OR
-    2. No attempts in the entire competition have been completed (very first attempt)
-    """
-    try:
-        flight_id = attempt.flight_id
-
-        # Check if any attempts in THIS flight have been completed
-        completed_in_flight = Attempt.query.filter(
-            Attempt.flight_id == flight_id, Attempt.status == "finished"
-        ).count()
-
-        # If no completed attempts in this flight, it's the first attempt of this flight
-        if completed_in_flight == 0:
-            return True
-
-        return False
-
-    except Exception as e:
-        print(f"[ERROR] is_first_attempt_of_flight: {e}")
-        return False
-
-
 @athlete_bp.route("/timer/start-attempt/<int:attempt_id>", methods=["POST"])
 def start_attempt_timer(attempt_id):
     """
@@ -1379,7 +1062,7 @@ def start_attempt_timer(attempt_id):
         ).get_or_404(attempt_id)
 
         competition_id = attempt.athlete_entry.event.competition_id
-        time_limit = attempt.athlete_entry.attempt_time_limit or 60
+        time_limit = attempt.athlete_entry.time_limit
 
         # Create/start timer in TimerManager
         timer_id = f"attempt_{attempt_id}"
@@ -1,22 +1,39 @@
 import json
-from pathlib import Path
-from flask import Blueprint, render_template, request, jsonify, current_app
+import queue
+from flask import (
+    Blueprint,
+    Response,
+    render_template,
+    request,
+    jsonify,
+    current_app,
+)
 from ..extensions import db
-from ..models import (
-    Competition,
-    Event,
-    Athlete,
-    AthleteFlight,
-    Flight,
-    Attempt,
-    AthleteEntry,
-    Score,
-    AttemptResult,
+from ..models import Competition, Event, Athlete
+from ..real_time.change_feed import change_feed
+from ..utils.display_projections import (
+    build_competition_rankings,
+    build_competition_state,
+    build_flights_data,
+    current_lifter_summary,
+    FRAGMENTS,
+    load_timer_state,
+    projection_cache,
+    rankings_delta,
+    render_fragment,
 )
-from sqlalchemy.orm import joinedload
 
 display_bp = Blueprint("display", __name__, url_prefix="/display")
 
+# Upper bound on competitions served by one /api/wall request
+MAX_WALL_COMPETITIONS = 24
+
+# Seconds between keep-alive comments on an idle event stream
+STREAM_HEARTBEAT_SECONDS = 15
+
+# Change feed events forwarded to stream clients unchanged
+STREAM_FORWARDED_EVENTS = ("referee_decision", "attempt_result", "decision_result")
+
 
 @display_bp.route("/")
 def display_index():
@@ -128,36 +145,7 @@ def get_public_timer_state():
     Mirrors /admin/api/timer-state GET without requiring admin session.
     """
     try:
-        state_file = Path(current_app.instance_path) / "timer_state.json"
-        if state_file.exists():
-            with state_file.open("r") as f:
-                state = json.load(f)
-                state.setdefault("break_timer_seconds", 0)
-                state.setdefault("break_timer_running", False)
-                state.setdefault("break_timer_type", "")
-                state.setdefault("break_timer_message", "")
-        else:
-            state = {
-                "athlete_name": "",
-                "athlete_id": "",
-                "attempt_number": "",
-                "timer_seconds": 60,
-                "timer_running": False,
-                "timer_mode": "attempt",
-                "competition": "",
-                "event": "",
-                "flight": "",
-                "flight_id": "",
-                "team": "",
-                "current_lift": "",
-                "attempt_weight": "",
-                "break_timer_seconds": 0,
-                "break_timer_running": False,
-                "break_timer_type": "",
-                "break_timer_message": "",
-                "timestamp": 0,
-            }
-        return jsonify(state)
+        return jsonify(load_timer_state(current_app.instance_path))
     except Exception as exc:
         current_app.logger.warning(
             f"Failed to load timer state for public display: {exc}"
@@ -275,408 +263,280 @@ def get_default_competition_state():
 @display_bp.route("/api/competition/<int:competition_id>/state")
 def get_competition_state(competition_id):
     """API endpoint to get current competition state with in-progress and waiting attempts"""
-    from ..models import Attempt, AthleteEntry
-
     try:
-        competition = Competition.query.get(competition_id)
-        if not competition:
+        state = projection_cache.get("state", competition_id, build_competition_state)
+        if state is None:
             return jsonify({"success": False, "error": "Competition not found"}), 404
 
-        # Get current in-progress attempt
-        current_attempt_query = (
-            db.session.query(Attempt)
-            .join(AthleteEntry)
-            .join(Athlete)
-            .filter(
-                Athlete.competition_id == competition_id,
-                Attempt.status == "in-progress",
-            )
-            .options(joinedload(Attempt.athlete), joinedload(Attempt.athlete_entry))
-            .first()
-        )
+        return jsonify({"success": True, **state})
 
-        current_attempt_data = None
-        if current_attempt_query:
-            current_attempt_data = {
-                "id": current_attempt_query.id,
-                "athlete": {
-                    "id": current_attempt_query.athlete.id,
-                    "name": f"{current_attempt_query.athlete.first_name} {current_attempt_query.athlete.last_name}".strip(),
-                    "team": current_attempt_query.athlete.team or "No Team",
-                },
-                "weight": current_attempt_query.requested_weight,
-                "attempt_number": current_attempt_query.attempt_number,
-                "movement": current_attempt_query.movement_type or "Unknown Movement",
-                "lift_type": current_attempt_query.athlete_entry.lift_type
-                if current_attempt_query.athlete_entry
-                else "Unknown",
-            }
+    except Exception as e:
+        return jsonify(
+            {"success": False, "error": f"Failed to get competition state: {str(e)}"}
+        ), 500
 
-        # Get waiting attempts, prioritizing same movement type
-        waiting_attempts_query = (
-            db.session.query(Attempt)
-            .join(AthleteEntry)
-            .join(Athlete)
-            .filter(
-                Athlete.competition_id == competition_id, Attempt.status == "waiting"
-            )
-            .options(joinedload(Attempt.athlete), joinedload(Attempt.athlete_entry))
-            .order_by(Attempt.lifting_order.asc())
-            .all()
-        )
 
-        # Organize waiting attempts by movement type
-        current_movement = (
-            current_attempt_data["movement"] if current_attempt_data else None
+@display_bp.route("/api/competition/<int:competition_id>/rankings")
+def get_competition_rankings(competition_id):
+    """API endpoint to get current rankings for competition"""
+    try:
+        rankings = projection_cache.get(
+            "rankings", competition_id, build_competition_rankings
         )
-        same_movement_attempts = []
-        other_movement_attempts = []
-
-        for attempt in waiting_attempts_query:
-            attempt_data = {
-                "id": attempt.id,
-                "athlete": {
-                    "id": attempt.athlete.id,
-                    "name": f"{attempt.athlete.first_name} {attempt.athlete.last_name}".strip(),
-                    "team": attempt.athlete.team or "No Team",
-                },
-                "weight": attempt.requested_weight,
-                "attempt_number": attempt.attempt_number,
-                "movement": attempt.movement_type or "Unknown Movement",
-                "lift_type": attempt.athlete_entry.lift_type
-                if attempt.athlete_entry
-                else "Unknown",
-                "lifting_order": attempt.lifting_order or 0,
-            }
+        if rankings is None:
+            return jsonify({"success": False, "error": "Competition not found"}), 404
 
-            if current_movement and attempt.movement_type == current_movement:
-                same_movement_attempts.append(attempt_data)
-            else:
-                other_movement_attempts.append(attempt_data)
+        return jsonify({"success": True, "rankings": rankings})
+
+    except Exception as e:
+        return jsonify(
+            {"success": False, "error": f"Failed to get rankings: {str(e)}"}
+        ), 500
 
-        # Combine with priority: same movement first, then others
-        next_attempts = same_movement_attempts + other_movement_attempts
 
-        # Get total athlete count for this competition
-        athlete_count = Athlete.query.filter_by(
-            competition_id=competition_id, is_active=True
-        ).count()
+@display_bp.route("/api/wall")
+def get_display_wall():
+    """
+    Batched state for a wall of screens showing different competitions.
+
+    Accepts ``competition_ids`` as a comma-separated list (or repeated
+    parameter) and returns state, rankings and the shared timer state for all
+    of them in one response, so a multi-screen wall makes one request per tick.
+    """
+    raw_ids = request.args.getlist("competition_ids") or request.args.getlist(
+        "competition_id"
+    )
+    competition_ids = []
+    for raw in raw_ids:
+        for part in raw.split(","):
+            part = part.strip()
+            if not part:
+                continue
+            if not part.isdigit():
+                return jsonify(
+                    {"success": False, "error": f"Invalid competition id: {part}"}
+                ), 400
+            if int(part) not in competition_ids:
+                competition_ids.append(int(part))
+
+    if not competition_ids:
+        return jsonify({"success": False, "error": "competition_ids is required"}), 400
+    if len(competition_ids) > MAX_WALL_COMPETITIONS:
+        return jsonify(
+            {
+                "success": False,
+                "error": f"At most {MAX_WALL_COMPETITIONS} competitions per request",
+            }
+        ), 400
+
+    try:
+        try:
+            timer_state = load_timer_state(current_app.instance_path)
+        except Exception as exc:
+            current_app.logger.warning(f"Failed to load timer state for wall: {exc}")
+            timer_state = None
+
+        competitions = {}
+        missing = []
+        for competition_id in competition_ids:
+            state = projection_cache.get(
+                "state", competition_id, build_competition_state
+            )
+            if state is None:
+                missing.append(competition_id)
+                continue
+            rankings = projection_cache.get(
+                "rankings", competition_id, build_competition_rankings
+            )
+            competitions[str(competition_id)] = {
+                "state": state,
+                "rankings": rankings,
+                "version": list(change_feed.version(competition_id)),
+            }
 
         return jsonify(
             {
                 "success": True,
-                "current_attempt": current_attempt_data,
-                "next_attempts": next_attempts[:10],  # Limit to 10 for display
-                "waiting_attempts": next_attempts,  # All waiting attempts
-                "athlete_count": athlete_count,
-                "has_current_attempt": current_attempt_data is not None,
-                "waiting_count": len(next_attempts),
+                "competitions": competitions,
+                "missing": missing,
+                "timer_state": timer_state,
             }
         )
 
     except Exception as e:
         return jsonify(
-            {"success": False, "error": f"Failed to get competition state: {str(e)}"}
+            {"success": False, "error": f"Failed to get display wall: {str(e)}"}
         ), 500
 
 
-@display_bp.route("/api/competition/<int:competition_id>/rankings")
-def get_competition_rankings(competition_id):
-    """API endpoint to get current rankings for competition"""
-    from ..models import Score, AthleteEntry
+@display_bp.route("/api/competition/<int:competition_id>/fragments")
+def get_display_fragments(competition_id):
+    """
+    Server-rendered HTML fragments for display screens.
+
+    ``names`` selects fragments (comma-separated, default all) and ``have``
+    lists the versions the client already shows as ``name:version`` pairs.
+    Only fragments whose version differs are returned with their HTML;
+    ``versions`` always carries the current version of every requested one.
+    """
+    names = [
+        name.strip()
+        for name in request.args.get("names", ",".join(FRAGMENTS)).split(",")
+        if name.strip()
+    ]
+    unknown = [name for name in names if name not in FRAGMENTS]
+    if unknown:
+        return jsonify(
+            {"success": False, "error": f"Unknown fragment: {', '.join(unknown)}"}
+        ), 400
+
+    have = {}
+    for pair in request.args.get("have", "").split(","):
+        name, _, version = pair.partition(":")
+        if name and version:
+            have[name.strip()] = version.strip()
 
     try:
-        competition = Competition.query.get(competition_id)
+        competition = db.session.get(Competition, competition_id)
         if not competition:
             return jsonify({"success": False, "error": "Competition not found"}), 404
 
-        # Get rankings from Score table or calculate from attempts
-        rankings_query = (
-            db.session.query(Score)
-            .join(AthleteEntry)
-            .join(Athlete)
-            .filter(Athlete.competition_id == competition_id)
-            .options(joinedload(Score.athlete_entry).joinedload(AthleteEntry.athlete))
-            .order_by(Score.rank.asc(), Score.total_score.desc())
-            .all()
-        )
-
-        rankings_data = []
-        for i, score in enumerate(rankings_query):
-            rankings_data.append(
-                {
-                    "rank": score.rank or (i + 1),
-                    "athlete": {
-                        "id": score.athlete_entry.athlete.id,
-                        "name": f"{score.athlete_entry.athlete.first_name} {score.athlete_entry.athlete.last_name}".strip(),
-                        "team": score.athlete_entry.athlete.team or "No Team",
-                    },
-                    "total_score": score.total_score or 0,
-                    "best_attempt_weight": score.best_attempt_weight or 0,
-                }
-            )
-
-        # If no scores available, create basic ranking from athletes
-        if not rankings_data:
-            athletes = Athlete.query.filter_by(
-                competition_id=competition_id, is_active=True
-            ).all()
-            for i, athlete in enumerate(athletes[:10]):  # Limit to top 10
-                rankings_data.append(
-                    {
-                        "rank": i + 1,
-                        "athlete": {
-                            "id": athlete.id,
-                            "name": f"{athlete.first_name} {athlete.last_name}".strip(),
-                            "team": athlete.team or "No Team",
-                        },
-                        "total_score": 0,
-                        "best_attempt_weight": 0,
-                    }
-                )
+        fragments = {}
+        versions = {}
+        for name in names:
+            fragment = render_fragment(name, competition_id)
+            versions[name] = fragment["version"]
+            if have.get(name) != fragment["version"]:
+                fragments[name] = fragment
 
         return jsonify(
             {
                 "success": True,
-                "rankings": rankings_data[:10],  # Top 10 for display
+                "competition": {"id": competition.id, "name": competition.name},
+                "fragments": fragments,
+                "versions": versions,
             }
         )
 
     except Exception as e:
         return jsonify(
-            {"success": False, "error": f"Failed to get rankings: {str(e)}"}
+            {"success": False, "error": f"Failed to render fragments: {str(e)}"}
         ), 500
 
 
-@display_bp.route("/api/competition/<int:competition_id>/flights-data")
-def get_flights_data(competition_id):
-    """
-    API endpoint to get complete flights table data for public stage display.
-    Returns nested structure: competition > events > flights > athletes > attempts
-    """
-    try:
-        competition = Competition.query.get(competition_id)
-        if not competition:
-            return jsonify({"success": False, "error": "Competition not found"}), 404
+def _sse(event, data):
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
-        # Get all flights for this competition with their events
-        flights = (
-            Flight.query.filter_by(competition_id=competition_id)
-            .options(joinedload(Flight.event))
-            .order_by(Flight.id)
-            .all()
-        )
 
-        events_dict = {}
+@display_bp.route("/stream/<int:competition_id>")
+def stream_competition(competition_id):
+    """
+    Server-Sent Events feed for stage displays.
 
-        for flight in flights:
-            # Get all athlete entries in this flight
-            entries = (
-                AthleteEntry.query.filter_by(flight_id=flight.id)
-                .options(joinedload(AthleteEntry.athlete))
-                .order_by(AthleteEntry.id)
-                .all()
+    Sends a snapshot on connect, then only transitions: timer state changes,
+    current/next lifter changes and ranking deltas, all driven by the same
+    change feed as the Socket.IO rooms. An idle connection just blocks on its
+    queue and emits a keep-alive comment every STREAM_HEARTBEAT_SECONDS.
+    """
+    if db.session.get(Competition, competition_id) is None:
+        return jsonify({"success": False, "error": "Competition not found"}), 404
+
+    app = current_app._get_current_object()
+    instance_path = current_app.instance_path
+    heartbeat = STREAM_HEARTBEAT_SECONDS
+    db.session.remove()  # don't hold a connection for the life of the stream
+
+    def load_projections():
+        with app.app_context():
+            state = projection_cache.get(
+                "state", competition_id, build_competition_state
+            )
+            rankings = projection_cache.get(
+                "rankings", competition_id, build_competition_rankings
+            )
+            return current_lifter_summary(state), rankings
+
+    def load_timer():
+        try:
+            return load_timer_state(instance_path)
+        except Exception:
+            return None
+
+    def generate():
+        # Subscribe on the first read, so a client gone before then leaks nothing
+        subscriber = change_feed.subscribe(competition_id)
+        try:
+            lifter, rankings = load_projections()
+            yield "retry: 3000\n\n"
+            yield _sse(
+                "snapshot",
+                {
+                    "competition_id": competition_id,
+                    "lifter": lifter,
+                    "rankings": rankings,
+                    "timer_state": load_timer(),
+                    "version": list(change_feed.version(competition_id)),
+                },
             )
 
-            # Prefetch score data for these entries to avoid N+1 queries
-            entry_ids = [entry.id for entry in entries]
-            scores_by_entry = {}
-            if entry_ids:
-                scores = Score.query.filter(Score.athlete_entry_id.in_(entry_ids)).all()
-                scores_by_entry = {score.athlete_entry_id: score for score in scores}
-
-            # Get event name from the event relationship or fall back to movement_type
-            event_name = None
-            if flight.event_id and flight.event:
-                event_name = flight.event.name
-            elif flight.movement_type:
-                event_name = flight.movement_type
-            else:
-                event_name = f"Event {flight.id}"
-
-            # Group by event name to create events
-            event_key = event_name
-
-            if event_key not in events_dict:
-                events_dict[event_key] = {"name": event_name, "flights": []}
-
-            athletes_data = []
-            for entry in entries:
-                athlete = entry.athlete
-
-                # Get all attempts for this entry
-                attempts = (
-                    Attempt.query.filter_by(athlete_entry_id=entry.id)
-                    .order_by(Attempt.attempt_number)
-                    .all()
-                )
-
-                # Build attempts array
-                attempts_data = []
-                best_weight_attempt = 0
-                for attempt in attempts:
-                    # Convert AttemptResult enum to 'success'/'fail' string
-                    result_str = None
-                    if attempt.final_result:
-                        if attempt.final_result == AttemptResult.GOOD_LIFT:
-                            result_str = "success"
-                        elif attempt.final_result in [
-                            AttemptResult.NO_LIFT,
-                            AttemptResult.NOT_TO_DEPTH,
-                            AttemptResult.MISSED,
-                            AttemptResult.DNF,
-                        ]:
-                            result_str = "fail"
-
-                    attempt_info = {
-                        "number": attempt.attempt_number,
-                        "weight": attempt.requested_weight,
-                        "result": result_str,  # 'success', 'fail', or None
-                        "reps": None,
-                    }
+            while True:
+                try:
+                    event, data = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
 
-                    # Update best weight if successful
-                    if (
-                        result_str == "success"
-                        and attempt.requested_weight > best_weight_attempt
-                    ):
-                        best_weight_attempt = attempt.requested_weight
-
-                    attempts_data.append(attempt_info)
-
-                # Ensure we have 3 attempts (pad with null if needed)
-                while len(attempts_data) < 3:
-                    attempts_data.append(
-                        {
-                            "number": len(attempts_data) + 1,
-                            "weight": None,
-                            "result": None,
-                            "reps": None,
-                        }
-                    )
-
-                # Get reps from entry if available
-                reps_value = None
-                if entry.reps:
+                # Coalesce a burst of commits into a single rebuild
+                pending = [(event, data)]
+                while True:
                     try:
-                        reps_data = (
-                            json.loads(entry.reps)
-                            if isinstance(entry.reps, str)
-                            else entry.reps
-                        )
-                        reps_value = (
-                            reps_data.get("value")
-                            if isinstance(reps_data, dict)
-                            else reps_data
-                        )
-                    except:
-                        reps_value = entry.reps
-
-                # Determine category (gender + weight class approximation)
-                weight_class = ""
-                if athlete.bodyweight:
-                    # Simple weight class approximation
-                    if athlete.gender == "M":
-                        if athlete.bodyweight <= 61:
-                            weight_class = "61kg"
-                        elif athlete.bodyweight <= 67:
-                            weight_class = "67kg"
-                        elif athlete.bodyweight <= 73:
-                            weight_class = "73kg"
-                        elif athlete.bodyweight <= 81:
-                            weight_class = "81kg"
-                        elif athlete.bodyweight <= 89:
-                            weight_class = "89kg"
-                        elif athlete.bodyweight <= 96:
-                            weight_class = "96kg"
-                        elif athlete.bodyweight <= 102:
-                            weight_class = "102kg"
-                        else:
-                            weight_class = "102+kg"
-                    else:
-                        if athlete.bodyweight <= 49:
-                            weight_class = "49kg"
-                        elif athlete.bodyweight <= 55:
-                            weight_class = "55kg"
-                        elif athlete.bodyweight <= 59:
-                            weight_class = "59kg"
-                        elif athlete.bodyweight <= 64:
-                            weight_class = "64kg"
-                        elif athlete.bodyweight <= 71:
-                            weight_class = "71kg"
-                        elif athlete.bodyweight <= 76:
-                            weight_class = "76kg"
-                        elif athlete.bodyweight <= 81:
-                            weight_class = "81kg"
-                        else:
-                            weight_class = "81+kg"
-
-                category = (
-                    f"{athlete.gender}'s {weight_class}"
-                    if weight_class
-                    else athlete.gender
-                )
-
-                # Check if this athlete is currently lifting
-                is_current = False
-                if hasattr(competition, "current_athlete_entry_id"):
-                    is_current = entry.id == competition.current_athlete_entry_id
-
-                # Pull score model data for competition results
-                score_record = scores_by_entry.get(entry.id)
-                score_best = None
-                score_total = None
-                if score_record:
-                    if score_record.best_attempt_weight is not None:
-                        score_best = score_record.best_attempt_weight
-                    if score_record.total_score is not None:
-                        score_total = score_record.total_score
-
-                # Prefer score model values; fall back to attempt-derived data
-                final_best = (
-                    score_best
-                    if score_best is not None
-                    else (best_weight_attempt if best_weight_attempt > 0 else None)
-                )
-                final_total = (
-                    score_total
-                    if score_total is not None
-                    else (final_best if final_best is not None else 0)
-                )
-
-                athlete_info = {
-                    "id": athlete.id,
-                    "name": f"{athlete.first_name} {athlete.last_name}",
-                    "class": weight_class,
-                    "category": category,
-                    "gender": athlete.gender,
-                    "attempts": attempts_data,
-                    "best": final_best,
-                    "reps": reps_value,
-                    "total": final_total,
-                    "is_current": is_current,
-                }
-
-                athletes_data.append(athlete_info)
-
-            flight_info = {
-                "id": flight.id,
-                "name": flight.name,
-                "athletes": athletes_data,
-            }
-
-            events_dict[event_key]["flights"].append(flight_info)
+                        pending.append(subscriber.get_nowait())
+                    except queue.Empty:
+                        break
+
+                data_changed = False
+                for event, data in pending:
+                    if event == "data_changed":
+                        data_changed = True
+                    elif event in ("timer_state", "timer_update"):
+                        yield _sse("timer", data)
+                    elif event in STREAM_FORWARDED_EVENTS:
+                        yield _sse(event, data)
+
+                if data_changed:
+                    new_lifter, new_rankings = load_projections()
+                    if new_lifter != lifter:
+                        lifter = new_lifter
+                        yield _sse("current_lifter", lifter)
+                    delta = rankings_delta(rankings, new_rankings)
+                    if delta["changed"] or delta["removed"]:
+                        rankings = new_rankings
+                        yield _sse("rankings", delta)
+        finally:
+            change_feed.unsubscribe(competition_id, subscriber)
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
-        # Convert events dict to list
-        events_list = list(events_dict.values())
 
-        response = {
-            "success": True,
-            "competition": {"id": competition.id, "name": competition.name},
-            "events": events_list,
-        }
+@display_bp.route("/api/competition/<int:competition_id>/flights-data")
+def get_flights_data(competition_id):
+    """
+    API endpoint to get complete flights table data for public stage display.
+    Returns nested structure: competition > events > flights > athletes > attempts
+    """
+    try:
+        flights_data = projection_cache.get(
+            "flights", competition_id, build_flights_data
+        )
+        if flights_data is None:
+            return jsonify({"success": False, "error": "Competition not found"}), 404
 
-        return jsonify(response)
+        return jsonify({"success": True, **flights_data})
 
     except Exception as e:
         return jsonify(
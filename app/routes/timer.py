@@ -1,5 +1,32 @@
+import threading
+
 from flask import render_template, request, jsonify
 from .admin import admin_bp  # reuse the existing /admin blueprint
+from ..real_time.websocket import competition_realtime
+
+# Fields whose change counts as a timer transition worth pushing to displays
+TIMER_TRANSITION_FIELDS = (
+    "timer_running",
+    "timer_mode",
+    "athlete_id",
+    "attempt_number",
+    "flight_id",
+    "break_timer_running",
+    "break_timer_type",
+)
+
+# Last transition pushed per competition, so competitions don't mask each other
+_last_timer_transitions = {}
+_timer_transitions_lock = threading.Lock()
+
+
+def _is_new_transition(competition_id, transition) -> bool:
+    """Record the transition and report whether it differs from the last one"""
+    with _timer_transitions_lock:
+        if _last_timer_transitions.get(competition_id) == transition:
+            return False
+        _last_timer_transitions[competition_id] = transition
+        return True
 
 
 @admin_bp.route("/timer", endpoint="timer")
@@ -58,6 +85,8 @@ def timer_state():
             attempt_number = state_data.get("attempt_number")
             flight_id = state_data.get("flight_id")
 
+            competition_id = None
+
             # Try to find attempt even if flight_id is missing
             if athlete_id and attempt_number:
                 from app.models import Athlete, Attempt, Flight
@@ -98,6 +127,8 @@ def timer_state():
                             state_data["flight_id"] = (
                                 attempt.flight_id
                             )  # Add the correct flight_id
+                            if attempt.flight:
+                                competition_id = attempt.flight.competition_id
                         else:
                             state_data["attempt_id"] = None
                 except Exception as e:
@@ -108,6 +139,12 @@ def timer_state():
             state_file.parent.mkdir(parents=True, exist_ok=True)
             with open(state_file, "w") as f:
                 json.dump(state_data, f)
+
+            # Only push start/stop/athlete changes, not every clock tick
+            transition = tuple(state_data.get(k) for k in TIMER_TRANSITION_FIELDS)
+            if _is_new_transition(competition_id, transition):
+                competition_realtime.broadcast_timer_state(competition_id, state_data)
+
             return jsonify({"success": True})
         except Exception as e:
             return jsonify({"error": str(e)}), 500
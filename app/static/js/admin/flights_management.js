@@ -3,6 +3,7 @@ class FlightManager {
   constructor() {
     this.searchTimeout;
     this.currentEventId = null;
+    this.currentCompetitionId = null;
     this.currentFlightId = null;
     this.deleteFlightId = null;
     this.flightsSortable = null;
@@ -58,31 +59,15 @@ class FlightManager {
 
   initializeData() {
     try {
-      // Load data from SSR window object
+      // Load data from SSR window object: the selected competition only.
+      // Event flights and flight rosters are fetched when expanded.
       if (window.flightManagementData) {
         this.competitions = window.flightManagementData.competitions || [];
-        this.events = window.flightManagementData.events || [];
-        this.athletes = window.flightManagementData.athletes || [];
-        this.flights = window.flightManagementData.flights || [];
-        
-        // Populate allEvents array from loaded data
-        this.allEvents = [];
-        this.events.forEach(event => {
-          const competition = this.competitions.find(c => c.id === event.competition_id);
-          this.allEvents.push({
-            ...event,
-            competition_name: competition ? competition.name : 'Unknown Competition'
-          });
-        });
-        
-        console.log('Loaded data from SSR:', {
-          competitions: this.competitions.length,
-          events: this.events.length,
-          athletes: this.athletes.length,
-          flights: this.flights.length,
-          allEvents: this.allEvents.length
-        });
-        
+        this.currentCompetitionId = window.flightManagementData.competition_id;
+        this.setCompetitionData(
+          window.flightManagementData.events || [],
+          window.flightManagementData.flights || []
+        );
         this.renderFlights();
       } else {
         console.log('No SSR data found, loading from API...');
@@ -112,6 +97,28 @@ class FlightManager {
     window.location.reload();
   }
 
+  setCompetitionData(events, flights) {
+    this.events = events;
+    this.flights = flights;
+    this.allEvents = events.map(event => ({ ...event }));
+  }
+
+  async loadCompetition(competitionId) {
+    const response = await fetch(
+      `/admin/api/flights-management/${competitionId}`
+    );
+    if (!response.ok) throw new Error("Failed to load competition");
+    const data = await response.json();
+
+    this.currentCompetitionId = data.competition.id;
+    this.setCompetitionData(data.events, data.flights);
+
+    const url = new URL(window.location.href);
+    url.searchParams.set("competition_id", this.currentCompetitionId);
+    window.history.replaceState(null, "", url);
+    return data;
+  }
+
   renderFlights() {
     // Use the loaded flights data
     this.displayFlights(this.flights);
@@ -261,6 +268,9 @@ class FlightManager {
       option.textContent = competition.name;
       this.competitionSelect.appendChild(option);
     });
+    if (this.currentCompetitionId) {
+      this.competitionSelect.value = this.currentCompetitionId;
+    }
 
     // Populate modal competition select
     if (this.flightCompetitionSelect) {
@@ -275,17 +285,18 @@ class FlightManager {
   }
 
   populateEventDropdowns() {
-    // Populate main event select (all events)
+    // Populate main event select (events of the selected competition)
     this.eventSelect.innerHTML = '<option value="">Select Event</option>';
     this.events.forEach((event) => {
       const option = document.createElement("option");
       option.value = event.id;
-      option.textContent = `${event.name} (${event.competition_name})`;
+      option.textContent = event.name;
       this.eventSelect.appendChild(option);
     });
+    this.eventSelect.disabled = this.events.length === 0;
   }
 
-  handleModalCompetitionChange() {
+  async handleModalCompetitionChange() {
     const competitionId = parseInt(this.flightCompetitionSelect.value);
     
     // Reset event dropdown
@@ -293,15 +304,27 @@ class FlightManager {
     
     if (!competitionId) return;
 
-    // Find the selected competition and populate its events
-    const selectedCompetition = this.competitions.find(c => c.id === competitionId);
-    if (selectedCompetition && selectedCompetition.events) {
-      selectedCompetition.events.forEach((event) => {
+    const addOptions = (events) => {
+      events.forEach((event) => {
         const option = document.createElement("option");
         option.value = event.id;
         option.textContent = event.name;
         this.flightEventSelect.appendChild(option);
       });
+    };
+
+    // Events of the loaded competition are already here; others are fetched
+    if (competitionId === this.currentCompetitionId) {
+      addOptions(this.events);
+      return;
+    }
+    try {
+      const response = await fetch(`/admin/competitions/${competitionId}/events`);
+      if (!response.ok) throw new Error("Failed to load events");
+      addOptions(await response.json());
+    } catch (error) {
+      console.error("Error loading events:", error);
+      this.showNotification("Error loading events", "error");
     }
   }
   bindEvents() {
@@ -498,7 +521,8 @@ class FlightManager {
 
     // Reset event select
     this.eventSelect.innerHTML = '<option value="">Select Event</option>';
-    this.eventSelect.disabled = !competitionId;
+    this.eventSelect.disabled = true;
+    this.currentEventId = null;
 
     // Hide flights
     this.showEmptyState();
@@ -506,24 +530,15 @@ class FlightManager {
     if (!competitionId) return;
 
     try {
-      const response = await fetch(
-        `/admin/competitions/${competitionId}/events`
-      );
-      if (!response.ok) throw new Error("Failed to load events");
-
-      const events = await response.json();
-
-      events.forEach((event) => {
-        const option = document.createElement("option");
-        option.value = event.id;
-        option.textContent = event.name;
-        this.eventSelect.appendChild(option);
-      });
-
-      this.eventSelect.disabled = false;
+      this.showLoading(this.flightsContainer);
+      await this.loadCompetition(competitionId);
+      this.populateEventDropdowns();
+      this.showAllFlights();
     } catch (error) {
-      console.error("Error loading events:", error);
-      this.showNotification("Error loading events", "error");
+      console.error("Error loading competition:", error);
+      this.showNotification("Error loading competition", "error");
+    } finally {
+      this.hideLoading(this.flightsContainer);
     }
   }
   async handleEventChange() {
@@ -537,7 +552,7 @@ class FlightManager {
 
     this.loadFlights(eventId);
   }
-  loadFlights(eventId) {
+  async loadFlights(eventId) {
     try {
       if (!eventId) {
         this.showEmptyState("Please select an event to view flights");
@@ -546,8 +561,14 @@ class FlightManager {
 
       this.showLoading(this.flightsContainer);
 
-      // Filter local flights data by event
-      const flights = this.flights.filter(flight => flight.event_id == eventId);
+      // Fetch the event's flights with their athlete counts
+      const response = await fetch(`/admin/events/${eventId}/flights`);
+      if (!response.ok) throw new Error("Failed to load flights");
+      const flights = await response.json();
+      const fetchedIds = new Set(flights.map(flight => flight.id));
+      this.flights = this.flights
+        .filter(flight => !fetchedIds.has(flight.id))
+        .concat(flights);
 
       if (flights.length === 0) {
         this.showEmptyState("No flights found for this event");
@@ -577,7 +598,6 @@ class FlightManager {
         // Clear event selection since we're showing all flights
         this.currentEventId = null;
         this.eventSelect.value = "";
-        this.competitionSelect.value = "";
       }
     } catch (error) {
       console.error("Error loading all flights:", error);
@@ -1501,41 +1521,14 @@ class FlightManager {
     }
   }
 
-  // Function to refresh all data from server
+  // Function to refresh the selected competition from the server
   async refreshAllData() {
     try {
-      console.log('Refreshing all data from server...');
-      
-      // Load flights
-      const flightsResponse = await fetch('/admin/flights/all');
-      if (flightsResponse.ok) {
-        this.flights = await flightsResponse.json();
-      }
-      
-      // Load competitions  
-      const competitionsResponse = await fetch('/admin/competitions');
-      if (competitionsResponse.ok) {
-        this.competitions = await competitionsResponse.json();
-      }
-      
-      // Load events
-      const eventsResponse = await fetch('/admin/events');
-      if (eventsResponse.ok) {
-        this.events = await eventsResponse.json();
-      }
-      
-      // Load athletes
-      const athletesResponse = await fetch('/admin/athletes');
-      if (athletesResponse.ok) {
-        const athletesData = await athletesResponse.json();
-        this.athletes = athletesData.athletes || athletesData;
-      }
-      
+      if (!this.currentCompetitionId) return;
+      await this.loadCompetition(this.currentCompetitionId);
       this.renderFlights();
-      
-      console.log('All data refreshed successfully');
     } catch (error) {
-      console.error('Error refreshing all data:', error);
+      console.error('Error refreshing competition data:', error);
     }
   }
 
@@ -21,6 +21,7 @@
     let currentAttemptTimeRemaining = null; // Track time until next attempt
     let readyPollingIntervalId = null;
     const READY_POLL_INTERVAL_MS = 3000;
+    let athletePushActive = false; // Server pushes athlete_status over Socket.IO
     
     // NEW: Grace period and GET READY timeout
     let gracePeriodActive = false;
@@ -575,6 +576,9 @@
         stopReadyPolling();
         checkServerForUpdate();
         
+        // The athlete room pushes "you are up" - no need to keep polling
+        if (athletePushActive) return;
+        
         // Poll every 3 seconds - NO timeout
         readyPollingIntervalId = setInterval(async () => {
             try {
@@ -1167,6 +1171,49 @@
                     user_type: 'athlete'
                 });
             }
+            
+            // Personal room: queue position, ETA bucket and "you are up" pushes
+            socket.emit('join_athlete', {});
+        });
+
+        socket.on('athlete_status', (data) => {
+            console.log('[WebSocket] Athlete status:', data);
+            athletePushActive = true;
+            const infoEl = document.querySelector('.next-attempt-info');
+            
+            if (data.no_attempts) {
+                stopReadyPolling();
+                if (timerCountdownInterval) {
+                    clearInterval(timerCountdownInterval);
+                    timerCountdownInterval = null;
+                }
+                updateTimerDisplay(0, 'inactive', 'inactive');
+                if (infoEl) infoEl.innerHTML = '<p>No attempts left</p>';
+                return;
+            }
+            
+            currentAttemptInfo = {
+                event: data.event,
+                lift_type: data.lift_type,
+                order: data.order,
+                weight: data.weight
+            };
+            
+            if (data.you_are_up) {
+                stopReadyPolling();
+                handleYouAreUp(data, infoEl);
+                return;
+            }
+            
+            // Pushes only arrive when position or ETA bucket changed, so resync the countdown
+            timerHasExpired = false;
+            readyStateStartTime = null;
+            stopReadyPolling();
+            updateTimerInfoDisplay(infoEl, data);
+            startLocalCountdown(data.eta_seconds, 'estimate', currentAttemptInfo);
+            currentCountdownAttemptId = data.attempt_id;
+            lastTimerType = 'estimate';
+            lastServerTime = data.eta_seconds;
         });
 
         socket.on('timer_update', (data) => {
@@ -1228,6 +1275,7 @@
 
         socket.on('disconnect', (reason) => {
             console.warn('🔌 Socket disconnected:', reason);
+            athletePushActive = false;
             clearTimerStateForDisconnect();
             updateTimerDisplay(0, 'disconnected', 'disconnected');
             const infoEl = document.querySelector('.next-attempt-info');
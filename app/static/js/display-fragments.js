@@ -0,0 +1,60 @@
+/**
+ * Display fragment swapper
+ * Fetches server-rendered HTML fragments and replaces only the ones whose
+ * version changed since the last refresh.
+ */
+
+class DisplayFragments {
+    /**
+     * @param {number} competitionId
+     * @param {Object<string, HTMLElement>} targets - fragment name -> container
+     * @param {{onSwap?: function(string[], object): void}} options
+     */
+    constructor(competitionId, targets, { onSwap = null } = {}) {
+        this.competitionId = competitionId;
+        this.targets = targets;
+        this.onSwap = onSwap;
+        this.versions = {};
+    }
+
+    async refresh() {
+        const names = Object.keys(this.targets).filter(name => this.targets[name]);
+        const params = new URLSearchParams({ names: names.join(',') });
+        const have = names
+            .filter(name => this.versions[name])
+            .map(name => `${name}:${this.versions[name]}`)
+            .join(',');
+        if (have) {
+            params.set('have', have);
+        }
+
+        const response = await fetch(
+            `/display/api/competition/${this.competitionId}/fragments?${params}`,
+            { cache: 'no-store' }
+        );
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
+
+        const data = await response.json();
+        if (!data.success) {
+            throw new Error(data.error || 'Failed to fetch fragments');
+        }
+
+        const swapped = [];
+        Object.entries(data.fragments || {}).forEach(([name, fragment]) => {
+            const target = this.targets[name];
+            if (!target) return;
+            target.innerHTML = fragment.html;
+            this.versions[name] = fragment.version;
+            swapped.push(name);
+        });
+
+        if (swapped.length > 0 && this.onSwap) {
+            this.onSwap(swapped, data);
+        }
+        return data;
+    }
+}
+
+window.DisplayFragments = DisplayFragments;
@@ -5,7 +5,7 @@
 
 // Global state
 let competitionId = null;
-let allEventsData = [];
+let stageFragments = null;
 let updateInterval = null;
 const UPDATE_INTERVAL_MS = 1000;
 let timerSynchronizer = null;
@@ -307,6 +307,17 @@ document.addEventListener('DOMContentLoaded', function() {
     
     timerSynchronizer.start();
 
+    // Event header clicks toggle collapse (headers are re-rendered by the server)
+    const flightsContainer = document.getElementById('flightsContainer');
+    if (flightsContainer) {
+        flightsContainer.addEventListener('click', (event) => {
+            const header = event.target.closest('th.event-header-group[data-event-index]');
+            if (header) {
+                toggleEventCollapse(parseInt(header.dataset.eventIndex));
+            }
+        });
+    }
+
     // Initial fetch
     fetchAndDisplayData();
 
@@ -382,29 +393,19 @@ function handleCompetitionChange(event) {
 }
 
 /**
- * Fetch competition data
+ * Fetch competition data as server-rendered fragments; unchanged ones are skipped
  */
 async function fetchAndDisplayData() {
     try {
-        const response = await fetch(`/display/api/competition/${competitionId}/flights-data`);
-
-        if (!response.ok) {
-            throw new Error(`HTTP error! status: ${response.status}`);
-        }
-
-        const data = await response.json();
-
-        if (!data.success) {
-            throw new Error(data.error || 'Failed to fetch data');
+        if (!stageFragments) {
+            stageFragments = new DisplayFragments(competitionId, {
+                flights_table: document.getElementById('flightsContainer'),
+                event_tabs: document.getElementById('eventTabs')
+            }, { onSwap: handleFragmentsSwapped });
         }
 
-        // Store events data
-        allEventsData = data.events || [];
-
-        // Update UI
+        const data = await stageFragments.refresh();
         updateCompetitionTitle(data.competition);
-        renderEventTabs();
-        renderMainTable();
 
         // Update status bar
         await updateStatusBar();
@@ -416,366 +417,49 @@ async function fetchAndDisplayData() {
 }
 
 /**
- * Update competition title
- */
-function updateCompetitionTitle(competition) {
-    const titleElement = document.getElementById('competitionTitle');
-    if (titleElement && competition) {
-        titleElement.textContent = competition.name || 'Small Goods Throwdown';
-    }
-}
-
-/**
- * Render event tabs
- */
-function renderEventTabs() {
-    const tabsContainer = document.getElementById('eventTabs');
-    if (!tabsContainer) return;
-
-    tabsContainer.innerHTML = '';
-
-    if (allEventsData.length === 0) {
-        return;
-    }
-
-    allEventsData.forEach((event, index) => {
-        const tab = document.createElement('button');
-        tab.className = 'event-tab';
-        tab.textContent = event.name || `Event ${index + 1}`;
-        tab.dataset.eventIndex = index;
-
-        // All tabs active by default (showing all events)
-        tab.classList.add('active');
-
-        tabsContainer.appendChild(tab);
-    });
-}
-
-/**
- * Render main table - 3 independent Flight cards with horizontal scrolling
+ * Re-apply client-side state after fresh fragments are swapped in
  */
-function renderMainTable() {
-    const flightsContainer = document.getElementById('flightsContainer');
-    if (!flightsContainer) return;
-
-    // Clear existing content
-    flightsContainer.innerHTML = '';
-
-    if (allEventsData.length === 0) {
-        flightsContainer.innerHTML = '<div class="empty-state">No events available</div>';
-        return;
-    }
-
-    // Build flight map: collect all athletes by flight across all events
-    const flightMap = new Map();
-
-    allEventsData.forEach(event => {
-        event.flights.forEach(flight => {
-            if (!flightMap.has(flight.id)) {
-                flightMap.set(flight.id, {
-                    name: flight.name,
-                    athletes: []
-                });
-            }
-
-            // Add athletes with event data
-            flight.athletes.forEach(athlete => {
-                // Store gender in map
-                if (athlete.gender) {
-                    athleteGenderMap.set(athlete.id, athlete.gender);
-                    athleteGenderMap.set(athlete.name, athlete.gender); // Also map by name
-                }
-
-                const existing = flightMap.get(flight.id).athletes.find(a => a.id === athlete.id);
-                if (existing) {
-                    // Add event data to existing athlete
-                    existing.eventData = existing.eventData || {};
-                    existing.eventData[event.name || event.id] = {
-                        attempts: athlete.attempts,
-                        best: athlete.best
-                    };
-                    if (athlete.total !== null && athlete.total !== undefined) {
-                        const normalizedTotal = Number(athlete.total);
-                        if (!Number.isNaN(normalizedTotal)) {
-                            const previousTotal = Number(existing.total);
-                            const safePreviousTotal = Number.isFinite(previousTotal) ? previousTotal : 0;
-                            existing.total = safePreviousTotal + normalizedTotal;
-                        }
-                    }
-                } else {
-                    // New athlete
-                    let initialTotal = 0;
-                    if (athlete.total !== null && athlete.total !== undefined) {
-                        const normalizedTotal = Number(athlete.total);
-                        if (!Number.isNaN(normalizedTotal) && Number.isFinite(normalizedTotal)) {
-                            initialTotal = normalizedTotal;
-                        }
-                    }
-                    const newAthlete = {
-                        id: athlete.id,
-                        name: athlete.name,
-                        class: athlete.class,
-                        gender: athlete.gender,
-                        is_current: athlete.is_current,
-                        total: initialTotal,
-                        eventData: {}
-                    };
-                    newAthlete.eventData[event.name || event.id] = {
-                        attempts: athlete.attempts,
-                        best: athlete.best
-                    };
-                    flightMap.get(flight.id).athletes.push(newAthlete);
-                }
-            });
-        });
-    });
-
-    // Render each flight as a separate card
-    flightMap.forEach((flightData, flightId) => {
-        const flightCard = createFlightCard(flightData);
-        flightsContainer.appendChild(flightCard);
-    });
-
-    // If no flights
-    if (flightMap.size === 0) {
-        flightsContainer.innerHTML = '<div class="empty-state">No flights available</div>';
-    }
-}
-
-/**
- * Create a Flight card with horizontally scrolling table
- */
-function createFlightCard(flightData) {
-    // Flight card container
-    const card = document.createElement('div');
-    card.className = 'flight-card';
-
-    // Flight header
-    const header = document.createElement('div');
-    header.className = 'flight-header';
-    const title = document.createElement('h2');
-    title.className = 'flight-title';
-    title.textContent = flightData.name;
-    header.appendChild(title);
-    card.appendChild(header);
-
-    // Table wrapper (horizontal scroll container)
-    const wrapper = document.createElement('div');
-    wrapper.className = 'flight-table-wrapper';
-
-    // Table
-    const table = document.createElement('table');
-    table.className = 'flight-table';
-
-    // Table header
-    const thead = document.createElement('thead');
-
-    // Header row 1: Group headers (Athletes | Events... | Comp Results)
-    const headerRow1 = document.createElement('tr');
-    const athletesGroup = createHeaderCell('Athletes', 'event-header-group');
-    athletesGroup.colSpan = 2; // Name + Class
-    headerRow1.appendChild(athletesGroup);
-
-    allEventsData.forEach((event, index) => {
-        const eventHeader = document.createElement('th');
-        eventHeader.className = 'event-header-group';
-        eventHeader.colSpan = 4; // Att.1, Att.2, Att.3, Best
-        eventHeader.dataset.eventIndex = index;
-
-        // Create wrapper for text and icon
-        const headerContent = document.createElement('div');
-        headerContent.className = 'event-header-content';
-
-        const headerText = document.createElement('span');
-        headerText.textContent = event.name || 'Event';
-
-        const collapseIcon = document.createElement('span');
-        collapseIcon.className = collapsedEvents.has(index) ? 'collapse-icon collapsed' : 'collapse-icon';
-        collapseIcon.innerHTML = '&#9658;'; // Right arrow ►
-
-        headerContent.appendChild(headerText);
-        headerContent.appendChild(collapseIcon);
-        eventHeader.appendChild(headerContent);
-
-        // Add click handler
-        eventHeader.style.cursor = 'pointer';
-        eventHeader.addEventListener('click', () => toggleEventCollapse(index));
-
-        headerRow1.appendChild(eventHeader);
-    });
-
-    const compResultsGroup = createHeaderCell('Comp Results', 'event-header-group');
-    compResultsGroup.colSpan = 1; // Total
-    headerRow1.appendChild(compResultsGroup);
-    thead.appendChild(headerRow1);
-
-    // Header row 2: Att. 1-3, Best sub-headers
-    const headerRow2 = document.createElement('tr');
-    headerRow2.appendChild(createHeaderCell('', 'col-name'));
-    headerRow2.appendChild(createHeaderCell('', 'col-class'));
-
-    allEventsData.forEach((event, index) => {
-        const att1 = createHeaderCell('Att. 1', 'col-att');
-        const att2 = createHeaderCell('Att. 2', 'col-att');
-        const att3 = createHeaderCell('Att. 3', 'col-att');
-        const best = createHeaderCell('Best', 'col-best');
-
-        att1.dataset.eventIndex = index;
-        att2.dataset.eventIndex = index;
-        att3.dataset.eventIndex = index;
-        best.dataset.eventIndex = index;
-
-        if (collapsedEvents.has(index)) {
-            att1.classList.add('event-collapsed');
-            att2.classList.add('event-collapsed');
-            att3.classList.add('event-collapsed');
-            best.classList.add('event-collapsed');
+function handleFragmentsSwapped(names) {
+    if (!names.includes('flights_table')) return;
+
+    athleteGenderMap.clear();
+    document.querySelectorAll('#flightsContainer .athlete-row').forEach(row => {
+        const gender = row.dataset.gender;
+        if (gender) {
+            athleteGenderMap.set(parseInt(row.dataset.athleteId), gender);
+            athleteGenderMap.set(row.dataset.athleteName, gender); // Also map by name
         }
-
-        headerRow2.appendChild(att1);
-        headerRow2.appendChild(att2);
-        headerRow2.appendChild(att3);
-        headerRow2.appendChild(best);
     });
 
-    headerRow2.appendChild(createHeaderCell('', 'col-total'));
-    thead.appendChild(headerRow2);
-
-    table.appendChild(thead);
-
-    // Table body
-    const tbody = document.createElement('tbody');
-
-    if (flightData.athletes && flightData.athletes.length > 0) {
-        flightData.athletes.forEach(athlete => {
-            const row = createAthleteRow(athlete);
-            tbody.appendChild(row);
-        });
-    } else {
-        // Show empty state message
-        const emptyRow = document.createElement('tr');
-        const emptyCell = document.createElement('td');
-        emptyCell.colSpan = 2 + (allEventsData.length * 4) + 1; // All columns
-        emptyCell.className = 'empty-state';
-        emptyCell.textContent = 'No athletes in this flight';
-        emptyRow.appendChild(emptyCell);
-        tbody.appendChild(emptyRow);
-    }
-
-    table.appendChild(tbody);
-
-    wrapper.appendChild(table);
-    card.appendChild(wrapper);
-
-    return card;
+    applyCollapsedEvents();
 }
 
 /**
- * Create header cell
+ * Update competition title
  */
-function createHeaderCell(text, className) {
-    const th = document.createElement('th');
-    th.textContent = text;
-    if (className) {
-        th.className = className;
+function updateCompetitionTitle(competition) {
+    const titleElement = document.getElementById('competitionTitle');
+    if (titleElement && competition) {
+        titleElement.textContent = competition.name || 'Small Goods Throwdown';
     }
-    return th;
 }
 
 /**
- * Create athlete row
+ * Mark the columns of collapsed events
  */
-function createAthleteRow(athlete) {
-    const row = document.createElement('tr');
-    row.className = 'athlete-row';
-    row.dataset.athleteId = athlete.id;
-
-    if (athlete.is_current) {
-        row.classList.add('current');
-    }
-
-    // Sticky left columns
-    const nameCell = document.createElement('td');
-    nameCell.className = 'col-name';
-    nameCell.textContent = athlete.name || 'Unknown';
-    row.appendChild(nameCell);
-
-    const classCell = document.createElement('td');
-    classCell.className = 'col-class';
-    classCell.textContent = athlete.class || '-';
-    row.appendChild(classCell);
-
-    // Event columns (scrollable middle section)
-    allEventsData.forEach((event, index) => {
-        const eventName = event.name || event.id;
-        const eventData = athlete.eventData[eventName];
-
-        if (eventData && eventData.attempts) {
-            // Att 1, 2, 3
-            for (let i = 0; i < 3; i++) {
-                const attCell = document.createElement('td');
-                attCell.className = 'col-att';
-                attCell.dataset.eventIndex = index;
-
-                const attempt = eventData.attempts[i];
-                if (attempt && attempt.weight !== null) {
-                    attCell.textContent = attempt.weight;
-
-                    if (attempt.result === 'success') {
-                        attCell.classList.add('attempt-success');
-                    } else if (attempt.result === 'fail') {
-                        attCell.classList.add('attempt-fail');
-                    } else {
-                        attCell.classList.add('attempt-pending');
-                    }
-                } else {
-                    attCell.textContent = '-';
-                    attCell.classList.add('attempt-pending');
-                }
-
-                if (collapsedEvents.has(index)) {
-                    attCell.classList.add('event-collapsed');
-                }
-
-                row.appendChild(attCell);
-            }
-
-            // Best
-            const bestCell = document.createElement('td');
-            bestCell.className = 'col-best';
-            bestCell.dataset.eventIndex = index;
-            bestCell.textContent = eventData.best !== null && eventData.best !== undefined ? eventData.best : '-';
-
-            if (collapsedEvents.has(index)) {
-                bestCell.classList.add('event-collapsed');
-            }
+function applyCollapsedEvents() {
+    const flightsContainer = document.getElementById('flightsContainer');
+    if (!flightsContainer) return;
 
-            row.appendChild(bestCell);
+    flightsContainer.querySelectorAll('[data-event-index]').forEach(cell => {
+        const collapsed = collapsedEvents.has(parseInt(cell.dataset.eventIndex));
+        if (cell.classList.contains('event-header-group')) {
+            const icon = cell.querySelector('.collapse-icon');
+            if (icon) icon.classList.toggle('collapsed', collapsed);
         } else {
-            // Empty cells for this event
-            for (let i = 0; i < 4; i++) {
-                const emptyCell = document.createElement('td');
-                emptyCell.className = i < 3 ? 'col-att' : 'col-best';
-                emptyCell.dataset.eventIndex = index;
-                emptyCell.textContent = '-';
-                emptyCell.classList.add('attempt-pending');
-
-                if (collapsedEvents.has(index)) {
-                    emptyCell.classList.add('event-collapsed');
-                }
-
-                row.appendChild(emptyCell);
-            }
+            cell.classList.toggle('event-collapsed', collapsed);
         }
     });
-
-    // Sticky right column - Total
-    const totalCell = document.createElement('td');
-    totalCell.className = 'col-total';
-    totalCell.textContent = athlete.total !== null && athlete.total !== undefined ? athlete.total : '0';
-    row.appendChild(totalCell);
-
-    return row;
 }
 
 /**
@@ -896,8 +580,7 @@ function toggleEventCollapse(eventIndex) {
         collapsedEvents.add(eventIndex);
     }
 
-    // Re-render the table
-    renderMainTable();
+    applyCollapsedEvents();
 }
 
 /**
@@ -237,6 +237,10 @@ class RefereePanel {
             // Fetch and apply referee configuration
             await this.loadRefereeConfig(competitionId);
             
+            // Follow live votes for this competition
+            this.joinDecisionRoom();
+            this.loadRefereeDecisions();
+            
             this.showNotification(`Loaded: ${this.currentCompetition.name}`, 'success');
         } catch (error) {
             console.error('Error loading competition:', error);
@@ -579,18 +583,64 @@ class RefereePanel {
             this.updateLocalTimerDisplay();
         }, 100);
         
-        // Poll for referee decisions every 2 seconds
-        this.pollRefereeDecisions();
-        this.decisionsInterval = setInterval(() => {
-            this.pollRefereeDecisions();
-        }, 2000);
+        // Referee votes and results are pushed over Socket.IO; the current
+        // board is fetched once whenever the competition changes
+        this.setupDecisionSocket();
+        this.loadRefereeDecisions();
         
         // Fetch immediately on init
         this.fetchTimerState();
     }
     
-    async pollRefereeDecisions() {
-        // Poll for referee decisions from other referees
+    setupDecisionSocket() {
+        if (typeof io === 'undefined' || this.decisionSocket) return;
+        
+        this.decisionRoomId = null;
+        this.decisionSocket = io();
+        this.decisionSocket.on('connect', () => {
+            this.decisionRoomId = null;
+            this.joinDecisionRoom();
+        });
+        this.decisionSocket.on('referee_vote', (data) => {
+            if (data.competition_id == this.currentCompetition?.id) {
+                this.showRefereeVote(data.referee_id, data);
+            }
+        });
+        this.decisionSocket.on('decision_result', (data) => {
+            if (data.competition_id == this.currentCompetition?.id) {
+                this.showDecisionResult(data);
+            }
+        });
+    }
+    
+    joinDecisionRoom() {
+        const competitionId = this.currentCompetition?.id;
+        if (!this.decisionSocket?.connected || !competitionId || this.decisionRoomId === competitionId) return;
+        
+        if (this.decisionRoomId) {
+            this.decisionSocket.emit('leave_competition', { competition_id: this.decisionRoomId });
+        }
+        this.decisionSocket.emit('join_competition', { competition_id: competitionId, user_type: 'referee' });
+        this.decisionRoomId = competitionId;
+    }
+    
+    showRefereeVote(refereeId, decisionData) {
+        const voteDisplay = document.getElementById(`referee-${refereeId}-vote`);
+        if (voteDisplay) {
+            voteDisplay.textContent = decisionData.decision_label || decisionData.decision_value;
+            voteDisplay.className = 'vote-result voted';
+        }
+    }
+    
+    showDecisionResult(result) {
+        const finalResult = document.getElementById('final-result');
+        if (finalResult) {
+            finalResult.textContent = result.label;
+        }
+    }
+    
+    async loadRefereeDecisions() {
+        // Current votes for the competition; later votes arrive over the socket
         if (!this.currentCompetition?.id) return;
         
         try {
@@ -599,17 +649,15 @@ class RefereePanel {
             
             const data = await response.json();
             if (data.success && data.decisions) {
-                // Update vote displays
                 Object.entries(data.decisions).forEach(([refereeId, decisionData]) => {
-                    const voteDisplay = document.getElementById(`referee-${refereeId}-vote`);
-                    if (voteDisplay) {
-                        voteDisplay.textContent = decisionData.decision_label || decisionData.decision_value;
-                        voteDisplay.className = 'vote-result voted';
-                    }
+                    this.showRefereeVote(refereeId, decisionData);
                 });
+                if (data.result) {
+                    this.showDecisionResult(data.result);
+                }
             }
         } catch (error) {
-            console.warn('Failed to poll referee decisions:', error);
+            console.warn('Failed to load referee decisions:', error);
         }
     }
 
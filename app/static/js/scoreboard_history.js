@@ -5,10 +5,11 @@
 
 let allScores = [];
 let competitions = [];
-let events = [];
+let filterOptions = { events: [], flights: [] };
+let nextCursor = null;
 
 /**
- * Load initial data (competitions and scores)
+ * Load initial data (competitions, filter options and the first page of scores)
  */
 async function loadData() {
     try {
@@ -24,12 +25,14 @@ async function loadData() {
             compSelect.appendChild(option);
         });
         
+        // Load events and flights for the filter dropdowns
+        const filtersResponse = await fetch('/admin/api/scores/filters');
+        filterOptions = await filtersResponse.json();
+        updateEventFilter();
+        updateFlightFilter();
+        
         // Load scores
         await loadScores();
-        
-        // Populate events and flights from loaded scores
-        populateEventFilter();
-        populateFlightFilter();
     } catch (error) {
         console.error('Error loading data:', error);
         document.getElementById('loading').textContent = 'Error loading data. Please refresh the page.';
@@ -37,28 +40,15 @@ async function loadData() {
 }
 
 /**
- * Populate event filter dropdown based on available scores
+ * Fill a filter dropdown with the given {id, name} options
  */
-function populateEventFilter() {
-    const eventSelect = document.getElementById('event-filter');
-    
-    // Extract unique events from scores
-    const uniqueEvents = new Map();
-    allScores.forEach(score => {
-        if (score.event_id && score.event_name) {
-            uniqueEvents.set(score.event_id, score.event_name);
-        }
-    });
-    
-    // Clear existing options except "All Events"
-    eventSelect.innerHTML = '<option value="">All Events</option>';
-    
-    // Add event options
-    uniqueEvents.forEach((name, id) => {
+function fillSelect(select, placeholder, options) {
+    select.innerHTML = `<option value="">${placeholder}</option>`;
+    options.forEach(item => {
         const option = document.createElement('option');
-        option.value = id;
-        option.textContent = name;
-        eventSelect.appendChild(option);
+        option.value = item.id;
+        option.textContent = item.name;
+        select.appendChild(option);
     });
 }
 
@@ -69,107 +59,71 @@ function updateEventFilter() {
     const compId = document.getElementById('competition-filter').value;
     const eventSelect = document.getElementById('event-filter');
     
-    if (!compId) {
-        // Show all events
-        populateEventFilter();
-        return;
-    }
-    
-    // Filter events by selected competition
-    const uniqueEvents = new Map();
-    allScores.forEach(score => {
-        if (score.competition_id == compId && score.event_id && score.event_name) {
-            uniqueEvents.set(score.event_id, score.event_name);
-        }
-    });
-    
-    // Clear and repopulate event dropdown
-    eventSelect.innerHTML = '<option value="">All Events</option>';
-    uniqueEvents.forEach((name, id) => {
-        const option = document.createElement('option');
-        option.value = id;
-        option.textContent = name;
-        eventSelect.appendChild(option);
-    });
+    const events = filterOptions.events.filter(event => !compId || event.competition_id == compId);
+    fillSelect(eventSelect, 'All Events', events);
     
     // Reset event selection
     eventSelect.value = '';
 }
 
 /**
- * Populate flight filter with all unique flights from scores
+ * Update flight filter based on selected competition and event
  */
-function populateFlightFilter() {
+function updateFlightFilter() {
+    const compId = document.getElementById('competition-filter').value;
+    const eventId = document.getElementById('event-filter').value;
     const flightSelect = document.getElementById('flight-filter');
     
-    // Extract unique flights
-    const uniqueFlights = new Map();
-    allScores.forEach(score => {
-        if (score.flight_id && score.flight_name) {
-            uniqueFlights.set(score.flight_id, score.flight_name);
-        }
-    });
+    const flights = filterOptions.flights.filter(flight =>
+        (!compId || flight.competition_id == compId) && (!eventId || flight.event_id == eventId)
+    );
+    fillSelect(flightSelect, 'All Flights', flights);
     
-    // Clear and populate flight dropdown
-    flightSelect.innerHTML = '<option value="">All Flights</option>';
-    uniqueFlights.forEach((name, id) => {
-        const option = document.createElement('option');
-        option.value = id;
-        option.textContent = name;
-        flightSelect.appendChild(option);
-    });
+    // Reset flight selection
+    flightSelect.value = '';
 }
 
 /**
- * Update flight filter based on selected competition and event
+ * Current filter values as query string parameters
  */
-function updateFlightFilter() {
-    const compSelect = document.getElementById('competition-filter');
-    const eventSelect = document.getElementById('event-filter');
-    const flightSelect = document.getElementById('flight-filter');
-    
-    const compId = compSelect.value;
-    const eventId = eventSelect.value;
-    
-    if (!compId && !eventId) {
-        // Show all flights
-        populateFlightFilter();
-        return;
-    }
-    
-    // Filter flights by selected competition and/or event
-    const uniqueFlights = new Map();
-    allScores.forEach(score => {
-        const matchesComp = !compId || score.competition_id == compId;
-        const matchesEvent = !eventId || score.event_id == eventId;
-        
-        if (matchesComp && matchesEvent && score.flight_id && score.flight_name) {
-            uniqueFlights.set(score.flight_id, score.flight_name);
+function filterParams() {
+    const params = new URLSearchParams();
+    const filters = {
+        competition_id: document.getElementById('competition-filter').value,
+        event_id: document.getElementById('event-filter').value,
+        flight_id: document.getElementById('flight-filter').value,
+        status: document.getElementById('status-filter').value
+    };
+    Object.entries(filters).forEach(([key, value]) => {
+        if (value) {
+            params.set(key, value);
         }
     });
-    
-    // Clear and repopulate flight dropdown
-    flightSelect.innerHTML = '<option value="">All Flights</option>';
-    uniqueFlights.forEach((name, id) => {
-        const option = document.createElement('option');
-        option.value = id;
-        option.textContent = name;
-        flightSelect.appendChild(option);
-    });
-    
-    // Reset flight selection
-    flightSelect.value = '';
+    return params;
 }
 
 /**
- * Load all scores from the API
+ * Load scores matching the current filters. The server pages results;
+ * with append set, the next page is added to the ones already shown.
  */
-async function loadScores() {
+async function loadScores(append = false) {
     try {
-        const response = await fetch('/admin/api/scores');
-        allScores = await response.json();
+        const params = filterParams();
+        if (append && nextCursor) {
+            params.set('cursor', nextCursor);
+        }
+        
+        const response = await fetch(`/admin/api/scores?${params}`);
+        const page = await response.json();
+        if (!response.ok) {
+            throw new Error(page.error || 'Failed to load scores');
+        }
+        
+        allScores = append ? allScores.concat(page.scores) : page.scores;
+        nextCursor = page.next_cursor;
         
         document.getElementById('loading').style.display = 'none';
+        document.getElementById('load-more').style.display = page.has_more ? 'inline-block' : 'none';
         
         if (allScores.length === 0) {
             document.getElementById('no-data').style.display = 'block';
@@ -185,6 +139,13 @@ async function loadScores() {
     }
 }
 
+/**
+ * Load the next page of scores
+ */
+function loadMoreScores() {
+    return loadScores(true);
+}
+
 /**
  * Display scores in the table
  * @param {Array} scores - Array of score objects to display
@@ -223,35 +184,11 @@ function displayScores(scores) {
 }
 
 /**
- * Apply filters to the scores display
+ * Apply filters to the scores display (filtering happens on the server)
  */
 function applyFilters() {
-    const compId = document.getElementById('competition-filter').value;
-    const eventId = document.getElementById('event-filter').value;
-    const flightId = document.getElementById('flight-filter').value;
-    const status = document.getElementById('status-filter').value;
-    
-    let filtered = allScores;
-    
-    if (compId) {
-        filtered = filtered.filter(s => s.competition_id == compId);
-    }
-    
-    if (eventId) {
-        filtered = filtered.filter(s => s.event_id == eventId);
-    }
-    
-    if (flightId) {
-        filtered = filtered.filter(s => s.flight_id == flightId);
-    }
-    
-    if (status === 'final') {
-        filtered = filtered.filter(s => s.is_final);
-    } else if (status === 'provisional') {
-        filtered = filtered.filter(s => !s.is_final);
-    }
-    
-    displayScores(filtered);
+    nextCursor = null;
+    return loadScores();
 }
 
 /**
@@ -343,12 +280,9 @@ async function deleteScore(scoreId) {
  * Export scores to CSV
  */
 function exportScores() {
-    const compId = document.getElementById('competition-filter').value;
-    let url = '/admin/api/scores/export';
-    if (compId) {
-        url += `?competition_id=${compId}`;
-    }
-    window.open(url, '_blank');
+    const params = filterParams();
+    const query = params.toString();
+    window.open(`/admin/api/scores/export${query ? `?${query}` : ''}`, '_blank');
 }
 
 /**
@@ -214,9 +214,9 @@ class WebSocketClient {
     }
 
     /**
-     * Send referee decision
+     * Send referee decision; onAck receives the server's {success, message, ...}
      */
-    submitRefereeDecision(refereeId, decision, attemptId) {
+    submitRefereeDecision(refereeId, decision, attemptId, onAck) {
         if (!this.isValidConnection()) return false;
 
         this.socket.emit('referee_decision', {
@@ -225,6 +225,8 @@ class WebSocketClient {
             decision: decision,
             attempt_id: attemptId,
             timestamp: Date.now()
+        }, (result) => {
+            if (onAck) onAck(result);
         });
         return true;
     }
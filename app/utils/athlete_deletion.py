@@ -0,0 +1,181 @@
+"""
+Set-based deletion of athletes and the rows that hang off them.
+
+Deleting a roster used to load and delete every attempt, entry and flight
+membership one ORM object at a time. Here each dependent table gets one
+DELETE (or UPDATE, for rows that only point at an athlete) covering all
+the athletes, issued in dependency order inside a single transaction.
+"""
+
+import logging
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, Set, Tuple
+
+from sqlalchemy import delete, or_, update
+
+from ..extensions import db
+from ..models import (
+    Athlete,
+    AthleteEntry,
+    AthleteFlight,
+    Attempt,
+    CoachAssignment,
+    Flight,
+    RefereeDecision,
+    RefereeDecisionAudit,
+    Score,
+    Timer,
+    User,
+)
+from ..real_time.change_feed import mark_changed
+from ..real_time.decision_board import decision_board
+from .lifting_order import mark_order_stale
+
+logger = logging.getLogger(__name__)
+
+_NO_SYNC = {"synchronize_session": False}
+
+
+@dataclass
+class AthleteDeletion:
+    """Rows removed (or unlinked) by delete_athletes"""
+
+    athletes: int = 0
+    users: int = 0
+    attempts: int = 0
+    referee_decisions: int = 0
+    scores: int = 0
+    coach_assignments: int = 0
+    entries: int = 0
+    flight_memberships: int = 0
+    timers_cleared: int = 0
+    audits_unlinked: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _delete(model, *criteria) -> int:
+    return db.session.execute(
+        delete(model).where(*criteria), execution_options=_NO_SYNC
+    ).rowcount
+
+
+def _clear(model, values: dict, *criteria) -> int:
+    return db.session.execute(
+        update(model).where(*criteria).values(**values), execution_options=_NO_SYNC
+    ).rowcount
+
+
+def delete_athletes(athlete_ids: Iterable[int]) -> Tuple[AthleteDeletion, Set[int]]:
+    """
+    Delete athletes with their attempts, referee decisions, scores, coach
+    assignments, entries, flight memberships and user accounts, and unlink
+    timers and audit rows that pointed at them. Commits on success and
+    rolls back (re-raising) on failure.
+
+    Returns the row counts and the ids of the athletes that were found.
+    """
+    requested = {int(athlete_id) for athlete_id in athlete_ids}
+    result = AthleteDeletion()
+    if not requested:
+        return result, set()
+
+    try:
+        athletes = db.session.query(
+            Athlete.id, Athlete.competition_id, Athlete.user_id
+        ).filter(Athlete.id.in_(requested))
+        found = set()
+        user_ids = set()
+        competition_ids = set()
+        for athlete_id, competition_id, user_id in athletes:
+            found.add(athlete_id)
+            competition_ids.add(competition_id)
+            if user_id:
+                user_ids.add(user_id)
+        if not found:
+            return result, found
+
+        entry_ids = db.session.query(AthleteEntry.id).filter(
+            AthleteEntry.athlete_id.in_(found)
+        )
+        # Attempt ids are read once: the attempt table is also the DELETE target
+        attempts: Dict[int, Tuple[int, int]] = {
+            attempt_id: (flight_id, competition_id)
+            for attempt_id, flight_id, competition_id in db.session.query(
+                Attempt.id, Attempt.flight_id, Flight.competition_id
+            )
+            .outerjoin(Flight, Flight.id == Attempt.flight_id)
+            .filter(
+                or_(
+                    Attempt.athlete_id.in_(found),
+                    Attempt.athlete_entry_id.in_(entry_ids.scalar_subquery()),
+                )
+            )
+        }
+        attempt_ids = list(attempts)
+        competition_ids.update(
+            competition_id for _, competition_id in attempts.values()
+        )
+        flight_ids = {flight_id for flight_id, _ in attempts.values()}
+        flight_ids.update(
+            flight_id
+            for (flight_id,) in db.session.query(AthleteFlight.flight_id)
+            .filter(AthleteFlight.athlete_id.in_(found))
+            .distinct()
+        )
+
+        # Rows that only point at the athletes are kept and unlinked
+        result.timers_cleared = _clear(
+            Timer, {"current_athlete_id": None}, Timer.current_athlete_id.in_(found)
+        )
+        if attempt_ids:
+            result.timers_cleared += _clear(
+                Timer,
+                {"current_attempt_id": None},
+                Timer.current_attempt_id.in_(attempt_ids),
+            )
+            result.audits_unlinked = _clear(
+                RefereeDecisionAudit,
+                {"attempt_id": None},
+                RefereeDecisionAudit.attempt_id.in_(attempt_ids),
+            )
+            result.referee_decisions = _delete(
+                RefereeDecision, RefereeDecision.attempt_id.in_(attempt_ids)
+            )
+            result.attempts = _delete(Attempt, Attempt.id.in_(attempt_ids))
+
+        result.scores = _delete(
+            Score, Score.athlete_entry_id.in_(entry_ids.scalar_subquery())
+        )
+        result.coach_assignments = _delete(
+            CoachAssignment, CoachAssignment.athlete_id.in_(found)
+        )
+        result.entries = _delete(AthleteEntry, AthleteEntry.athlete_id.in_(found))
+        result.flight_memberships = _delete(
+            AthleteFlight, AthleteFlight.athlete_id.in_(found)
+        )
+        result.athletes = _delete(Athlete, Athlete.id.in_(found))
+        if user_ids:
+            result.users = _delete(User, User.id.in_(user_ids))
+
+        # Bulk statements bypass the flush hooks
+        for competition_id in competition_ids:
+            mark_changed(db.session, competition_id)
+        for flight_id in flight_ids:
+            mark_order_stale(db.session, flight_id)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    # Tallies of deleted attempts would otherwise linger on the live board
+    for attempt_id, (_, competition_id) in attempts.items():
+        if competition_id is not None:
+            decision_board.clear(competition_id, attempt_id)
+
+    logger.info(
+        f"Deleted {result.athletes} athletes with {result.attempts} attempts "
+        f"and {result.entries} entries"
+    )
+    return result, found
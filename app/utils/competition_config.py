@@ -0,0 +1,379 @@
+"""
+Helpers for reading settings out of Competition.config JSON.
+
+Hot paths read the config through a CompiledConfig: the events are indexed
+once (by id and by name) with their movements, timer defaults and the
+referee settings resolved up front. Compiled configs are shared by config
+hash and kept per competition until the competition is next committed.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from ..models import Competition
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_NUMBER_OF_REFEREES = 3
+
+DEFAULT_DECISION_OPTIONS = [
+    {"label": "Good Lift", "color": "green", "value": True},
+    {"label": "No Lift", "color": "red", "value": False},
+]
+
+
+def default_referee_settings() -> dict:
+    return {
+        "number_of_referees": DEFAULT_NUMBER_OF_REFEREES,
+        "decision_options": [dict(option) for option in DEFAULT_DECISION_OPTIONS],
+    }
+
+
+def _group_decision_options(options) -> List[dict]:
+    """Decision options in the group format (list of objects)"""
+    decision_options = []
+    for option in options:
+        if (
+            isinstance(option, dict)
+            and "label" in option
+            and "color" in option
+            and "value" in option
+        ):
+            decision_options.append(
+                {
+                    "label": str(option["label"]),
+                    "color": str(option["color"]),
+                    "value": bool(option["value"]),
+                }
+            )
+    return decision_options
+
+
+def _legacy_decision_options(text) -> List[dict]:
+    """Decision options in the legacy movement format ("label, color, value" lines)"""
+    decision_options = []
+    for line in str(text).strip().split("\n"):
+        if line.strip():
+            parts = [part.strip() for part in line.split(",")]
+            if len(parts) >= 3:
+                decision_options.append(
+                    {
+                        "label": parts[0],
+                        "color": parts[1],
+                        "value": parts[2].lower() == "true",
+                    }
+                )
+    return decision_options
+
+
+def referee_settings(config: Optional[dict]) -> dict:
+    """
+    Number of referees and decision options for a competition. The first
+    referee block found wins: in an event's groups, or (for events without
+    groups) in its movements, which is the legacy format.
+    """
+    settings = default_referee_settings()
+    if not config or "events" not in config:
+        return settings
+
+    for event_cfg in config["events"]:
+        if "groups" in event_cfg:
+            for group in event_cfg["groups"]:
+                if "referee" in group:
+                    ref_config = group["referee"]
+                    if "n" in ref_config:
+                        settings["number_of_referees"] = int(ref_config["n"])
+                    if "options" in ref_config and isinstance(
+                        ref_config["options"], list
+                    ):
+                        decision_options = _group_decision_options(
+                            ref_config["options"]
+                        )
+                        if decision_options:
+                            settings["decision_options"] = decision_options
+                    return settings
+            continue
+
+        for movement in event_cfg.get("movements", []):
+            if "referee" in movement:
+                ref_config = movement["referee"]
+                if "ref_n" in ref_config:
+                    settings["number_of_referees"] = int(ref_config["ref_n"])
+                if ref_config.get("ref_options"):
+                    decision_options = _legacy_decision_options(
+                        ref_config["ref_options"]
+                    )
+                    if decision_options:
+                        settings["decision_options"] = decision_options
+                return settings
+
+    return settings
+
+
+def to_seconds(val) -> Optional[int]:
+    """Accepts int, float, 'MM:SS', 'HH:MM:SS', or numeric strings."""
+    if val is None:
+        return None
+    if isinstance(val, (int, float)):
+        return int(val)
+    s = str(val).strip()
+    if not s:
+        return None
+    if ":" in s:
+        parts = [int(p or 0) for p in s.split(":")]
+        if len(parts) == 3:
+            return parts[0] * 3600 + parts[1] * 60 + parts[2]
+        if len(parts) == 2:
+            return parts[0] * 60 + parts[1]
+    try:
+        return int(float(s))
+    except Exception:
+        return None
+
+
+def scan_event_times(edict) -> Tuple[Optional[int], Optional[int]]:
+    """Search a single event dict for attempt/break time fields (top, movements, groups)."""
+    attempt_sec = None
+    break_sec = None
+
+    def scan_obj(obj):
+        nonlocal attempt_sec, break_sec
+        if not isinstance(obj, dict):
+            return
+        for k, v in obj.items():
+            kl = str(k).lower()
+            if attempt_sec is None and ("attempt" in kl and "time" in kl):
+                attempt_sec = to_seconds(v)
+            if break_sec is None and ("break" in kl and "time" in kl):
+                break_sec = to_seconds(v)
+
+    if isinstance(edict, dict):
+        scan_obj(edict)
+        for mv in edict.get("movements") or []:
+            scan_obj(mv)
+        for grp in edict.get("groups") or []:
+            scan_obj(grp)
+
+    return attempt_sec, break_sec
+
+
+def _timer_defaults(ev_cfg: dict, attempt=None, brk=None):
+    """Fill attempt/break seconds from an event's movement and group timers"""
+    # Prefer movement-level timers if present
+    for mv in ev_cfg.get("movements") or []:
+        if not isinstance(mv, dict):
+            continue
+        t = mv.get("timer") or {}
+        if attempt is None and t.get("attempt_seconds") is not None:
+            attempt = int(t["attempt_seconds"])
+        if brk is None and t.get("break_seconds") is not None:
+            brk = int(t["break_seconds"])
+        if attempt is not None or brk is not None:
+            break
+
+    for grp in ev_cfg.get("groups") or []:
+        if not isinstance(grp, dict):
+            continue
+        t = grp.get("timer") or {}
+        if attempt is None and t.get("attempt_seconds") is not None:
+            attempt = int(t["attempt_seconds"])
+        if brk is None and t.get("break_seconds") is not None:
+            brk = int(t["break_seconds"])
+    return attempt, brk
+
+
+def config_hash(config) -> str:
+    return hashlib.sha1(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _event_key(name) -> str:
+    return (name or "").strip().lower()
+
+
+@dataclass
+class CompiledConfig:
+    """Lookup maps built from one Competition.config"""
+
+    config_hash: str
+    events: List[dict] = field(default_factory=list)
+    events_by_id: Dict[object, dict] = field(default_factory=dict)
+    events_by_name: Dict[str, dict] = field(default_factory=dict)
+    referee: dict = field(default_factory=default_referee_settings)
+    _movements_by_id: Dict[object, List[dict]] = field(default_factory=dict)
+    _movements_by_name: Dict[str, List[dict]] = field(default_factory=dict)
+    _fallback_movements: List[dict] = field(default_factory=list)
+    _timers_by_name: Dict[str, Tuple] = field(default_factory=dict)
+    _timers_all_events: Tuple = (None, None)
+    _times_by_name: Dict[str, Tuple] = field(default_factory=dict)
+
+    @classmethod
+    def compile(cls, config, digest: Optional[str] = None) -> "CompiledConfig":
+        # Own copy, so later in-place edits of the ORM value do not leak in
+        config = copy.deepcopy(config) if isinstance(config, dict) else {}
+        compiled = cls(
+            config_hash=digest or config_hash(config),
+            referee=referee_settings(config),
+        )
+        events_cfg = config.get("events") or []
+        if not isinstance(events_cfg, list):
+            return compiled
+
+        timers_all = (None, None)
+        for block in events_cfg:
+            if not isinstance(block, dict):
+                continue
+            compiled.events.append(block)
+            event_id = block.get("id")
+            key = _event_key(block.get("name"))
+            compiled.events_by_id.setdefault(event_id, block)
+            compiled.events_by_name.setdefault(key, block)
+
+            if block.get("movements"):
+                movements = list(block["movements"])
+                compiled._movements_by_id.setdefault(event_id, movements)
+                compiled._movements_by_name.setdefault(key, movements)
+                if not compiled._fallback_movements:
+                    compiled._fallback_movements = movements
+
+            # Timer defaults match event names exactly
+            compiled._timers_by_name.setdefault(
+                block.get("name"), _timer_defaults(block)
+            )
+            timers_all = _timer_defaults(block, *timers_all)
+            compiled._times_by_name.setdefault(
+                block.get("name"), scan_event_times(block)
+            )
+        compiled._timers_all_events = timers_all
+        return compiled
+
+    def movements_for_event(self, event_id=None, event_name=None) -> List[dict]:
+        """
+        Movements of the event block matching the id, else the name, else
+        the first block that has movements.
+        """
+        if event_id is not None and event_id in self._movements_by_id:
+            return list(self._movements_by_id[event_id])
+        key = _event_key(event_name)
+        if key in self._movements_by_name:
+            return list(self._movements_by_name[key])
+        return list(self._fallback_movements)
+
+    def timer_defaults(self, event_name=None) -> Tuple[Optional[int], Optional[int]]:
+        """
+        (attempt_seconds, break_seconds) from the named event's movement or
+        group timers; without a name, the first values across all events.
+        """
+        if event_name:
+            return self._timers_by_name.get(event_name, (None, None))
+        return self._timers_all_events
+
+    def event_times(self, event_name) -> Tuple[Optional[int], Optional[int]]:
+        """Attempt/break times from any *attempt*time / *break*time fields"""
+        return self._times_by_name.get(event_name, (None, None))
+
+    def referee_settings(self) -> dict:
+        return copy.deepcopy(self.referee)
+
+
+class CompiledConfigCache:
+    """
+    Competition id -> CompiledConfig, dropped when the competition commits.
+    Compiled configs are also indexed by hash, so identical configs (and
+    uncommitted edits that are saved back unchanged) compile once.
+    """
+
+    def __init__(self, max_configs: int = 64):
+        self._lock = threading.Lock()
+        self._max_configs = max_configs
+        self._by_competition: Dict[int, CompiledConfig] = {}
+        self._by_hash: "OrderedDict[str, CompiledConfig]" = OrderedDict()
+
+    def compile(self, config) -> CompiledConfig:
+        """Compiled form of a config, shared by hash"""
+        digest = config_hash(config)
+        with self._lock:
+            compiled = self._by_hash.get(digest)
+            if compiled is not None:
+                self._by_hash.move_to_end(digest)
+                return compiled
+        compiled = CompiledConfig.compile(config, digest)
+        with self._lock:
+            self._by_hash[digest] = compiled
+            while len(self._by_hash) > self._max_configs:
+                self._by_hash.popitem(last=False)
+        return compiled
+
+    def get(self, competition: Optional[Competition]) -> CompiledConfig:
+        """Compiled config of a loaded competition"""
+        if competition is None:
+            return self.compile(None)
+        state = inspect(competition)
+        # Pending or edited in this session: compile what is there now
+        if (
+            competition.id is None
+            or state.pending
+            or state.attrs.config.history.has_changes()
+        ):
+            return self.compile(competition.config)
+
+        with self._lock:
+            compiled = self._by_competition.get(competition.id)
+        if compiled is None:
+            compiled = self.compile(competition.config)
+            with self._lock:
+                self._by_competition[competition.id] = compiled
+        return compiled
+
+    def invalidate(self, competition_id: Optional[int] = None) -> None:
+        """Forget one competition (or all, including the hash index)"""
+        with self._lock:
+            if competition_id is None:
+                self._by_competition.clear()
+                self._by_hash.clear()
+            else:
+                self._by_competition.pop(competition_id, None)
+
+
+def compiled_config(competition: Optional[Competition]) -> CompiledConfig:
+    return compiled_config_cache.get(competition)
+
+
+def _after_flush(session, flush_context):
+    changed = session.info.setdefault("changed_competition_configs", set())
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Competition):
+            changed.add(obj.id)
+
+
+def _after_commit(session):
+    for competition_id in session.info.pop("changed_competition_configs", set()):
+        compiled_config_cache.invalidate(competition_id)
+
+
+def _after_rollback(session):
+    session.info.pop("changed_competition_configs", None)
+
+
+def track_config_changes() -> None:
+    """Drop compiled configs when competitions are saved (idempotent)"""
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.debug("Compiled config cache attached to SQLAlchemy sessions")
+
+
+# Global instance
+compiled_config_cache = CompiledConfigCache()
@@ -0,0 +1,391 @@
+"""
+Saving the competition model (Competition.config plus its Event and Flight
+rows).
+
+A save compares the new config with the stored one: events and flights are
+only written when their fields changed, removed ones are deleted with one
+statement each, and each event's movement definitions are updated in place
+(entries read their movement from there, so none are rewritten). Partial
+updates arrive as JSON Patch (RFC 6902) operations applied to the stored
+model and then saved the same way.
+"""
+
+import copy
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional, Set, Tuple
+
+from ..extensions import db
+from ..models import Competition, Event, Flight, ScoringType, SportType
+from .competition_config import compiled_config_cache
+from .movements import sync_movement_definitions
+
+logger = logging.getLogger(__name__)
+
+SCORING_TYPES = {
+    "max": ScoringType.MAX,
+    "sum": ScoringType.SUM,
+    "min": ScoringType.MIN,
+}
+
+
+# --- JSON Patch -------------------------------------------------------------
+
+
+def _pointer(path: str) -> List[str]:
+    if path == "":
+        return []
+    if not isinstance(path, str) or not path.startswith("/"):
+        raise ValueError(f"Invalid JSON pointer: {path!r}")
+    return [part.replace("~1", "/").replace("~0", "~") for part in path[1:].split("/")]
+
+
+def _index(container: list, token: str, allow_end: bool = False) -> int:
+    if allow_end and token == "-":
+        return len(container)
+    if not token.isdigit() or (len(token) > 1 and token.startswith("0")):
+        raise ValueError(f"Invalid array index: {token!r}")
+    index = int(token)
+    if index > len(container) or (index == len(container) and not allow_end):
+        raise ValueError(f"Array index out of range: {index}")
+    return index
+
+
+def _resolve(doc, tokens: List[str]):
+    for token in tokens:
+        if isinstance(doc, dict):
+            if token not in doc:
+                raise ValueError(f"Path not found: /{'/'.join(tokens)}")
+            doc = doc[token]
+        elif isinstance(doc, list):
+            doc = doc[_index(doc, token)]
+        else:
+            raise ValueError(f"Path not found: /{'/'.join(tokens)}")
+    return doc
+
+
+def _add(doc, tokens: List[str], value):
+    if not tokens:
+        return value
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    elif isinstance(parent, list):
+        parent.insert(_index(parent, tokens[-1], allow_end=True), value)
+    else:
+        raise ValueError(f"Cannot add to /{'/'.join(tokens)}")
+    return doc
+
+
+def _remove(doc, tokens: List[str]):
+    if not tokens:
+        raise ValueError("Cannot remove the whole document")
+    parent = _resolve(doc, tokens[:-1])
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise ValueError(f"Path not found: /{'/'.join(tokens)}")
+        return parent.pop(tokens[-1])
+    if isinstance(parent, list):
+        return parent.pop(_index(parent, tokens[-1]))
+    raise ValueError(f"Path not found: /{'/'.join(tokens)}")
+
+
+def apply_json_patch(doc: dict, operations: list) -> dict:
+    """
+    Apply JSON Patch operations to a copy of doc. All operations succeed or
+    a ValueError is raised and nothing is applied.
+    """
+    if not isinstance(operations, list):
+        raise ValueError("A JSON Patch must be a list of operations")
+    doc = copy.deepcopy(doc)
+    for operation in operations:
+        if not isinstance(operation, dict) or "path" not in operation:
+            raise ValueError(f"Invalid patch operation: {operation!r}")
+        op = operation.get("op")
+        tokens = _pointer(operation["path"])
+        if op in ("add", "replace", "test") and "value" not in operation:
+            raise ValueError(f"'{op}' needs a value")
+
+        if op == "add":
+            doc = _add(doc, tokens, copy.deepcopy(operation["value"]))
+        elif op == "remove":
+            _remove(doc, tokens)
+        elif op == "replace":
+            _resolve(doc, tokens)  # the target must exist
+            if not tokens:
+                doc = copy.deepcopy(operation["value"])
+            else:
+                _remove(doc, tokens)
+                doc = _add(doc, tokens, copy.deepcopy(operation["value"]))
+        elif op in ("move", "copy"):
+            source = _pointer(operation.get("from", ""))
+            if op == "move":
+                if tokens[: len(source)] == source and tokens != source:
+                    raise ValueError("Cannot move a value into itself")
+                value = _remove(doc, source)
+            else:
+                value = copy.deepcopy(_resolve(doc, source))
+            doc = _add(doc, tokens, value)
+        elif op == "test":
+            if _resolve(doc, tokens) != operation["value"]:
+                raise ValueError(f"Test failed at {operation['path']}")
+        else:
+            raise ValueError(f"Unsupported patch operation: {op!r}")
+    return doc
+
+
+# --- Structural diff --------------------------------------------------------
+
+
+def _event_fields(event_data: dict) -> Tuple:
+    return (
+        event_data.get("name"),
+        event_data.get("gender"),
+        event_data.get("sport_type"),
+        scoring_type_for_event(event_data),
+    )
+
+
+def _flight_fields(flight_data: dict, event_id) -> Tuple:
+    return (
+        flight_data.get("name"),
+        flight_data.get("order", 1),
+        flight_data.get("is_active", True),
+        event_id,
+    )
+
+
+def scoring_type_for_event(event_data: dict) -> ScoringType:
+    """Scoring type from the event's first movement (max by default)"""
+    movements = event_data.get("movements") or []
+    if movements and isinstance(movements[0], dict):
+        scoring_data = movements[0].get("scoring") or {}
+        return SCORING_TYPES.get(scoring_data.get("type", "max"), ScoringType.MAX)
+    return ScoringType.MAX
+
+
+@dataclass
+class ConfigDiff:
+    """What changed between two competition configs"""
+
+    # Events/flights (by config id) that are new or whose fields changed
+    changed_event_ids: Set[int] = field(default_factory=set)
+    changed_flight_ids: Set[int] = field(default_factory=set)
+    # Config ids no longer present
+    removed_event_ids: Set[int] = field(default_factory=set)
+    removed_flight_ids: Set[int] = field(default_factory=set)
+
+    def event_changed(self, event_id) -> bool:
+        return event_id is None or event_id in self.changed_event_ids
+
+    def flight_changed(self, flight_id) -> bool:
+        return flight_id is None or flight_id in self.changed_flight_ids
+
+
+def _events(config) -> List[dict]:
+    events = (config or {}).get("events") or []
+    return (
+        [e for e in events if isinstance(e, dict)] if isinstance(events, list) else []
+    )
+
+
+def diff_competition_config(old: Optional[dict], new: Optional[dict]) -> ConfigDiff:
+    """Structural diff of the events and flights (groups) of two configs"""
+    diff = ConfigDiff()
+    old_events = {e["id"]: e for e in _events(old) if e.get("id")}
+    old_flights = {
+        group["id"]: _flight_fields(group, event_id)
+        for event_id, event_data in old_events.items()
+        for group in event_data.get("groups") or []
+        if isinstance(group, dict) and group.get("id")
+    }
+
+    seen_events, seen_flights = set(), set()
+    for event_data in _events(new):
+        event_id = event_data.get("id")
+        if event_id:
+            seen_events.add(event_id)
+            old_event = old_events.get(event_id)
+            if old_event is None or _event_fields(old_event) != _event_fields(
+                event_data
+            ):
+                diff.changed_event_ids.add(event_id)
+        for group in event_data.get("groups") or []:
+            if not isinstance(group, dict) or not group.get("id"):
+                continue
+            seen_flights.add(group["id"])
+            if old_flights.get(group["id"]) != _flight_fields(group, event_id):
+                diff.changed_flight_ids.add(group["id"])
+
+    diff.removed_event_ids = set(old_events) - seen_events
+    diff.removed_flight_ids = set(old_flights) - seen_flights
+    return diff
+
+
+# --- Save ------------------------------------------------------------------
+
+
+@dataclass
+class SaveResult:
+    competition: Competition
+    events_created: int = 0
+    events_updated: int = 0
+    events_deleted: int = 0
+    flights_created: int = 0
+    flights_updated: int = 0
+    flights_deleted: int = 0
+    movements_created: int = 0
+    movements_updated: int = 0
+    movements_deleted: int = 0
+    rep_overrides_reset: int = 0
+
+
+def competition_model_document(competition: Competition) -> dict:
+    """The model as the editor sends it; JSON Patch paths are relative to this"""
+    config = competition.config or {}
+    return {
+        "name": competition.name,
+        "comp_date": competition.start_date.isoformat()
+        if competition.start_date
+        else config.get("comp_date"),
+        "description": competition.description or "",
+        "breaktime_between_events": competition.breaktime_between_events,
+        "breaktime_between_flights": competition.breaktime_between_flights,
+        "events": copy.deepcopy(config.get("events") or []),
+    }
+
+
+def _apply_event_fields(event: Event, event_data: dict) -> None:
+    event.name = event_data["name"]
+    event.gender = event_data.get("gender")
+    event.sport_type = (
+        SportType(event_data["sport_type"])
+        if event_data.get("sport_type")
+        else SportType.OLYMPIC_WEIGHTLIFTING
+    )
+    event.scoring_type = scoring_type_for_event(event_data)
+    event.is_active = True
+
+
+def _apply_flight_fields(flight: Flight, flight_data: dict, event_id: int) -> None:
+    flight.name = flight_data["name"]
+    flight.order = flight_data.get("order", 1)
+    flight.is_active = flight_data.get("is_active", True)
+    flight.event_id = event_id
+
+
+def apply_competition_model(data: dict, competition: Optional[Competition] = None):
+    """
+    Save a full competition model (as sent by the model editor). Only events
+    and flights that changed are written. Ids of created events and flights
+    are written back into the stored config so later saves diff cleanly.
+    Nothing is committed here.
+    """
+    if competition is None:
+        competition = Competition()
+        db.session.add(competition)
+    old_config = copy.deepcopy(competition.config) if competition.id else None
+
+    competition.name = data["name"]
+    competition.start_date = datetime.strptime(data["comp_date"], "%Y-%m-%d").date()
+    competition.description = data.get("description", "")
+    competition.breaktime_between_events = data.get("breaktime_between_events", 600)
+    competition.breaktime_between_flights = data.get("breaktime_between_flights", 180)
+    competition.is_active = True
+
+    new_config = {
+        "name": data["name"],
+        "comp_date": data["comp_date"],
+        "events": copy.deepcopy(data.get("events", [])),
+    }
+    diff = diff_competition_config(old_config, new_config)
+    result = SaveResult(competition=competition)
+
+    # One query each for the rows that already exist
+    existing_events = {event.id: event for event in competition.events}
+    existing_flights = (
+        {
+            flight.id: flight
+            for flight in Flight.query.filter_by(competition_id=competition.id)
+        }
+        if competition.id
+        else {}
+    )
+
+    kept_event_ids, kept_flight_ids = set(), set()
+    new_events: List[Tuple[Event, dict]] = []
+    for event_data in _events(new_config):
+        event = existing_events.get(event_data.get("id"))
+        if event is not None:
+            kept_event_ids.add(event.id)
+            if diff.event_changed(event.id):
+                _apply_event_fields(event, event_data)
+                result.events_updated += 1
+        else:
+            event = Event(competition=competition)
+            _apply_event_fields(event, event_data)
+            db.session.add(event)
+            result.events_created += 1
+        new_events.append((event, event_data))
+    if result.events_created:
+        db.session.flush()  # ids for the new events
+
+    new_flights: List[Tuple[Flight, dict]] = []
+    for event, event_data in new_events:
+        event_data["id"] = event.id
+        for flight_data in event_data.get("groups") or []:
+            if not isinstance(flight_data, dict):
+                continue
+            flight_id = flight_data.get("id")
+            flight = existing_flights.get(flight_id)
+            if flight is not None:
+                kept_flight_ids.add(flight.id)
+                if diff.flight_changed(flight.id) or flight.event_id != event.id:
+                    _apply_flight_fields(flight, flight_data, event.id)
+                    result.flights_updated += 1
+            elif not flight_id:
+                flight = Flight(competition=competition)
+                _apply_flight_fields(flight, flight_data, event.id)
+                db.session.add(flight)
+                new_flights.append((flight, flight_data))
+                result.flights_created += 1
+    if new_flights:
+        db.session.flush()  # ids for the new flights
+        for flight, flight_data in new_flights:
+            flight_data["id"] = flight.id
+            kept_flight_ids.add(flight.id)
+
+    # Remove flights, then events, that are no longer in the configuration
+    flights_to_delete = set(existing_flights) - kept_flight_ids
+    if flights_to_delete:
+        Flight.query.filter(Flight.id.in_(flights_to_delete)).delete(
+            synchronize_session="fetch"
+        )
+        result.flights_deleted = len(flights_to_delete)
+    events_to_delete = set(existing_events) - kept_event_ids
+    if events_to_delete:
+        Event.query.filter(Event.id.in_(events_to_delete)).delete(
+            synchronize_session="fetch"
+        )
+        result.events_deleted = len(events_to_delete)
+
+    competition.config = new_config
+    movements = sync_movement_definitions(
+        [event for event, _ in new_events], compiled_config_cache.compile(new_config)
+    )
+    result.movements_created = movements.created
+    result.movements_updated = movements.updated
+    result.movements_deleted = movements.deleted
+    result.rep_overrides_reset = movements.overrides_reset
+    return result
+
+
+def apply_competition_patch(competition: Competition, operations: list):
+    """Apply JSON Patch operations to the stored model and save the result"""
+    document = apply_json_patch(competition_model_document(competition), operations)
+    if not isinstance(document, dict) or not document.get("name"):
+        raise ValueError("The patched model needs a name")
+    if not document.get("comp_date"):
+        raise ValueError("The patched model needs a comp_date")
+    return apply_competition_model(document, competition)
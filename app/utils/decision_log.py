@@ -0,0 +1,306 @@
+"""
+Referee decision log queries and the decision audit trail.
+
+Results are read as a joined column projection (referee and competition
+names included) and paged by keyset on (timestamp, id), newest first.
+The event/flight/athlete filter values are kept in an in-process index per
+competition: built with one query on first use, then extended as new log
+rows are committed instead of being rescanned.
+
+Every submitted decision is also appended to RefereeDecisionAudit with a
+single INSERT; audit entries are never updated. Decisions that carry a
+client-generated id are recorded once: the unique index on that id is
+the set of decisions already seen.
+"""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, event, insert, or_
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import Competition, Referee, RefereeDecisionAudit, RefereeDecisionLog
+from .keyset import decode_cursor, encode_cursor
+
+logger = logging.getLogger(__name__)
+
+# Decisions per page of results
+DECISIONS_PAGE_SIZE = 100
+MAX_DECISIONS_PAGE_SIZE = 500
+
+# Audit entries returned per request
+MAX_AUDIT_ENTRIES = 1000
+
+_FILTER_FIELDS = ("events", "flights", "athletes")
+
+
+def decision_projection(
+    competition_id: Optional[int] = None,
+    event_name: Optional[str] = None,
+    flight_name: Optional[str] = None,
+    athlete_name: Optional[str] = None,
+):
+    """Query of flat decision log rows matching the filters, newest first"""
+    log = RefereeDecisionLog
+    query = (
+        db.session.query(
+            log.id,
+            log.referee_id,
+            Referee.name.label("referee_name"),
+            Referee.position.label("referee_position"),
+            log.competition_id,
+            Competition.name.label("competition_name"),
+            log.event_name,
+            log.flight_name,
+            log.athlete_name,
+            log.weight_class,
+            log.team,
+            log.current_lift,
+            log.attempt_number,
+            log.attempt_weight,
+            log.decision_label,
+            log.decision_value,
+            log.decision_color,
+            log.violations,
+            log.timestamp,
+        )
+        .outerjoin(Referee, log.referee_id == Referee.id)
+        .outerjoin(Competition, log.competition_id == Competition.id)
+    )
+    if competition_id:
+        query = query.filter(log.competition_id == competition_id)
+    if event_name:
+        query = query.filter(log.event_name == event_name)
+    if flight_name:
+        query = query.filter(log.flight_name == flight_name)
+    if athlete_name:
+        query = query.filter(log.athlete_name == athlete_name)
+    return query.order_by(log.timestamp.desc(), log.id.desc())
+
+
+def decision_page(
+    cursor: Optional[str] = None, limit: int = DECISIONS_PAGE_SIZE, **filters
+) -> Tuple[List, Optional[str]]:
+    """One page of decision rows and the cursor for the next page"""
+    limit = max(1, min(limit, MAX_DECISIONS_PAGE_SIZE))
+    query = decision_projection(**filters)
+    if cursor:
+        timestamp, log_id = decode_cursor(cursor)
+        if timestamp is None:
+            raise ValueError("Invalid cursor")
+        query = query.filter(
+            or_(
+                RefereeDecisionLog.timestamp < timestamp,
+                and_(
+                    RefereeDecisionLog.timestamp == timestamp,
+                    RefereeDecisionLog.id < log_id,
+                ),
+            )
+        )
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return rows, next_cursor
+
+
+def decision_row_to_dict(row) -> dict:
+    """Same shape as RefereeDecisionLog.to_dict, from a projection row"""
+    return {
+        "id": row.id,
+        "referee_id": row.referee_id,
+        "referee_name": row.referee_name or "Unknown",
+        "referee_position": row.referee_position,
+        "competition_id": row.competition_id,
+        "competition_name": row.competition_name or "Unknown",
+        "event_name": row.event_name,
+        "flight_name": row.flight_name,
+        "athlete_name": row.athlete_name,
+        "weight_class": row.weight_class,
+        "team": row.team,
+        "current_lift": row.current_lift,
+        "attempt_number": row.attempt_number,
+        "attempt_weight": row.attempt_weight,
+        "decision_label": row.decision_label,
+        "decision_value": row.decision_value,
+        "decision_color": row.decision_color,
+        "violations": row.violations,
+        "timestamp": row.timestamp.isoformat() if row.timestamp else None,
+    }
+
+
+class DecisionFilterIndex:
+    """Distinct event, flight and athlete names in each competition's log"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values: Dict[int, Dict[str, Set[str]]] = {}
+
+    def get(self, competition_id: int) -> Dict[str, List[str]]:
+        """Sorted filter values, loading the competition on first use"""
+        competition_id = int(competition_id)
+        with self._lock:
+            values = self._values.get(competition_id)
+            if values is None:
+                values = self._load(competition_id)
+                self._values[competition_id] = values
+            return {field: sorted(values[field]) for field in _FILTER_FIELDS}
+
+    def _load(self, competition_id: int) -> Dict[str, Set[str]]:
+        values = {field: set() for field in _FILTER_FIELDS}
+        for event_name, flight_name, athlete_name in (
+            db.session.query(
+                RefereeDecisionLog.event_name,
+                RefereeDecisionLog.flight_name,
+                RefereeDecisionLog.athlete_name,
+            )
+            .filter(RefereeDecisionLog.competition_id == competition_id)
+            .distinct()
+        ):
+            self._add_to(values, event_name, flight_name, athlete_name)
+        return values
+
+    @staticmethod
+    def _add_to(values, event_name, flight_name, athlete_name) -> None:
+        for field, value in zip(
+            _FILTER_FIELDS, (event_name, flight_name, athlete_name)
+        ):
+            if value:
+                values[field].add(value)
+
+    def add(self, competition_id, event_name, flight_name, athlete_name) -> None:
+        """Record a new log row; competitions not loaded yet are skipped"""
+        with self._lock:
+            values = self._values.get(competition_id)
+            if values is not None:
+                self._add_to(values, event_name, flight_name, athlete_name)
+
+    def invalidate(self, competition_id: Optional[int] = None) -> None:
+        """Forget one competition (or all) after rows were edited or deleted"""
+        with self._lock:
+            if competition_id is None:
+                self._values.clear()
+            else:
+                self._values.pop(competition_id, None)
+
+
+def record_decision_audit(
+    referee_id: int,
+    competition_id: int,
+    attempt_id: Optional[int],
+    decision: str,
+    notes: Optional[str] = None,
+    client_timestamp=None,
+    client_decision_id: Optional[str] = None,
+) -> None:
+    """Append an audit entry; committed with the caller's transaction"""
+    db.session.execute(
+        insert(RefereeDecisionAudit).values(
+            audit_values(
+                referee_id,
+                competition_id,
+                attempt_id,
+                decision,
+                notes,
+                client_timestamp,
+                client_decision_id,
+            )
+        )
+    )
+
+
+def audit_values(
+    referee_id: int,
+    competition_id: int,
+    attempt_id: Optional[int],
+    decision: str,
+    notes: Optional[str] = None,
+    client_timestamp=None,
+    client_decision_id: Optional[str] = None,
+) -> dict:
+    """Column values for one audit row (for batched inserts)"""
+    return {
+        "referee_id": referee_id,
+        "competition_id": competition_id,
+        "attempt_id": attempt_id,
+        "decision": str(decision)[:50],
+        "notes": notes or None,
+        "client_timestamp": str(client_timestamp)[:50]
+        if client_timestamp is not None
+        else None,
+        "client_decision_id": client_decision_id,
+    }
+
+
+def seen_client_decision_ids(client_decision_ids: Iterable[str]) -> Set[str]:
+    """The given client decision ids that are already in the audit log"""
+    client_decision_ids = {i for i in client_decision_ids if i}
+    if not client_decision_ids:
+        return set()
+    rows = db.session.query(RefereeDecisionAudit.client_decision_id).filter(
+        RefereeDecisionAudit.client_decision_id.in_(client_decision_ids)
+    )
+    return {client_decision_id for (client_decision_id,) in rows}
+
+
+def decision_audit_entries(
+    attempt_id: Optional[int] = None,
+    referee_id: Optional[int] = None,
+    limit: int = MAX_AUDIT_ENTRIES,
+) -> List[RefereeDecisionAudit]:
+    """Audit entries for an attempt and/or referee, oldest first"""
+    if attempt_id is None and referee_id is None:
+        raise ValueError("attempt_id or referee_id is required")
+    query = RefereeDecisionAudit.query
+    if attempt_id is not None:
+        query = query.filter(RefereeDecisionAudit.attempt_id == attempt_id)
+    if referee_id is not None:
+        query = query.filter(RefereeDecisionAudit.referee_id == referee_id)
+    return (
+        query.order_by(RefereeDecisionAudit.recorded_at, RefereeDecisionAudit.id)
+        .limit(max(1, min(limit, MAX_AUDIT_ENTRIES)))
+        .all()
+    )
+
+
+def _after_flush(session, flush_context):
+    inserted = session.info.setdefault("decision_log_inserts", [])
+    changed = session.info.setdefault("decision_log_changes", set())
+    for obj in session.new:
+        if isinstance(obj, RefereeDecisionLog):
+            inserted.append(
+                (obj.competition_id, obj.event_name, obj.flight_name, obj.athlete_name)
+            )
+    for obj in list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RefereeDecisionLog):
+            changed.add(obj.competition_id)
+
+
+def _after_commit(session):
+    for row in session.info.pop("decision_log_inserts", []):
+        decision_filter_index.add(*row)
+    for competition_id in session.info.pop("decision_log_changes", set()):
+        decision_filter_index.invalidate(competition_id)
+
+
+def _after_rollback(session):
+    session.info.pop("decision_log_inserts", None)
+    session.info.pop("decision_log_changes", None)
+
+
+def track_decision_log_changes() -> None:
+    """Keep the filter index in step with committed log rows (idempotent)"""
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.debug("Decision filter index attached to SQLAlchemy sessions")
+
+
+# Global instance
+decision_filter_index = DecisionFilterIndex()
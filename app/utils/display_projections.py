@@ -0,0 +1,581 @@
+"""
+Shared projections behind the public display endpoints.
+
+Every screen in a venue asks the same questions (who is lifting, who is next,
+what are the rankings, what does the timer say). The answers are built once
+per data version and shared between all requests instead of being recomputed
+for every poll from every screen.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from flask import render_template
+from sqlalchemy.orm import joinedload
+
+from ..extensions import db
+from ..models import (
+    Athlete,
+    AthleteEntry,
+    Attempt,
+    AttemptResult,
+    Competition,
+    Flight,
+    Score,
+)
+from ..real_time.change_feed import change_feed
+
+DEFAULT_TIMER_STATE = {
+    "athlete_name": "",
+    "athlete_id": "",
+    "attempt_number": "",
+    "timer_seconds": 60,
+    "timer_running": False,
+    "timer_mode": "attempt",
+    "competition": "",
+    "event": "",
+    "flight": "",
+    "flight_id": "",
+    "team": "",
+    "current_lift": "",
+    "attempt_weight": "",
+    "break_timer_seconds": 0,
+    "break_timer_running": False,
+    "break_timer_type": "",
+    "break_timer_message": "",
+    "timestamp": 0,
+}
+
+
+class ProjectionCache:
+    """
+    Caches built projections per (kind, competition) against the competition's
+    data version. Entries also expire after ``max_age`` seconds as a safety net
+    for writes that bypass the ORM session.
+    """
+
+    def __init__(self, max_age: float = 5.0):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[Any, float, Any]] = {}
+
+    def get(self, kind: str, competition_id: int, builder: Callable[[int], Any]):
+        """Return the cached projection, rebuilding it if the data changed"""
+        key = (kind, int(competition_id))
+        version = change_feed.version(competition_id)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached and cached[0] == version and now - cached[1] < self.max_age:
+            return cached[2]
+
+        value = builder(competition_id)
+        with self._lock:
+            self._entries[key] = (version, now, value)
+        return value
+
+    def invalidate(self, competition_id: Optional[int] = None) -> None:
+        """Drop cached projections for one competition, or all of them"""
+        with self._lock:
+            if competition_id is None:
+                self._entries.clear()
+                return
+            for key in [k for k in self._entries if k[1] == int(competition_id)]:
+                del self._entries[key]
+
+
+def _athlete_summary(athlete: Athlete) -> dict:
+    return {
+        "id": athlete.id,
+        "name": f"{athlete.first_name} {athlete.last_name}".strip(),
+        "team": athlete.team or "No Team",
+    }
+
+
+def build_competition_state(competition_id: int) -> Optional[dict]:
+    """Current attempt plus the waiting queue, same movement first"""
+    competition = db.session.get(Competition, competition_id)
+    if not competition:
+        return None
+
+    current_attempt = (
+        db.session.query(Attempt)
+        .join(AthleteEntry)
+        .join(Athlete)
+        .filter(
+            Athlete.competition_id == competition_id,
+            Attempt.status == "in-progress",
+        )
+        .options(joinedload(Attempt.athlete), joinedload(Attempt.athlete_entry))
+        .first()
+    )
+
+    current_attempt_data = None
+    if current_attempt:
+        current_attempt_data = {
+            "id": current_attempt.id,
+            "athlete": _athlete_summary(current_attempt.athlete),
+            "weight": current_attempt.requested_weight,
+            "attempt_number": current_attempt.attempt_number,
+            "movement": current_attempt.movement_type or "Unknown Movement",
+            "lift_type": current_attempt.athlete_entry.lift_type
+            if current_attempt.athlete_entry
+            else "Unknown",
+        }
+
+    waiting_attempts = (
+        db.session.query(Attempt)
+        .join(AthleteEntry)
+        .join(Athlete)
+        .filter(Athlete.competition_id == competition_id, Attempt.status == "waiting")
+        .options(joinedload(Attempt.athlete), joinedload(Attempt.athlete_entry))
+        .order_by(Attempt.lifting_order.asc())
+        .all()
+    )
+
+    current_movement = (
+        current_attempt_data["movement"] if current_attempt_data else None
+    )
+    same_movement_attempts = []
+    other_movement_attempts = []
+
+    for attempt in waiting_attempts:
+        attempt_data = {
+            "id": attempt.id,
+            "athlete": _athlete_summary(attempt.athlete),
+            "weight": attempt.requested_weight,
+            "attempt_number": attempt.attempt_number,
+            "movement": attempt.movement_type or "Unknown Movement",
+            "lift_type": attempt.athlete_entry.lift_type
+            if attempt.athlete_entry
+            else "Unknown",
+            "lifting_order": attempt.lifting_order or 0,
+        }
+
+        if current_movement and attempt.movement_type == current_movement:
+            same_movement_attempts.append(attempt_data)
+        else:
+            other_movement_attempts.append(attempt_data)
+
+    next_attempts = same_movement_attempts + other_movement_attempts
+
+    athlete_count = Athlete.query.filter_by(
+        competition_id=competition_id, is_active=True
+    ).count()
+
+    return {
+        "current_attempt": current_attempt_data,
+        "next_attempts": next_attempts[:10],
+        "waiting_attempts": next_attempts,
+        "athlete_count": athlete_count,
+        "has_current_attempt": current_attempt_data is not None,
+        "waiting_count": len(next_attempts),
+    }
+
+
+def build_competition_rankings(competition_id: int) -> Optional[list]:
+    """Top 10 rankings from Score, falling back to the athlete list"""
+    competition = db.session.get(Competition, competition_id)
+    if not competition:
+        return None
+
+    scores = (
+        db.session.query(Score)
+        .join(AthleteEntry)
+        .join(Athlete)
+        .filter(Athlete.competition_id == competition_id)
+        .options(joinedload(Score.athlete_entry).joinedload(AthleteEntry.athlete))
+        .order_by(Score.rank.asc(), Score.total_score.desc())
+        .all()
+    )
+
+    rankings = []
+    for i, score in enumerate(scores):
+        rankings.append(
+            {
+                "rank": score.rank or (i + 1),
+                "athlete": _athlete_summary(score.athlete_entry.athlete),
+                "total_score": score.total_score or 0,
+                "best_attempt_weight": score.best_attempt_weight or 0,
+            }
+        )
+
+    if not rankings:
+        athletes = (
+            Athlete.query.filter_by(competition_id=competition_id, is_active=True)
+            .limit(10)
+            .all()
+        )
+        for i, athlete in enumerate(athletes):
+            rankings.append(
+                {
+                    "rank": i + 1,
+                    "athlete": _athlete_summary(athlete),
+                    "total_score": 0,
+                    "best_attempt_weight": 0,
+                }
+            )
+
+    return rankings[:10]
+
+
+_FAILED_RESULTS = (
+    AttemptResult.NO_LIFT,
+    AttemptResult.NOT_TO_DEPTH,
+    AttemptResult.MISSED,
+    AttemptResult.DNF,
+)
+
+_MALE_CLASSES = (
+    (61, "61kg"),
+    (67, "67kg"),
+    (73, "73kg"),
+    (81, "81kg"),
+    (89, "89kg"),
+    (96, "96kg"),
+    (102, "102kg"),
+)
+_FEMALE_CLASSES = (
+    (49, "49kg"),
+    (55, "55kg"),
+    (59, "59kg"),
+    (64, "64kg"),
+    (71, "71kg"),
+    (76, "76kg"),
+    (81, "81kg"),
+)
+
+
+def _weight_class(athlete: Athlete) -> str:
+    """Simple weight class approximation from bodyweight and gender"""
+    if not athlete.bodyweight:
+        return ""
+    if athlete.gender == "M":
+        classes, heaviest = _MALE_CLASSES, "102+kg"
+    else:
+        classes, heaviest = _FEMALE_CLASSES, "81+kg"
+    for limit, label in classes:
+        if athlete.bodyweight <= limit:
+            return label
+    return heaviest
+
+
+def _reps_value(entry: AthleteEntry):
+    if not entry.reps:
+        return None
+    try:
+        reps_data = (
+            json.loads(entry.reps) if isinstance(entry.reps, str) else entry.reps
+        )
+        return reps_data.get("value") if isinstance(reps_data, dict) else reps_data
+    except (TypeError, ValueError):
+        return entry.reps
+
+
+def build_flights_data(competition_id: int) -> Optional[dict]:
+    """
+    Nested competition > events > flights > athletes > attempts structure for
+    the public stage, assembled from one query each for flights, entries,
+    attempts and scores.
+    """
+    competition = db.session.get(Competition, competition_id)
+    if not competition:
+        return None
+
+    flights = (
+        Flight.query.filter_by(competition_id=competition_id)
+        .options(joinedload(Flight.event))
+        .order_by(Flight.id)
+        .all()
+    )
+
+    entries = (
+        AthleteEntry.query.join(Flight, AthleteEntry.flight_id == Flight.id)
+        .filter(Flight.competition_id == competition_id)
+        .options(joinedload(AthleteEntry.athlete), joinedload(AthleteEntry.movement))
+        .order_by(AthleteEntry.id)
+        .all()
+    )
+    entries_by_flight: Dict[int, list] = {}
+    for entry in entries:
+        entries_by_flight.setdefault(entry.flight_id, []).append(entry)
+
+    attempts = (
+        Attempt.query.join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
+        .join(Flight, AthleteEntry.flight_id == Flight.id)
+        .filter(Flight.competition_id == competition_id)
+        .order_by(Attempt.athlete_entry_id, Attempt.attempt_number)
+        .all()
+    )
+    attempts_by_entry: Dict[int, list] = {}
+    for attempt in attempts:
+        attempts_by_entry.setdefault(attempt.athlete_entry_id, []).append(attempt)
+
+    scores = (
+        Score.query.join(AthleteEntry, Score.athlete_entry_id == AthleteEntry.id)
+        .join(Flight, AthleteEntry.flight_id == Flight.id)
+        .filter(Flight.competition_id == competition_id)
+        .all()
+    )
+    scores_by_entry = {score.athlete_entry_id: score for score in scores}
+
+    current_entry_id = getattr(competition, "current_athlete_entry_id", None)
+    events_dict: Dict[str, dict] = {}
+
+    for flight in flights:
+        if flight.event_id and flight.event:
+            event_name = flight.event.name
+        elif flight.movement_type:
+            event_name = flight.movement_type
+        else:
+            event_name = f"Event {flight.id}"
+
+        if event_name not in events_dict:
+            events_dict[event_name] = {"name": event_name, "flights": []}
+
+        athletes_data = []
+        for entry in entries_by_flight.get(flight.id, []):
+            athlete = entry.athlete
+
+            attempts_data = []
+            best_weight_attempt = 0
+            for attempt in attempts_by_entry.get(entry.id, []):
+                result_str = None
+                if attempt.final_result == AttemptResult.GOOD_LIFT:
+                    result_str = "success"
+                elif attempt.final_result in _FAILED_RESULTS:
+                    result_str = "fail"
+
+                attempts_data.append(
+                    {
+                        "number": attempt.attempt_number,
+                        "weight": attempt.requested_weight,
+                        "result": result_str,
+                        "reps": None,
+                    }
+                )
+                if (
+                    result_str == "success"
+                    and attempt.requested_weight > best_weight_attempt
+                ):
+                    best_weight_attempt = attempt.requested_weight
+
+            while len(attempts_data) < 3:
+                attempts_data.append(
+                    {
+                        "number": len(attempts_data) + 1,
+                        "weight": None,
+                        "result": None,
+                        "reps": None,
+                    }
+                )
+
+            weight_class = _weight_class(athlete)
+            category = (
+                f"{athlete.gender}'s {weight_class}" if weight_class else athlete.gender
+            )
+
+            # Prefer score model values; fall back to attempt-derived data
+            score_record = scores_by_entry.get(entry.id)
+            score_best = score_record.best_attempt_weight if score_record else None
+            score_total = score_record.total_score if score_record else None
+            final_best = (
+                score_best
+                if score_best is not None
+                else (best_weight_attempt if best_weight_attempt > 0 else None)
+            )
+            final_total = (
+                score_total
+                if score_total is not None
+                else (final_best if final_best is not None else 0)
+            )
+
+            athletes_data.append(
+                {
+                    "id": athlete.id,
+                    "name": f"{athlete.first_name} {athlete.last_name}",
+                    "class": weight_class,
+                    "category": category,
+                    "gender": athlete.gender,
+                    "attempts": attempts_data,
+                    "best": final_best,
+                    "reps": _reps_value(entry),
+                    "total": final_total,
+                    "is_current": current_entry_id is not None
+                    and entry.id == current_entry_id,
+                }
+            )
+
+        events_dict[event_name]["flights"].append(
+            {"id": flight.id, "name": flight.name, "athletes": athletes_data}
+        )
+
+    return {
+        "competition": {"id": competition.id, "name": competition.name},
+        "events": list(events_dict.values()),
+    }
+
+
+def current_lifter_summary(state: Optional[dict]) -> dict:
+    """The slice of competition state a stage display shows as 'now / next'"""
+    if not state:
+        return {"current_attempt": None, "next_attempt": None}
+    next_attempts = state.get("next_attempts") or []
+    return {
+        "current_attempt": state.get("current_attempt"),
+        "next_attempt": next_attempts[0] if next_attempts else None,
+    }
+
+
+def rankings_delta(previous: Optional[list], current: Optional[list]) -> dict:
+    """
+    Rows that changed between two rankings snapshots, keyed by athlete id,
+    plus the ids of athletes that dropped out of the list.
+    """
+    previous_by_athlete = {row["athlete"]["id"]: row for row in previous or []}
+    current_ids = set()
+    changed = []
+    for row in current or []:
+        athlete_id = row["athlete"]["id"]
+        current_ids.add(athlete_id)
+        if previous_by_athlete.get(athlete_id) != row:
+            changed.append(row)
+    removed = [aid for aid in previous_by_athlete if aid not in current_ids]
+    return {"changed": changed, "removed": removed}
+
+
+def _flight_cards(flights_data: dict) -> Tuple[list, list]:
+    """
+    Pivot the nested flights data into one card per flight with a cell per
+    event column, the shape the stage table is drawn in.
+    """
+    events = flights_data.get("events") or []
+    event_names = [event.get("name") for event in events]
+    cards: Dict[int, dict] = {}
+
+    for event_index, event in enumerate(events):
+        for flight in event.get("flights", []):
+            card = cards.setdefault(
+                flight["id"], {"id": flight["id"], "name": flight["name"], "rows": {}}
+            )
+            for athlete in flight.get("athletes", []):
+                row = card["rows"].get(athlete["id"])
+                if row is None:
+                    row = {
+                        "id": athlete["id"],
+                        "name": athlete["name"],
+                        "class": athlete["class"],
+                        "gender": athlete["gender"],
+                        "is_current": athlete["is_current"],
+                        "total": 0,
+                        "events": [None] * len(events),
+                    }
+                    card["rows"][athlete["id"]] = row
+                row["events"][event_index] = {
+                    "attempts": athlete["attempts"],
+                    "best": athlete["best"],
+                }
+                if athlete["total"] is not None:
+                    row["total"] += athlete["total"]
+
+    flights = [
+        {
+            "id": card["id"],
+            "name": card["name"],
+            "athletes": list(card["rows"].values()),
+        }
+        for card in cards.values()
+    ]
+    return event_names, flights
+
+
+def _fragment_context(name: str, competition_id: int) -> Optional[dict]:
+    if name in ("flights_table", "event_tabs"):
+        flights_data = projection_cache.get(
+            "flights", competition_id, build_flights_data
+        )
+        if flights_data is None:
+            return None
+        events, flights = _flight_cards(flights_data)
+        return {"events": events, "flights": flights}
+    if name == "current_lifter":
+        state = projection_cache.get("state", competition_id, build_competition_state)
+        if state is None:
+            return None
+        return {"current_attempt": state["current_attempt"]}
+    if name == "rankings":
+        rankings = projection_cache.get(
+            "rankings", competition_id, build_competition_rankings
+        )
+        if rankings is None:
+            return None
+        return {"rankings": rankings}
+    raise KeyError(name)
+
+
+FRAGMENTS = ("flights_table", "event_tabs", "current_lifter", "rankings")
+
+
+def render_fragment(name: str, competition_id: int) -> Optional[dict]:
+    """
+    Render one display fragment, at most once per data version. Returns
+    ``{"version": ..., "html": ...}`` where the version is a content hash, so
+    a commit that leaves the rendered markup unchanged does not make every
+    screen swap it.
+    """
+    if name not in FRAGMENTS:
+        raise KeyError(name)
+
+    def build(cid):
+        context = _fragment_context(name, cid)
+        if context is None:
+            return None
+        html = render_template(f"display/fragments/{name}.html", **context)
+        version = hashlib.sha1(html.encode("utf-8")).hexdigest()[:16]
+        return {"version": version, "html": html}
+
+    return projection_cache.get(f"fragment:{name}", competition_id, build)
+
+
+_timer_state_lock = threading.Lock()
+_timer_state_cache: Dict[str, Tuple[Tuple[int, int], dict]] = {}
+
+
+def load_timer_state(instance_path: str) -> dict:
+    """
+    Read the shared timer state file, re-parsing it only when it changes on
+    disk. Returns a fresh dict the caller is free to modify.
+    """
+    state_file = Path(instance_path) / "timer_state.json"
+    try:
+        stat = os.stat(state_file)
+    except FileNotFoundError:
+        return dict(DEFAULT_TIMER_STATE)
+
+    signature = (stat.st_mtime_ns, stat.st_size)
+    key = str(state_file)
+    with _timer_state_lock:
+        cached = _timer_state_cache.get(key)
+    if cached and cached[0] == signature:
+        return dict(cached[1])
+
+    with state_file.open("r") as f:
+        state = json.load(f)
+    state.setdefault("break_timer_seconds", 0)
+    state.setdefault("break_timer_running", False)
+    state.setdefault("break_timer_type", "")
+    state.setdefault("break_timer_message", "")
+
+    with _timer_state_lock:
+        _timer_state_cache[key] = (signature, state)
+    return dict(state)
+
+
+# Global instance
+projection_cache = ProjectionCache()
@@ -0,0 +1,26 @@
+"""
+Opaque cursors for keyset pagination on (timestamp, id), newest first.
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+def encode_cursor(timestamp: Optional[datetime], row_id: int) -> str:
+    """Cursor for the row a page ended on"""
+    raw = f"{timestamp.isoformat() if timestamp else ''}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[datetime], int]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        timestamp, row_id = raw.split("|")
+        return (
+            datetime.fromisoformat(timestamp) if timestamp else None,
+            int(row_id),
+        )
+    except (UnicodeError, ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
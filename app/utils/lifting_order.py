@@ -0,0 +1,525 @@
+"""
+Server-side lifting order per flight.
+
+Finished attempts keep their places at the head of the flight, in the order
+they were completed. Waiting attempts follow in their stored order, which is
+weight order (requested weight, then attempt number, then lot number)
+unless an admin arranged the flight by hand. Each flight's order is kept in
+memory. A weight change only moves the changed attempt past the attempts it
+now outweighs (or is outweighed by), so a hand-made order survives it, and
+only the attempts whose position moved are written back.
+"""
+
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, event, inspect, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from ..extensions import db
+from ..models import Attempt, AthleteFlight, Flight
+from ..real_time.change_feed import mark_changed
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ("finished", "success", "failed")
+
+# Attempt columns that decide where an attempt sits in the order
+_ORDER_ATTRIBUTES = (
+    "flight_id",
+    "requested_weight",
+    "attempt_number",
+    "status",
+    "completed_at",
+    "final_result",
+    "lifting_order",
+)
+
+
+# Attempt columns that decide where a waiting attempt goes, beyond its key
+_PLACEMENT_ATTRIBUTES = ("flight_id", "status", "completed_at", "final_result")
+
+
+def is_finished(status, completed_at=None, final_result=None) -> bool:
+    """The status field wins; legacy fields only count when it is empty"""
+    if status and status.strip():
+        return status.lower() in FINISHED_STATUSES
+    return bool(completed_at or final_result)
+
+
+def order_key(requested_weight, attempt_number, lot_number, attempt_id) -> Tuple:
+    """Sort key of a waiting attempt; attempts without a lot number go last"""
+    return (
+        float(requested_weight or 0),
+        attempt_number or 0,
+        lot_number is None,
+        lot_number or 0,
+        attempt_id,
+    )
+
+
+@dataclass
+class FlightOrder:
+    """Lifting order of one flight"""
+
+    flight_id: int
+    competition_id: Optional[int]
+    done: List[int] = field(default_factory=list)
+    waiting: List[int] = field(default_factory=list)
+    key_of: Dict[int, Tuple] = field(default_factory=dict)
+    lot_of: Dict[int, Optional[int]] = field(default_factory=dict)
+    stored: Dict[int, Optional[int]] = field(default_factory=dict)
+
+    def attempt_ids(self) -> List[int]:
+        return self.done + self.waiting
+
+    def position(self, attempt_id: int) -> Optional[int]:
+        """1-based lifting order"""
+        if attempt_id in self.key_of:
+            return len(self.done) + self.waiting.index(attempt_id) + 1
+        if attempt_id in self.done:
+            return self.done.index(attempt_id) + 1
+        return None
+
+    def _changes(self, start: int, stop: int) -> Dict[int, int]:
+        """Positions of waiting attempts [start, stop] that differ from stored"""
+        changes = {}
+        for index in range(start, min(stop, len(self.waiting) - 1) + 1):
+            attempt_id = self.waiting[index]
+            position = len(self.done) + index + 1
+            if self.stored.get(attempt_id) != position:
+                changes[attempt_id] = position
+        return changes
+
+    def _swap(self, index: int) -> None:
+        waiting = self.waiting
+        waiting[index], waiting[index + 1] = waiting[index + 1], waiting[index]
+
+    def reposition(self, attempt_id: int, new_key: Tuple) -> Dict[int, int]:
+        """
+        Move a waiting attempt after its key changed from the one it was
+        placed by. It only passes neighbours whose order relative to it the
+        change reversed, which in a weight-ordered flight is the same as
+        re-sorting it, and in a hand-made order leaves everyone else put.
+        """
+        old_key = self.key_of[attempt_id]
+        self.key_of[attempt_id] = new_key
+        start = stop = self.waiting.index(attempt_id)
+        while (
+            stop + 1 < len(self.waiting)
+            and old_key < self.key_of[self.waiting[stop + 1]] < new_key
+        ):
+            self._swap(stop)
+            stop += 1
+        while start > 0 and new_key < self.key_of[self.waiting[start - 1]] < old_key:
+            self._swap(start - 1)
+            start -= 1
+        return self._changes(start, stop)
+
+    def insert(self, attempt_id: int, key: Tuple) -> Dict[int, int]:
+        """Place a waiting attempt before the first one with a greater key"""
+        index = next(
+            (i for i, other in enumerate(self.waiting) if self.key_of[other] > key),
+            len(self.waiting),
+        )
+        self.waiting.insert(index, attempt_id)
+        self.key_of[attempt_id] = key
+        return self._changes(index, len(self.waiting) - 1)
+
+    def remove(self, attempt_id: int) -> None:
+        """Take a waiting attempt out without renumbering (see insert)"""
+        self.waiting.remove(attempt_id)
+        del self.key_of[attempt_id]
+
+    def complete(self, attempt_id: int) -> Dict[int, int]:
+        """
+        Move a waiting attempt behind the finished ones. Waiting attempts
+        that were ahead of it shift back by one; those after it keep their
+        place.
+        """
+        index = self.waiting.index(attempt_id)
+        self.remove(attempt_id)
+        self.done.append(attempt_id)
+        changes = self._changes(0, index - 1)
+        position = len(self.done)
+        if self.stored.get(attempt_id) != position:
+            changes[attempt_id] = position
+        return changes
+
+    def sort_by_weight(self) -> None:
+        """Drop any hand-made order"""
+        self.waiting.sort(key=self.key_of.__getitem__)
+
+    def full_changes(self) -> Dict[int, int]:
+        """Every attempt whose stored position differs from the order"""
+        changes = {
+            attempt_id: position
+            for position, attempt_id in enumerate(self.done, start=1)
+            if self.stored.get(attempt_id) != position
+        }
+        changes.update(self._changes(0, len(self.waiting) - 1))
+        return changes
+
+
+def load_flight_order(
+    flight_id: int, moved: Optional[Dict[int, Optional[Tuple]]] = None
+) -> FlightOrder:
+    """
+    Read a flight's attempts and lot numbers in one query. Waiting attempts
+    keep their stored order; those without one are placed by weight.
+
+    moved maps attempts changed since their order was stored to the
+    (requested_weight, attempt_number) they were placed by, or to None if
+    they have to be placed afresh. They are moved as a weight change would.
+    """
+    moved = moved or {}
+    flight = db.session.get(Flight, flight_id)
+    order = FlightOrder(
+        flight_id=flight_id,
+        competition_id=flight.competition_id if flight else None,
+    )
+    rows = (
+        db.session.query(
+            Attempt.id,
+            Attempt.requested_weight,
+            Attempt.attempt_number,
+            Attempt.status,
+            Attempt.completed_at,
+            Attempt.final_result,
+            Attempt.lifting_order,
+            AthleteFlight.lot_number,
+        )
+        .outerjoin(
+            AthleteFlight,
+            and_(
+                AthleteFlight.athlete_id == Attempt.athlete_id,
+                AthleteFlight.flight_id == Attempt.flight_id,
+            ),
+        )
+        .filter(Attempt.flight_id == flight_id)
+        .all()
+    )
+
+    done = []
+    waiting = []
+    for row in rows:
+        if row.id in order.stored:
+            continue  # athlete listed twice in the flight; first lot wins
+        order.stored[row.id] = row.lifting_order
+        order.lot_of[row.id] = row.lot_number
+        if is_finished(row.status, row.completed_at, row.final_result):
+            done.append(row)
+        else:
+            waiting.append(row)
+
+    done.sort(
+        key=lambda row: (
+            row.completed_at is None,
+            row.completed_at or 0,
+            row.lifting_order is None,
+            row.lifting_order or 0,
+            row.id,
+        )
+    )
+    order.done = [row.id for row in done]
+
+    def key(row):
+        return order_key(
+            row.requested_weight, row.attempt_number, row.lot_number, row.id
+        )
+
+    placed = sorted(
+        (row for row in waiting if row.lifting_order is not None),
+        key=lambda row: (row.lifting_order, key(row)),
+    )
+    order.waiting = [row.id for row in placed]
+    order.key_of = {row.id: key(row) for row in placed}
+    unplaced = [row for row in waiting if row.lifting_order is None]
+    for row in sorted(unplaced, key=key):
+        order.insert(row.id, key(row))
+
+    for row in placed:
+        if row.id not in moved:
+            continue
+        previous = moved[row.id]
+        if previous is None:
+            order.remove(row.id)
+            order.insert(row.id, key(row))
+        else:
+            order.key_of[row.id] = order_key(*previous, row.lot_number, row.id)
+            order.reposition(row.id, key(row))
+    return order
+
+
+def write_lifting_orders(flight_id: int, changes: Dict[int, int]) -> int:
+    """
+    Persist {attempt_id: lifting_order} for one flight with a single
+    executemany UPDATE. Loaded attempts are updated in place without being
+    marked dirty. Nothing is committed here.
+    """
+    if not changes:
+        return 0
+    stmt = (
+        update(Attempt.__table__)
+        .where(
+            Attempt.__table__.c.id == bindparam("b_id"),
+            Attempt.__table__.c.flight_id == bindparam("b_flight_id"),
+        )
+        .values(lifting_order=bindparam("b_lifting_order"))
+    )
+    db.session.execute(
+        stmt,
+        [
+            {"b_id": attempt_id, "b_flight_id": flight_id, "b_lifting_order": order}
+            for attempt_id, order in changes.items()
+        ],
+    )
+
+    mapper = inspect(Attempt)
+    identity_map = db.session.identity_map
+    for attempt_id, position in changes.items():
+        attempt = identity_map.get(mapper.identity_key_from_primary_key([attempt_id]))
+        if attempt is not None:
+            set_committed_value(attempt, "lifting_order", position)
+    return len(changes)
+
+
+class LiftingOrderEngine:
+    """
+    Flight id -> FlightOrder. Orders are changed in memory by the calls
+    below; any other change to a flight's attempts drops its order when the
+    session commits, and it is reloaded on next use.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._flights: Dict[int, FlightOrder] = {}
+        # Flight id -> attempts changed elsewhere, applied on the next load
+        self._moved: Dict[int, Dict[int, Optional[Tuple]]] = {}
+
+    def _flight(self, flight_id: int) -> Tuple[FlightOrder, Dict[int, int]]:
+        """Cached order, or a fresh load plus the rows it would correct"""
+        with self._lock:
+            order = self._flights.get(flight_id)
+            moved = self._moved.pop(flight_id, {}) if order is None else {}
+        if order is not None:
+            return order, {}
+        loaded = load_flight_order(flight_id, moved)
+        with self._lock:
+            order = self._flights.setdefault(flight_id, loaded)
+            return order, order.full_changes()
+
+    def note_moved(self, flight_id: int, moved: Dict[int, Optional[Tuple]]) -> None:
+        """
+        Record attempts of a flight changed without attempt_changed(), with
+        the values they were placed by (see load_flight_order). The first
+        record of an attempt wins: that is where its stored order put it.
+        """
+        with self._lock:
+            pending = self._moved.setdefault(flight_id, {})
+            for attempt_id, previous in moved.items():
+                pending.setdefault(attempt_id, previous)
+
+    def _persist(self, order: FlightOrder, changes: Dict[int, int]) -> int:
+        if not changes:
+            return 0
+        session = db.session()
+        session.info.setdefault("lifting_order_flights", set()).add(order.flight_id)
+        written = write_lifting_orders(order.flight_id, changes)
+        with self._lock:
+            order.stored.update(changes)
+        mark_changed(session, order.competition_id)
+        return written
+
+    def sync(self, flight_id: int) -> int:
+        """Bring a flight's stored order in line with the engine"""
+        order, changes = self._flight(flight_id)
+        return self._persist(order, changes)
+
+    def order(self, flight_id: int) -> List[int]:
+        """Attempt ids of a flight in lifting order"""
+        order, _ = self._flight(flight_id)
+        with self._lock:
+            return order.attempt_ids()
+
+    def resort(self, flight_id: int) -> int:
+        """Put a flight's waiting attempts back into weight order"""
+        self.invalidate(flight_id)
+        order, _ = self._flight(flight_id)
+        with self._lock:
+            order.sort_by_weight()
+            changes = order.full_changes()
+        return self._persist(order, changes)
+
+    def attempt_changed(self, attempt: Attempt) -> int:
+        """
+        Reposition an attempt after its weight changed or it was finished.
+        Call before committing; returns the number of rows written.
+        """
+        # Before any query below autoflushes the attempt's own change
+        db.session().info.setdefault("lifting_order_synced", set()).add(attempt.id)
+        with self._lock:
+            cached = attempt.flight_id in self._flights
+        if not cached:
+            # The load reads the new values; history says where it stood
+            self.note_moved(attempt.flight_id, {attempt.id: _placed_by(attempt)})
+        order, changes = self._flight(attempt.flight_id)
+
+        finished = is_finished(
+            attempt.status, attempt.completed_at, attempt.final_result
+        )
+        with self._lock:
+            if attempt.id in order.key_of:
+                if finished:
+                    changes.update(order.complete(attempt.id))
+                else:
+                    key = order_key(
+                        attempt.requested_weight,
+                        attempt.attempt_number,
+                        order.lot_of.get(attempt.id),
+                        attempt.id,
+                    )
+                    if key != order.key_of[attempt.id]:
+                        changes.update(order.reposition(attempt.id, key))
+                stale = False
+            else:
+                # Unknown here, or reopened after being finished
+                stale = not (finished and attempt.id in order.done)
+
+        if stale:
+            self.invalidate(attempt.flight_id)
+            self.note_moved(attempt.flight_id, {attempt.id: None})
+            order, changes = self._flight(attempt.flight_id)
+        return self._persist(order, changes)
+
+    def invalidate(self, flight_id: Optional[int] = None) -> None:
+        with self._lock:
+            if flight_id is None:
+                self._flights.clear()
+                self._moved.clear()
+            else:
+                self._flights.pop(flight_id, None)
+
+    def invalidate_many(self, flight_ids: Iterable[Optional[int]]) -> None:
+        for flight_id in flight_ids:
+            if flight_id is not None:
+                self.invalidate(flight_id)
+
+
+def mark_order_stale(session, flight_id: Optional[int]) -> None:
+    """
+    Record a change to a flight's attempts made with bulk/Core statements,
+    which bypass the flush hooks. Its order is reloaded after the commit.
+    """
+    session.info.setdefault("stale_lifting_orders", set()).add(flight_id)
+
+
+def _order_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in _ORDER_ATTRIBUTES)
+
+
+def _previous(attr):
+    """Value before the unflushed change; None (unknown) when never loaded"""
+    history = attr.history
+    if history.deleted:
+        return history.deleted[0]
+    if history.added:
+        return None
+    return attr.value
+
+
+def _placed_by(attempt: Attempt) -> Optional[Tuple]:
+    """
+    (requested_weight, attempt_number) an attempt was placed by before its
+    unflushed changes, or None when it has to be placed afresh: it is new,
+    came from another flight, was reopened after finishing, or its old
+    values are unknown.
+    """
+    state = inspect(attempt)
+    attrs = state.attrs
+    if state.pending or attrs.flight_id.history.deleted:
+        return None
+    was_finished = is_finished(
+        _previous(attrs.status),
+        _previous(attrs.completed_at),
+        _previous(attrs.final_result),
+    )
+    if was_finished:
+        return None
+    weight = attrs.requested_weight.history
+    number = attrs.attempt_number.history
+    if (weight.added and not weight.deleted) or (number.added and not number.deleted):
+        return None
+    return (_previous(attrs.requested_weight), _previous(attrs.attempt_number))
+
+
+def _placement_changed(obj) -> bool:
+    attrs = inspect(obj).attrs
+    return any(
+        attrs[name].history.has_changes()
+        for name in ("requested_weight", "attempt_number") + _PLACEMENT_ATTRIBUTES
+    )
+
+
+def _after_flush(session, flush_context):
+    stale = session.info.setdefault("stale_lifting_orders", set())
+    moved = session.info.setdefault("moved_lifting_orders", {})
+    synced = session.info.get("lifting_order_synced", set())
+    for obj in session.new:
+        if isinstance(obj, (Attempt, AthleteFlight)):
+            stale.add(obj.flight_id)
+    for obj in session.deleted:
+        if isinstance(obj, (Attempt, AthleteFlight)):
+            stale.add(obj.flight_id)
+    for obj in session.dirty:
+        if isinstance(obj, Attempt):
+            if obj.id not in synced and _order_changed(obj):
+                stale.add(obj.flight_id)
+                flight_history = inspect(obj).attrs.flight_id.history
+                stale.update(flight_history.deleted or ())
+                if _placement_changed(obj):
+                    # A stored lifting_order alone is kept as it is
+                    moved.setdefault(obj.flight_id, {}).setdefault(
+                        obj.id, _placed_by(obj)
+                    )
+        elif isinstance(obj, AthleteFlight):
+            stale.add(obj.flight_id)
+
+
+def _after_commit(session):
+    for flight_id, attempts in session.info.pop("moved_lifting_orders", {}).items():
+        if flight_id is not None:
+            lifting_order_engine.note_moved(flight_id, attempts)
+    lifting_order_engine.invalidate_many(
+        session.info.pop("stale_lifting_orders", set())
+    )
+    session.info.pop("lifting_order_synced", None)
+    session.info.pop("lifting_order_flights", None)
+
+
+def _after_rollback(session):
+    session.info.pop("moved_lifting_orders", None)
+    # Orders changed in memory during the transaction are rolled back too
+    lifting_order_engine.invalidate_many(
+        session.info.pop("stale_lifting_orders", set())
+        | session.info.pop("lifting_order_flights", set())
+    )
+    session.info.pop("lifting_order_synced", None)
+
+
+def track_lifting_order_changes() -> None:
+    """Drop cached flight orders when attempts change elsewhere (idempotent)"""
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.debug("Lifting order engine attached to SQLAlchemy sessions")
+
+
+# Global instance
+lifting_order_engine = LiftingOrderEngine()
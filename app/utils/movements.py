@@ -0,0 +1,131 @@
+"""
+Movement definitions: the movements of each event, normalized out of
+Competition.config into MovementDefinition rows.
+
+Entries reference their definition by (event_id, lift_type) and only store
+athlete overrides, so changing a movement in the config updates one row
+rather than every entry for it.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Tuple
+
+from ..extensions import db
+from ..models import AthleteEntry, Event, MovementDefinition
+from .competition_config import compiled_config
+
+logger = logging.getLogger(__name__)
+
+# Longest name an entry's lift_type can hold
+MAX_MOVEMENT_NAME = 50
+
+
+@dataclass
+class MovementSync:
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    overrides_reset: int = 0
+
+
+def movement_values(mv: dict) -> dict:
+    """Definition columns for a movement block of the config"""
+    timer = mv.get("timer") or {}
+    attempt_seconds = timer.get("attempt_seconds", 60)
+    return {
+        "reps": mv.get("reps"),
+        "attempt_seconds": int(attempt_seconds)
+        if attempt_seconds is not None
+        else None,
+        "config": mv,
+    }
+
+
+def _movements_by_name(compiled, event: Event) -> Dict[str, dict]:
+    """Name -> movement block; the first block with a name wins"""
+    movements = {}
+    for mv in compiled.movements_for_event(event.id, event.name):
+        name = (mv.get("name") or "").strip()
+        if name and len(name) <= MAX_MOVEMENT_NAME:
+            movements.setdefault(name, mv)
+    return movements
+
+
+def sync_movement_definitions(events: Iterable[Event], compiled) -> MovementSync:
+    """
+    Make the definitions of these events match a compiled config: changed
+    movements are updated in place, new ones added and removed ones deleted.
+    When a movement's reps change, athletes' rep overrides for it are reset
+    (one UPDATE per movement), as a config change always has.
+    Nothing is committed here.
+    """
+    events = [event for event in events if event.id is not None]
+    result = MovementSync()
+    if not events:
+        return result
+
+    existing: Dict[Tuple[int, str], MovementDefinition] = {
+        (definition.event_id, definition.name): definition
+        for definition in MovementDefinition.query.filter(
+            MovementDefinition.event_id.in_([event.id for event in events])
+        )
+    }
+
+    for event in events:
+        movements = _movements_by_name(compiled, event)
+        for name, mv in movements.items():
+            values = movement_values(mv)
+            definition = existing.pop((event.id, name), None)
+            if definition is None:
+                db.session.add(
+                    MovementDefinition(
+                        competition_id=event.competition_id,
+                        event_id=event.id,
+                        name=name,
+                        **values,
+                    )
+                )
+                result.created += 1
+                continue
+            if all(getattr(definition, key) == value for key, value in values.items()):
+                continue
+            if definition.reps != values["reps"]:
+                result.overrides_reset += AthleteEntry.query.filter(
+                    AthleteEntry.event_id == event.id,
+                    AthleteEntry.lift_type == name,
+                    AthleteEntry.reps_override.isnot(None),
+                ).update({AthleteEntry.reps_override: None}, synchronize_session=False)
+            for key, value in values.items():
+                setattr(definition, key, value)
+            result.updated += 1
+
+    # Whatever is left is no longer in the config. Definitions that entries
+    # still point at are kept, as the entries' own copies used to be.
+    if existing:
+        in_use = set(
+            db.session.query(AthleteEntry.event_id, AthleteEntry.lift_type)
+            .filter(
+                AthleteEntry.event_id.in_({key[0] for key in existing}),
+                AthleteEntry.lift_type.in_({key[1] for key in existing}),
+            )
+            .distinct()
+        )
+        for key, definition in existing.items():
+            if key not in in_use:
+                db.session.delete(definition)
+                result.deleted += 1
+    return result
+
+
+def ensure_movement_definitions(event: Event) -> List[MovementDefinition]:
+    """
+    Definitions for an event, created from the competition config if
+    missing (competitions saved before definitions existed)
+    """
+    definitions = MovementDefinition.query.filter_by(event_id=event.id).all()
+    if definitions:
+        return definitions
+    sync_movement_definitions([event], compiled_config(event.competition))
+    db.session.flush()
+    return MovementDefinition.query.filter_by(event_id=event.id).all()
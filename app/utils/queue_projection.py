@@ -0,0 +1,379 @@
+"""
+Shared per-competition lifting queue projection.
+
+Every attempt in a competition is read once per data version into plain
+rows. From those rows the projection answers the athlete-facing questions
+(next attempt, queue position, cumulative ETA, first-in-queue and
+first-of-flight flags) with dictionary lookups instead of queries.
+"""
+
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, func
+
+from ..extensions import db
+from ..models import Attempt, AthleteEntry, Event, MovementDefinition
+from ..real_time.timer_manager import timer_manager
+from .display_projections import projection_cache
+
+# Seconds allowed per attempt on top of its time limit (loading, walk-up)
+ATTEMPT_BUFFER_SECONDS = 15
+
+DEFAULT_ATTEMPT_TIME_LIMIT = 60
+
+
+@dataclass
+class EventInfo:
+    """Event fields the athlete views need"""
+
+    id: int
+    name: str
+    sport_type: object
+    weight_category: Optional[str]
+    gender: Optional[str]
+
+
+@dataclass
+class AttemptRow:
+    """One attempt, flattened with its entry's fields"""
+
+    id: int
+    athlete_id: int
+    event_id: int
+    flight_id: int
+    status: str
+    movement_type: Optional[str]
+    lift_type: Optional[str]
+    attempt_number: int
+    requested_weight: float
+    lifting_order: Optional[int]
+    started_at: Optional[datetime]
+    completed_at: Optional[datetime]
+    time_limit: int
+
+    @property
+    def movement_name(self) -> str:
+        return self.lift_type or "Unknown"
+
+
+@dataclass
+class FlightStatus:
+    """Precomputed per-flight flags"""
+
+    flight_id: int
+    first_attempt_id: Optional[int] = None  # head of the in-progress/waiting queue
+    has_completed: bool = False
+    has_in_progress: bool = False
+
+
+@dataclass
+class QueueSlot:
+    """A waiting attempt's place in the queue"""
+
+    attempt_id: int
+    flight_id: int
+    position: int  # 0-based position among all waiting attempts
+    flight_position: int  # 0-based position among waiting attempts in its flight
+    seconds_ahead: int  # time for waiting attempts ahead of this one
+    time_limit: int
+
+
+@dataclass
+class QueueProjection:
+    """Lifting queue snapshot for one competition (and optional sport type)"""
+
+    competition_id: int
+    current: Optional[AttemptRow] = None
+    slots: Dict[int, QueueSlot] = field(default_factory=dict)
+    order: List[int] = field(default_factory=list)
+
+    def current_remaining(self) -> int:
+        """
+        Seconds left on the in-progress attempt. Live timers win, then the
+        attempt's start time; with neither, the full time limit is assumed.
+        """
+        current = self.current
+        if not current:
+            return 0
+
+        for timer_id in (
+            f"attempt_{current.id}",
+            f"break_athlete_{current.athlete_id}",
+        ):
+            timer_data = timer_manager.get_timer_data(self.competition_id, timer_id)
+            if timer_data and timer_data.state.value in ["running", "paused"]:
+                if timer_data.remaining and timer_data.remaining > 0:
+                    return timer_data.remaining
+                return current.time_limit
+
+        if current.started_at:
+            elapsed = (datetime.utcnow() - current.started_at).total_seconds()
+            remaining = int(current.time_limit - elapsed)
+            if remaining > 0:
+                return remaining
+        return current.time_limit
+
+    def estimated_seconds(self, attempt_id: int) -> int:
+        """ETA for a waiting attempt; 0 if it is not waiting in this queue"""
+        slot = self.slots.get(attempt_id)
+        if slot is None:
+            return 0
+        return max(0, int(self.current_remaining() + slot.seconds_ahead))
+
+
+def _queue_sort_key(row: AttemptRow) -> Tuple:
+    """lifting_order (nulls last), then requested weight, then attempt number"""
+    return (
+        row.lifting_order is None,
+        row.lifting_order or 0,
+        row.requested_weight,
+        row.attempt_number,
+    )
+
+
+def _sport_key(sport_type) -> str:
+    if sport_type is None:
+        return "all"
+    return getattr(sport_type, "value", str(sport_type))
+
+
+class CompetitionStatus:
+    """
+    Everything the athlete timer needs for one competition, built from two
+    queries per data version.
+    """
+
+    def __init__(self, competition_id: int, events: Dict[int, EventInfo], rows):
+        self.competition_id = competition_id
+        self.events = events
+        self.attempts: Dict[int, AttemptRow] = {}
+        self.attempts_by_athlete: Dict[int, List[AttemptRow]] = {}
+        self.flights: Dict[int, FlightStatus] = {}
+        self.events_with_completed = set()
+        self.events_with_in_progress = set()
+        self._queues: Dict[str, QueueProjection] = {}
+        self._lock = threading.Lock()
+
+        queued_by_flight: Dict[int, List[AttemptRow]] = {}
+        for row in rows:
+            self.attempts[row.id] = row
+            self.attempts_by_athlete.setdefault(row.athlete_id, []).append(row)
+            flight = self.flights.setdefault(
+                row.flight_id, FlightStatus(flight_id=row.flight_id)
+            )
+            if row.status == "finished":
+                flight.has_completed = True
+                self.events_with_completed.add(row.event_id)
+            elif row.status in ("waiting", "in-progress"):
+                queued_by_flight.setdefault(row.flight_id, []).append(row)
+                if row.status == "in-progress":
+                    flight.has_in_progress = True
+                    self.events_with_in_progress.add(row.event_id)
+
+        for flight_id, queued in queued_by_flight.items():
+            self.flights[flight_id].first_attempt_id = min(
+                queued, key=_queue_sort_key
+            ).id
+
+    # Per-athlete lookups -------------------------------------------------
+
+    def _athlete_rows(self, athlete_id: int, sport_type=None) -> List[AttemptRow]:
+        rows = self.attempts_by_athlete.get(athlete_id, [])
+        if sport_type is None:
+            return rows
+        return [
+            row
+            for row in rows
+            if row.event_id in self.events
+            and self.events[row.event_id].sport_type == sport_type
+        ]
+
+    def preferred_movement(self, athlete_id: int) -> Optional[str]:
+        """Movement of the athlete's most recently started or finished attempt"""
+        lifted = [
+            row
+            for row in self.attempts_by_athlete.get(athlete_id, [])
+            if row.status in ("in-progress", "finished")
+        ]
+        if not lifted:
+            return None
+        latest = max(
+            lifted,
+            key=lambda row: (
+                row.started_at is not None,
+                row.started_at or datetime.min,
+                row.completed_at is not None,
+                row.completed_at or datetime.min,
+                row.id,
+            ),
+        )
+        return latest.movement_type
+
+    def next_attempt_for_athlete(
+        self, athlete_id: int, sport_type=None, prefer_movement: Optional[str] = None
+    ) -> Tuple[Optional[AttemptRow], str]:
+        """
+        The athlete's next attempt: in-progress first, then the lowest
+        attempt number in the preferred movement, then in any movement.
+        """
+        rows = self._athlete_rows(athlete_id, sport_type)
+
+        for row in rows:
+            if row.status == "in-progress":
+                return row, "in-progress"
+
+        waiting = sorted(
+            (row for row in rows if row.status == "waiting"),
+            key=lambda row: (row.attempt_number, row.id),
+        )
+        if prefer_movement:
+            for row in waiting:
+                if row.movement_type == prefer_movement:
+                    return row, "waiting-same-movement"
+        if waiting:
+            return waiting[0], "waiting-other-movement"
+        return None, "none"
+
+    def is_first_in_queue(self, attempt: AttemptRow) -> bool:
+        flight = self.flights.get(attempt.flight_id)
+        return bool(flight and flight.first_attempt_id == attempt.id)
+
+    def is_first_of_flight(self, attempt: AttemptRow) -> bool:
+        flight = self.flights.get(attempt.flight_id)
+        return not (flight and flight.has_completed)
+
+    # Queue ---------------------------------------------------------------
+
+    def queue(self, sport_type=None) -> QueueProjection:
+        """Waiting queue with cumulative ETAs, memoised per sport type"""
+        key = _sport_key(sport_type)
+        with self._lock:
+            projection = self._queues.get(key)
+        if projection is not None:
+            return projection
+
+        projection = QueueProjection(competition_id=self.competition_id)
+        rows = [
+            row
+            for row in self.attempts.values()
+            if sport_type is None
+            or (
+                row.event_id in self.events
+                and self.events[row.event_id].sport_type == sport_type
+            )
+        ]
+        projection.current = next(
+            (row for row in rows if row.status == "in-progress"), None
+        )
+        waiting = sorted(
+            (row for row in rows if row.status == "waiting"), key=_queue_sort_key
+        )
+
+        # Attempts from later flights never hold up an earlier flight, so an
+        # attempt's ETA only counts queued attempts from its own or earlier flights
+        seconds_by_flight: Dict[int, int] = {}
+        waiting_by_flight: Dict[int, int] = {}
+        for position, row in enumerate(waiting):
+            seconds_ahead = sum(
+                seconds
+                for flight_id, seconds in seconds_by_flight.items()
+                if flight_id <= row.flight_id
+            )
+            projection.slots[row.id] = QueueSlot(
+                attempt_id=row.id,
+                flight_id=row.flight_id,
+                position=position,
+                flight_position=waiting_by_flight.get(row.flight_id, 0),
+                seconds_ahead=seconds_ahead,
+                time_limit=row.time_limit,
+            )
+            projection.order.append(row.id)
+            waiting_by_flight[row.flight_id] = (
+                waiting_by_flight.get(row.flight_id, 0) + 1
+            )
+            seconds_by_flight[row.flight_id] = (
+                seconds_by_flight.get(row.flight_id, 0)
+                + row.time_limit
+                + ATTEMPT_BUFFER_SECONDS
+            )
+
+        with self._lock:
+            self._queues[key] = projection
+        return projection
+
+
+def build_competition_status(competition_id: int) -> CompetitionStatus:
+    """Load events and attempt rows for a competition (two column queries)"""
+    events = {
+        row.id: EventInfo(
+            id=row.id,
+            name=row.name,
+            sport_type=row.sport_type,
+            weight_category=row.weight_category,
+            gender=row.gender,
+        )
+        for row in db.session.query(
+            Event.id, Event.name, Event.sport_type, Event.weight_category, Event.gender
+        ).filter(Event.competition_id == competition_id)
+    }
+
+    rows = [
+        AttemptRow(
+            id=row.id,
+            athlete_id=row.athlete_id,
+            event_id=row.event_id,
+            flight_id=row.flight_id,
+            status=row.status,
+            movement_type=row.movement_type,
+            lift_type=row.lift_type,
+            attempt_number=row.attempt_number,
+            requested_weight=row.requested_weight,
+            lifting_order=row.lifting_order,
+            started_at=row.started_at,
+            completed_at=row.completed_at,
+            time_limit=row.attempt_time_limit or DEFAULT_ATTEMPT_TIME_LIMIT,
+        )
+        for row in db.session.query(
+            Attempt.id,
+            AthleteEntry.athlete_id,
+            AthleteEntry.event_id,
+            Attempt.flight_id,
+            Attempt.status,
+            Attempt.movement_type,
+            AthleteEntry.lift_type,
+            Attempt.attempt_number,
+            Attempt.requested_weight,
+            Attempt.lifting_order,
+            Attempt.started_at,
+            Attempt.completed_at,
+            func.coalesce(
+                MovementDefinition.attempt_seconds, AthleteEntry.attempt_time_limit
+            ).label("attempt_time_limit"),
+        )
+        .join(AthleteEntry, Attempt.athlete_entry_id == AthleteEntry.id)
+        .join(Event, AthleteEntry.event_id == Event.id)
+        .outerjoin(
+            MovementDefinition,
+            and_(
+                MovementDefinition.event_id == AthleteEntry.event_id,
+                MovementDefinition.name == AthleteEntry.lift_type,
+            ),
+        )
+        .filter(Event.competition_id == competition_id)
+        .order_by(Attempt.id)
+    ]
+
+    return CompetitionStatus(competition_id, events, rows)
+
+
+def get_competition_status(competition_id: int) -> CompetitionStatus:
+    """Shared status record, rebuilt only when the competition's data changes"""
+    return projection_cache.get("status", competition_id, build_competition_status)
+
+
+def get_queue_projection(competition_id: int, sport_type=None) -> QueueProjection:
+    """Shared queue projection for a competition and optional sport type"""
+    return get_competition_status(competition_id).queue(sport_type)
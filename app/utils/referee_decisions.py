@@ -0,0 +1,605 @@
+"""
+Referee decision writes.
+
+Decisions are stored against a RefereeAssignment keyed by a virtual user id
+(referees are not User rows). The referee -> assignment mapping is resolved
+once, at login, and kept in process, so recording a decision does not look
+up the referee or its assignment again. The decision itself is a single
+upsert on (attempt_id, referee_assignment_id).
+
+submit_decision() is the one write path for a referee's vote; the HTTP
+route and the Socket.IO referee_decision event both go through it.
+replay_decisions() applies a tablet's offline queue in one transaction,
+skipping decisions whose client-generated id has been seen before.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import event, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..extensions import db
+from ..models import (
+    Attempt,
+    AttemptResult,
+    Referee,
+    RefereeAssignment,
+    RefereeDecision,
+    RefereeDecisionAudit,
+)
+from ..real_time.decision_board import decision_board
+from .decision_log import (
+    audit_values,
+    record_decision_audit,
+    seen_client_decision_ids,
+)
+from .scoring import calculate_scores_after_referee_decision
+
+logger = logging.getLogger(__name__)
+
+# Offset keeping virtual referee user ids clear of real User ids
+VIRTUAL_USER_ID_OFFSET = 1000000
+
+# Decision values that are not AttemptResult names
+DECISION_ALIASES = {
+    "good": AttemptResult.GOOD_LIFT,
+    "no": AttemptResult.NO_LIFT,
+}
+
+# Decisions accepted in one replay batch
+MAX_REPLAY_DECISIONS = 500
+
+TIMER_STATE_FILE = Path(__file__).parent.parent.parent / "instance" / "timer_state.json"
+
+
+@dataclass(frozen=True)
+class RefereeContext:
+    """What the decision path needs to know about a referee"""
+
+    referee_id: int
+    competition_id: Optional[int]
+    position: Optional[str]
+    assignment_id: int
+    is_active: bool
+
+
+def _resolve_assignment(referee: Referee) -> RefereeAssignment:
+    """Get or create the referee's assignment (flushes, does not commit)"""
+    virtual_user_id = VIRTUAL_USER_ID_OFFSET + referee.id
+    assignment = RefereeAssignment.query.filter_by(
+        user_id=virtual_user_id, referee_position=referee.position
+    ).first()
+    if not assignment:
+        assignment = RefereeAssignment(
+            user_id=virtual_user_id,
+            referee_position=referee.position or "Referee",
+            is_active=True,
+        )
+        db.session.add(assignment)
+        db.session.flush()
+    return assignment
+
+
+class RefereeAssignmentCache:
+    """Referee id -> RefereeContext, filled at login and on first use"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._contexts: Dict[int, RefereeContext] = {}
+
+    def resolve(self, referee: Referee) -> RefereeContext:
+        """
+        Resolve a loaded referee's context. It is cached once the session
+        commits, so an assignment created in a rolled-back transaction is
+        never remembered.
+        """
+        assignment = _resolve_assignment(referee)
+        context = RefereeContext(
+            referee_id=referee.id,
+            competition_id=referee.competition_id,
+            position=referee.position,
+            assignment_id=assignment.id,
+            is_active=bool(referee.is_active),
+        )
+        db.session.info.setdefault("resolved_referees", []).append(context)
+        return context
+
+    def remember(self, context: RefereeContext) -> None:
+        with self._lock:
+            self._contexts[context.referee_id] = context
+
+    def get(self, referee_id: int) -> Optional[RefereeContext]:
+        """Cached context, resolved from the database on a miss"""
+        with self._lock:
+            context = self._contexts.get(referee_id)
+        if context is not None:
+            return context
+        referee = db.session.get(Referee, referee_id)
+        if not referee:
+            return None
+        return self.resolve(referee)
+
+    def invalidate(self, referee_id: Optional[int] = None) -> None:
+        """Forget one referee (or all) after referee rows change"""
+        with self._lock:
+            if referee_id is None:
+                self._contexts.clear()
+            else:
+                self._contexts.pop(referee_id, None)
+
+    def invalidate_competition(self, competition_id: Optional[int]) -> None:
+        """Forget every referee of a competition"""
+        with self._lock:
+            for referee_id, context in list(self._contexts.items()):
+                if context.competition_id == competition_id:
+                    del self._contexts[referee_id]
+
+
+def _upsert_statement(values: dict, update: dict):
+    """Dialect-specific INSERT ... ON CONFLICT, or None if unsupported"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    elif dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as dialect_insert
+
+        return (
+            dialect_insert(RefereeDecision)
+            .values(**values)
+            .on_duplicate_key_update(**update)
+        )
+    else:
+        return None
+    return (
+        dialect_insert(RefereeDecision)
+        .values(**values)
+        .on_conflict_do_update(
+            index_elements=["attempt_id", "referee_assignment_id"], set_=update
+        )
+    )
+
+
+def upsert_referee_decision(
+    attempt_id: int,
+    assignment_id: int,
+    decision: AttemptResult,
+    notes: Optional[str] = None,
+) -> None:
+    """Record (or replace) a referee's vote on an attempt in one statement"""
+    decided_at = datetime.utcnow()
+    update = {"decision": decision, "decision_time": decided_at, "notes": notes}
+    statement = _upsert_statement(
+        {"attempt_id": attempt_id, "referee_assignment_id": assignment_id, **update},
+        update,
+    )
+    if statement is not None:
+        db.session.execute(statement)
+        return
+
+    existing = RefereeDecision.query.filter_by(
+        attempt_id=attempt_id, referee_assignment_id=assignment_id
+    ).first()
+    if existing:
+        existing.decision = decision
+        existing.decision_time = decided_at
+        existing.notes = notes
+    else:
+        db.session.add(
+            RefereeDecision(
+                attempt_id=attempt_id,
+                referee_assignment_id=assignment_id,
+                **update,
+            )
+        )
+
+
+def parse_decision(decision: str) -> AttemptResult:
+    """AttemptResult for a decision value; unknown values count as no lift"""
+    key = decision.strip().lower().replace(" ", "_")
+    try:
+        return AttemptResult[key.upper()]
+    except KeyError:
+        return DECISION_ALIASES.get(key, AttemptResult.NO_LIFT)
+
+
+def _attempt_from_timer_state() -> Optional[int]:
+    """Attempt currently on the timer, if the timer state names one"""
+    if not TIMER_STATE_FILE.exists():
+        return None
+    try:
+        with open(TIMER_STATE_FILE, "r") as f:
+            timer_state = json.load(f)
+        athlete_id = timer_state.get("athlete_id")
+        attempt_number = timer_state.get("attempt_number")
+        flight_id = timer_state.get("flight_id")
+        if not (athlete_id and attempt_number and flight_id):
+            return None
+        attempt = Attempt.query.filter_by(
+            athlete_id=int(athlete_id),
+            attempt_number=int(attempt_number),
+            flight_id=int(flight_id),
+        ).first()
+        return attempt.id if attempt else None
+    except Exception:
+        return None  # Timer state not available
+
+
+def _normalize_decision(decision, notes) -> Tuple[object, Optional[str], str]:
+    """
+    (decision value, label, notes) for a submitted decision, which may be a
+    value such as 'good_lift' or a legacy {label, value} option object
+    """
+    decision_label = None
+    if isinstance(decision, dict):
+        decision_label = decision.get("label", "Unknown")
+        decision_value = decision.get("value")
+        if isinstance(decision_value, bool):
+            decision = "good_lift" if decision_value else "no_lift"
+        elif isinstance(decision_value, str):
+            decision = decision_value
+        else:
+            decision = decision_label.lower().replace(" ", "_")
+        notes = notes or f"Decision: {decision_label}"
+    return decision, decision_label, notes
+
+
+def _client_decision_id(data: dict) -> Optional[str]:
+    client_decision_id = data.get("client_decision_id")
+    return str(client_decision_id)[:64] if client_decision_id else None
+
+
+def _recalculate_scores(attempt_id: int, body: dict) -> None:
+    """Recompute the attempt's result and scores into the response body"""
+    try:
+        score_results = calculate_scores_after_referee_decision(attempt_id)
+        body.update(
+            attempt_result=score_results["attempt_result"],
+            score=score_results["score"],
+            rankings_updated=True,
+        )
+    except Exception:
+        # The decision is stored even if score calculation fails
+        logger.exception(f"Score calculation failed for attempt {attempt_id}")
+        body["message"] = "Decision recorded successfully (score calculation pending)"
+
+
+def submit_decision(data: dict) -> Tuple[dict, int]:
+    """
+    Validate and persist a referee's decision, then push it to the live
+    decision board. If attempt_id is missing the attempt on the timer is
+    used; with no attempt at all the decision goes to the audit log only.
+    A decision whose client_decision_id was already recorded is not
+    applied again.
+
+    Returns the response body and HTTP status.
+    """
+    try:
+        referee_id = data.get("referee_id")
+        competition_id = data.get("competition_id")
+        attempt_id = data.get("attempt_id")
+        timestamp = data.get("timestamp")
+        client_decision_id = _client_decision_id(data)
+        decision, decision_label, notes = _normalize_decision(
+            data.get("decision"),  # e.g. 'good_lift', 'no_lift'
+            data.get("notes", ""),
+        )
+
+        if not all([referee_id, competition_id, decision]) or not isinstance(
+            decision, str
+        ):
+            return {"success": False, "message": "Missing required fields"}, 400
+
+        if client_decision_id and seen_client_decision_ids([client_decision_id]):
+            return {
+                "success": True,
+                "message": "Decision already recorded",
+                "duplicate": True,
+                "referee_id": referee_id,
+                "decision": decision,
+                "client_decision_id": client_decision_id,
+            }, 200
+
+        if not attempt_id:
+            attempt_id = _attempt_from_timer_state()
+
+        # Verify referee exists and belongs to the competition
+        try:
+            referee = referee_assignment_cache.get(int(referee_id))
+        except (TypeError, ValueError):
+            referee = None
+        if not referee or str(referee.competition_id) != str(competition_id):
+            return {"success": False, "message": "Invalid referee or competition"}, 404
+
+        if not attempt_id:
+            # Keep the decision in the audit trail only
+            record_decision_audit(
+                referee_id,
+                competition_id,
+                None,
+                decision,
+                notes,
+                timestamp,
+                client_decision_id,
+            )
+            db.session.commit()
+            return {
+                "success": True,
+                "message": "Warning: No attempt_id provided or found in timer state. Decision recorded in the audit log only.",
+                "referee_id": referee_id,
+                "decision": decision,
+                "warning": "Decision not linked to attempt - stored in audit log only",
+            }, 200
+
+        if not db.session.get(Attempt, attempt_id):
+            return {
+                "success": False,
+                "message": f"Invalid attempt ID: {attempt_id}",
+            }, 404
+
+        decision_enum = parse_decision(decision)
+        upsert_referee_decision(attempt_id, referee.assignment_id, decision_enum, notes)
+        record_decision_audit(
+            referee_id,
+            competition_id,
+            attempt_id,
+            decision,
+            notes,
+            timestamp,
+            client_decision_id,
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Error submitting referee decision")
+        return {"success": False, "message": f"Error submitting decision: {e}"}, 500
+
+    # Push the vote (and the result, once quorum is reached) to the room
+    decision_board.record(
+        referee.competition_id,
+        attempt_id,
+        referee.referee_id,
+        decision_enum == AttemptResult.GOOD_LIFT,
+        decision_label,
+    )
+
+    body = {
+        "success": True,
+        "message": "Decision recorded successfully",
+        "referee_id": referee_id,
+        "attempt_id": attempt_id,
+        "decision": decision,
+        "decision_enum": decision_enum.value,
+    }
+    _recalculate_scores(attempt_id, body)
+    return body, 200
+
+
+def _replay_item(item, seen: set, attempt_ids: set) -> Tuple[str, dict]:
+    """
+    Validate one queued decision. Returns ("applied", values) for a new
+    decision, or ("duplicate" | "rejected", {"message": ...}).
+    """
+    if not isinstance(item, dict):
+        return "rejected", {"message": "Decision must be an object"}
+    client_decision_id = _client_decision_id(item)
+    if not client_decision_id:
+        return "rejected", {"message": "client_decision_id is required"}
+    if client_decision_id in seen:
+        return "duplicate", {"message": "Decision already recorded"}
+
+    decision, decision_label, notes = _normalize_decision(
+        item.get("decision"), item.get("notes", "")
+    )
+    attempt_id = item.get("attempt_id")
+    if not all([item.get("referee_id"), item.get("competition_id"), attempt_id]):
+        return "rejected", {"message": "Missing required fields"}
+    if not decision or not isinstance(decision, str):
+        return "rejected", {"message": "Missing required fields"}
+
+    try:
+        referee = referee_assignment_cache.get(int(item["referee_id"]))
+        attempt_id = int(attempt_id)
+    except (TypeError, ValueError):
+        referee = None
+    if not referee or str(referee.competition_id) != str(item["competition_id"]):
+        return "rejected", {"message": "Invalid referee or competition"}
+    if attempt_id not in attempt_ids:
+        return "rejected", {"message": f"Invalid attempt ID: {attempt_id}"}
+
+    seen.add(client_decision_id)
+    return "applied", {
+        "referee": referee,
+        "attempt_id": attempt_id,
+        "decision": decision,
+        "decision_enum": parse_decision(decision),
+        "decision_label": decision_label,
+        "notes": notes,
+        "timestamp": item.get("timestamp"),
+        "client_decision_id": client_decision_id,
+    }
+
+
+def replay_decisions(items: list) -> Tuple[dict, int]:
+    """
+    Apply a queue of decisions buffered by a tablet while it was offline.
+
+    Every decision must carry a client_decision_id; ids already in the audit
+    log (or repeated within the batch) are skipped, so a queue can be sent
+    again safely. New decisions are written in one transaction, in queue
+    order, and scores are recomputed once per affected attempt afterwards.
+    Unlike submit_decision, attempt_id is required: a replayed decision is
+    never attached to whatever attempt is on the timer now.
+
+    Returns the response body and HTTP status.
+    """
+    if not isinstance(items, list) or not items:
+        return {"success": False, "message": "No decisions provided"}, 400
+    if len(items) > MAX_REPLAY_DECISIONS:
+        return {
+            "success": False,
+            "message": f"At most {MAX_REPLAY_DECISIONS} decisions per batch",
+        }, 400
+
+    try:
+        seen = seen_client_decision_ids(
+            _client_decision_id(item) for item in items if isinstance(item, dict)
+        )
+        requested_attempts = set()
+        for item in items:
+            try:
+                requested_attempts.add(int(item["attempt_id"]))
+            except (KeyError, TypeError, ValueError):
+                pass
+        attempt_ids = {
+            attempt_id
+            for (attempt_id,) in db.session.query(Attempt.id).filter(
+                Attempt.id.in_(requested_attempts)
+            )
+        }
+
+        results = []
+        applied = []
+        for item in items:
+            status, values = _replay_item(item, seen, attempt_ids)
+            result = {
+                "client_decision_id": _client_decision_id(item)
+                if isinstance(item, dict)
+                else None,
+                "status": status,
+            }
+            if status == "applied":
+                applied.append(values)
+                result["attempt_id"] = values["attempt_id"]
+            else:
+                result["message"] = values["message"]
+            results.append(result)
+
+        for values in applied:
+            referee = values["referee"]
+            upsert_referee_decision(
+                values["attempt_id"],
+                referee.assignment_id,
+                values["decision_enum"],
+                values["notes"],
+            )
+        if applied:
+            db.session.execute(
+                insert(RefereeDecisionAudit),
+                [
+                    audit_values(
+                        values["referee"].referee_id,
+                        values["referee"].competition_id,
+                        values["attempt_id"],
+                        values["decision"],
+                        values["notes"],
+                        values["timestamp"],
+                        values["client_decision_id"],
+                    )
+                    for values in applied
+                ],
+            )
+        db.session.commit()
+    except IntegrityError:
+        # Another request recorded one of these ids first; a retry dedupes
+        db.session.rollback()
+        return {
+            "success": False,
+            "message": "Decisions were recorded concurrently; retry the batch",
+        }, 409
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Error replaying referee decisions")
+        return {"success": False, "message": f"Error replaying decisions: {e}"}, 500
+
+    # Latest vote per referee and attempt goes to the live board
+    latest_votes = {}
+    for values in applied:
+        latest_votes[(values["attempt_id"], values["referee"].referee_id)] = values
+    for values in latest_votes.values():
+        decision_board.record(
+            values["referee"].competition_id,
+            values["attempt_id"],
+            values["referee"].referee_id,
+            values["decision_enum"] == AttemptResult.GOOD_LIFT,
+            values["decision_label"],
+        )
+
+    recalculated = []
+    for attempt_id in dict.fromkeys(values["attempt_id"] for values in applied):
+        body = {}
+        _recalculate_scores(attempt_id, body)
+        recalculated.append(
+            {
+                "attempt_id": attempt_id,
+                "attempt_result": body.get("attempt_result"),
+                "score": body.get("score"),
+            }
+        )
+
+    counts = {"applied": 0, "duplicate": 0, "rejected": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {
+        "success": True,
+        "message": f"{counts['applied']} decisions applied, "
+        f"{counts['duplicate']} duplicates, {counts['rejected']} rejected",
+        **counts,
+        "results": results,
+        "attempts": recalculated,
+    }, 200
+
+
+def mark_referees_changed(session, competition_id: Optional[int]) -> None:
+    """
+    Record a change to a competition's referees made with bulk/Core
+    statements, which bypass the flush hooks. Their cached contexts are
+    dropped after the commit.
+    """
+    session.info.setdefault("changed_referee_competitions", set()).add(competition_id)
+
+
+def _after_flush(session, flush_context):
+    changed = session.info.setdefault("changed_referees", set())
+    # New rows count too: SQLite hands out the ids of deleted rows again
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Referee):
+            changed.add(obj.id)
+
+
+def _after_commit(session):
+    for competition_id in session.info.pop("changed_referee_competitions", set()):
+        referee_assignment_cache.invalidate_competition(competition_id)
+    for referee_id in session.info.pop("changed_referees", set()):
+        referee_assignment_cache.invalidate(referee_id)
+    # Contexts resolved in this transaction were read after any edits above
+    for context in session.info.pop("resolved_referees", []):
+        referee_assignment_cache.remember(context)
+
+
+def _after_rollback(session):
+    session.info.pop("changed_referee_competitions", None)
+    session.info.pop("changed_referees", None)
+    session.info.pop("resolved_referees", None)
+
+
+def track_referee_changes() -> None:
+    """Drop cached referee contexts when referees are edited (idempotent)"""
+    if event.contains(Session, "after_flush", _after_flush):
+        return
+    event.listen(Session, "after_flush", _after_flush)
+    event.listen(Session, "after_commit", _after_commit)
+    event.listen(Session, "after_rollback", _after_rollback)
+    logger.debug("Referee assignment cache attached to SQLAlchemy sessions")
+
+
+# Global instance
+referee_assignment_cache = RefereeAssignmentCache()
@@ -0,0 +1,432 @@
+"""
+Streaming CSV roster import.
+
+Rows are read lazily from the upload and processed in fixed-size chunks:
+each chunk is validated, checked against a hashed (email, name, competition)
+index of known athletes and bulk-inserted, optionally with user accounts and
+flight assignments. The index is loaded for each competition the first time
+a row refers to it, so memory use is bounded by the chunk size plus the
+athletes of the competitions in the file.
+"""
+
+import csv
+import hashlib
+import io
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import func, insert, or_
+from sqlalchemy.orm import joinedload
+from werkzeug.security import generate_password_hash
+
+from ..extensions import db
+from ..models import Athlete, AthleteFlight, Event, Flight, User, UserRole
+from ..real_time.change_feed import mark_changed
+
+# Rows validated and inserted per batch
+IMPORT_CHUNK_SIZE = 500
+
+# Row errors reported back to the client (the count is always complete)
+MAX_REPORTED_ERRORS = 100
+
+# Accepted spellings of each column, after lower-casing and trimming
+COLUMN_ALIASES = {
+    "first_name": ("first_name", "first name", "firstname", "given name"),
+    "last_name": ("last_name", "last name", "lastname", "surname", "family name"),
+    "email": ("email", "e-mail", "email address"),
+    "phone": ("phone", "phone number", "mobile"),
+    "team": ("team", "club"),
+    "gender": ("gender", "sex"),
+    "age": ("age",),
+    "bodyweight": ("bodyweight", "body weight", "bw", "weight"),
+    "competition_id": ("competition_id", "competition id"),
+    "flight_id": ("flight_id", "flight id"),
+}
+
+
+@dataclass
+class RosterImportResult:
+    """Outcome of a roster import"""
+
+    rows: int = 0
+    created: int = 0
+    duplicates: int = 0
+    accounts_created: int = 0
+    accounts_existing: int = 0
+    assigned: int = 0
+    error_count: int = 0
+    errors: List[dict] = field(default_factory=list)
+
+    def add_error(self, row_number: int, message: str) -> None:
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row_number, "message": message})
+
+    def to_dict(self) -> dict:
+        return {
+            "rows": self.rows,
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "accounts_created": self.accounts_created,
+            "accounts_existing": self.accounts_existing,
+            "assigned": self.assigned,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+def athlete_key(email, first_name, last_name, competition_id) -> bytes:
+    """Digest identifying an athlete registration for duplicate detection"""
+    raw = "|".join(
+        [
+            (email or "").strip().lower(),
+            (first_name or "").strip().lower(),
+            (last_name or "").strip().lower(),
+            str(competition_id or ""),
+        ]
+    )
+    return hashlib.sha1(raw.encode("utf-8")).digest()
+
+
+def _column_map(fieldnames: Iterable[str]) -> Dict[str, str]:
+    """Map our field names to the CSV's header names"""
+    lookup = {}
+    for header in fieldnames or []:
+        normalized = (header or "").strip().lower().replace("_", " ")
+        for name, aliases in COLUMN_ALIASES.items():
+            if normalized in {alias.replace("_", " ") for alias in aliases}:
+                lookup.setdefault(name, header)
+    return lookup
+
+
+def _chunks(reader: Iterator[dict], size: int) -> Iterator[List[tuple]]:
+    """Yield lists of (row_number, row) without reading ahead of a chunk"""
+    chunk = []
+    # Row 1 is the header
+    for row_number, row in enumerate(reader, start=2):
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _parse_row(row: dict, columns: Dict[str, str], default_competition_id):
+    """Validate one CSV row; returns (values, error_message)"""
+
+    def value(name):
+        header = columns.get(name)
+        raw = row.get(header) if header else None
+        raw = (raw or "").strip()
+        return raw or None
+
+    first_name = value("first_name")
+    last_name = value("last_name")
+    if not first_name or not last_name:
+        return None, "First name and last name are required"
+
+    try:
+        age = int(value("age")) if value("age") else None
+        bodyweight = float(value("bodyweight")) if value("bodyweight") else None
+        competition_id = (
+            int(value("competition_id"))
+            if value("competition_id")
+            else default_competition_id
+        )
+        flight_id = int(value("flight_id")) if value("flight_id") else None
+    except ValueError:
+        return None, "Age, bodyweight, competition_id and flight_id must be numbers"
+
+    return {
+        "first_name": first_name[:80],
+        "last_name": last_name[:80],
+        "email": value("email"),
+        "phone": value("phone"),
+        "team": value("team"),
+        "gender": value("gender"),
+        "age": age,
+        "bodyweight": bodyweight,
+        "competition_id": competition_id,
+        "user_id": None,
+        "flight_id": flight_id,
+    }, None
+
+
+class RosterImporter:
+    """
+    Imports one roster file. Known athletes are indexed once per competition;
+    flight orders are read once per flight and then allocated in memory.
+    """
+
+    def __init__(
+        self,
+        competition_id: Optional[int] = None,
+        flight_id: Optional[int] = None,
+        create_accounts: bool = False,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+    ):
+        self.competition_id = competition_id
+        self.flight_id = flight_id
+        self.create_accounts = create_accounts
+        self.chunk_size = chunk_size
+        self.result = RosterImportResult()
+        self._known = set()
+        self._indexed_competitions = set()
+        self._flights: Dict[int, Optional[Flight]] = {}
+        self._next_order: Dict[int, int] = {}
+        self._password_hash = None
+
+    def run(self, text_stream) -> RosterImportResult:
+        """Import every row from a text stream of CSV data"""
+        reader = csv.DictReader(text_stream)
+        columns = _column_map(reader.fieldnames)
+        missing = {"first_name", "last_name"} - set(columns)
+        if missing:
+            raise ValueError(
+                "Missing required column(s): " + ", ".join(sorted(missing))
+            )
+
+        for chunk in _chunks(reader, self.chunk_size):
+            self._import_chunk(chunk, columns)
+        return self.result
+
+    def _load_known_athletes(self, competition_ids: Iterable[Optional[int]]) -> None:
+        """Index the athletes of competitions not seen earlier in the file"""
+        new_ids = set(competition_ids) - self._indexed_competitions
+        if not new_ids:
+            return
+        self._indexed_competitions |= new_ids
+
+        criteria = []
+        ids = [competition_id for competition_id in new_ids if competition_id]
+        if ids:
+            criteria.append(Athlete.competition_id.in_(ids))
+        if None in new_ids:
+            criteria.append(Athlete.competition_id.is_(None))
+        query = db.session.query(
+            Athlete.email, Athlete.first_name, Athlete.last_name, Athlete.competition_id
+        ).filter(or_(*criteria))
+        for email, first_name, last_name, competition_id in query.yield_per(1000):
+            self._known.add(athlete_key(email, first_name, last_name, competition_id))
+
+    def _import_chunk(self, chunk: List[tuple], columns: Dict[str, str]) -> None:
+        parsed = []
+        for row_number, raw in chunk:
+            self.result.rows += 1
+            values, error = _parse_row(raw, columns, self.competition_id)
+            if error:
+                self.result.add_error(row_number, error)
+                continue
+
+            values["flight_id"] = values["flight_id"] or self.flight_id
+            if values["flight_id"]:
+                flight = self._flight(values["flight_id"])
+                if not flight:
+                    self.result.add_error(
+                        row_number, f"Flight {values['flight_id']} not found"
+                    )
+                    continue
+                # Athletes take the competition of the flight they are assigned to
+                values["competition_id"] = flight.competition_id or (
+                    flight.event.competition_id if flight.event else None
+                )
+            values["row_number"] = row_number
+            parsed.append(values)
+
+        # Rows may name their own competition, directly or through a flight
+        self._load_known_athletes(values["competition_id"] for values in parsed)
+
+        rows = []
+        for values in parsed:
+            key = athlete_key(
+                values["email"],
+                values["first_name"],
+                values["last_name"],
+                values["competition_id"],
+            )
+            if key in self._known:
+                self.result.duplicates += 1
+                continue
+            self._known.add(key)
+            rows.append(values)
+
+        if not rows:
+            return
+
+        if self.create_accounts:
+            rows = self._link_accounts(rows)
+            if not rows:
+                return
+
+        assigned_rows = [row for row in rows if row["flight_id"]]
+        last_id = None
+        if assigned_rows:
+            last_id = db.session.query(func.max(Athlete.id)).scalar() or 0
+
+        # Plain executemany: INSERT ... RETURNING is sent row by row on SQLite
+        db.session.execute(
+            insert(Athlete),
+            [
+                {k: v for k, v in row.items() if k not in ("flight_id", "row_number")}
+                for row in rows
+            ],
+        )
+        self.result.created += len(rows)
+        for competition_id in {row["competition_id"] for row in rows}:
+            mark_changed(db.session, competition_id)
+
+        if assigned_rows:
+            # Rows are unique by key within the import, so new ids map back by key
+            new_ids = {
+                athlete_key(email, first_name, last_name, competition_id): athlete_id
+                for athlete_id, email, first_name, last_name, competition_id in (
+                    db.session.query(
+                        Athlete.id,
+                        Athlete.email,
+                        Athlete.first_name,
+                        Athlete.last_name,
+                        Athlete.competition_id,
+                    ).filter(Athlete.id > last_id)
+                )
+            }
+            by_flight: Dict[int, List[int]] = {}
+            for row in assigned_rows:
+                key = athlete_key(
+                    row["email"],
+                    row["first_name"],
+                    row["last_name"],
+                    row["competition_id"],
+                )
+                by_flight.setdefault(row["flight_id"], []).append(new_ids[key])
+            for flight_id, ids in by_flight.items():
+                self._assign_to_flight(self._flight(flight_id), ids)
+
+    def _link_accounts(self, rows: List[dict]) -> List[dict]:
+        """
+        Link rows with an email address to athlete user accounts, creating
+        the missing ones. Rows whose email belongs to another kind of account
+        are reported as errors and dropped. Returns the rows to insert.
+        """
+        emails = {row["email"].lower() for row in rows if row["email"]}
+        if not emails:
+            return rows
+
+        existing = {
+            email.lower(): (user_id, role)
+            for user_id, email, role in db.session.query(
+                User.id, User.email, User.role
+            ).filter(func.lower(User.email).in_(emails))
+        }
+
+        kept = []
+        new_users: Dict[str, dict] = {}
+        for row in rows:
+            email = (row["email"] or "").lower()
+            if email in existing:
+                user_id, role = existing[email]
+                if role != UserRole.ATHLETE:
+                    self.result.add_error(
+                        row["row_number"],
+                        f"{row['email']} belongs to a {role.name.lower()} account",
+                    )
+                    self._known.discard(
+                        athlete_key(
+                            row["email"],
+                            row["first_name"],
+                            row["last_name"],
+                            row["competition_id"],
+                        )
+                    )
+                    continue
+                row["user_id"] = user_id
+                self.result.accounts_existing += 1
+            elif email:
+                new_users.setdefault(email, row)
+            kept.append(row)
+
+        if not new_users:
+            return kept
+
+        if self._password_hash is None:
+            # Athletes log in with email only; hash the empty password once
+            # per import rather than once per account
+            self._password_hash = generate_password_hash("")
+
+        db.session.execute(
+            insert(User),
+            [
+                {
+                    "email": row["email"],
+                    "password_hash": self._password_hash,
+                    "first_name": row["first_name"],
+                    "last_name": row["last_name"],
+                    "role": UserRole.ATHLETE,
+                    "is_active": True,
+                }
+                for row in new_users.values()
+            ],
+        )
+        # Emails are unique, so the new accounts map back by email; rows
+        # repeating an email within the file share its account
+        user_ids = {
+            email.lower(): user_id
+            for user_id, email in db.session.query(User.id, User.email).filter(
+                func.lower(User.email).in_(list(new_users))
+            )
+        }
+        for row in kept:
+            email = (row["email"] or "").lower()
+            if row["user_id"] is None and email in user_ids:
+                row["user_id"] = user_ids[email]
+        self.result.accounts_created += len(new_users)
+        return kept
+
+    def _flight(self, flight_id: int) -> Optional[Flight]:
+        if flight_id not in self._flights:
+            self._flights[flight_id] = Flight.query.options(
+                joinedload(Flight.event).joinedload(Event.competition)
+            ).get(flight_id)
+        return self._flights[flight_id]
+
+    def _assign_to_flight(self, flight: Flight, athlete_ids: List[int]) -> None:
+        from ..routes.athlete import provision_athlete_entries
+
+        if flight.id not in self._next_order:
+            self._next_order[flight.id] = (
+                db.session.query(func.max(AthleteFlight.order))
+                .filter(AthleteFlight.flight_id == flight.id)
+                .scalar()
+                or 0
+            )
+
+        assignments = []
+        for athlete_id in athlete_ids:
+            self._next_order[flight.id] += 1
+            assignments.append((athlete_id, self._next_order[flight.id]))
+
+        db.session.execute(
+            insert(AthleteFlight),
+            [
+                {"flight_id": flight.id, "athlete_id": athlete_id, "order": order}
+                for athlete_id, order in assignments
+            ],
+        )
+        if flight.event:
+            provision_athlete_entries(flight.event, flight, assignments)
+        self.result.assigned += len(assignments)
+
+
+def import_roster(file_storage, **options) -> RosterImportResult:
+    """
+    Import a CSV roster from an uploaded file. The upload is decoded as a
+    stream; nothing is committed here.
+    """
+    text_stream = io.TextIOWrapper(
+        file_storage.stream, encoding="utf-8-sig", newline=""
+    )
+    try:
+        return RosterImporter(**options).run(text_stream)
+    finally:
+        # Leave the underlying upload stream to werkzeug
+        text_stream.detach()
@@ -0,0 +1,152 @@
+"""
+Brings an existing database up to date with the models.
+
+db.create_all() only runs for a new database, so tables, columns and indexes
+added to the models afterwards never reach a database that already exists.
+Each step checks what the database has and adds only what is missing, so the
+steps run on every startup.
+"""
+
+import logging
+from typing import Callable, List
+
+from sqlalchemy import Index, MetaData, delete, func, inspect, select, text
+from sqlalchemy.engine import Connection
+
+from ..extensions import db
+from ..models import (
+    MovementDefinition,
+    RefereeDecision,
+    RefereeDecisionAudit,
+    RefereeDecisionLog,
+    Score,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _create_missing_table(connection: Connection, model) -> None:
+    """Create a model's table, with its indexes, if the database has none"""
+    table = model.__table__
+    if not inspect(connection).has_table(table.name):
+        logger.info(f"Creating table {table.name}")
+        table.create(connection)
+
+
+def _add_missing_columns(connection: Connection, model, *names: str) -> None:
+    """Add nullable columns of a model that its table does not have"""
+    table = model.__table__
+    existing = {
+        column["name"] for column in inspect(connection).get_columns(table.name)
+    }
+    preparer = connection.dialect.identifier_preparer
+    for name in names:
+        if name in existing:
+            continue
+        column = table.c[name]
+        logger.info(f"Adding column {name} to {table.name}")
+        connection.execute(
+            text(
+                f"ALTER TABLE {preparer.format_table(table)} "
+                f"ADD COLUMN {preparer.format_column(column)} "
+                f"{column.type.compile(dialect=connection.dialect)}"
+            )
+        )
+
+
+def _create_missing_indexes(connection: Connection, model) -> None:
+    """Create the indexes declared on a model that its table does not have"""
+    table = model.__table__
+    existing = {index["name"] for index in inspect(connection).get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name not in existing:
+            logger.info(f"Creating index {index.name} on {table.name}")
+            index.create(connection)
+
+
+def _score_history_indexes(connection: Connection) -> None:
+    """Score history is paged by (calculated_at, id) and filtered by entry"""
+    _create_missing_indexes(connection, Score)
+
+
+def _decision_log_indexes(connection: Connection) -> None:
+    """The decision log is paged per competition and filtered by name"""
+    _create_missing_indexes(connection, RefereeDecisionLog)
+
+
+def _decision_audit_table(connection: Connection) -> None:
+    """Every submitted decision is appended to the audit table"""
+    _create_missing_table(connection, RefereeDecisionAudit)
+
+
+def _has_unique_key(connection: Connection, table_name: str, columns) -> bool:
+    """Whether a unique constraint or unique index covers exactly these columns"""
+    inspector = inspect(connection)
+    keys = inspector.get_unique_constraints(table_name) + [
+        index for index in inspector.get_indexes(table_name) if index["unique"]
+    ]
+    return any(set(key["column_names"]) == set(columns) for key in keys)
+
+
+def _referee_decision_unique_vote(connection: Connection) -> None:
+    """
+    Decisions are upserted on (attempt_id, referee_assignment_id), which
+    needs a unique key there. Older databases may hold several votes per
+    referee and attempt; the latest one is kept before the index is added.
+    """
+    columns = ("attempt_id", "referee_assignment_id")
+    if _has_unique_key(connection, RefereeDecision.__tablename__, columns):
+        return
+
+    decisions = RefereeDecision.__table__
+    latest = (
+        select(func.max(decisions.c.id).label("id"))
+        .group_by(decisions.c.attempt_id, decisions.c.referee_assignment_id)
+        .subquery()
+    )
+    removed = connection.execute(
+        delete(decisions).where(decisions.c.id.not_in(select(latest.c.id)))
+    ).rowcount
+    if removed:
+        logger.info(f"Removed {removed} superseded referee decisions")
+
+    # Built on a copy of the table so the model's metadata is left alone
+    table = decisions.to_metadata(MetaData())
+    logger.info("Creating index uq_referee_decision_attempt_assignment")
+    Index(
+        "uq_referee_decision_attempt_assignment",
+        *(table.c[name] for name in columns),
+        unique=True,
+    ).create(connection)
+
+
+def _decision_audit_client_ids(connection: Connection) -> None:
+    """Replayed decisions are applied once per tablet-generated decision id"""
+    _add_missing_columns(connection, RefereeDecisionAudit, "client_decision_id")
+    _create_missing_indexes(connection, RefereeDecisionAudit)
+
+
+def _movement_definition_table(connection: Connection) -> None:
+    """
+    Entries read their movement through movement_definition. Existing
+    entries keep their own copies and use them until a definition exists.
+    """
+    _create_missing_table(connection, MovementDefinition)
+
+
+# Run in order; later steps may rely on earlier ones
+SCHEMA_STEPS: List[Callable[[Connection], None]] = [
+    _score_history_indexes,
+    _decision_log_indexes,
+    _decision_audit_table,
+    _referee_decision_unique_vote,
+    _decision_audit_client_ids,
+    _movement_definition_table,
+]
+
+
+def upgrade_schema() -> None:
+    """Apply every schema step to the current database, one transaction each"""
+    for step in SCHEMA_STEPS:
+        with db.engine.begin() as connection:
+            step(connection)
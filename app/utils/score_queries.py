@@ -0,0 +1,240 @@
+"""
+Score listings read as a single joined column projection.
+
+Scores are never loaded as ORM objects here: each row carries the score
+columns plus the athlete, event, competition and flight fields the admin
+views show, so listing or exporting any number of scores is one query.
+Listings are paged by keyset on (calculated_at, id), newest first.
+"""
+
+import csv
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_
+
+from ..extensions import db
+from ..models import Athlete, AthleteEntry, Competition, Event, Flight, Score
+from .keyset import decode_cursor, encode_cursor
+
+# Scores per page of the history listing
+SCORES_PAGE_SIZE = 50
+MAX_SCORES_PAGE_SIZE = 200
+
+# Rows fetched from the cursor per round trip while streaming
+EXPORT_FETCH_SIZE = 1000
+
+# CSV rows buffered into each chunk written to the response
+EXPORT_CHUNK_ROWS = 200
+
+EXPORT_HEADERS = [
+    "Rank",
+    "Athlete",
+    "Event",
+    "Flight",
+    "Lift Type",
+    "Best Weight (kg)",
+    "Total Score",
+    "Status",
+    "Calculated At",
+]
+
+
+def score_projection(
+    competition_id: Optional[int] = None,
+    event_id: Optional[int] = None,
+    flight_id: Optional[int] = None,
+    is_final: Optional[bool] = None,
+):
+    """Query of flat score rows matching the filters, newest first"""
+    query = (
+        db.session.query(
+            Score.id,
+            Score.athlete_entry_id,
+            Score.best_attempt_weight,
+            Score.total_score,
+            Score.rank,
+            Score.score_type,
+            Score.calculated_at,
+            Score.is_final,
+            Athlete.id.label("athlete_id"),
+            Athlete.first_name,
+            Athlete.last_name,
+            Event.id.label("event_id"),
+            Event.name.label("event_name"),
+            Competition.id.label("competition_id"),
+            Competition.name.label("competition_name"),
+            AthleteEntry.flight_id,
+            Flight.name.label("flight_name"),
+            AthleteEntry.lift_type,
+        )
+        .join(AthleteEntry, Score.athlete_entry_id == AthleteEntry.id)
+        .join(Athlete, AthleteEntry.athlete_id == Athlete.id)
+        .outerjoin(Event, AthleteEntry.event_id == Event.id)
+        .outerjoin(Competition, Event.competition_id == Competition.id)
+        .outerjoin(Flight, AthleteEntry.flight_id == Flight.id)
+    )
+    if competition_id:
+        query = query.filter(Event.competition_id == competition_id)
+    if event_id:
+        query = query.filter(AthleteEntry.event_id == event_id)
+    if flight_id:
+        query = query.filter(AthleteEntry.flight_id == flight_id)
+    if is_final is not None:
+        query = query.filter(Score.is_final.is_(is_final))
+    return query.order_by(Score.calculated_at.desc().nulls_last(), Score.id.desc())
+
+
+def _after_cursor(query, calculated_at: Optional[datetime], score_id: int):
+    """Rows that sort after (calculated_at, id) in newest-first order"""
+    if calculated_at is None:
+        # Undated scores sort last, by id
+        return query.filter(Score.calculated_at.is_(None), Score.id < score_id)
+    return query.filter(
+        or_(
+            Score.calculated_at < calculated_at,
+            and_(Score.calculated_at == calculated_at, Score.id < score_id),
+            Score.calculated_at.is_(None),
+        )
+    )
+
+
+def score_page(
+    cursor: Optional[str] = None, limit: int = SCORES_PAGE_SIZE, **filters
+) -> Tuple[List, Optional[str]]:
+    """
+    One page of score rows and the cursor for the next page (None on the
+    last page). Reads one row past the page to know whether more exist.
+    """
+    limit = max(1, min(limit, MAX_SCORES_PAGE_SIZE))
+    query = score_projection(**filters)
+    if cursor:
+        query = _after_cursor(query, *decode_cursor(cursor))
+
+    rows = query.limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].calculated_at, rows[-1].id)
+    return rows, next_cursor
+
+
+def score_row_to_dict(row) -> dict:
+    """JSON shape of a score row for the admin API"""
+    return {
+        "id": row.id,
+        "athlete_entry_id": row.athlete_entry_id,
+        "athlete_name": f"{row.first_name} {row.last_name}",
+        "athlete_id": row.athlete_id,
+        "event_name": row.event_name or "N/A",
+        "event_id": row.event_id,
+        "competition_id": row.competition_id,
+        "competition_name": row.competition_name or "N/A",
+        "flight_id": row.flight_id,
+        "flight_name": row.flight_name or "N/A",
+        "lift_type": row.lift_type or "N/A",
+        "best_attempt_weight": row.best_attempt_weight,
+        "total_score": row.total_score,
+        "rank": row.rank,
+        "score_type": row.score_type,
+        "calculated_at": row.calculated_at.isoformat() if row.calculated_at else None,
+        "is_final": row.is_final,
+    }
+
+
+def score_filter_options() -> dict:
+    """Events and flights for the history filters, from one small query"""
+    events = {}
+    flights = {}
+    for (
+        competition_id,
+        event_id,
+        event_name,
+        flight_id,
+        flight_name,
+    ) in db.session.query(
+        Event.competition_id, Event.id, Event.name, Flight.id, Flight.name
+    ).outerjoin(Flight, Flight.event_id == Event.id):
+        events.setdefault(
+            event_id,
+            {"id": event_id, "name": event_name, "competition_id": competition_id},
+        )
+        if flight_id:
+            flights.setdefault(
+                flight_id,
+                {
+                    "id": flight_id,
+                    "name": flight_name,
+                    "event_id": event_id,
+                    "competition_id": competition_id,
+                },
+            )
+    return {"events": list(events.values()), "flights": list(flights.values())}
+
+
+def _csv_values(row) -> list:
+    return [
+        row.rank or "-",
+        f"{row.first_name} {row.last_name}",
+        row.event_name or "N/A",
+        row.flight_name or "N/A",
+        row.lift_type or "-",
+        row.best_attempt_weight or "-",
+        row.total_score or "-",
+        "FINAL" if row.is_final else "PROVISIONAL",
+        row.calculated_at.strftime("%Y-%m-%d %H:%M:%S") if row.calculated_at else "-",
+    ]
+
+
+class _LineBuffer:
+    """File-like target for csv.writer that collects lines into a list"""
+
+    def __init__(self):
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+    def drain(self) -> str:
+        text = "".join(self.lines)
+        self.lines = []
+        return text
+
+
+def iter_scores_csv(
+    chunk_rows: int = EXPORT_CHUNK_ROWS,
+    fetch_size: int = EXPORT_FETCH_SIZE,
+    **filters,
+) -> Iterator[str]:
+    """
+    Yield the scores CSV in chunks of ``chunk_rows`` rows. Rows are fetched
+    ``fetch_size`` at a time, so memory does not grow with the export size.
+    """
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_HEADERS)
+
+    pending = 0
+    for row in score_projection(**filters).yield_per(fetch_size):
+        writer.writerow(_csv_values(row))
+        pending += 1
+        if pending >= chunk_rows:
+            yield buffer.drain()
+            pending = 0
+
+    # The header is buffered before any row, so this is never empty for an
+    # export without rows
+    tail = buffer.drain()
+    if tail:
+        yield tail
+
+
+def gzip_chunks(chunks: Iterable[str], encoding: str = "utf-8") -> Iterator[bytes]:
+    """Compress text chunks into a gzip stream as they are produced"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode(encoding))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,96 @@
+"""
+Tests for the batched athlete dashboard loader
+"""
+
+from app.extensions import db
+from app.models import AthleteEntry, Attempt, Event, Flight, Score, SportType
+from app.routes.athlete import load_dashboard_data
+
+# Athlete + competition, entries, attempts, scores, flights
+DASHBOARD_QUERY_BUDGET = 5
+
+
+def _add_event(competition, athlete, name):
+    event = Event(
+        competition_id=competition.id,
+        name=name,
+        sport_type=SportType.POWERLIFTING,
+    )
+    db.session.add(event)
+    db.session.flush()
+    flight = Flight(
+        event_id=event.id, competition_id=competition.id, name=name, order=1
+    )
+    db.session.add(flight)
+    db.session.flush()
+    entry = AthleteEntry(
+        athlete_id=athlete.id,
+        event_id=event.id,
+        flight_id=flight.id,
+        entry_order=1,
+        lift_type=name,
+    )
+    db.session.add(entry)
+    db.session.flush()
+    db.session.add(
+        Attempt(
+            athlete_id=athlete.id,
+            athlete_entry_id=entry.id,
+            flight_id=flight.id,
+            attempt_number=1,
+            requested_weight=100,
+        )
+    )
+    db.session.add(Score(athlete_entry_id=entry.id, total_score=100, rank=1))
+    db.session.commit()
+
+
+def test_dashboard_data(app, seeded_competition):
+    ada = seeded_competition["athletes"][0]
+
+    data = load_dashboard_data(ada.id)
+
+    assert data["athlete"]["profile"]["first_name"] == "Ada"
+    (entry,) = data["athlete"]["entries"]
+    assert [a["attempt_number"] for a in entry["attempts"]] == [1, 2, 3]
+    assert data["competition"]["name"] == "Test Open"
+    assert data["competition"]["rankings"] == [
+        {"movement": "Snatch", "rank": None, "total_score": 0}
+    ]
+    assert data["my_flights"][0]["flight_name"] == "Flight A"
+    assert data["next_attempt"]["attempt_number"] == 1
+    assert data["next_attempt"]["requested_weight"] == 80
+
+
+def test_unknown_athlete(app):
+    assert load_dashboard_data(12345) is None
+
+
+def test_query_budget_does_not_grow_with_entries(
+    app, seeded_competition, count_queries
+):
+    competition = seeded_competition["competition"]
+    ada = seeded_competition["athletes"][0]
+    for name in ("Squat", "Bench", "Deadlift"):
+        _add_event(competition, ada, name)
+    athlete_id = ada.id
+    db.session.expire_all()
+
+    with count_queries() as counter:
+        data = load_dashboard_data(athlete_id)
+
+    assert len(data["athlete"]["entries"]) == 4
+    assert len(data["competition"]["rankings"]) == 4
+    assert counter.count <= DASHBOARD_QUERY_BUDGET
+
+
+def test_dashboard_route_renders(client, seeded_competition):
+    ada = seeded_competition["athletes"][0]
+    with client.session_transaction() as sess:
+        sess["athlete_id"] = ada.id
+        sess["user_id"] = 1
+
+    response = client.get("/athlete/")
+
+    assert response.status_code == 200
+    assert b"Test Open" in response.data
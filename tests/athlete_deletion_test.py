@@ -0,0 +1,129 @@
+"""
+Tests for set-based athlete deletion
+"""
+
+from app.extensions import db
+from app.models import (
+    Athlete,
+    AthleteEntry,
+    AthleteFlight,
+    Attempt,
+    AttemptResult,
+    CoachAssignment,
+    RefereeAssignment,
+    RefereeDecision,
+    Score,
+    Timer,
+    User,
+    UserRole,
+)
+from app.real_time.change_feed import change_feed
+from app.utils.athlete_deletion import delete_athletes
+from app.utils.lifting_order import lifting_order_engine
+
+
+def _user(email, role):
+    user = User(
+        email=email, password_hash="x", first_name="A", last_name="B", role=role
+    )
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def _add_dependents(seeded_competition):
+    """Coach assignment, score, timer and referee decision for athlete 0"""
+    athlete = seeded_competition["athletes"][0]
+    athlete.user_id = _user("ada@example.com", UserRole.ATHLETE).id
+    coach = _user("coach@example.com", UserRole.COACH)
+    referee = _user("ref@example.com", UserRole.REFEREE)
+    entry = AthleteEntry.query.filter_by(athlete_id=athlete.id).first()
+    attempt = Attempt.query.filter_by(athlete_id=athlete.id).first()
+    assignment = RefereeAssignment(user_id=referee.id)
+    db.session.add(assignment)
+    db.session.flush()
+    db.session.add_all(
+        [
+            CoachAssignment(coach_user_id=coach.id, athlete_id=athlete.id),
+            Score(athlete_entry_id=entry.id, total_score=80),
+            Timer(
+                timer_type="attempt",
+                duration_seconds=60,
+                remaining_seconds=60,
+                current_athlete_id=athlete.id,
+                current_attempt_id=attempt.id,
+            ),
+            RefereeDecision(
+                attempt_id=attempt.id,
+                referee_assignment_id=assignment.id,
+                decision=AttemptResult.GOOD_LIFT,
+            ),
+        ]
+    )
+    db.session.commit()
+    return athlete
+
+
+def test_deletes_roster_with_fixed_statements(app, seeded_competition, count_queries):
+    competition = seeded_competition["competition"]
+    flight = seeded_competition["flight"]
+    _add_dependents(seeded_competition)
+    athlete_ids = [a.id for a in seeded_competition["athletes"]]
+    assert len(lifting_order_engine.order(flight.id)) == 6
+    version = change_feed.version(competition.id)
+
+    with count_queries() as counter:
+        result, found = delete_athletes(athlete_ids + [9999])
+
+    # Three reads, then one statement per table, however big the roster
+    assert counter.count == 14
+    assert found == set(athlete_ids)
+    assert (result.athletes, result.attempts, result.entries) == (2, 6, 2)
+    assert (result.scores, result.referee_decisions, result.users) == (1, 1, 1)
+    assert result.timers_cleared == 2
+
+    assert Athlete.query.count() == 0
+    assert Attempt.query.count() == 0
+    assert AthleteFlight.query.count() == 0
+    assert CoachAssignment.query.count() == 0
+    # The athlete's account goes; the coach and referee stay
+    assert User.query.filter_by(email="ada@example.com").count() == 0
+    assert (
+        User.query.filter(
+            User.email.in_(["coach@example.com", "ref@example.com"])
+        ).count()
+        == 2
+    )
+    timer = Timer.query.one()
+    assert (timer.current_athlete_id, timer.current_attempt_id) == (None, None)
+
+    assert change_feed.version(competition.id) > version
+    assert lifting_order_engine.order(flight.id) == []
+
+
+def test_delete_route_uses_service(app, admin_client, seeded_competition):
+    athlete_id = _add_dependents(seeded_competition).id
+    other_id = seeded_competition["athletes"][1].id
+
+    response = admin_client.delete(f"/admin/athletes/{athlete_id}")
+    assert response.status_code == 200
+    assert response.get_json()["deleted"]["attempts"] == 3
+    assert admin_client.delete(f"/admin/athletes/{athlete_id}").status_code == 404
+
+    # The other athlete is untouched
+    assert Attempt.query.filter_by(athlete_id=other_id).count() == 3
+
+
+def test_bulk_delete_route(app, admin_client, seeded_competition):
+    athlete_ids = [a.id for a in seeded_competition["athletes"]]
+
+    response = admin_client.post(
+        "/admin/athletes:bulk-delete", json={"athlete_ids": athlete_ids + [9999]}
+    )
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["deleted"]["athletes"] == 2
+    assert body["missing"] == [9999]
+
+    bad = admin_client.post("/admin/athletes:bulk-delete", json={"athlete_ids": []})
+    assert bad.status_code == 400
@@ -0,0 +1,82 @@
+"""
+Tests for per-athlete queue status pushes over Socket.IO
+"""
+
+from app.extensions import db, socketio
+from app.models import Attempt
+from app.real_time.athlete_notifier import athlete_notifier, eta_bucket
+
+
+def _connect_as(app, client, athlete):
+    with client.session_transaction() as sess:
+        sess["athlete_id"] = athlete.id
+    socket = socketio.test_client(app, flask_test_client=client)
+    socket.emit("join_athlete", {})
+    return socket
+
+
+def _statuses(socket):
+    return [
+        m["args"][0] for m in socket.get_received() if m["name"] == "athlete_status"
+    ]
+
+
+def test_eta_buckets():
+    assert eta_bucket(None) is None
+    assert eta_bucket(0) == "now"
+    assert eta_bucket(45) == "<1m"
+    assert eta_bucket(4 * 60) == "3-5m"
+    assert eta_bucket(2 * 3600) == "60m+"
+
+
+def test_join_sends_current_status(app, client, seeded_competition):
+    ben = seeded_competition["athletes"][1]
+    socket = _connect_as(app, client, ben)
+
+    (status,) = _statuses(socket)
+    assert status["you_are_up"] is False
+    assert status["position"] == 1
+    assert status["eta_bucket"] == "1-3m"
+    socket.disconnect()
+
+
+def test_push_only_when_status_changes(app, client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    ben = seeded_competition["athletes"][1]
+    socket = _connect_as(app, client, ben)
+    socket.get_received()
+
+    # Nothing changed for Ben: no push
+    assert athlete_notifier.refresh(competition_id) == 0
+    assert _statuses(socket) == []
+
+    first = Attempt.query.order_by(Attempt.lifting_order).first()
+    first.status = "finished"
+    db.session.commit()
+    athlete_notifier.refresh(competition_id)
+
+    statuses = _statuses(socket)
+    assert statuses and statuses[-1]["you_are_up"] is True
+    socket.disconnect()
+
+
+def test_join_requires_athlete_login(app, client, seeded_competition):
+    socket = socketio.test_client(app, flask_test_client=client)
+    socket.emit("join_athlete", {})
+
+    errors = [m for m in socket.get_received() if m["name"] == "error"]
+    assert errors
+    socket.disconnect()
+
+
+def test_disconnect_forgets_last_sent_status(app, client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    ben = seeded_competition["athletes"][1]
+    socket = _connect_as(app, client, ben)
+    assert ben.id in athlete_notifier._last_sent
+
+    socket.disconnect()
+
+    assert ben.id not in athlete_notifier._last_sent
+    assert athlete_notifier.refresh(competition_id) == 0
+    assert ben.id not in athlete_notifier._last_sent
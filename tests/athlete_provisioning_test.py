@@ -0,0 +1,111 @@
+"""
+Tests for bulk athlete entry and attempt provisioning
+"""
+
+from app.extensions import db
+from app.models import Athlete, AthleteEntry, Attempt
+from app.real_time.change_feed import change_feed
+from app.utils.movements import ensure_movement_definitions
+from app.routes.athlete import (
+    ensure_athlete_entries_for_event,
+    provision_athlete_entries,
+)
+
+
+def _configure_movements(competition, event):
+    competition.config = {
+        "events": [
+            {
+                "id": event.id,
+                "name": event.name,
+                "movements": [
+                    {
+                        "name": "Snatch",
+                        "timer": {"attempt_seconds": 90},
+                        "reps": [1, 1, 1],
+                    },
+                    {"name": "Clean & Jerk", "reps": [1, 1, 1]},
+                ],
+            }
+        ]
+    }
+    db.session.commit()
+    # Saving the model creates the definitions
+    ensure_movement_definitions(event)
+    db.session.commit()
+
+
+def _add_athletes(competition, count):
+    athletes = [
+        Athlete(
+            first_name=f"Lifter{i}", last_name="Test", competition_id=competition.id
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(athletes)
+    db.session.commit()
+    return athletes
+
+
+def test_provisions_roster_with_fixed_query_count(
+    app, seeded_competition, count_queries
+):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    flight = seeded_competition["flight"]
+    _configure_movements(competition, event)
+    athletes = _add_athletes(competition, 40)
+    assignments = [(a.id, order) for order, a in enumerate(athletes, start=10)]
+    # Callers hand in loaded event (with competition config) and flight rows
+    assert event.competition.config and flight.movement_type == "Snatch"
+
+    version = change_feed.version(competition.id)
+
+    with count_queries() as counter:
+        created = provision_athlete_entries(event, flight, assignments)
+        db.session.commit()
+
+    assert change_feed.version(competition.id) > version
+
+    # One definitions lookup, two existence checks, two executemany inserts
+    # and one id lookup, independent of roster size
+    assert counter.count == 6
+    assert all(len(entries) == 1 for entries in created.values())
+
+    athlete_ids = [a.id for a in athletes]
+    entries = AthleteEntry.query.filter(AthleteEntry.athlete_id.in_(athlete_ids)).all()
+    assert len(entries) == 40
+    # Only the movement matching the flight's movement type is entered
+    assert {e.lift_type for e in entries} == {"Snatch"}
+    assert {e.time_limit for e in entries} == {90}
+    assert Attempt.query.filter(Attempt.athlete_id.in_(athlete_ids)).count() == 120
+
+
+def test_provisioning_skips_existing_rows(app, seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    flight = seeded_competition["flight"]
+    _configure_movements(competition, event)
+    ada = seeded_competition["athletes"][0]
+
+    # Ada already has a Snatch entry and attempts from the fixture
+    created = provision_athlete_entries(event, flight, [(ada.id, 1)])
+    db.session.commit()
+
+    assert created == {ada.id: []}
+    assert Attempt.query.filter_by(athlete_id=ada.id).count() == 3
+
+
+def test_ensure_entries_for_single_athlete(app, seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    flight = seeded_competition["flight"]
+    _configure_movements(competition, event)
+    (athlete,) = _add_athletes(competition, 1)
+
+    created = ensure_athlete_entries_for_event(athlete.id, event.id, flight.id, 3)
+
+    assert [e.lift_type for e in created] == ["Snatch"]
+    attempts = Attempt.query.filter_by(athlete_id=athlete.id).all()
+    assert sorted(a.attempt_number for a in attempts) == [1, 2, 3]
+    assert all(a.athlete_entry_id == created[0].id for a in attempts)
@@ -0,0 +1,78 @@
+"""
+Tests for the compiled competition config index
+"""
+
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.extensions import db
+from app.utils.competition_config import CompiledConfig, compiled_config
+
+CONFIG = {
+    "events": [
+        {
+            "id": 1,
+            "name": "Snatch",
+            "movements": [
+                {"name": "Snatch", "reps": 1, "timer": {"attempt_seconds": 60}}
+            ],
+            "groups": [{"referee": {"n": 5}, "timer": {"break_seconds": 120}}],
+        },
+        {
+            "id": 2,
+            "name": "Squat",
+            "movements": [{"name": "Back Squat", "reps": 3}],
+            "attempt_time": "1:30",
+        },
+    ]
+}
+
+
+def test_lookups():
+    compiled = CompiledConfig.compile(CONFIG)
+
+    assert compiled.movements_for_event(2)[0]["name"] == "Back Squat"
+    assert compiled.movements_for_event(99, " squat ")[0]["name"] == "Back Squat"
+    assert compiled.movements_for_event(99, "Deadlift")[0]["name"] == "Snatch"
+    assert compiled.timer_defaults("Snatch") == (60, 120)
+    assert compiled.timer_defaults("Deadlift") == (None, None)
+    assert compiled.event_times("Squat") == (90, None)
+    assert compiled.referee["number_of_referees"] == 5
+
+
+def test_cached_per_competition_until_saved(app, seeded_competition, count_queries):
+    competition = seeded_competition["competition"]
+    competition.config = CONFIG
+    db.session.commit()
+
+    first = compiled_config(competition)
+    with count_queries() as counter:
+        assert compiled_config(competition) is first
+    assert counter.count == 0
+
+    # In-place edits are seen before the commit, and the cache is then dropped
+    competition.config["events"][0]["groups"][0]["referee"]["n"] = 1
+    flag_modified(competition, "config")
+    assert compiled_config(competition).referee["number_of_referees"] == 1
+    db.session.commit()
+    assert compiled_config(competition) is not first
+    assert compiled_config(competition).referee["number_of_referees"] == 1
+
+
+def test_routes_read_the_compiled_config(admin_client, seeded_competition):
+    competition = seeded_competition["competition"]
+    competition.config = CONFIG
+    db.session.commit()
+
+    referee_config = admin_client.get(
+        f"/admin/api/competitions/{competition.id}/referee-config"
+    ).get_json()
+    timers = admin_client.get(
+        "/admin/api/timer-defaults",
+        query_string={
+            "comp_id": competition.id,
+            "event_id": seeded_competition["event"].id,
+        },
+    ).get_json()
+
+    assert referee_config["number_of_referees"] == 5
+    assert (timers["attempt_seconds"], timers["break_seconds"]) == (60, 120)
@@ -0,0 +1,145 @@
+"""
+Tests for diff-based competition model saves and JSON Patch updates
+"""
+
+import pytest
+
+from app.extensions import db
+from app.models import AthleteEntry, Competition, Event, Flight
+from app.utils.competition_model import apply_json_patch
+
+
+def _model(**overrides):
+    model = {
+        "name": "Spring Open",
+        "comp_date": "2024-04-01",
+        "events": [
+            {
+                "name": "Snatch",
+                "sport_type": "olympic_weightlifting",
+                "movements": [{"name": "Snatch", "reps": [1, 1, 1]}],
+                "groups": [{"name": "A", "order": 1}, {"name": "B", "order": 2}],
+            },
+            {"name": "Squat", "sport_type": "powerlifting", "groups": []},
+        ],
+    }
+    model.update(overrides)
+    return model
+
+
+def test_json_patch_operations():
+    doc = {"events": [{"name": "Snatch", "groups": []}]}
+
+    patched = apply_json_patch(
+        doc,
+        [
+            {"op": "add", "path": "/events/0/groups/-", "value": {"name": "A"}},
+            {"op": "replace", "path": "/events/0/name", "value": "Clean"},
+            {"op": "copy", "from": "/events/0", "path": "/events/1"},
+            {"op": "remove", "path": "/events/1/groups/0"},
+            {"op": "test", "path": "/events/1/name", "value": "Clean"},
+        ],
+    )
+
+    assert patched == {
+        "events": [
+            {"name": "Clean", "groups": [{"name": "A"}]},
+            {"name": "Clean", "groups": []},
+        ]
+    }
+    assert doc == {"events": [{"name": "Snatch", "groups": []}]}
+    for bad in (
+        [{"op": "test", "path": "/events/0/name", "value": "Jerk"}],
+        [{"op": "remove", "path": "/events/3"}],
+        [{"op": "explode", "path": "/events"}],
+    ):
+        with pytest.raises(ValueError):
+            apply_json_patch(doc, bad)
+
+
+def test_resave_only_touches_what_changed(admin_client, app):
+    created = admin_client.post(
+        "/admin/competition-model/save", json=_model()
+    ).get_json()
+    assert (created["events_created"], created["flights_created"]) == (2, 2)
+
+    competition = db.session.get(Competition, created["competition_id"])
+    stored = competition.config
+    # Ids of created rows are written back, so the next save can diff them
+    assert [event["id"] for event in stored["events"]] == [
+        e.id for e in Event.query.order_by(Event.id)
+    ]
+
+    unchanged = admin_client.post(
+        "/admin/competition-model/save", json={"id": competition.id, **stored}
+    ).get_json()
+    assert unchanged["status"] == "success"
+    assert (unchanged["events_updated"], unchanged["flights_updated"]) == (0, 0)
+    assert (unchanged["events_created"], unchanged["events_deleted"]) == (0, 0)
+
+    stored["events"][0]["groups"][1]["name"] = "B2"
+    del stored["events"][1]
+    changed = admin_client.post(
+        "/admin/competition-model/save", json={"id": competition.id, **stored}
+    ).get_json()
+    assert (changed["flights_updated"], changed["events_deleted"]) == (1, 1)
+    assert sorted(f.name for f in Flight.query) == ["A", "B2"]
+    assert Event.query.count() == 1
+
+
+def test_patch_updates_only_changed_movements(admin_client, seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    competition.config = {
+        "name": "Test Open",
+        "comp_date": "2024-01-01",
+        "events": [
+            {
+                "id": event.id,
+                "name": "Snatch",
+                "sport_type": "olympic_weightlifting",
+                "movements": [
+                    {"name": "Snatch", "reps": [1]},
+                    {"name": "Clean", "reps": [1]},
+                ],
+                "groups": [{"id": seeded_competition["flight"].id, "name": "Flight A"}],
+            }
+        ],
+    }
+    db.session.commit()
+
+    first = admin_client.patch(
+        f"/admin/competition-model/{competition.id}",
+        json=[{"op": "replace", "path": "/events/0/movements/1/reps", "value": [2]}],
+    ).get_json()
+    # Config set directly has no definitions yet; the first save adds them
+    assert first["movements_created"] == 2
+    assert first["movements_updated"] == 0
+
+    response = admin_client.patch(
+        f"/admin/competition-model/{competition.id}",
+        json=[
+            {
+                "op": "replace",
+                "path": "/events/0/movements/0",
+                "value": {
+                    "name": "Snatch",
+                    "reps": [1, 1],
+                    "timer": {"attempt_seconds": 90},
+                },
+            }
+        ],
+    ).get_json()
+
+    assert response["movements_created"] == 0
+    assert response["movements_updated"] == 1
+    assert response["events_updated"] == 0
+    entries = AthleteEntry.query.all()
+    assert {tuple(e.reps) for e in entries} == {(1, 1)}
+    assert {e.time_limit for e in entries} == {90}
+
+    bad = admin_client.patch(
+        f"/admin/competition-model/{competition.id}",
+        json=[{"op": "remove", "path": "/name"}],
+    )
+    assert bad.status_code == 400
@@ -42,8 +42,27 @@ def app():
         db.session.close()
         db.session.remove()
         db.drop_all()
+        engine_db_path = db.engine.url.database
         db.engine.dispose()
 
+    # Every test gets a fresh database, so competition ids are reused
+    from app.real_time.decision_board import decision_board
+    from app.utils.competition_config import compiled_config_cache
+    from app.utils.decision_log import decision_filter_index
+    from app.utils.lifting_order import lifting_order_engine
+    from app.utils.referee_decisions import referee_assignment_cache
+
+    decision_filter_index.invalidate()
+    referee_assignment_cache.invalidate()
+    decision_board.reset()
+    compiled_config_cache.invalidate()
+    lifting_order_engine.invalidate()
+
+    # The engine is bound before the URI override above takes effect, so the
+    # file-backed test database has to go too or the next app skips create_all
+    if engine_db_path and os.path.exists(engine_db_path):
+        os.unlink(engine_db_path)
+
     # Clean up the temporary database file
     os.close(db_fd)
     os.unlink(db_path)
@@ -81,3 +100,132 @@ def auth(client):
             return self._client.get("/auth/logout")
 
     return AuthActions(client)
+
+
+@pytest.fixture()
+def admin_client(client):
+    """A test client with an admin session (the admin user from the app fixture)."""
+    with client.session_transaction() as sess:
+        sess["is_admin"] = True
+        sess["user_id"] = 1
+    return client
+
+
+@pytest.fixture()
+def seeded_competition(app):
+    """A competition with one event, one flight and two athletes with attempts."""
+    from datetime import date
+    from app.models import (
+        Competition,
+        Event,
+        Flight,
+        Athlete,
+        AthleteFlight,
+        AthleteEntry,
+        Attempt,
+        SportType,
+    )
+
+    competition = Competition(name="Test Open", start_date=date(2024, 1, 1))
+    db.session.add(competition)
+    db.session.flush()
+
+    event = Event(
+        competition_id=competition.id,
+        name="Snatch",
+        sport_type=SportType.OLYMPIC_WEIGHTLIFTING,
+    )
+    db.session.add(event)
+    db.session.flush()
+
+    flight = Flight(
+        event_id=event.id,
+        competition_id=competition.id,
+        name="Flight A",
+        order=1,
+        movement_type="Snatch",
+    )
+    db.session.add(flight)
+    db.session.flush()
+
+    athletes = []
+    for order, (first, last, opener) in enumerate(
+        [("Ada", "Lift", 80.0), ("Ben", "Press", 90.0)], start=1
+    ):
+        athlete = Athlete(
+            first_name=first,
+            last_name=last,
+            competition_id=competition.id,
+            gender="F",
+            bodyweight=60,
+        )
+        db.session.add(athlete)
+        db.session.flush()
+        db.session.add(
+            AthleteFlight(
+                athlete_id=athlete.id,
+                flight_id=flight.id,
+                order=order,
+                lot_number=order,
+            )
+        )
+        entry = AthleteEntry(
+            athlete_id=athlete.id,
+            event_id=event.id,
+            flight_id=flight.id,
+            entry_order=order,
+            lift_type="Snatch",
+            attempt_time_limit=60,
+        )
+        db.session.add(entry)
+        db.session.flush()
+        for number in range(1, 4):
+            db.session.add(
+                Attempt(
+                    athlete_id=athlete.id,
+                    athlete_entry_id=entry.id,
+                    flight_id=flight.id,
+                    movement_type="Snatch",
+                    attempt_number=number,
+                    requested_weight=opener + (number - 1) * 5,
+                    lifting_order=(number - 1) * 2 + order,
+                    status="waiting",
+                )
+            )
+        athletes.append(athlete)
+
+    db.session.commit()
+    return {
+        "competition": competition,
+        "event": event,
+        "flight": flight,
+        "athletes": athletes,
+    }
+
+
+class QueryCounter:
+    """Counts SQL statements executed on an engine while active"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.count = 0
+
+    def _count(self, *args, **kwargs):
+        self.count += 1
+
+    def __enter__(self):
+        from sqlalchemy import event
+
+        event.listen(self.engine, "before_cursor_execute", self._count)
+        return self
+
+    def __exit__(self, *exc):
+        from sqlalchemy import event
+
+        event.remove(self.engine, "before_cursor_execute", self._count)
+
+
+@pytest.fixture()
+def count_queries(app):
+    """Context manager factory counting queries, for query budget tests."""
+    return lambda: QueryCounter(db.engine)
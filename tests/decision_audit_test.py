@@ -0,0 +1,82 @@
+"""
+Tests for the append-only referee decision audit trail
+"""
+
+from app.extensions import db
+from app.models import Attempt, Referee, RefereeDecisionAudit
+
+
+def _referee(competition_id, username="rita"):
+    referee = Referee(
+        name="Rita Ref",
+        username=username,
+        password="secret",
+        position="Head Referee",
+        competition_id=competition_id,
+        notes="Certified 2019",
+    )
+    db.session.add(referee)
+    db.session.commit()
+    return referee
+
+
+def _submit(client, referee, **payload):
+    body = {
+        "referee_id": referee.id,
+        "competition_id": referee.competition_id,
+        "decision": "good_lift",
+        "timestamp": "2024-01-01T09:00:00Z",
+    }
+    body.update(payload)
+    return client.post("/admin/api/referee-decision", json=body)
+
+
+def test_decisions_are_audited_without_touching_referee_notes(
+    client, seeded_competition
+):
+    competition_id = seeded_competition["competition"].id
+    referee = _referee(competition_id)
+    attempt = Attempt.query.order_by(Attempt.id).first()
+
+    assert _submit(client, referee, attempt_id=attempt.id).get_json()["success"]
+    assert _submit(
+        client, referee, attempt_id=attempt.id, decision="no_lift", notes="Press out"
+    ).get_json()["success"]
+    assert _submit(client, referee).get_json()["success"]
+
+    db.session.expire_all()
+    assert db.session.get(Referee, referee.id).notes == "Certified 2019"
+
+    entries = RefereeDecisionAudit.query.order_by(RefereeDecisionAudit.id).all()
+    assert [(e.attempt_id, e.decision) for e in entries] == [
+        (attempt.id, "good_lift"),
+        (attempt.id, "no_lift"),
+        (None, "good_lift"),
+    ]
+    assert entries[1].notes == "Press out"
+    assert entries[0].client_timestamp == "2024-01-01T09:00:00Z"
+
+
+def test_audit_is_queryable_by_attempt_and_referee(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    rita = _referee(competition_id)
+    sam = _referee(competition_id, username="sam")
+    first, second = Attempt.query.order_by(Attempt.id).limit(2).all()
+    _submit(admin_client, rita, attempt_id=first.id)
+    _submit(admin_client, sam, attempt_id=first.id, decision="no_lift")
+    _submit(admin_client, rita, attempt_id=second.id)
+
+    by_attempt = admin_client.get(
+        "/admin/api/decision-audit", query_string={"attempt_id": first.id}
+    ).get_json()["entries"]
+    assert [(e["referee_id"], e["decision"]) for e in by_attempt] == [
+        (rita.id, "good_lift"),
+        (sam.id, "no_lift"),
+    ]
+
+    by_referee = admin_client.get(
+        "/admin/api/decision-audit", query_string={"referee_id": rita.id}
+    ).get_json()["entries"]
+    assert [e["attempt_id"] for e in by_referee] == [first.id, second.id]
+
+    assert admin_client.get("/admin/api/decision-audit").status_code == 400
@@ -0,0 +1,143 @@
+"""
+Tests for the live referee decision board
+"""
+
+from app.extensions import db, socketio
+from app.models import Attempt, AttemptResult, Referee
+from app.utils.scoring import ScoringCalculator
+
+
+def _referees(competition_id, count):
+    referees = [
+        Referee(
+            name=f"Ref {i}",
+            username=f"ref{i}",
+            password="secret",
+            position=f"Referee {i}",
+            competition_id=competition_id,
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(referees)
+    db.session.commit()
+    return referees
+
+
+def _vote(client, referee, attempt_id, decision):
+    return client.post(
+        "/admin/api/referee-decision",
+        json={
+            "referee_id": referee.id,
+            "competition_id": referee.competition_id,
+            "attempt_id": attempt_id,
+            "decision": decision,
+        },
+    )
+
+
+def _events(socket, name):
+    return [m["args"][0] for m in socket.get_received() if m["name"] == name]
+
+
+def test_result_is_pushed_once_at_quorum(app, client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    referees = _referees(competition_id, 3)
+    socket = socketio.test_client(app, flask_test_client=client)
+    socket.emit(
+        "join_competition", {"competition_id": competition_id, "user_type": "referee"}
+    )
+    socket.get_received()
+
+    _vote(client, referees[0], attempt_id, "good_lift")
+    _vote(client, referees[1], attempt_id, "no_lift")
+    received = socket.get_received()
+    assert [m["name"] for m in received] == ["referee_vote", "referee_vote"]
+
+    _vote(client, referees[2], attempt_id, "good_lift")
+    received = socket.get_received()
+    results = [m["args"][0] for m in received if m["name"] == "decision_result"]
+    assert len(results) == 1
+    assert results[0]["attempt_id"] == attempt_id
+    assert results[0]["good_lift"] is True
+    assert (results[0]["good_votes"], results[0]["no_votes"]) == (2, 1)
+
+    # A repeat vote that does not change the outcome is not re-announced
+    _vote(client, referees[2], attempt_id, "good_lift")
+    assert _events(socket, "decision_result") == []
+
+    # One that flips it is
+    _vote(client, referees[0], attempt_id, "no_lift")
+    (flipped,) = _events(socket, "decision_result")
+    assert flipped["good_lift"] is False
+    socket.disconnect()
+
+
+def test_board_endpoint_and_clear(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    referee = _referees(competition_id, 1)[0]
+
+    empty = admin_client.get(
+        f"/admin/api/referee-decisions/{competition_id}"
+    ).get_json()
+    assert empty["decisions"] == {}
+    assert empty["result"] is None
+
+    _vote(admin_client, referee, attempt_id, "good_lift")
+    _vote(admin_client, referee, attempt_id, "no_lift")
+    data = admin_client.get(f"/admin/api/referee-decisions/{competition_id}").get_json()
+    assert data["attempt_id"] == attempt_id
+    assert data["required"] == 3
+    assert list(data["decisions"]) == [str(referee.id)]
+    assert data["decisions"][str(referee.id)]["decision_value"] is False
+
+    admin_client.post(
+        f"/admin/api/referee-decisions/{competition_id}/clear",
+        json={"attempt_id": attempt_id},
+    )
+    data = admin_client.get(f"/admin/api/referee-decisions/{competition_id}").get_json()
+    assert data["decisions"] == {}
+
+
+def test_required_count_comes_from_config(client, seeded_competition):
+    competition = seeded_competition["competition"]
+    competition.config = {
+        "events": [{"name": "Snatch", "groups": [{"referee": {"n": 1}}]}]
+    }
+    db.session.commit()
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    referee = _referees(competition.id, 1)[0]
+    socket = socketio.test_client(client.application, flask_test_client=client)
+    socket.emit("join_competition", {"competition_id": competition.id})
+    socket.get_received()
+
+    _vote(client, referee, attempt_id, "good_lift")
+
+    (result,) = _events(socket, "decision_result")
+    assert result["label"] == "Good Lift"
+    socket.disconnect()
+
+
+def test_tie_is_no_lift_like_the_stored_result(client, seeded_competition):
+    competition = seeded_competition["competition"]
+    competition.config = {
+        "events": [{"name": "Snatch", "groups": [{"referee": {"n": 2}}]}]
+    }
+    db.session.commit()
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    referees = _referees(competition.id, 2)
+    socket = socketio.test_client(client.application, flask_test_client=client)
+    socket.emit("join_competition", {"competition_id": competition.id})
+    socket.get_received()
+
+    _vote(client, referees[0], attempt_id, "good_lift")
+    _vote(client, referees[1], attempt_id, "no_lift")
+
+    (result,) = _events(socket, "decision_result")
+    assert result["good_lift"] is False
+    assert (result["good_votes"], result["no_votes"]) == (1, 1)
+    assert ScoringCalculator.determine_attempt_result(attempt_id) == (
+        AttemptResult.NO_LIFT
+    )
+    socket.disconnect()
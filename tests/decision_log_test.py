@@ -0,0 +1,130 @@
+"""
+Tests for the paginated referee decision log and its filter index
+"""
+
+from datetime import datetime, timedelta
+
+from app.extensions import db
+from app.models import Referee, RefereeDecisionLog
+
+
+def _referee(competition_id):
+    referee = Referee(
+        name="Rita Ref",
+        username="rita",
+        password="secret",
+        position="Head Referee",
+        competition_id=competition_id,
+    )
+    db.session.add(referee)
+    db.session.commit()
+    return referee
+
+
+def _log(referee, count, athlete="Ada Lift", flight="Flight A", start=None):
+    start = start or datetime(2024, 1, 1, 9, 0, 0)
+    for i in range(count):
+        db.session.add(
+            RefereeDecisionLog(
+                referee_id=referee.id,
+                competition_id=referee.competition_id,
+                event_name="Snatch",
+                flight_name=flight,
+                athlete_name=athlete,
+                attempt_number=i % 3 + 1,
+                attempt_weight=80.0 + i,
+                decision_label="Good Lift" if i % 2 == 0 else "No Lift",
+                decision_value=i % 2 == 0,
+                # Pairs of rows share a timestamp so pages split ties
+                timestamp=start + timedelta(seconds=i // 2),
+            )
+        )
+    db.session.commit()
+
+
+def test_results_are_paged_newest_first(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    referee = _referee(competition_id)
+    _log(referee, 11)
+    expected = [
+        log.id
+        for log in RefereeDecisionLog.query.order_by(
+            RefereeDecisionLog.timestamp.desc(), RefereeDecisionLog.id.desc()
+        )
+    ]
+
+    ids = []
+    cursor = None
+    while True:
+        query = {"competition_id": competition_id, "limit": 4}
+        if cursor:
+            query["cursor"] = cursor
+        data = admin_client.get(
+            "/admin/api/decision-results", query_string=query
+        ).get_json()
+        assert data["success"]
+        ids.extend(decision["id"] for decision in data["decisions"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            break
+
+    assert ids == expected
+    assert data["decisions"][0]["referee_name"] == "Rita Ref"
+    assert data["decisions"][0]["competition_name"] == "Test Open"
+
+    bad = admin_client.get("/admin/api/decision-results", query_string={"cursor": "x"})
+    assert bad.status_code == 400
+
+
+def test_results_filters_and_query_count(
+    admin_client, seeded_competition, count_queries
+):
+    competition_id = seeded_competition["competition"].id
+    referee = _referee(competition_id)
+    _log(referee, 4)
+    _log(referee, 3, athlete="Ben Press", flight="Flight B")
+    db.session.expire_all()
+
+    with count_queries() as counter:
+        response = admin_client.get(
+            "/admin/api/decision-results",
+            query_string={
+                "competition_id": competition_id,
+                "flight": "Flight B",
+                "athlete": "Ben Press",
+            },
+        )
+
+    assert counter.count == 1
+    decisions = response.get_json()["decisions"]
+    assert len(decisions) == 3
+    assert {d["athlete_name"] for d in decisions} == {"Ben Press"}
+
+
+def test_filter_index_is_maintained_on_insert(
+    admin_client, seeded_competition, count_queries
+):
+    competition_id = seeded_competition["competition"].id
+    referee = _referee(competition_id)
+    _log(referee, 2)
+    url = f"/admin/api/decision-filters/{competition_id}"
+
+    first = admin_client.get(url).get_json()
+    assert first["events"] == ["Snatch"]
+    assert first["flights"] == ["Flight A"]
+    assert first["athletes"] == ["Ada Lift"]
+
+    # New rows are added to the index at commit; no rescans afterwards
+    _log(referee, 1, athlete="Ben Press", flight="Flight B")
+    with count_queries() as counter:
+        second = admin_client.get(url).get_json()
+    assert counter.count == 0
+    assert second["flights"] == ["Flight A", "Flight B"]
+    assert second["athletes"] == ["Ada Lift", "Ben Press"]
+
+    # Edits and deletes reload the competition's values
+    db.session.delete(
+        RefereeDecisionLog.query.filter_by(athlete_name="Ben Press").one()
+    )
+    db.session.commit()
+    assert admin_client.get(url).get_json()["athletes"] == ["Ada Lift"]
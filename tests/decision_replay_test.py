@@ -0,0 +1,113 @@
+"""
+Tests for idempotent replay of queued referee decisions
+"""
+
+from app.extensions import db
+from app.models import (
+    Attempt,
+    AttemptResult,
+    Referee,
+    RefereeDecision,
+    RefereeDecisionAudit,
+)
+from app.utils import referee_decisions
+
+
+def _referees(competition_id, count=2):
+    referees = [
+        Referee(
+            name=f"Ref {i}",
+            username=f"ref{i}",
+            password="secret",
+            position=f"Referee {i}",
+            competition_id=competition_id,
+        )
+        for i in range(count)
+    ]
+    db.session.add_all(referees)
+    db.session.commit()
+    return referees
+
+
+def _decision(client_decision_id, referee, attempt_id, decision="good_lift"):
+    return {
+        "client_decision_id": client_decision_id,
+        "referee_id": referee.id,
+        "competition_id": referee.competition_id,
+        "attempt_id": attempt_id,
+        "decision": decision,
+    }
+
+
+def _replay(client, decisions):
+    return client.post(
+        "/admin/api/referee-decisions/replay", json={"decisions": decisions}
+    )
+
+
+def test_replay_applies_once_and_recomputes_once_per_attempt(
+    client, seeded_competition, monkeypatch
+):
+    first, second = _referees(seeded_competition["competition"].id)
+    attempt_ids = [a.id for a in Attempt.query.order_by(Attempt.id).limit(2)]
+    recomputed = []
+    monkeypatch.setattr(
+        referee_decisions,
+        "calculate_scores_after_referee_decision",
+        lambda attempt_id: recomputed.append(attempt_id) or {},
+    )
+    batch = [
+        _decision("a-1", first, attempt_ids[0], "no_lift"),
+        _decision("a-2", second, attempt_ids[0]),
+        _decision("a-3", first, attempt_ids[0]),  # changed vote, applied in order
+        _decision("a-2", second, attempt_ids[0]),  # repeated within the batch
+        _decision("b-1", first, attempt_ids[1]),
+        _decision("c-1", first, 999999),
+        {"referee_id": first.id, "decision": "good_lift"},
+    ]
+
+    data = _replay(client, batch).get_json()
+
+    assert (data["applied"], data["duplicate"], data["rejected"]) == (4, 1, 2)
+    assert [r["status"] for r in data["results"]] == [
+        "applied",
+        "applied",
+        "applied",
+        "duplicate",
+        "applied",
+        "rejected",
+        "rejected",
+    ]
+    assert recomputed == attempt_ids
+    votes = RefereeDecision.query.filter_by(attempt_id=attempt_ids[0]).all()
+    assert [v.decision for v in votes] == [AttemptResult.GOOD_LIFT] * 2
+    assert RefereeDecisionAudit.query.count() == 4
+
+    # Sending the whole queue again changes nothing
+    recomputed.clear()
+    again = _replay(client, batch).get_json()
+    assert (again["applied"], again["duplicate"], again["rejected"]) == (0, 5, 2)
+    assert recomputed == []
+    assert RefereeDecisionAudit.query.count() == 4
+
+
+def test_single_submit_with_seen_id_is_not_reapplied(client, seeded_competition):
+    referee = _referees(seeded_competition["competition"].id, 1)[0]
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    decision = _decision("tablet-1", referee, attempt_id)
+
+    first = client.post("/admin/api/referee-decision", json=decision).get_json()
+    decision["decision"] = "no_lift"
+    retry = client.post("/admin/api/referee-decision", json=decision).get_json()
+
+    assert first["success"] and "duplicate" not in first
+    assert retry["success"] and retry["duplicate"] is True
+    vote = RefereeDecision.query.filter_by(attempt_id=attempt_id).one()
+    assert vote.decision == AttemptResult.GOOD_LIFT
+    assert RefereeDecisionAudit.query.count() == 1
+
+
+def test_replay_rejects_empty_or_oversized_batches(client, app):
+    assert _replay(client, []).status_code == 400
+    oversized = [{}] * (referee_decisions.MAX_REPLAY_DECISIONS + 1)
+    assert _replay(client, oversized).status_code == 400
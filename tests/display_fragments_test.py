@@ -0,0 +1,75 @@
+"""
+Tests for server-rendered display fragments
+"""
+
+from app.extensions import db
+from app.models import Attempt, AttemptResult
+
+
+def _fragments(client, competition_id, **params):
+    query = "&".join(f"{key}={value}" for key, value in params.items())
+    response = client.get(
+        f"/display/api/competition/{competition_id}/fragments?{query}"
+    )
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_fragments_render_all_by_default(client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+
+    data = _fragments(client, competition_id)
+
+    assert set(data["fragments"]) == {
+        "flights_table",
+        "event_tabs",
+        "current_lifter",
+        "rankings",
+    }
+    flights_html = data["fragments"]["flights_table"]["html"]
+    assert "Flight A" in flights_html
+    assert 'data-athlete-name="Ada Lift"' in flights_html
+    assert "No Current Attempt" in data["fragments"]["current_lifter"]["html"]
+
+
+def test_only_changed_fragments_are_resent(client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    first = _fragments(client, competition_id, names="flights_table,rankings")
+    have = ",".join(f"{name}:{version}" for name, version in first["versions"].items())
+
+    unchanged = _fragments(
+        client, competition_id, names="flights_table,rankings", have=have
+    )
+    assert unchanged["fragments"] == {}
+
+    attempt = Attempt.query.filter_by(attempt_number=1).first()
+    attempt.final_result = AttemptResult.GOOD_LIFT
+    attempt.status = "finished"
+    db.session.commit()
+
+    changed = _fragments(
+        client, competition_id, names="flights_table,rankings", have=have
+    )
+    assert list(changed["fragments"]) == ["flights_table"]
+    assert "attempt-success" in changed["fragments"]["flights_table"]["html"]
+
+
+def test_unknown_fragment_is_rejected(client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    response = client.get(
+        f"/display/api/competition/{competition_id}/fragments?names=nope"
+    )
+    assert response.status_code == 400
+
+
+def test_flights_data_keeps_response_shape(client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    data = client.get(
+        f"/display/api/competition/{competition_id}/flights-data"
+    ).get_json()
+
+    assert data["success"] is True
+    athletes = data["events"][0]["flights"][0]["athletes"]
+    assert [a["name"] for a in athletes] == ["Ada Lift", "Ben Press"]
+    assert len(athletes[0]["attempts"]) == 3
+    assert athletes[0]["class"] == "64kg"
@@ -0,0 +1,101 @@
+"""
+Tests for the Server-Sent Events display stream and the change feed behind it
+"""
+
+import json
+
+from app.real_time.change_feed import ChangeFeed, change_feed
+from app.routes.display import stream_competition
+from app.routes.timer import _is_new_transition
+from app.utils.display_projections import rankings_delta
+
+
+def _read_event(chunks):
+    """Return (event, data) for the next non-comment SSE message"""
+    for chunk in chunks:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if text.startswith(":") or text.startswith("retry:"):
+            continue
+        lines = dict(line.split(": ", 1) for line in text.strip().splitlines())
+        return lines["event"], json.loads(lines["data"])
+    raise AssertionError("stream ended")
+
+
+def test_change_feed_fan_out_and_unsubscribe():
+    """Published events reach competition subscribers; global ones reach all"""
+    feed = ChangeFeed()
+    first = feed.subscribe(1)
+    second = feed.subscribe(2)
+
+    feed.publish(1, "timer_update", {"action": "start"})
+    feed.publish(None, "timer_state", {"timer_running": True})
+
+    assert first.get_nowait() == ("timer_update", {"action": "start"})
+    assert first.get_nowait()[0] == "timer_state"
+    assert second.get_nowait()[0] == "timer_state"
+    assert second.empty()
+
+    feed.unsubscribe(1, first)
+    assert feed.subscriber_count(1) == 0
+    assert feed.subscriber_count() == 1
+
+
+def test_rankings_delta_reports_changed_and_removed_rows():
+    previous = [
+        {"rank": 1, "athlete": {"id": 1}, "total_score": 100},
+        {"rank": 2, "athlete": {"id": 2}, "total_score": 90},
+    ]
+    current = [
+        {"rank": 1, "athlete": {"id": 2}, "total_score": 110},
+        {"rank": 2, "athlete": {"id": 3}, "total_score": 95},
+    ]
+
+    delta = rankings_delta(previous, current)
+
+    assert [row["athlete"]["id"] for row in delta["changed"]] == [2, 3]
+    assert delta["removed"] == [1]
+
+
+def test_stream_sends_snapshot_then_feed_events(client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+
+    response = client.get(f"/display/stream/{competition_id}")
+    assert response.status_code == 200
+    assert response.mimetype == "text/event-stream"
+
+    chunks = iter(response.response)
+    event, data = _read_event(chunks)
+    assert event == "snapshot"
+    assert data["lifter"]["next_attempt"]["athlete"]["name"] == "Ada Lift"
+
+    change_feed.publish(competition_id, "timer_update", {"action": "start"})
+    event, data = _read_event(chunks)
+    assert event == "timer"
+    assert data == {"action": "start"}
+
+    response.close()
+    assert change_feed.subscriber_count(competition_id) == 0
+
+
+def test_stream_closed_before_first_read_leaves_no_subscriber(app, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+
+    # The test client reads the first chunk itself, so call the view directly
+    with app.test_request_context(f"/display/stream/{competition_id}"):
+        response = stream_competition(competition_id)
+    response.close()
+
+    assert change_feed.subscriber_count(competition_id) == 0
+
+
+def test_timer_transitions_are_tracked_per_competition():
+    transition = (True, "attempt", 7, 1, 3, False, None)
+
+    assert _is_new_transition(101, transition)
+    assert _is_new_transition(102, transition)  # not masked by competition 101
+    assert not _is_new_transition(101, transition)
+    assert _is_new_transition(101, (False,) + transition[1:])
+
+
+def test_stream_unknown_competition_is_404(client):
+    assert client.get("/display/stream/9999").status_code == 404
@@ -0,0 +1,49 @@
+"""
+Tests for the batched display wall endpoint and shared display projections
+"""
+
+from app.extensions import db
+from app.models import Attempt
+from app.real_time.change_feed import change_feed
+
+
+def test_wall_returns_every_requested_competition(client, seeded_competition):
+    """One request returns state, rankings and timer state per competition"""
+    competition_id = seeded_competition["competition"].id
+
+    response = client.get(f"/display/api/wall?competition_ids={competition_id},9999")
+    data = response.get_json()
+
+    assert response.status_code == 200
+    assert data["success"] is True
+    assert data["missing"] == [9999]
+    assert "timer_state" in data
+
+    wall_entry = data["competitions"][str(competition_id)]
+    assert wall_entry["state"]["waiting_count"] == 6
+    assert wall_entry["state"]["has_current_attempt"] is False
+    assert len(wall_entry["rankings"]) == 2
+
+
+def test_wall_rejects_bad_ids(client):
+    """Missing or malformed ids are a 400"""
+    assert client.get("/display/api/wall").status_code == 400
+    assert client.get("/display/api/wall?competition_ids=abc").status_code == 400
+
+
+def test_state_projection_refreshes_after_commit(client, seeded_competition):
+    """Committing attempt changes bumps the version and invalidates the cache"""
+    competition_id = seeded_competition["competition"].id
+    before = change_feed.version(competition_id)
+
+    first = client.get(f"/display/api/competition/{competition_id}/state").get_json()
+    assert first["current_attempt"] is None
+
+    attempt = Attempt.query.order_by(Attempt.lifting_order).first()
+    attempt.status = "in-progress"
+    db.session.commit()
+
+    assert change_feed.version(competition_id) != before
+    second = client.get(f"/display/api/competition/{competition_id}/state").get_json()
+    assert second["current_attempt"]["id"] == attempt.id
+    assert second["waiting_count"] == 5
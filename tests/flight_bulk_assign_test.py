@@ -0,0 +1,120 @@
+"""
+Tests for bulk athlete-to-flight assignment
+"""
+
+from app.extensions import db
+from app.models import Athlete, AthleteEntry, AthleteFlight, Attempt
+
+
+def _roster(count):
+    athletes = [
+        Athlete(first_name=f"Lifter{i}", last_name="Bulk", competition_id=None)
+        for i in range(count)
+    ]
+    db.session.add_all(athletes)
+    db.session.commit()
+    return [a.id for a in athletes]
+
+
+def _configure_movements(competition, event):
+    competition.config = {
+        "events": [
+            {"id": event.id, "name": event.name, "movements": [{"name": "Snatch"}]}
+        ]
+    }
+    db.session.commit()
+
+
+def test_bulk_assigns_with_orders_and_outcomes(admin_client, seeded_competition):
+    competition = seeded_competition["competition"]
+    flight = seeded_competition["flight"]
+    _configure_movements(competition, seeded_competition["event"])
+    ada = seeded_competition["athletes"][0]
+    new_ids = _roster(3)
+    competition_id, flight_id = competition.id, flight.id
+
+    response = admin_client.post(
+        f"/admin/flights/{flight_id}/athletes:bulk",
+        json={
+            "athletes": [
+                {"athlete_id": new_ids[0], "order": 10, "lot_number": 4},
+                {"athlete_id": new_ids[1]},
+                {"athlete_id": new_ids[2], "order": 1},
+                {"athlete_id": ada.id},
+                {"athlete_id": 99999},
+            ]
+        },
+    )
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["added"] == 2
+    assert [r["status"] for r in data["results"]] == [
+        "added",
+        "added",
+        "order_taken",
+        "already_in_flight",
+        "not_found",
+    ]
+    # Auto orders start after the highest order in use (10)
+    assert data["results"][0]["order"] == 10
+    assert data["results"][0]["lot_number"] == 4
+    assert data["results"][1]["order"] == 11
+
+    members = AthleteFlight.query.filter_by(flight_id=flight_id).count()
+    assert members == 4
+    for athlete_id in new_ids[:2]:
+        assert db.session.get(Athlete, athlete_id).competition_id == competition_id
+        assert AthleteEntry.query.filter_by(athlete_id=athlete_id).count() == 1
+        assert Attempt.query.filter_by(athlete_id=athlete_id).count() == 3
+
+
+def test_bulk_accepts_plain_id_list(admin_client, seeded_competition):
+    flight_id = seeded_competition["flight"].id
+    new_ids = _roster(5)
+
+    response = admin_client.post(
+        f"/admin/flights/{flight_id}/athletes:bulk", json={"athlete_ids": new_ids}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["added"] == 5
+    orders = sorted(
+        af.order for af in AthleteFlight.query.filter_by(flight_id=flight_id)
+    )
+    assert orders == [1, 2, 3, 4, 5, 6, 7]
+
+
+def test_bulk_skips_members_without_an_order(admin_client, seeded_competition):
+    flight_id = seeded_competition["flight"].id
+    ben = seeded_competition["athletes"][1]
+    AthleteFlight.query.filter_by(athlete_id=ben.id).update({"order": None})
+    db.session.commit()
+    new_ids = _roster(1)
+
+    response = admin_client.post(
+        f"/admin/flights/{flight_id}/athletes:bulk", json={"athlete_ids": new_ids}
+    )
+
+    assert response.status_code == 200
+    assert response.get_json()["results"][0]["order"] == 2
+
+
+def test_bulk_rejects_bad_payloads(admin_client, seeded_competition):
+    flight_id = seeded_competition["flight"].id
+
+    assert (
+        admin_client.post(
+            f"/admin/flights/{flight_id}/athletes:bulk", json={}
+        ).status_code
+        == 400
+    )
+    bad = admin_client.post(
+        f"/admin/flights/{flight_id}/athletes:bulk",
+        json={"athletes": [{"athlete_id": "x"}]},
+    )
+    assert bad.status_code == 400
+    missing = admin_client.post(
+        "/admin/flights/9999/athletes:bulk", json={"athlete_ids": [1]}
+    )
+    assert missing.status_code == 404
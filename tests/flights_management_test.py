@@ -0,0 +1,119 @@
+"""
+Tests for the competition-scoped flights management page and API
+"""
+
+from datetime import date
+
+from app.extensions import db
+from app.models import (
+    Athlete,
+    AthleteFlight,
+    Competition,
+    Event,
+    Flight,
+    SportType,
+)
+
+
+def _other_competition(name, flights, athletes_per_flight):
+    """An older competition with its own event, flights and rosters"""
+    competition = Competition(name=name, start_date=date(2023, 1, 1))
+    db.session.add(competition)
+    db.session.flush()
+    event = Event(
+        competition_id=competition.id,
+        name=f"{name} Clean",
+        sport_type=SportType.OLYMPIC_WEIGHTLIFTING,
+    )
+    db.session.add(event)
+    db.session.flush()
+    for n in range(flights):
+        flight = Flight(
+            event_id=event.id,
+            competition_id=competition.id,
+            name=f"{name} Flight {n}",
+            order=n + 1,
+        )
+        db.session.add(flight)
+        db.session.flush()
+        for lot in range(athletes_per_flight):
+            athlete = Athlete(
+                competition_id=competition.id,
+                first_name=f"Athlete{lot}",
+                last_name=name,
+                gender="F",
+            )
+            db.session.add(athlete)
+            db.session.flush()
+            db.session.add(
+                AthleteFlight(
+                    athlete_id=athlete.id, flight_id=flight.id, lot_number=lot + 1
+                )
+            )
+    db.session.commit()
+    return competition
+
+
+def test_page_renders_only_the_selected_competition(
+    app, admin_client, seeded_competition
+):
+    other = _other_competition("Winter Cup", flights=2, athletes_per_flight=2)
+    seeded_competition["flight"].name = "Morning Session"
+    db.session.commit()
+
+    # Defaults to the latest competition
+    html = admin_client.get("/admin/flights-management").get_data(as_text=True)
+    assert "Morning Session" in html
+    assert "Winter Cup Flight" not in html
+    assert "Ada" not in html
+    assert "Winter Cup" in html  # still offered in the competition select
+
+    html = admin_client.get(
+        f"/admin/flights-management?competition_id={other.id}"
+    ).get_data(as_text=True)
+    assert "Winter Cup Flight 1" in html
+    assert "Morning Session" not in html
+
+
+def test_page_queries_do_not_grow_with_other_competitions(
+    app, admin_client, seeded_competition, count_queries
+):
+    url = f"/admin/flights-management?competition_id={seeded_competition['competition'].id}"
+
+    def page_queries():
+        db.session.expire_all()
+        with count_queries() as counter:
+            assert admin_client.get(url).status_code == 200
+        return counter.count
+
+    before = page_queries()
+    _other_competition("Winter Cup", flights=3, athletes_per_flight=4)
+    _other_competition("Spring Cup", flights=2, athletes_per_flight=3)
+    assert page_queries() == before
+
+
+def test_api_returns_events_and_flight_summaries(app, admin_client, seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    flight = seeded_competition["flight"]
+
+    response = admin_client.get(f"/admin/api/flights-management/{competition.id}")
+    body = response.get_json()
+    assert response.status_code == 200
+    assert body["competition"] == {"id": competition.id, "name": "Test Open"}
+    assert body["events"] == [
+        {
+            "id": event.id,
+            "name": "Snatch",
+            "competition_id": competition.id,
+            "competition_name": "Test Open",
+            "flight_count": 1,
+        }
+    ]
+    (summary,) = body["flights"]
+    assert summary["id"] == flight.id
+    assert summary["event_name"] == "Snatch"
+    assert summary["athlete_count"] == 2
+    assert "athletes" not in summary
+
+    assert admin_client.get("/admin/api/flights-management/9999").status_code == 404
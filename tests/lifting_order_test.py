@@ -0,0 +1,222 @@
+"""
+Tests for the incremental per-flight lifting order engine
+"""
+
+from app.extensions import db
+from app.models import Attempt, AthleteEntry, AthleteFlight, Flight
+from app.utils.lifting_order import lifting_order_engine
+
+
+def _attempts(seeded_competition):
+    """(athlete index, attempt number) -> Attempt"""
+    athlete_ids = [a.id for a in seeded_competition["athletes"]]
+    return {
+        (athlete_ids.index(a.athlete_id), a.attempt_number): a
+        for a in Attempt.query.all()
+    }
+
+
+def _orders(attempts):
+    db.session.expire_all()
+    return {
+        key: db.session.get(Attempt, a.id).lifting_order for key, a in attempts.items()
+    }
+
+
+def test_weight_change_moves_only_affected_attempts(
+    app, admin_client, seeded_competition
+):
+    flight = seeded_competition["flight"]
+    attempts = _attempts(seeded_competition)
+
+    # The stored order is kept until the flight is sorted by weight:
+    # weight, then attempt number, then lot number
+    assert lifting_order_engine.sync(flight.id) == 0
+    assert lifting_order_engine.resort(flight.id) == 4
+    db.session.commit()
+    assert _orders(attempts) == {
+        (0, 1): 1,
+        (0, 2): 2,
+        (1, 1): 3,
+        (0, 3): 4,
+        (1, 2): 5,
+        (1, 3): 6,
+    }
+
+    attempt = db.session.get(Attempt, attempts[(0, 1)].id)
+    attempt.requested_weight = 92
+    assert lifting_order_engine.attempt_changed(attempt) == 4
+    db.session.commit()
+    orders = _orders(attempts)
+    assert orders[(0, 1)] == 4
+    assert (orders[(1, 2)], orders[(1, 3)]) == (5, 6)
+
+    response = admin_client.put(
+        f"/admin/attempts/{attempts[(1, 3)].id}/weight", json={"weight": 70}
+    )
+    assert response.get_json()["attempt"]["lifting_order"] == 1
+    assert lifting_order_engine.order(flight.id)[0] == attempts[(1, 3)].id
+
+
+def test_completed_attempts_stay_at_the_head(app, seeded_competition):
+    flight = seeded_competition["flight"]
+    attempts = _attempts(seeded_competition)
+    lifting_order_engine.resort(flight.id)
+    db.session.commit()
+
+    # The first lifter finishing moves nobody
+    head = db.session.get(Attempt, attempts[(0, 1)].id)
+    head.status = "finished"
+    assert lifting_order_engine.attempt_changed(head) == 0
+    db.session.commit()
+
+    # Finishing out of turn shifts only those that were ahead of it
+    third = db.session.get(Attempt, attempts[(1, 1)].id)
+    third.status = "finished"
+    assert lifting_order_engine.attempt_changed(third) == 2
+    db.session.commit()
+    orders = _orders(attempts)
+    assert (orders[(0, 1)], orders[(1, 1)], orders[(0, 2)]) == (1, 2, 3)
+
+    # Edits made elsewhere reload the flight after they commit
+    other = db.session.get(Attempt, attempts[(1, 3)].id)
+    other.requested_weight = 50
+    db.session.commit()
+    assert lifting_order_engine.order(flight.id)[2] == attempts[(1, 3)].id
+
+
+def test_sort_only_reorders_the_flight(app, admin_client, seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    athlete = seeded_competition["athletes"][1]
+    other_flight = Flight(
+        event_id=event.id, competition_id=competition.id, name="Flight B", order=2
+    )
+    db.session.add(other_flight)
+    db.session.flush()
+    db.session.add(
+        AthleteFlight(athlete_id=athlete.id, flight_id=other_flight.id, lot_number=1)
+    )
+    entry = AthleteEntry.query.filter_by(athlete_id=athlete.id).first()
+    other = Attempt(
+        athlete_id=athlete.id,
+        athlete_entry_id=entry.id,
+        flight_id=other_flight.id,
+        attempt_number=1,
+        requested_weight=100,
+        lifting_order=7,
+    )
+    db.session.add(other)
+    db.session.commit()
+
+    response = admin_client.post(
+        f"/admin/flights/{seeded_competition['flight'].id}/attempts/sort/name"
+    )
+    assert response.status_code == 200
+
+    db.session.expire_all()
+    assert db.session.get(Attempt, other.id).lifting_order == 7
+    orders = sorted(
+        a.lifting_order
+        for a in Attempt.query.filter_by(flight_id=seeded_competition["flight"].id)
+    )
+    assert orders == [1, 2, 3, 4, 5, 6]
+
+
+def test_reorder_validates_and_writes_in_bulk(
+    app, admin_client, seeded_competition, count_queries
+):
+    flight = seeded_competition["flight"]
+    ids = [
+        a.id
+        for a in Attempt.query.filter_by(flight_id=flight.id).order_by(
+            Attempt.lifting_order
+        )
+    ]
+    url = f"/admin/flights/{flight.id}/attempts/reorder"
+
+    def reorder(order):
+        updates = [{"id": i, "lifting_order": n} for n, i in enumerate(order, 1)]
+        db.session.expire_all()
+        with count_queries() as counter:
+            response = admin_client.post(url, json={"updates": updates})
+        return response, counter.count
+
+    swapped, swap_queries = reorder([ids[1], ids[0]] + ids[2:])
+    assert swapped.get_json()["updated"] == 2
+    reversed_, reverse_queries = reorder(list(reversed(ids)))
+    assert reversed_.get_json()["updated"] == 6
+    # Same statements however many attempts move
+    assert reverse_queries == swap_queries
+
+    db.session.expire_all()
+    assert [
+        a.id
+        for a in Attempt.query.filter_by(flight_id=flight.id).order_by(
+            Attempt.lifting_order
+        )
+    ] == list(reversed(ids))
+
+    other_flight = Flight(
+        event_id=flight.event_id,
+        competition_id=flight.competition_id,
+        name="B",
+        order=2,
+    )
+    db.session.add(other_flight)
+    db.session.commit()
+    foreign = admin_client.post(
+        f"/admin/flights/{other_flight.id}/attempts/reorder",
+        json={"updates": [{"id": ids[0], "lifting_order": 1}]},
+    )
+    assert foreign.status_code == 400
+    db.session.expire_all()
+    assert db.session.get(Attempt, ids[0]).lifting_order == 6
+
+
+def test_manual_order_survives_weight_changes(app, admin_client, seeded_competition):
+    flight = seeded_competition["flight"]
+    attempts = _attempts(seeded_competition)
+    stored = [
+        a.id
+        for a in Attempt.query.filter_by(flight_id=flight.id).order_by(
+            Attempt.lifting_order
+        )
+    ]
+    manual = list(reversed(stored))
+    admin_client.post(
+        f"/admin/flights/{flight.id}/attempts/reorder",
+        json={
+            "updates": [{"id": i, "lifting_order": n} for n, i in enumerate(manual, 1)]
+        },
+    )
+
+    def stored_order():
+        db.session.expire_all()
+        return [
+            a.id
+            for a in Attempt.query.filter_by(flight_id=flight.id).order_by(
+                Attempt.lifting_order
+            )
+        ]
+
+    # +0.5 kg passes nobody: the hand-made order stays
+    nudged = attempts[(0, 2)]
+    response = admin_client.put(
+        f"/admin/attempts/{nudged.id}/weight", json={"weight": 85.5}
+    )
+    assert (
+        response.get_json()["attempt"]["lifting_order"] == manual.index(nudged.id) + 1
+    )
+    assert stored_order() == manual
+
+    # Outweighing the next lifter swaps just those two; 92 kg passes Ben's
+    # 90 kg opener, which followed it, and nobody else
+    assert manual[3:5] == [nudged.id, attempts[(1, 1)].id]
+    admin_client.put(f"/admin/attempts/{nudged.id}/weight", json={"weight": 92})
+    assert stored_order() == manual[:3] + [attempts[(1, 1)].id, nudged.id] + manual[5:]
+
+    # Sorting by weight drops the hand-made order
+    admin_client.post(f"/admin/flights/{flight.id}/attempts/sort/weight")
+    weights = [db.session.get(Attempt, i).requested_weight for i in stored_order()]
+    assert weights == sorted(weights)
@@ -0,0 +1,104 @@
+"""
+Tests for movement definitions shared by athlete entries
+"""
+
+import copy
+
+from app.extensions import db
+from app.models import AthleteEntry, MovementDefinition
+from app.utils.competition_config import compiled_config_cache
+from app.utils.movements import (
+    ensure_movement_definitions,
+    sync_movement_definitions,
+)
+
+
+def _config(event, snatch):
+    return {
+        "events": [
+            {
+                "id": event.id,
+                "name": event.name,
+                "movements": [snatch, {"name": "Clean & Jerk", "reps": [1, 1, 1]}],
+            }
+        ]
+    }
+
+
+def _setup(seeded_competition):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    competition.config = _config(
+        event,
+        {"name": "Snatch", "reps": [1, 1, 1], "timer": {"attempt_seconds": 60}},
+    )
+    db.session.commit()
+    ensure_movement_definitions(event)
+    db.session.commit()
+    return competition, event
+
+
+def test_entries_read_their_movement_definition(app, seeded_competition):
+    _, event = _setup(seeded_competition)
+
+    definitions = MovementDefinition.query.filter_by(event_id=event.id).all()
+    assert sorted(d.name for d in definitions) == ["Clean & Jerk", "Snatch"]
+
+    entry = AthleteEntry.query.first()
+    assert entry.movement.name == "Snatch"
+    assert entry.reps == [1, 1, 1]
+    assert entry.default_reps == [1, 1, 1]
+    assert entry.entry_config["name"] == "Snatch"
+    assert entry.time_limit == 60
+
+
+def test_config_change_updates_one_row(app, seeded_competition, count_queries):
+    competition, event = _setup(seeded_competition)
+    new_config = copy.deepcopy(competition.config)
+    new_config["events"][0]["movements"][0]["timer"] = {"attempt_seconds": 90}
+    compiled = compiled_config_cache.compile(new_config)
+    db.session.refresh(event)
+
+    with count_queries() as counter:
+        result = sync_movement_definitions([event], compiled)
+        db.session.flush()
+    db.session.commit()
+
+    # Definitions lookup and one UPDATE; entries are not touched
+    assert counter.count == 2
+    assert (result.created, result.updated, result.deleted) == (0, 1, 0)
+    db.session.expire_all()
+    assert {e.time_limit for e in AthleteEntry.query.all()} == {90}
+
+
+def test_reps_change_resets_overrides(app, seeded_competition):
+    competition, event = _setup(seeded_competition)
+    first, second = AthleteEntry.query.order_by(AthleteEntry.id).all()
+    first.reps_override = [1]
+    db.session.commit()
+    assert first.reps == [1]
+    assert second.reps == [1, 1, 1]
+
+    new_config = copy.deepcopy(competition.config)
+    new_config["events"][0]["movements"][0]["reps"] = [1, 1]
+    result = sync_movement_definitions(
+        [event], compiled_config_cache.compile(new_config)
+    )
+    db.session.commit()
+
+    assert result.overrides_reset == 1
+    db.session.expire_all()
+    assert {tuple(e.reps) for e in AthleteEntry.query.all()} == {(1, 1)}
+
+
+def test_entries_without_definition_use_stored_copies(app, seeded_competition):
+    entry = AthleteEntry.query.first()
+    entry.stored_default_reps = [1, 1]
+    entry.stored_entry_config = {"name": "Snatch", "reps": [1, 1]}
+    entry.attempt_time_limit = 75
+    db.session.commit()
+
+    assert entry.movement is None
+    assert entry.reps == [1, 1]
+    assert entry.entry_config == {"name": "Snatch", "reps": [1, 1]}
+    assert entry.time_limit == 75
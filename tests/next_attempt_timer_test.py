@@ -0,0 +1,81 @@
+"""
+Tests for the athlete next-attempt timer served from the competition status record
+"""
+
+from app.extensions import db
+from app.models import Athlete, Attempt
+
+
+def _login_as(client, athlete):
+    with client.session_transaction() as sess:
+        sess["athlete_id"] = athlete.id
+
+
+def test_first_in_queue_is_up(client, seeded_competition):
+    ada = seeded_competition["athletes"][0]
+    _login_as(client, ada)
+
+    data = client.get("/athlete/next-attempt-timer").get_json()
+
+    assert data["timer_type"] == "you-are-up"
+    assert data["order"] == 1
+    assert data["weight"] == 80
+    assert data["is_first_in_queue"] is True
+    assert data["is_first_of_flight"] is True
+    assert data["has_completed_attempts"] is False
+    assert data["event"]["name"] == "Snatch"
+
+
+def test_waiting_athlete_gets_estimate(client, seeded_competition):
+    ben = seeded_competition["athletes"][1]
+    _login_as(client, ben)
+
+    data = client.get("/athlete/next-attempt-timer").get_json()
+
+    assert data["timer_type"] == "estimate"
+    assert data["is_first_in_queue"] is False
+    assert data["time"] > 0
+
+
+def test_poll_uses_one_query_while_data_is_unchanged(
+    client, seeded_competition, count_queries
+):
+    ben = seeded_competition["athletes"][1]
+    _login_as(client, ben)
+    client.get("/athlete/next-attempt-timer")
+
+    with count_queries() as counter:
+        data = client.get("/athlete/next-attempt-timer").get_json()
+
+    assert data["timer_type"] == "estimate"
+    assert counter.count <= 1
+
+
+def test_status_refreshes_after_attempt_finishes(app, client, seeded_competition):
+    ada, ben = seeded_competition["athletes"]
+    _login_as(client, ben)
+    client.get("/athlete/next-attempt-timer")
+
+    first = Attempt.query.order_by(Attempt.lifting_order).first()
+    first.status = "finished"
+    db.session.commit()
+
+    data = client.get("/athlete/next-attempt-timer").get_json()
+
+    assert data["timer_type"] == "you-are-up"
+    assert data["is_first_of_flight"] is False
+    assert data["has_completed_attempts"] is True
+
+
+def test_athlete_without_competition_has_no_attempts(app, client):
+    athlete = Athlete(first_name="Cy", last_name="Free", gender="M")
+    db.session.add(athlete)
+    db.session.commit()
+    _login_as(client, athlete)
+
+    response = client.get("/athlete/next-attempt-timer")
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["no_attempts"] is True
+    assert data["timer_type"] == "inactive"
@@ -0,0 +1,55 @@
+"""
+Tests for the shared per-competition queue projection
+"""
+
+from app.extensions import db
+from app.models import Attempt
+from app.utils.queue_projection import ATTEMPT_BUFFER_SECONDS, get_queue_projection
+
+
+def _attempts_in_order():
+    return Attempt.query.order_by(Attempt.lifting_order).all()
+
+
+def test_queue_projection_holds_cumulative_etas(app, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    attempts = _attempts_in_order()
+
+    projection = get_queue_projection(competition_id)
+
+    per_attempt = 60 + ATTEMPT_BUFFER_SECONDS
+    assert projection.order == [a.id for a in attempts]
+    for position, attempt in enumerate(attempts):
+        slot = projection.slots[attempt.id]
+        assert slot.position == position
+        assert projection.estimated_seconds(attempt.id) == position * per_attempt
+
+
+def test_in_progress_attempt_adds_its_remaining_time(app, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    first, second, third = _attempts_in_order()[:3]
+    first.status = "in-progress"
+    db.session.commit()
+
+    projection = get_queue_projection(competition_id)
+
+    assert projection.current.id == first.id
+    assert first.id not in projection.slots
+    # No live timer and no start time: the full 60s limit is assumed
+    assert projection.estimated_seconds(second.id) == 60
+    assert projection.estimated_seconds(third.id) == 60 + 60 + ATTEMPT_BUFFER_SECONDS
+
+
+def test_projection_is_shared_until_data_changes(app, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+
+    first = get_queue_projection(competition_id)
+    assert get_queue_projection(competition_id) is first
+
+    attempt = _attempts_in_order()[0]
+    attempt.status = "finished"
+    db.session.commit()
+
+    rebuilt = get_queue_projection(competition_id)
+    assert rebuilt is not first
+    assert attempt.id not in rebuilt.slots
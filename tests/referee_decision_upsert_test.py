@@ -0,0 +1,206 @@
+"""
+Tests for the cached referee assignment and the single-statement decision upsert
+"""
+
+from datetime import date
+
+from sqlalchemy import delete
+
+from app.extensions import db, socketio
+from app.models import Attempt, AttemptResult, Competition, Referee, RefereeDecision
+from app.utils.competition_config import DEFAULT_NUMBER_OF_REFEREES
+from app.utils.referee_decisions import (
+    referee_assignment_cache,
+    upsert_referee_decision,
+)
+
+
+def _referee(competition_id):
+    referee = Referee(
+        name="Rita Ref",
+        username="rita",
+        password="secret",
+        position="Head Referee",
+        competition_id=competition_id,
+    )
+    db.session.add(referee)
+    db.session.commit()
+    return referee
+
+
+def _login(client, referee):
+    return client.post(
+        "/admin/api/referee/login",
+        json={"username": referee.username, "password": referee.password},
+    )
+
+
+def test_login_caches_assignment_and_edits_invalidate(
+    client, seeded_competition, count_queries
+):
+    referee = _referee(seeded_competition["competition"].id)
+    referee_id = referee.id
+
+    assert _login(client, referee).get_json()["success"]
+
+    with count_queries() as counter:
+        context = referee_assignment_cache.get(referee_id)
+    assert counter.count == 0
+    assert context.position == "Head Referee"
+
+    referee.position = "Side Referee"
+    db.session.commit()
+    context = referee_assignment_cache.get(referee_id)
+    db.session.commit()
+    assert context.position == "Side Referee"
+    assert referee_assignment_cache.get(referee_id) is context
+
+
+def test_repeat_votes_replace_the_previous_one(client, seeded_competition):
+    referee = _referee(seeded_competition["competition"].id)
+    attempt = Attempt.query.order_by(Attempt.id).first()
+    _login(client, referee)
+
+    for decision in ("good_lift", "no_lift"):
+        response = client.post(
+            "/admin/api/referee-decision",
+            json={
+                "referee_id": referee.id,
+                "competition_id": referee.competition_id,
+                "attempt_id": attempt.id,
+                "decision": decision,
+            },
+        )
+        assert response.get_json()["success"]
+
+    votes = RefereeDecision.query.filter_by(attempt_id=attempt.id).all()
+    assert len(votes) == 1
+    assert votes[0].decision == AttemptResult.NO_LIFT
+
+
+def test_upsert_is_one_statement(app, seeded_competition, count_queries):
+    referee = _referee(seeded_competition["competition"].id)
+    attempt_id = Attempt.query.order_by(Attempt.id).first().id
+    assignment_id = referee_assignment_cache.resolve(referee).assignment_id
+    db.session.commit()
+
+    for decision in (AttemptResult.GOOD_LIFT, AttemptResult.NO_LIFT):
+        with count_queries() as counter:
+            upsert_referee_decision(attempt_id, assignment_id, decision, "note")
+        assert counter.count == 1
+    db.session.commit()
+
+    vote = RefereeDecision.query.filter_by(attempt_id=attempt_id).one()
+    assert vote.decision == AttemptResult.NO_LIFT
+    assert vote.referee_assignment_id == assignment_id
+
+
+def test_socket_decision_is_persisted_and_acknowledged(app, client, seeded_competition):
+    referee = _referee(seeded_competition["competition"].id)
+    attempt = Attempt.query.order_by(Attempt.id).first()
+    socket = socketio.test_client(app, flask_test_client=client)
+
+    ack = socket.emit(
+        "referee_decision",
+        {
+            "referee_id": referee.id,
+            "competition_id": referee.competition_id,
+            "attempt_id": attempt.id,
+            "decision": "good_lift",
+        },
+        callback=True,
+    )
+
+    assert ack["success"] is True
+    assert ack["decision_enum"] == AttemptResult.GOOD_LIFT.value
+    vote = RefereeDecision.query.filter_by(attempt_id=attempt.id).one()
+    assert vote.decision == AttemptResult.GOOD_LIFT
+
+    ack = socket.emit(
+        "referee_decision",
+        {
+            "referee_id": referee.id,
+            "competition_id": referee.competition_id + 1,
+            "attempt_id": attempt.id,
+            "decision": "no_lift",
+        },
+        callback=True,
+    )
+    assert ack == {"success": False, "message": "Invalid referee or competition"}
+    socket.disconnect()
+
+
+def test_regenerating_referees_drops_cached_contexts(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    referees = [
+        Referee(
+            name=f"Ref {n}",
+            username=f"ref{n}",
+            password="secret",
+            position="Side Referee",
+            competition_id=competition_id,
+        )
+        for n in range(DEFAULT_NUMBER_OF_REFEREES + 1)
+    ]
+    db.session.add_all(referees)
+    db.session.commit()
+    first_id, last_id = referees[0].id, referees[-1].id
+    for referee in referees:
+        assert _login(admin_client, referee).get_json()["success"]
+    db.session.expunge_all()
+
+    response = admin_client.post(
+        f"/admin/api/referees/auto-generate/{competition_id}",
+        json={"clear_existing": True},
+    )
+    assert response.get_json()["referees_created"] == DEFAULT_NUMBER_OF_REFEREES
+
+    # The extra referee is gone; its id was not handed out again
+    assert db.session.get(Referee, last_id) is None
+    attempt = Attempt.query.order_by(Attempt.id).first()
+    vote = admin_client.post(
+        "/admin/api/referee-decision",
+        json={
+            "referee_id": last_id,
+            "competition_id": competition_id,
+            "attempt_id": attempt.id,
+            "decision": "good_lift",
+        },
+    )
+    assert vote.status_code == 404
+    assert RefereeDecision.query.count() == 0
+
+    # A reused id resolves to the new referee
+    replacement = db.session.get(Referee, first_id)
+    context = referee_assignment_cache.get(first_id)
+    db.session.commit()
+    assert context.position == replacement.position
+
+
+def test_reused_referee_id_is_not_served_from_cache(app, seeded_competition):
+    referee = _referee(seeded_competition["competition"].id)
+    referee_id = referee.id
+    referee_assignment_cache.resolve(referee)
+    db.session.commit()
+
+    # Removed by a statement nobody reported; SQLite hands the id out again
+    db.session.execute(delete(Referee).where(Referee.id == referee_id))
+    db.session.commit()
+    db.session.expunge_all()
+    other = Competition(name="Winter Cup", start_date=date(2024, 2, 1))
+    db.session.add(other)
+    db.session.flush()
+    newcomer = Referee(
+        name="Sam Side",
+        username="sam",
+        password="secret",
+        position="Side Referee",
+        competition_id=other.id,
+    )
+    db.session.add(newcomer)
+    db.session.commit()
+    assert newcomer.id == referee_id
+
+    context = referee_assignment_cache.get(referee_id)
+    db.session.commit()
+    assert (context.competition_id, context.position) == (other.id, "Side Referee")
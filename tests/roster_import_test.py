@@ -0,0 +1,183 @@
+"""
+Tests for the streaming CSV roster import
+"""
+
+import io
+from datetime import date
+
+from app.extensions import db
+from app.models import (
+    Athlete,
+    AthleteFlight,
+    Attempt,
+    Competition,
+    Flight,
+    User,
+    UserRole,
+)
+from app.utils.roster_import import RosterImporter
+
+
+def _upload(client, csv_text, **form):
+    data = {"file": (io.BytesIO(csv_text.encode("utf-8")), "roster.csv")}
+    data.update({k: str(v) for k, v in form.items()})
+    return client.post(
+        "/admin/athletes/import", data=data, content_type="multipart/form-data"
+    )
+
+
+def test_import_creates_athletes_and_reports_bad_rows(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    csv_text = (
+        "First Name,Last Name,Email,Gender,Bodyweight,Team\n"
+        "Cara,Clean,cara@example.com,F,63.5,North\n"
+        "Dan,Dead,,M,90,South\n"
+        ",Nameless,,M,80,\n"
+        "Eve,Heavy,,F,not-a-number,\n"
+        # Already registered by the fixture, and repeated within the file
+        "Ada,Lift,,F,60,\n"
+        "Cara,Clean,cara@example.com,F,63.5,North\n"
+    )
+
+    response = _upload(admin_client, csv_text, competition_id=competition_id)
+
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["rows"] == 6
+    assert data["created"] == 2
+    assert data["duplicates"] == 2
+    assert [e["row"] for e in data["errors"]] == [4, 5]
+
+    cara = Athlete.query.filter_by(first_name="Cara").one()
+    assert cara.competition_id == competition_id
+    assert cara.bodyweight == 63.5
+    assert cara.team == "North"
+    assert cara.user_id is None
+
+
+def test_import_creates_accounts_and_flight_assignments(
+    admin_client, seeded_competition
+):
+    competition = seeded_competition["competition"]
+    event = seeded_competition["event"]
+    flight_id = seeded_competition["flight"].id
+    competition.config = {
+        "events": [
+            {"id": event.id, "name": event.name, "movements": [{"name": "Snatch"}]}
+        ]
+    }
+    db.session.commit()
+    csv_text = "first_name,last_name,email\nFay,Fast,fay@example.com\nGus,Grip,\n"
+
+    response = _upload(
+        admin_client, csv_text, flight_id=flight_id, create_accounts="true"
+    )
+
+    data = response.get_json()
+    assert data["created"] == 2
+    assert data["accounts_created"] == 1
+    assert data["assigned"] == 2
+
+    fay = Athlete.query.filter_by(first_name="Fay").one()
+    assert db.session.get(User, fay.user_id).email == "fay@example.com"
+    orders = sorted(
+        af.order for af in AthleteFlight.query.filter_by(flight_id=flight_id)
+    )
+    assert orders == [1, 2, 3, 4]
+    assert Attempt.query.filter_by(athlete_id=fay.id).count() == 3
+
+
+def test_import_streams_in_chunks(app, seeded_competition, count_queries):
+    competition_id = seeded_competition["competition"].id
+    lines = ["first_name,last_name"] + [f"Lifter{i},Roster" for i in range(2000)]
+    stream = io.StringIO("\n".join(lines) + "\n")
+
+    with count_queries() as counter:
+        result = RosterImporter(competition_id=competition_id, chunk_size=500).run(
+            stream
+        )
+    db.session.commit()
+
+    assert result.created == 2000
+    # One index query plus one batched insert per chunk
+    assert counter.count == 1 + 4
+    assert Athlete.query.filter_by(last_name="Roster").count() == 2000
+
+
+def test_import_rejects_missing_columns(admin_client, seeded_competition):
+    response = _upload(admin_client, "email\nx@example.com\n")
+
+    assert response.status_code == 400
+    assert "first_name" in response.get_json()["message"]
+
+
+def test_import_rejects_bad_or_unknown_targets(admin_client, seeded_competition):
+    csv_text = "first_name,last_name\nCara,Clean\n"
+
+    assert _upload(admin_client, csv_text, competition_id="abc").status_code == 400
+    assert _upload(admin_client, csv_text, flight_id="1.5").status_code == 400
+    assert _upload(admin_client, csv_text, competition_id=9999).status_code == 404
+    assert _upload(admin_client, csv_text, flight_id=9999).status_code == 404
+    assert Athlete.query.filter_by(first_name="Cara").count() == 0
+
+
+def test_reimport_detects_duplicates_in_other_competitions(
+    admin_client, seeded_competition
+):
+    other = Competition(name="Winter Cup", start_date=date(2024, 2, 1))
+    db.session.add(other)
+    db.session.flush()
+    other_flight = Flight(competition_id=other.id, name="W1", order=1)
+    db.session.add(other_flight)
+    db.session.commit()
+    form_competition = seeded_competition["competition"].id
+    csv_text = (
+        "first_name,last_name,competition_id,flight_id\n"
+        f"Hal,Hook,{other.id},\n"
+        f"Ivy,Iron,,{other_flight.id}\n"
+    )
+
+    first = _upload(admin_client, csv_text, competition_id=form_competition)
+    again = _upload(admin_client, csv_text, competition_id=form_competition)
+
+    assert first.get_json()["created"] == 2
+    assert again.get_json()["created"] == 0
+    assert again.get_json()["duplicates"] == 2
+    assert Athlete.query.filter_by(competition_id=other.id).count() == 2
+
+
+def test_existing_accounts_are_linked(admin_client, seeded_competition):
+    competition_id = seeded_competition["competition"].id
+    jo = User(
+        email="jo@example.com",
+        password_hash="x",
+        first_name="Jo",
+        last_name="Jerk",
+        role=UserRole.ATHLETE,
+    )
+    coach = User(
+        email="coach@example.com",
+        password_hash="x",
+        first_name="Kim",
+        last_name="Coach",
+        role=UserRole.COACH,
+    )
+    db.session.add_all([jo, coach])
+    db.session.commit()
+    csv_text = (
+        "first_name,last_name,email\n"
+        "Jo,Jerk,JO@example.com\n"
+        "Kim,Coach,coach@example.com\n"
+    )
+
+    response = _upload(
+        admin_client, csv_text, competition_id=competition_id, create_accounts="true"
+    )
+
+    data = response.get_json()
+    assert data["created"] == 1
+    assert data["accounts_existing"] == 1
+    assert data["accounts_created"] == 0
+    assert [e["row"] for e in data["errors"]] == [3]
+    assert Athlete.query.filter_by(first_name="Jo").one().user_id == jo.id
+    assert Athlete.query.filter_by(first_name="Kim").count() == 0
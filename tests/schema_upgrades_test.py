@@ -0,0 +1,144 @@
+"""
+Tests for bringing an existing database up to date with the models
+"""
+
+from sqlalchemy import inspect, select, text
+
+from app.extensions import db
+from app.models import AttemptResult, RefereeDecision
+from app.utils.referee_decisions import upsert_referee_decision
+from app.utils.schema_upgrades import upgrade_schema
+
+
+def _index_names(table_name):
+    return {index["name"] for index in inspect(db.engine).get_indexes(table_name)}
+
+
+def _drop_index(name):
+    with db.engine.begin() as connection:
+        connection.execute(text(f"DROP INDEX {name}"))
+
+
+def test_upgrade_is_a_no_op_on_a_current_database(app):
+    before = _index_names("score")
+
+    upgrade_schema()
+    upgrade_schema()
+
+    assert _index_names("score") == before
+
+
+def test_upgrade_adds_missing_score_indexes(app):
+    _drop_index("ix_score_calculated_at_id")
+    _drop_index("ix_score_athlete_entry_id")
+
+    upgrade_schema()
+
+    assert {"ix_score_calculated_at_id", "ix_score_athlete_entry_id"} <= _index_names(
+        "score"
+    )
+
+
+def test_upgrade_adds_missing_decision_log_indexes(app):
+    names = {
+        "ix_decision_log_competition_timestamp",
+        "ix_decision_log_competition_event",
+        "ix_decision_log_competition_flight",
+        "ix_decision_log_competition_athlete",
+    }
+    for name in names:
+        _drop_index(name)
+
+    upgrade_schema()
+
+    assert names <= _index_names("referee_decision_log")
+
+
+def test_upgrade_creates_the_decision_audit_table(app):
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP TABLE referee_decision_audit"))
+
+    upgrade_schema()
+
+    assert inspect(db.engine).has_table("referee_decision_audit")
+    assert {
+        "ix_decision_audit_attempt",
+        "ix_decision_audit_referee",
+    } <= _index_names("referee_decision_audit")
+
+
+def test_upgrade_dedupes_votes_before_adding_the_upsert_key(app):
+    # An older referee_decision table, without the unique key
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP TABLE referee_decision"))
+        connection.execute(
+            text(
+                "CREATE TABLE referee_decision ("
+                "id INTEGER PRIMARY KEY, attempt_id INTEGER NOT NULL, "
+                "referee_assignment_id INTEGER NOT NULL, "
+                "decision VARCHAR(12) NOT NULL, decision_time DATETIME, notes TEXT)"
+            )
+        )
+        connection.execute(
+            text(
+                "INSERT INTO referee_decision "
+                "(id, attempt_id, referee_assignment_id, decision) VALUES "
+                "(1, 7, 1, 'NO_LIFT'), (2, 7, 1, 'GOOD_LIFT'), (3, 7, 2, 'NO_LIFT')"
+            )
+        )
+
+    upgrade_schema()
+    upgrade_schema()
+
+    rows = db.session.execute(
+        select(RefereeDecision.id, RefereeDecision.decision).order_by(
+            RefereeDecision.id
+        )
+    ).all()
+    assert rows == [(2, AttemptResult.GOOD_LIFT), (3, AttemptResult.NO_LIFT)]
+
+    upsert_referee_decision(7, 1, AttemptResult.NO_LIFT)
+    db.session.commit()
+    assert db.session.get(RefereeDecision, 2).decision == AttemptResult.NO_LIFT
+    assert RefereeDecision.query.count() == 2
+
+
+def test_upgrade_adds_the_client_decision_id_and_its_unique_index(app):
+    # The audit table as it was before decisions carried a client id
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP TABLE referee_decision_audit"))
+        connection.execute(
+            text(
+                "CREATE TABLE referee_decision_audit ("
+                "id INTEGER PRIMARY KEY, referee_id INTEGER NOT NULL, "
+                "competition_id INTEGER NOT NULL, attempt_id INTEGER, "
+                "decision VARCHAR(50) NOT NULL, notes TEXT, "
+                "client_timestamp VARCHAR(50), recorded_at DATETIME NOT NULL)"
+            )
+        )
+
+    upgrade_schema()
+
+    columns = {
+        column["name"]
+        for column in inspect(db.engine).get_columns("referee_decision_audit")
+    }
+    assert "client_decision_id" in columns
+    (index,) = [
+        index
+        for index in inspect(db.engine).get_indexes("referee_decision_audit")
+        if index["name"] == "uq_decision_audit_client_decision_id"
+    ]
+    assert index["unique"]
+    assert index["column_names"] == ["client_decision_id"]
+
+
+def test_upgrade_creates_the_movement_definition_table(app):
+    with db.engine.begin() as connection:
+        connection.execute(text("DROP TABLE movement_definition"))
+
+    upgrade_schema()
+
+    assert inspect(db.engine).has_table("movement_definition")
+    (key,) = inspect(db.engine).get_unique_constraints("movement_definition")
+    assert key["column_names"] == ["event_id", "name"]
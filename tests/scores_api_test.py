@@ -0,0 +1,124 @@
+"""
+Tests for the keyset-paginated scores API
+"""
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import AthleteEntry, Score
+
+
+def _add_scores(entry_ids, count, same_time=False):
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    db.session.execute(
+        insert(Score),
+        [
+            {
+                "athlete_entry_id": entry_ids[i % len(entry_ids)],
+                "best_attempt_weight": 80.0 + i,
+                "total_score": 80.0 + i,
+                "rank": i + 1,
+                "score_type": "best_lift",
+                # Pairs of scores share a timestamp so pages split ties
+                "calculated_at": start + timedelta(seconds=0 if same_time else i // 2),
+                "is_final": i % 3 == 0,
+            }
+            for i in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def _entry_ids():
+    return [entry.id for entry in AthleteEntry.query.order_by(AthleteEntry.id)]
+
+
+def _all_pages(client, **params):
+    ids = []
+    cursor = None
+    while True:
+        query = dict(params)
+        if cursor:
+            query["cursor"] = cursor
+        data = client.get("/admin/api/scores", query_string=query).get_json()
+        ids.extend(score["id"] for score in data["scores"])
+        cursor = data["next_cursor"]
+        assert data["has_more"] == (cursor is not None)
+        if not cursor:
+            return ids
+
+
+def test_pages_cover_every_score_once_newest_first(admin_client, seeded_competition):
+    _add_scores(_entry_ids(), 25)
+    expected = [
+        score.id
+        for score in Score.query.order_by(Score.calculated_at.desc(), Score.id.desc())
+    ]
+
+    assert _all_pages(admin_client, limit=4) == expected
+
+    _add_scores(_entry_ids(), 7, same_time=True)
+    assert sorted(_all_pages(admin_client, limit=3)) == sorted(
+        score.id for score in Score.query
+    )
+
+
+def test_filters_and_serialized_fields(admin_client, seeded_competition):
+    _add_scores(_entry_ids(), 6)
+    flight = seeded_competition["flight"]
+
+    response = admin_client.get(
+        "/admin/api/scores",
+        query_string={
+            "competition_id": seeded_competition["competition"].id,
+            "event_id": seeded_competition["event"].id,
+            "flight_id": flight.id,
+            "status": "final",
+        },
+    )
+
+    scores = response.get_json()["scores"]
+    assert len(scores) == 2
+    assert all(score["is_final"] for score in scores)
+    assert scores[0]["flight_name"] == "Flight A"
+    assert scores[0]["competition_name"] == "Test Open"
+    assert scores[0]["athlete_name"] in ("Ada Lift", "Ben Press")
+
+    other = admin_client.get(
+        "/admin/api/scores", query_string={"flight_id": flight.id + 1}
+    ).get_json()
+    assert other == {"scores": [], "next_cursor": None, "has_more": False}
+
+    filters = admin_client.get("/admin/api/scores/filters").get_json()
+    assert filters["events"] == [
+        {
+            "id": seeded_competition["event"].id,
+            "name": "Snatch",
+            "competition_id": seeded_competition["competition"].id,
+        }
+    ]
+    assert [f["id"] for f in filters["flights"]] == [flight.id]
+
+
+def test_invalid_cursor_is_rejected(admin_client, seeded_competition):
+    response = admin_client.get("/admin/api/scores", query_string={"cursor": "nope"})
+
+    assert response.status_code == 400
+
+
+def test_each_page_is_one_query(admin_client, seeded_competition, count_queries):
+    _add_scores(_entry_ids(), 60)
+    db.session.expire_all()
+
+    with count_queries() as counter:
+        first = admin_client.get("/admin/api/scores", query_string={"limit": 20})
+    assert counter.count == 1
+
+    with count_queries() as counter:
+        admin_client.get(
+            "/admin/api/scores",
+            query_string={"limit": 20, "cursor": first.get_json()["next_cursor"]},
+        )
+    assert counter.count == 1
@@ -0,0 +1,106 @@
+"""
+Tests for the streamed scores CSV export
+"""
+
+import csv
+import gzip
+import io
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import AthleteEntry, Competition, Score
+from app.utils.score_queries import EXPORT_HEADERS, iter_scores_csv
+
+
+def _add_scores(entry_ids, count):
+    start = datetime(2024, 1, 1, 9, 0, 0)
+    db.session.execute(
+        insert(Score),
+        [
+            {
+                "athlete_entry_id": entry_ids[i % len(entry_ids)],
+                "best_attempt_weight": 80.0 + i,
+                "total_score": 80.0 + i,
+                "rank": i + 1,
+                "score_type": "best_lift",
+                "calculated_at": start + timedelta(seconds=i),
+                "is_final": i % 2 == 0,
+            }
+            for i in range(count)
+        ],
+    )
+    db.session.commit()
+
+
+def _rows(body: str):
+    return list(csv.reader(io.StringIO(body)))
+
+
+def test_export_streams_csv_rows(admin_client, seeded_competition):
+    entry_ids = [entry.id for entry in AthleteEntry.query.order_by(AthleteEntry.id)]
+    _add_scores(entry_ids, 3)
+
+    response = admin_client.get("/admin/api/scores/export")
+
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "text/csv"
+    assert "scores_export.csv" in response.headers["Content-Disposition"]
+    rows = _rows(response.get_data(as_text=True))
+    assert rows[0] == EXPORT_HEADERS
+    # Newest first
+    assert rows[1] == [
+        "3",
+        "Ada Lift",
+        "Snatch",
+        "Flight A",
+        "Snatch",
+        "82.0",
+        "82.0",
+        "FINAL",
+        "2024-01-01 09:00:02",
+    ]
+    assert [row[1] for row in rows[1:]] == ["Ada Lift", "Ben Press", "Ada Lift"]
+
+
+def test_export_gzip_and_competition_filter(admin_client, seeded_competition):
+    entry_ids = [entry.id for entry in AthleteEntry.query.order_by(AthleteEntry.id)]
+    _add_scores(entry_ids, 4)
+
+    response = admin_client.get(
+        "/admin/api/scores/export",
+        query_string={
+            "gzip": "1",
+            "competition_id": seeded_competition["competition"].id,
+        },
+    )
+
+    assert response.mimetype == "application/gzip"
+    assert "scores_export.csv.gz" in response.headers["Content-Disposition"]
+    rows = _rows(gzip.decompress(response.get_data()).decode("utf-8"))
+    assert len(rows) == 5
+
+    other = Competition(name="Other Open", start_date=date(2024, 2, 1))
+    db.session.add(other)
+    db.session.commit()
+    response = admin_client.get(
+        "/admin/api/scores/export", query_string={"competition_id": other.id}
+    )
+    assert _rows(response.get_data(as_text=True)) == [EXPORT_HEADERS]
+
+
+def test_export_is_one_query_in_bounded_chunks(app, seeded_competition, count_queries):
+    entry_ids = [entry.id for entry in AthleteEntry.query.order_by(AthleteEntry.id)]
+    _add_scores(entry_ids, 1000)
+    db.session.expire_all()
+
+    with count_queries() as counter:
+        chunks = list(iter_scores_csv(chunk_rows=100, fetch_size=250))
+
+    assert counter.count == 1
+    # Header plus 1000 rows, written 100 rows per chunk
+    assert len(chunks) == 10
+    assert all(chunk.count("\n") <= 101 for chunk in chunks)
+    assert sum(chunk.count("\n") for chunk in chunks) == 1001